@@ -33,6 +33,7 @@
 ##########################################################################
 
 
+import multiprocessing
 import os
 import platform
 import subprocess
@@ -335,7 +336,7 @@ class Eddy(QtWidgets.QApplication):
                 break
         else:
             # If we do not have a session for the given project we'll create one.
-            with BusyProgressDialog('Loading project: {0}'.format(path)):
+            with BusyProgressDialog('Loading project: {0}'.format(path), modal=True):
                 try:
                     session = Session(self, path, name=name, iri=iri, prefix=prefix, owl_path=owl_path)
                 except ProjectStopLoadingError:
@@ -520,6 +521,14 @@ def main() -> int:
     """
     Application entry point.
     """
+    #############################################
+    # SETUP WORKER PROCESSES SUPPORT
+    #################################
+
+    # In frozen builds worker processes (see eddy.core.exporters.owl2_analysis)
+    # are started by running the executable again: let them bootstrap here.
+    multiprocessing.freeze_support()
+
     #############################################
     # SETUP EXCEPTION HOOK
     #################################
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+
+from PyQt5 import QtCore
+from PyQt5 import QtGui
+from PyQt5 import QtWidgets
+
+from eddy.core.exporters.common import DiagramRenderCache
+from eddy.core.functions.signals import connect, disconnect
+
+
+class DiagramCatalogueEntry(object):
+    """
+    This class holds the metadata describing a single diagram of a project: its name,
+    the number of nodes and edges it contains, the bounding box of its items and a
+    thumbnail picturing its content.
+    """
+    __slots__ = ('name', 'diagram', 'nodes', 'edges', 'bounds', 'thumbnail', 'stale')
+
+    def __init__(self, name, nodes=0, edges=0, bounds=None, thumbnail=None):
+        """
+        Initialize the catalogue entry.
+        :type name: str
+        :type nodes: int
+        :type edges: int
+        :type bounds: QRectF
+        :type thumbnail: QImage
+        """
+        self.name = name
+        self.diagram = None
+        self.nodes = nodes
+        self.edges = edges
+        self.bounds = bounds or QtCore.QRectF()
+        self.thumbnail = thumbnail or QtGui.QImage()
+        self.stale = self.thumbnail.isNull()
+
+    def hasDiagram(self):
+        """
+        Returns True if the diagram described by this entry has been added to the project, False otherwise.
+        :rtype: bool
+        """
+        return self.diagram is not None
+
+
+class DiagramCatalogue(QtCore.QObject):
+    """
+    This class keeps a catalogue of the diagrams of a project, holding for each diagram the
+    metadata needed to browse the project without inspecting the diagram itself (see
+    DiagramCatalogueEntry). The catalogue is persisted along with the project, so that this
+    metadata is available as soon as the project is opened.
+
+    Item counters are read from the project index (which summarizes the content of diagrams
+    whose items have not been built yet), while the bounding box and the thumbnail are computed
+    lazily: they are marked as stale whenever the diagram is updated (or its font or the rendering
+    of the node labels change) and computed again only the next time they are requested.
+    The persisted ones are kept for diagrams which are not built yet.
+    """
+    ThumbnailSize = 128
+
+    sgnEntryAdded = QtCore.pyqtSignal(str)
+    sgnEntryRemoved = QtCore.pyqtSignal(str)
+
+    def __init__(self, project):
+        """
+        Initialize the diagram catalogue.
+        :type project: Project
+        """
+        super().__init__(project)
+        self.setObjectName('diagram_catalogue')
+        self.entries = {}
+        connect(project.sgnDiagramAdded, self.onDiagramAdded)
+        connect(project.sgnDiagramRemoved, self.onDiagramRemoved)
+        session = project.session
+        if session is not None and hasattr(session, 'sgnRenderingModified'):
+            connect(session.sgnRenderingModified, self.onRenderingModified)
+            connect(session.sgnPrefixAdded, self.onRenderingModified)
+            connect(session.sgnPrefixRemoved, self.onRenderingModified)
+            connect(session.sgnPrefixModified, self.onRenderingModified)
+        for diagram in project.diagrams():
+            self.onDiagramAdded(diagram)
+
+    #############################################
+    #   PROPERTIES
+    #################################
+
+    @property
+    def project(self):
+        """
+        Returns the project whose diagrams are catalogued.
+        :rtype: Project
+        """
+        return self.parent()
+
+    #############################################
+    #   EVENTS
+    #################################
+
+    def eventFilter(self, source, event):
+        """
+        Filters the events of the catalogued diagrams, marking their entry as stale when their font changes.
+        :type source: QObject
+        :type event: QEvent
+        :rtype: bool
+        """
+        if event.type() == QtCore.QEvent.FontChange:
+            entry = self.entries.get(source.name)
+            if entry:
+                entry.stale = True
+        return super().eventFilter(source, event)
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot(QtWidgets.QGraphicsScene)
+    def onDiagramAdded(self, diagram):
+        """
+        Executed when a diagram is added to the project.
+        :type diagram: Diagram
+        """
+        entry = self.entries.get(diagram.name)
+        if entry is None or entry.hasDiagram():
+            entry = self.entries[diagram.name] = DiagramCatalogueEntry(diagram.name)
+        entry.diagram = diagram
+        connect(diagram.sgnUpdated, self.onDiagramUpdated)
+        diagram.installEventFilter(self)
+        self.sgnEntryAdded.emit(diagram.name)
+
+    @QtCore.pyqtSlot(QtWidgets.QGraphicsScene)
+    def onDiagramRemoved(self, diagram):
+        """
+        Executed when a diagram is removed from the project.
+        :type diagram: Diagram
+        """
+        disconnect(diagram.sgnUpdated, self.onDiagramUpdated)
+        diagram.removeEventFilter(self)
+        if self.entries.pop(diagram.name, None) is not None:
+            self.sgnEntryRemoved.emit(diagram.name)
+
+    @QtCore.pyqtSlot()
+    def onDiagramUpdated(self):
+        """
+        Executed when a catalogued diagram is updated.
+        """
+        entry = self.entries.get(self.sender().name)
+        if entry:
+            entry.stale = True
+
+    @QtCore.pyqtSlot()
+    def onRenderingModified(self):
+        """
+        Executed when the rendering of the node labels changes.
+        """
+        for entry in self.entries.values():
+            if entry.hasDiagram():
+                entry.stale = True
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    @classmethod
+    def forProject(cls, project):
+        """
+        Returns the diagram catalogue of the given project, creating it if needed.
+        :type project: Project
+        :rtype: DiagramCatalogue
+        """
+        catalogue = project.findChild(cls, 'diagram_catalogue', QtCore.Qt.FindDirectChildrenOnly)
+        if catalogue is None:
+            catalogue = cls(project)
+        return catalogue
+
+    def entry(self, name):
+        """
+        Returns the catalogue entry of the diagram with the given name, or None if no such diagram exists.
+        Item counters are brought up to date, while the bounding box and the thumbnail are left untouched.
+        :type name: str
+        :rtype: DiagramCatalogueEntry
+        """
+        entry = self.entries.get(name)
+        if entry and entry.hasDiagram():
+            pending = self.project.pendingDiagram(entry.diagram)
+            if pending:
+                entry.nodes = pending.nodeNum()
+                entry.edges = pending.edgeNum()
+            else:
+                entry.nodes = len(self.project.nodes(entry.diagram))
+                entry.edges = len(self.project.edges(entry.diagram))
+        return entry
+
+    def fromDomElement(self, name, element):
+        """
+        Register the metadata of the diagram with the given name, as persisted in the given 'catalogue' element.
+        Nothing is registered if the element is null (i.e. the project was saved without catalogue).
+        :type name: str
+        :type element: QDomElement
+        :rtype: DiagramCatalogueEntry
+        """
+        if element.isNull():
+            return None
+        thumbnail = QtGui.QImage()
+        thumbnailEl = element.firstChildElement('thumbnail')
+        if not thumbnailEl.isNull():
+            data = QtCore.QByteArray.fromBase64(thumbnailEl.text().encode('ascii'))
+            thumbnail.loadFromData(data, thumbnailEl.attribute('format', 'PNG'))
+        entry = DiagramCatalogueEntry(
+            name,
+            nodes=int(element.attribute('nodes', '0')),
+            edges=int(element.attribute('edges', '0')),
+            bounds=QtCore.QRectF(
+                float(element.attribute('x', '0')),
+                float(element.attribute('y', '0')),
+                float(element.attribute('width', '0')),
+                float(element.attribute('height', '0'))),
+            thumbnail=thumbnail)
+        self.entries[name] = entry
+        return entry
+
+    def names(self):
+        """
+        Returns the names of the catalogued diagrams.
+        :rtype: KeysView
+        """
+        return self.entries.keys()
+
+    def refresh(self, name):
+        """
+        Returns the fully up to date catalogue entry of the diagram with the given name, or None if no
+        such diagram exists. The bounding box and the thumbnail are computed again if they are stale.
+        :type name: str
+        :rtype: DiagramCatalogueEntry
+        """
+        entry = self.entry(name)
+        if entry and entry.hasDiagram() and entry.stale and not self.project.isPending(entry.diagram):
+            picture, _ = DiagramRenderCache.get(entry.diagram, self.project.session)
+            entry.bounds = entry.diagram.visibleRect()
+            entry.thumbnail = self.renderThumbnail(picture, entry.bounds)
+            entry.stale = False
+        return entry
+
+    def renderThumbnail(self, picture, shape):
+        """
+        Returns a thumbnail of the given area of a diagram picture, fitting a square of ThumbnailSize pixels.
+        :type picture: QPicture
+        :type shape: QRectF
+        :rtype: QImage
+        """
+        if shape.isEmpty():
+            return QtGui.QImage()
+        ratio = min(self.ThumbnailSize / shape.width(), self.ThumbnailSize / shape.height())
+        size = QtCore.QSize(max(int(shape.width() * ratio), 1), max(int(shape.height() * ratio), 1))
+        thumbnail = QtGui.QImage(size, QtGui.QImage.Format_ARGB32_Premultiplied)
+        thumbnail.fill(QtCore.Qt.white)
+        painter = QtGui.QPainter(thumbnail)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        DiagramRenderCache.render(painter, picture, shape, QtCore.QRectF(thumbnail.rect()))
+        painter.end()
+        return thumbnail
+
+    def toDomElement(self, document, name):
+        """
+        Returns a 'catalogue' element persisting the metadata of the diagram with the given name.
+        :type document: QDomDocument
+        :type name: str
+        :rtype: QDomElement
+        """
+        entry = self.refresh(name)
+        element = document.createElement('catalogue')
+        element.setAttribute('nodes', entry.nodes)
+        element.setAttribute('edges', entry.edges)
+        element.setAttribute('x', entry.bounds.x())
+        element.setAttribute('y', entry.bounds.y())
+        element.setAttribute('width', entry.bounds.width())
+        element.setAttribute('height', entry.bounds.height())
+        if not entry.thumbnail.isNull():
+            data = QtCore.QByteArray()
+            buffer = QtCore.QBuffer(data)
+            buffer.open(QtCore.QIODevice.WriteOnly)
+            entry.thumbnail.save(buffer, 'PNG')
+            buffer.close()
+            thumbnailEl = document.createElement('thumbnail')
+            thumbnailEl.setAttribute('format', 'PNG')
+            thumbnailEl.appendChild(document.createTextNode(bytes(data.toBase64()).decode('ascii')))
+            element.appendChild(thumbnailEl)
+        return element
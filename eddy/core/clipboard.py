@@ -33,9 +33,15 @@
 ##########################################################################
 
 
-from PyQt5 import QtCore
+from time import time
+
+from PyQt5 import (
+    QtCore,
+    QtWidgets,
+)
 
 from eddy.core.commands.common import CommandItemsAdd
+from eddy.core.functions.signals import connect
 from eddy.core.output import getLogger
 
 
@@ -45,11 +51,15 @@ LOGGER = getLogger()
 class Clipboard(QtCore.QObject):
     """
     Extension of QtCore.QObject which implements the Clipboard.
+    Selected items are serialized once into a Graphol fragment which is stored on the system
+    clipboard using a dedicated MIME type (plus a plain text version of the same document), so
+    that items can be pasted across different running instances of the application.
     Additionally to built-in signals, this class emits:
 
     * sgnCleared: whenever the clipboard is cleared.
     * sgnUpdated: whenever the clipboard is updated with new elements.
     """
+    MimeType = 'application/x-graphol-fragment'
     PasteOffsetX = 20
     PasteOffsetY = 10
 
@@ -62,8 +72,11 @@ class Clipboard(QtCore.QObject):
         :type session: Session
         """
         super().__init__(session)
-        self.edges = {}
-        self.nodes = {}
+        self.available = False
+        self.edges = 0
+        self.nodes = 0
+        connect(self.system.dataChanged, self.onDataChanged)
+        self.onDataChanged()
 
     #############################################
     #   PROPERTIES
@@ -77,6 +90,41 @@ class Clipboard(QtCore.QObject):
         """
         return self.parent()
 
+    @property
+    def system(self):
+        """
+        Returns the reference to the system clipboard.
+        :rtype: QClipboard
+        """
+        return QtWidgets.QApplication.clipboard()
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot()
+    def onDataChanged(self):
+        """
+        Executed whenever the content of the system clipboard changes.
+        """
+        mimeData = self.system.mimeData()
+        available = mimeData is not None and mimeData.hasFormat(self.MimeType)
+        if available:
+            # Only read the fragment header to figure out the amount of copied elements.
+            reader = QtCore.QXmlStreamReader(mimeData.data(self.MimeType))
+            while not reader.atEnd():
+                if reader.readNext() == QtCore.QXmlStreamReader.StartElement and reader.name() == 'fragment':
+                    self.edges = int(reader.attributes().value('edges') or 0)
+                    self.nodes = int(reader.attributes().value('nodes') or 0)
+                    break
+            self.available = True
+            self.sgnUpdated.emit()
+        elif self.available:
+            self.available = False
+            self.edges = 0
+            self.nodes = 0
+            self.sgnCleared.emit()
+
     #############################################
     #   INTERFACE
     #################################
@@ -85,17 +133,16 @@ class Clipboard(QtCore.QObject):
         """
         Clear the clipboard.
         """
-        self.edges.clear()
-        self.nodes.clear()
+        if self.available:
+            self.system.clear()
         LOGGER.debug('Clipboard cleared!')
-        self.sgnCleared.emit()
 
     def empty(self):
         """
         Tells whether the clipboard is empty.
         :rtype: bool
         """
-        return not self.edges and not self.nodes
+        return not self.available
 
     def paste(self, diagram, pos=None):
         """
@@ -103,113 +150,89 @@ class Clipboard(QtCore.QObject):
         :type diagram: Diagram
         :type pos: QPointF
         """
-        def ncopy(node):
-            """
-            Create a copy of the given node generating a new id.
-            :type node: AbstractNode
-            """
-            copy = node.copy(diagram)
-            copy.id = diagram.guid.next('n')
-            return copy
-
-        # Create a copy of all the nodes in the clipboard and store them in a dict using the old
-        # node id: this is needed so we can attach copied edges to the copy of the nodes in the
-        # clipboard and to do so we need a mapping between the old node id and the new node id.
-        nodes = {x:ncopy(n) for x, n in self.nodes.items()}
-
-        def ecopy(edge):
-            """
-            Create a copy of the given edge generating a new id and attaching the
-            copied edge to the correspondent previously copied source/target nodes.
-            :type edge: AbstractEdge
-            """
-            copy = edge.copy(diagram)
-            copy.id = diagram.guid.next('e')
-            copy.source = nodes[edge.source.id]
-            copy.target = nodes[edge.target.id]
-            copy.source.setAnchor(copy, edge.source.anchor(edge))
-            copy.target.setAnchor(copy, edge.target.anchor(edge))
-            nodes[edge.source.id].addEdge(copy)
-            nodes[edge.target.id].addEdge(copy)
-            copy.updateEdge()
-            return copy
-
-        # Copy all the needed edges
-        edges = [ecopy(e) for e in self.edges.values()]
-        nodes = [n for n in nodes.values()]
-        items = nodes + edges
+        # IMPORTED HERE SINCE THE DIAGRAM MODULE DEPENDS ON THE CLIPBOARD
+        from eddy.core.loaders.graphol_iri import GrapholIRIFragmentLoader
 
+        mimeData = self.system.mimeData()
+        if mimeData is None or not mimeData.hasFormat(self.MimeType):
+            return
+
+        # Rebuild the items stored in the fragment: copied nodes are given new identifiers
+        # and their IRIs are resolved against the project the diagram belongs to. IRIs which
+        # are created in the project meanwhile are handed over to the paste command, so that
+        # they are removed from the project along with the pasted items on undo.
+        project = diagram.project
+        known = set(project.iris)
+        loader = GrapholIRIFragmentLoader(bytes(mimeData.data(self.MimeType)), diagram)
         try:
-            zValue = max(diagram.items(), key=lambda x: x.zValue()).zValue()
-        except ValueError:
-            zValue = 0  # Diagram is empty
+            nodes, edges = loader.run()
+        except Exception as e:
+            LOGGER.exception('Failed to paste clipboard content: %s', e)
+            nodes, edges = [], []
+        iris = project.iris - known
+        if not nodes:
+            for iri in iris:
+                project.deleteIRI(iri)
+            return
 
         if pos:
-
             # Paste position has been given manually => figure out which node to use as anchor item and
             # adjust the paste position so that the anchor item is pasted right after the given position
             item = min(nodes, key=lambda x: x.boundingRect().top())
             offset = pos - item.pos() + QtCore.QPointF(item.width() / 2, item.height() / 2)
-            for item in items:
-                item.moveBy(offset.x(), offset.y())
-                if item.isNode():
-                    item.setZValue(zValue + 0.1)
-                    zValue += 0.1
-                elif item.isEdge():
-                    item.updateEdge()
-
+            offsetX, offsetY = offset.x(), offset.y()
             # Adjust offsets for a possible next paste using shortcuts.
-            diagram.pasteX = offset.x() + self.PasteOffsetX
-            diagram.pasteY = offset.y() + self.PasteOffsetY
-
+            diagram.pasteX = offsetX + self.PasteOffsetX
+            diagram.pasteY = offsetY + self.PasteOffsetY
         else:
-
             # No paste position given => use offsets set in the diagram instance.
-            for item in items:
-                item.moveBy(diagram.pasteX, diagram.pasteY)
-                if item.isNode():
-                    item.setZValue(zValue + 0.1)
-                    zValue += 0.1
-                elif item.isEdge():
-                    item.updateEdge()
-
+            offsetX, offsetY = diagram.pasteX, diagram.pasteY
             # Adjust diagram offsets for a possible next paste using shortcuts.
             diagram.pasteX += self.PasteOffsetX
             diagram.pasteY += self.PasteOffsetY
 
-        self.session.undostack.push(CommandItemsAdd(diagram, items))
+        # Stack pasted nodes on top of the diagram ones, preserving their relative order.
+        zValue = max((node.zValue() for node in diagram.nodes()), default=0)
+        for i, node in enumerate(nodes, start=1):
+            node.moveBy(offsetX, offsetY)
+            node.setZValue(zValue + i * 0.1)
+        for edge in edges:
+            edge.moveBy(offsetX, offsetY)
+            edge.updateEdge()
+
+        self.session.undostack.push(CommandItemsAdd(diagram, nodes + edges, iris))
 
     def size(self):
         """
         Returns the amount of elements in the clipboard.
         """
-        return len(self.edges) + len(self.nodes)
+        return self.edges + self.nodes
 
     def update(self, diagram):
         """
         Update the clipboard collecting new selected items.
         :type diagram: Diagram
         """
+        # IMPORTED HERE SINCE THE DIAGRAM MODULE DEPENDS ON THE CLIPBOARD
+        from eddy.core.exporters.graphol_iri import GrapholIRIFragmentExporter
+
         nodes = diagram.selectedNodes()
         if nodes:
-
-            self.edges = {}
-            self.nodes = {node.id: node.copy(diagram) for node in nodes}
-            for node in nodes:
-                for edge in node.edges:
-                    if edge.id not in self.edges and edge.isSelected() and edge.other(node).isSelected():
-                        copy = edge.copy(diagram)
-                        copy.source = self.nodes[edge.source.id]
-                        copy.source.setAnchor(copy, edge.source.anchor(edge))
-                        copy.target = self.nodes[edge.target.id]
-                        copy.target.setAnchor(copy, edge.target.anchor(edge))
-                        self.edges[edge.id] = copy
-
-            LOGGER.debug('Clipboard updated: nodes=%s, edges=%s', len(self.nodes), len(self.edges))
-            self.sgnUpdated.emit()
+            start = time()
+            selected = set(nodes)
+            edges = {edge for node in nodes for edge in node.edges
+                     if edge.source in selected and edge.target in selected and edge.isSelected()}
+            nodes = sorted(nodes, key=lambda x: x.zValue())
+            edges = sorted(edges, key=lambda x: x.id)
+            fragment = GrapholIRIFragmentExporter(diagram, nodes, edges).run()
+            mimeData = QtCore.QMimeData()
+            mimeData.setData(self.MimeType, QtCore.QByteArray(fragment.encode('utf-8')))
+            mimeData.setText(fragment)
+            self.system.setMimeData(mimeData)
+            LOGGER.debug('Clipboard updated: nodes=%s, edges=%s (%.3fs)', len(nodes), len(edges), time() - start)
 
     def __repr__(self):
         """
         Return repr(self).
         """
-        return 'Clipboard<nodes:{0},edges:{1}>'.format(len(self.nodes), len(self.edges))
\ No newline at end of file
+        return 'Clipboard<nodes:{0},edges:{1}>'.format(self.nodes, self.edges)
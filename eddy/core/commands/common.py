@@ -41,15 +41,18 @@ from eddy.core.functions.misc import first
 
 class CommandItemsAdd(QtWidgets.QUndoCommand):
     """
-    This command is used to add a collection of items to a diagram.
+    This command is used to add a collection of items to a diagram, along with the
+    IRIs which have been created for them (e.g. when pasting items from another project).
     """
-    def __init__(self, diagram, items):
+    def __init__(self, diagram, items, iris=None):
         """
         Initialize the command.
         :type diagram: Diagram
         :type items: T <= tuple|list|set
+        :type iris: T <= tuple|list|set
         """
         self.items = items
+        self.iris = iris or set()
         self.diagram = diagram
         self.selected = diagram.selectedItems()
         if len(items) == 1:
@@ -61,12 +64,16 @@ class CommandItemsAdd(QtWidgets.QUndoCommand):
     def redo(self):
         """redo the command"""
         self.diagram.clearSelection()
+        # Add the IRIs created for the items to the project.
+        for iri in self.iris:
+            self.diagram.project.addIRI(iri)
         # Add all the items to the diagram.
-        for item in self.items:
-            self.diagram.addItem(item)
-            self.diagram.sgnItemAdded.emit(self.diagram, item)
-            item.setSelected(True)
-            item.updateEdgeOrNode(selected=True)
+        with self.diagram.transaction():
+            for item in self.items:
+                self.diagram.addItem(item)
+                self.diagram.sgnItemAdded.emit(self.diagram, item)
+                item.setSelected(True)
+                item.updateEdgeOrNode(selected=True)
         # Emit updated signal.
         self.diagram.sgnUpdated.emit()
 
@@ -74,9 +81,14 @@ class CommandItemsAdd(QtWidgets.QUndoCommand):
         """undo the command"""
         self.diagram.clearSelection()
         # Remove all the items from the diagram.
-        for item in self.items:
-            self.diagram.removeItem(item)
-            self.diagram.sgnItemRemoved.emit(self.diagram, item)
+        with self.diagram.transaction():
+            for item in self.items:
+                self.diagram.removeItem(item)
+                self.diagram.sgnItemRemoved.emit(self.diagram, item)
+        # Remove the IRIs created for the items from the project.
+        for iri in self.iris:
+            if iri in self.diagram.project.iris:
+                self.diagram.project.deleteIRI(iri)
         # Restore the old selection.
         for item in self.selected:
             item.setSelected(True)
@@ -123,16 +135,17 @@ class CommandItemsRemove(QtWidgets.QUndoCommand):
 
     def redo(self):
         """redo the command"""
-        # Remove the edges.
-        for edge in self.edges:
-            edge.source.removeEdge(edge)
-            edge.target.removeEdge(edge)
-            self.diagram.removeItem(edge)
-            self.diagram.sgnItemRemoved.emit(self.diagram, edge)
-        # Remove the nodes.
-        for node in self.nodes:
-            self.diagram.removeItem(node)
-            self.diagram.sgnItemRemoved.emit(self.diagram, node)
+        with self.diagram.transaction():
+            # Remove the edges.
+            for edge in self.edges:
+                edge.source.removeEdge(edge)
+                edge.target.removeEdge(edge)
+                self.diagram.removeItem(edge)
+                self.diagram.sgnItemRemoved.emit(self.diagram, edge)
+            # Remove the nodes.
+            for node in self.nodes:
+                self.diagram.removeItem(node)
+                self.diagram.sgnItemRemoved.emit(self.diagram, node)
         # Update node inputs.
         for node in self.inputs:
             node.inputs = self.inputs[node]['redo'][:]
@@ -143,16 +156,17 @@ class CommandItemsRemove(QtWidgets.QUndoCommand):
 
     def undo(self):
         """undo the command"""
-        # Add back the nodes.
-        for node in self.nodes:
-            self.diagram.addItem(node)
-            self.diagram.sgnItemAdded.emit(self.diagram, node)
-        # Add back the edges.
-        for edge in self.edges:
-            edge.source.addEdge(edge)
-            edge.target.addEdge(edge)
-            self.diagram.addItem(edge)
-            self.diagram.sgnItemAdded.emit(self.diagram, edge)
+        with self.diagram.transaction():
+            # Add back the nodes.
+            for node in self.nodes:
+                self.diagram.addItem(node)
+                self.diagram.sgnItemAdded.emit(self.diagram, node)
+            # Add back the edges.
+            for edge in self.edges:
+                edge.source.addEdge(edge)
+                edge.target.addEdge(edge)
+                self.diagram.addItem(edge)
+                self.diagram.sgnItemAdded.emit(self.diagram, edge)
         # Update node inputs.
         for node in self.inputs:
             node.inputs = self.inputs[node]['undo'][:]
@@ -188,9 +202,10 @@ class CommandComposeAxiom(QtWidgets.QUndoCommand):
             edge.source.addEdge(edge)
             edge.target.addEdge(edge)
         # Add items to the diagram.
-        for item in self.nodes | self.edges:
-            self.diagram.addItem(item)
-            self.diagram.sgnItemAdded.emit(self.diagram, item)
+        with self.diagram.transaction():
+            for item in self.nodes | self.edges:
+                self.diagram.addItem(item)
+                self.diagram.sgnItemAdded.emit(self.diagram, item)
         # Update edges.
         for edge in self.edges:
             edge.updateEdge()
@@ -200,9 +215,10 @@ class CommandComposeAxiom(QtWidgets.QUndoCommand):
     def undo(self):
         """undo the command"""
         # Remove items from the diagram.
-        for item in self.nodes | self.edges:
-            self.diagram.removeItem(item)
-            self.diagram.sgnItemRemoved.emit(self.diagram, item)
+        with self.diagram.transaction():
+            for item in self.nodes | self.edges:
+                self.diagram.removeItem(item)
+                self.diagram.sgnItemRemoved.emit(self.diagram, item)
         # Remove edge mappings from source and target nodes.
         for edge in self.edges:
             edge.source.removeEdge(edge)
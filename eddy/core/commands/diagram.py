@@ -55,7 +55,7 @@ class CommandDiagramAdd(QtWidgets.QUndoCommand):
         """redo the command"""
         self.diagram.setParent(self.parents['redo'])
         self.project.addDiagram(self.diagram)
-        for item in self.project.items():
+        for item in self.project.items(self.diagram):
             item.updateEdgeOrNode()
         self.project.sgnUpdated.emit()
 
@@ -36,6 +36,7 @@
 from PyQt5 import QtWidgets
 
 from eddy.core.datatypes.graphol import Item
+from eddy.core.datatypes.misc import CommandId
 from eddy.core.functions.misc import first
 
 
@@ -160,6 +161,24 @@ class CommandEdgeAnchorMove(QtWidgets.QUndoCommand):
         self.edge.updateEdge()
         self.diagram.sgnUpdated.emit()
 
+    def id(self):
+        """
+        Returns the command id, used for command compression.
+        :rtype: int
+        """
+        return CommandId.EdgeAnchorMove
+
+    def mergeWith(self, command):
+        """
+        Merge a consecutive move of the same anchor point into this command.
+        :type command: CommandEdgeAnchorMove
+        :rtype: bool
+        """
+        if command.edge is not self.edge or command.node is not self.node:
+            return False
+        self.data['redo'] = command.data['redo']
+        return True
+
 
 class CommandEdgeBreakpointMove(QtWidgets.QUndoCommand):
     """
@@ -191,6 +210,24 @@ class CommandEdgeBreakpointMove(QtWidgets.QUndoCommand):
         self.edge.updateEdge()
         self.diagram.sgnUpdated.emit()
 
+    def id(self):
+        """
+        Returns the command id, used for command compression.
+        :rtype: int
+        """
+        return CommandId.EdgeBreakpointMove
+
+    def mergeWith(self, command):
+        """
+        Merge a consecutive move of the same breakpoint into this command.
+        :type command: CommandEdgeBreakpointMove
+        :rtype: bool
+        """
+        if command.edge is not self.edge or command.index != self.index:
+            return False
+        self.data['redo'] = command.data['redo']
+        return True
+
 
 class CommandEdgeBreakpointRemove(QtWidgets.QUndoCommand):
     """
@@ -272,6 +309,11 @@ class CommandEdgeSwap(QtWidgets.QUndoCommand):
         for edge in self.edges:
             for node in {edge.source, edge.target}:
                 self.diagram.sgnNodeIdentification.emit(node)
+        # Record the semantic change.
+        with self.diagram.project.transaction():
+            for edge in self.edges:
+                for item in (edge, edge.source, edge.target):
+                    self.diagram.project.doModifyItem(self.diagram, item)
         # Emit updated signal.
         self.diagram.sgnUpdated.emit()
 
@@ -289,6 +331,11 @@ class CommandEdgeSwap(QtWidgets.QUndoCommand):
         for edge in self.edges:
             for node in {edge.source, edge.target}:
                 self.diagram.sgnNodeIdentification.emit(node)
+        # Record the semantic change.
+        with self.diagram.project.transaction():
+            for edge in self.edges:
+                for item in (edge, edge.source, edge.target):
+                    self.diagram.project.doModifyItem(self.diagram, item)
         # Emit updated signal.
         self.diagram.sgnUpdated.emit()
 
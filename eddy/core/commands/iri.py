@@ -34,6 +34,7 @@
 
 from PyQt5 import QtWidgets
 
+from eddy.core.datatypes.misc import CommandId
 from eddy.core.owl import IRI
 
 
@@ -61,10 +62,12 @@ class CommandEdgeAddAnnotation(QtWidgets.QUndoCommand):
     def redo(self):
         """redo the command"""
         self._edge.addAnnotation(self.ann)
+        self._project.doModifyItem(self._edge.diagram, self._edge)
 
     def undo(self):
         """undo the command"""
         self._edge.removeAnnotation(self.ann)
+        self._project.doModifyItem(self._edge.diagram, self._edge)
 
 
 class CommandEdgeRemoveAnnotation(QtWidgets.QUndoCommand):
@@ -87,17 +90,19 @@ class CommandEdgeRemoveAnnotation(QtWidgets.QUndoCommand):
     def redo(self):
         """redo the command"""
         self._edge.removeAnnotation(self._ann)
+        self._project.doModifyItem(self._edge.diagram, self._edge)
 
     def undo(self):
         """undo the command"""
         self._edge.addAnnotation(self._ann)
+        self._project.doModifyItem(self._edge.diagram, self._edge)
 
 
 class CommandEdgeModifyAnnotation(QtWidgets.QUndoCommand):
     """
     This command is used to set axiom properties.
     """
-    def __init__(self, project, ann, undo, redo, name=None):
+    def __init__(self, project, ann, undo, redo, name=None, edge=None):
         """
         Initialize the command.
         :type project: Project
@@ -105,9 +110,11 @@ class CommandEdgeModifyAnnotation(QtWidgets.QUndoCommand):
         :type undo: dict
         :type redo: dict
         :type name: str
+        :type edge: AxiomEdge
         """
         super().__init__(name or 'Modify annotation {} '.format(str(ann)))
         self._project = project
+        self._edge = edge
         self._ann = ann
         self._undo = undo
         self._redo = redo
@@ -115,10 +122,32 @@ class CommandEdgeModifyAnnotation(QtWidgets.QUndoCommand):
     def redo(self):
         """redo the command"""
         self._ann.refactor(self._redo)
+        if self._edge:
+            self._project.doModifyItem(self._edge.diagram, self._edge)
 
     def undo(self):
         """undo the command"""
         self._ann.refactor(self._undo)
+        if self._edge:
+            self._project.doModifyItem(self._edge.diagram, self._edge)
+
+    def id(self):
+        """
+        Returns the command id, used for command compression.
+        :rtype: int
+        """
+        return CommandId.EdgeModifyAnnotation
+
+    def mergeWith(self, command):
+        """
+        Merge a consecutive edit of the same annotation into this command.
+        :type command: CommandEdgeModifyAnnotation
+        :rtype: bool
+        """
+        if command._ann is not self._ann or command._edge is not self._edge:
+            return False
+        self._redo = command._redo
+        return True
 
 
 #############################################
@@ -304,6 +333,24 @@ class CommandIRIModifyAnnotationAssertion(QtWidgets.QUndoCommand):
         """undo the command"""
         self._annAss.refactor(self._undo)
 
+    def id(self):
+        """
+        Returns the command id, used for command compression.
+        :rtype: int
+        """
+        return CommandId.IRIModifyAnnotationAssertion
+
+    def mergeWith(self, command):
+        """
+        Merge a consecutive edit of the same annotation assertion into this command.
+        :type command: CommandIRIModifyAnnotationAssertion
+        :rtype: bool
+        """
+        if command._annAss is not self._annAss:
+            return False
+        self._redo = command._redo
+        return True
+
 
 #############################################
 #   IRI METAPROPERTIES
@@ -417,11 +464,13 @@ class CommandChangeFacetOfNode(QtWidgets.QUndoCommand):
     def redo(self):
         """redo the command"""
         self._node.facet = self._facetRedo
+        self._project.doModifyItem(self._node.diagram, self._node)
         #self._project.sgnIRIChanged.emit(self._node, oldIri)
 
     def undo(self):
         """undo the command"""
         self._node.facet = self._facetUndo
+        self._project.doModifyItem(self._node.diagram, self._node)
         #self._project.sgnIRIChanged.emit(self._node, iri)
 
 
@@ -452,9 +501,11 @@ class CommandChangeLiteralOfNode(QtWidgets.QUndoCommand):
     def redo(self):
         """redo the command"""
         self._node.literal = self._literalRedo
+        self._project.doModifyItem(self._node.diagram, self._node)
         #self._project.sgnIRIChanged.emit(self._node, oldIri)
 
     def undo(self):
         """undo the command"""
         self._node.literal = self._literalUndo
+        self._project.doModifyItem(self._node.diagram, self._node)
         #self._project.sgnIRIChanged.emit(self._node, iri)
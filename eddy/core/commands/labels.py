@@ -36,6 +36,7 @@
 from PyQt5 import QtWidgets
 
 from eddy.core.datatypes.graphol import Identity, Item
+from eddy.core.datatypes.misc import CommandId
 
 
 class CommandLabelChange(QtWidgets.QUndoCommand):
@@ -147,6 +148,24 @@ class CommandLabelChange(QtWidgets.QUndoCommand):
         # EMIT UPDATED SIGNAL
         self.diagram.sgnUpdated.emit()
 
+    def id(self):
+        """
+        Returns the command id, used for command compression.
+        :rtype: int
+        """
+        return CommandId.LabelChange
+
+    def mergeWith(self, command):
+        """
+        Merge a consecutive edit of the same label into this command.
+        :type command: CommandLabelChange
+        :rtype: bool
+        """
+        if command.item is not self.item or command.refactor != self.refactor:
+            return False
+        self.data['redo'] = command.data['redo']
+        return True
+
 
 class CommandLabelMove(QtWidgets.QUndoCommand):
     """
@@ -174,3 +193,21 @@ class CommandLabelMove(QtWidgets.QUndoCommand):
         """undo the command"""
         self.item.setTextPos(self.data['undo'])
         self.diagram.sgnUpdated.emit()
+
+    def id(self):
+        """
+        Returns the command id, used for command compression.
+        :rtype: int
+        """
+        return CommandId.LabelMove
+
+    def mergeWith(self, command):
+        """
+        Merge a consecutive move of the same label into this command.
+        :type command: CommandLabelMove
+        :rtype: bool
+        """
+        if command.item is not self.item:
+            return False
+        self.data['redo'] = command.data['redo']
+        return True
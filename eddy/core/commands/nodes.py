@@ -35,6 +35,7 @@
 
 from PyQt5 import QtWidgets
 
+from eddy.core.datatypes.misc import CommandId
 from eddy.core.functions.misc import first
 from eddy.core.items.common import AbstractItem
 
@@ -231,6 +232,30 @@ class CommandNodeMove(QtWidgets.QUndoCommand):
         # Emit updated signal.
         self._diagram.sgnUpdated.emit()
 
+    def id(self):
+        """
+        Returns the command id, used for command compression.
+        :rtype: int
+        """
+        return CommandId.NodeMove
+
+    def mergeWith(self, command):
+        """
+        Merge a consecutive move of the same nodes into this command.
+        The undo stack merges only the moves of a single interaction, e.g. the steps
+        of a node moved by holding down an arrow key (see eddy.core.history.UndoEntry).
+        :type command: CommandNodeMove
+        :rtype: bool
+        """
+        if command._diagram is not self._diagram or \
+            command._redo['nodes'].keys() != self._redo['nodes'].keys() or \
+            command._redo['edges'].keys() != self._redo['edges'].keys():
+            return False
+        self._edges |= command._edges
+        self._redo = command._redo
+        return True
+
+
 class CommandNodeSwitchTo(QtWidgets.QUndoCommand):
     """
     This command is used to swap between 2 nodes.
@@ -338,12 +363,14 @@ class CommandNodeChangeInputsOrder(QtWidgets.QUndoCommand):
         """redo the command"""
         self.node.inputs = self.inputs['redo']
         self.node.updateEdges()
+        self.diagram.project.doModifyItem(self.diagram, self.node)
         self.diagram.sgnUpdated.emit()
 
     def undo(self):
         """redo the command"""
         self.node.inputs = self.inputs['undo']
         self.node.updateEdges()
+        self.diagram.project.doModifyItem(self.diagram, self.node)
         self.diagram.sgnUpdated.emit()
 
 class CommandNodeSetBrush(QtWidgets.QUndoCommand):
@@ -136,13 +136,13 @@ class CommandProjectSetOntologyIRIAndVersion(QtWidgets.QUndoCommand):
 
     def redo(self):
         """redo the command"""
-        self._project.setOntologyIRI(self._iriRedo)
         self._project.version = self._versionRedo
+        self._project.setOntologyIRI(self._iriRedo)
 
     def undo(self):
         """undo the command"""
-        self._project.setOntologyIRI(self._iriUndo)
         self._project.version = self._versionUndo
+        self._project.setOntologyIRI(self._iriUndo)
 
 #############################################
 #   PREFIXES
@@ -382,7 +382,8 @@ class CommandProjectSetProfile(QtWidgets.QUndoCommand):
         self.project.profile = self.project.session.createProfile(self.data['redo'], self.project)
 
         # Reshape all the Role and Attribute nodes to show/hide functionality and inverse functionality.
-        for node in self.project.nodes():
+        # Nodes of diagrams which are not built yet are shaped according to the profile when built.
+        for node in self.project.index.nodes():
             if node.type() in {Item.RoleNode, Item.AttributeNode}:
                 node.updateNode(selected=node.isSelected())
 
@@ -395,7 +396,8 @@ class CommandProjectSetProfile(QtWidgets.QUndoCommand):
         self.project.profile = self.project.session.createProfile(self.data['undo'], self.project)
 
         # Reshape all the Role and Attribute nodes to show/hide functionality and inverse functionality.
-        for node in self.project.nodes():
+        # Nodes of diagrams which are not built yet are shaped according to the profile when built.
+        for node in self.project.index.nodes():
             if node.type() in {Item.RoleNode, Item.AttributeNode}:
                 node.updateNode(selected=node.isSelected())
                 # Emit updated signals.
@@ -58,6 +58,30 @@ class Color(Enum_):
     Beige = '#c2b078'
 
 
+@unique
+class CommandId(IntEnum_):
+    """
+    This class defines the ids of undo commands which can be merged together.
+    """
+    NodeMove = 1
+    LabelMove = 2
+    LabelChange = 3
+    EdgeAnchorMove = 4
+    EdgeBreakpointMove = 5
+    EdgeModifyAnnotation = 6
+    IRIModifyAnnotationAssertion = 7
+
+
+@unique
+class Direction(Enum_):
+    """
+    This class defines the directions along which a graph can be traversed.
+    """
+    Outgoing = 'outgoing'
+    Incoming = 'incoming'
+    Both = 'both'
+
+
 @unique
 class DiagramMode(IntEnum_):
     """
@@ -69,11 +69,14 @@ class File(Enum_):
     Html = 'Hyper-Text Markup Language (*.html)'
     Jar = 'Java Archive (*.jar)'
     Jpeg = 'JPEG (*.jpg)'
+    Json = 'JSON (*.json)'
     Owl = 'Web Ontology Language (*.owl *.ofn *.owx *.omn *.ttl)'
     Pdf = 'Portable Document Format (*.pdf)'
     Png = 'PNG (*.png)'
     Qss = 'Qt Style Sheet (*.qss)'
     Spec = 'Plugin SPEC (*.spec)'
+    Svg = 'Scalable Vector Graphics (*.svg)'
+    Tiff = 'TIFF (*.tif *.tiff)'
     Zip = 'ZIP (*.zip)'
     Xlsx = 'Excel Spreadsheet (*.xlsx)'
     Xml = 'XML (*.xml)'
@@ -81,7 +81,10 @@ from eddy.core.items.nodes.literal import LiteralNode
 from eddy.core.output import getLogger
 
 if TYPE_CHECKING:
-    from eddy.core.project import Project
+    from eddy.core.project import (
+        Project,
+        ProjectTransaction,
+    )
     from eddy.ui.session import Session
 
 #############################################
@@ -131,6 +134,8 @@ class Diagram(QtWidgets.QGraphicsScene):
         self.name = name
         self.pasteX = Clipboard.PasteOffsetX
         self.pasteY = Clipboard.PasteOffsetY
+        self.pendingIdentification = set()
+        self.selection = DiagramSelection()
 
         self.mo_Node = None
         self.mp_Data = None
@@ -592,10 +597,12 @@ class Diagram(QtWidgets.QGraphicsScene):
     #################################
 
     @QtCore.pyqtSlot(QtWidgets.QGraphicsItem)
-    def doNodeIdentification(self, node: AbstractNode) -> None:
+    def doNodeIdentification(self, node: AbstractNode) -> Set[AbstractNode]:
         """
         Perform node identification.
+        Returns the set of nodes which have been visited by the identification procedure.
         """
+        collection = set()
         if Identity.Neutral in node.identities():
 
             func = lambda x: Identity.Neutral in x.identities()
@@ -622,6 +629,21 @@ class Diagram(QtWidgets.QGraphicsScene):
             for node in weak - strong - excluded:
                 node.setIdentity(computed)
 
+        return set(collection)
+
+    def doPendingNodeIdentification(self) -> None:
+        """
+        Perform node identification on the nodes collected while a project transaction was open.
+        Since the identification procedure is executed on a whole connected component, nodes
+        which have already been visited while identifying another node are skipped.
+        """
+        visited = set()
+        pending = self.pendingIdentification
+        self.pendingIdentification = set()
+        for node in pending:
+            if node not in visited:
+                visited |= self.doNodeIdentification(node)
+
     @QtCore.pyqtSlot(QtWidgets.QGraphicsScene, QtWidgets.QGraphicsItem)
     def onItemAdded(self, _: Diagram, item: AbstractItem) -> None:
         """
@@ -633,6 +655,9 @@ class Diagram(QtWidgets.QGraphicsScene):
             # Execute the node identification procedure only if one of the
             # endpoints we are connecting is currently identified as NEUTRAL.
             if (item.source.identity() is Identity.Neutral) ^ (item.target.identity() is Identity.Neutral):
+                if self.isInTransaction():
+                    self.pendingIdentification.update((item.source, item.target))
+                    return
                 for node in (item.source, item.target):
                     self.sgnNodeIdentification.emit(node)
 
@@ -645,6 +670,9 @@ class Diagram(QtWidgets.QGraphicsScene):
             # When an edge is removed we may be in the case where
             # the ontology is split into 2 subgraphs, hence we need
             # to run the identification procedure on the 2 subgraphs.
+            if self.isInTransaction():
+                self.pendingIdentification.update((item.source, item.target))
+                return
             for node in (item.source, item.target):
                 self.sgnNodeIdentification.emit(node)
 
@@ -661,6 +689,8 @@ class Diagram(QtWidgets.QGraphicsScene):
             if item.isPredicate():
                 item.connectSignals()
             item.updateNode()
+        if item.isSelected():
+            self.selection.add(item)
 
     @staticmethod
     def completeMove(
@@ -691,6 +721,15 @@ class Diagram(QtWidgets.QGraphicsScene):
         """
         return self.project.edges(self)
 
+    def onItemSelectedChanged(self, item: AbstractItem, selected: bool) -> None:
+        """
+        Executed by diagram nodes and edges whenever their selection state changes.
+        """
+        if selected:
+            self.selection.add(item)
+        else:
+            self.selection.discard(item)
+
     def isEdgeAdd(self) ->  bool:
         """
         Returns `True` if an edge insertion is currently in progress, `False` otherwise.
@@ -722,12 +761,20 @@ class Diagram(QtWidgets.QGraphicsScene):
         """
         return len(self.project.items(self)) == 0
 
+    def isInTransaction(self) -> bool:
+        """
+        Returns `True` if a transaction is open on the project this diagram belongs to, `False` otherwise.
+        """
+        return self.project.transactionDepth > 0
+
     def items(self, mixed=None, mode=QtCore.Qt.IntersectsItemShape, **kwargs):
         """
         Returns a collection of items ordered from TOP to BOTTOM.
-        If no argument is supplied, an unordered list containing all the elements in the diagram is returned.
+        If no argument is supplied, an unordered list containing all the elements in the diagram is returned
+        (building them first if the diagram is still pending, see Project.addPendingDiagram()).
         """
         if mixed is None:
+            self.project.materialize(self)
             items = super().items()
         elif isinstance(mixed, QtCore.QPointF):
             x = mixed.x() - (Diagram.SelectionRadius / 2)
@@ -781,6 +828,15 @@ class Diagram(QtWidgets.QGraphicsScene):
         """
         return [x for x in super().selectedItems() if x.isNode() and filter_on_nodes(x)]
 
+    def removeItem(self, item: QtWidgets.QGraphicsItem) -> None:
+        """
+        Remove an item from the Diagram.
+        """
+        # QGraphicsScene does not notify the item when it is
+        # deselected because of its removal from the scene.
+        self.selection.discard(item)
+        super().removeItem(item)
+
     def setMode(self, mode: DiagramMode, param: Item = None) -> None:
         """
         Set the operational mode.
@@ -836,10 +892,63 @@ class Diagram(QtWidgets.QGraphicsScene):
             )
         return QtCore.QRectF()
 
+    def transaction(self) -> ProjectTransaction:
+        """
+        Returns a context manager which keeps a transaction open on the project this diagram belongs to.
+        """
+        return self.project.transaction()
+
     def __str__(self):
         return 'Diagram {}'.format(self.name)
 
 
+class DiagramSelection:
+    """
+    Summary of the nodes and edges selected in a diagram, which is maintained
+    incrementally from the selection state changes of the single items, so that
+    the selection can be inspected without querying the scene.
+    """
+    __slots__ = ('counts', 'edges', 'nodes')
+
+    def __init__(self) -> None:
+        """
+        Initialize the selection summary.
+        """
+        self.counts = {}
+        self.edges = {}
+        self.nodes = {}
+
+    def __len__(self) -> int:
+        """
+        Returns the number of selected nodes and edges.
+        """
+        return len(self.nodes) + len(self.edges)
+
+    def add(self, item: AbstractItem) -> None:
+        """
+        Add the given item to the selection summary.
+        """
+        items = self.nodes if item.isNode() else self.edges if item.isEdge() else None
+        if items is not None and item not in items:
+            items[item] = None
+            self.counts[item.type()] = self.counts.get(item.type(), 0) + 1
+
+    def count(self, *types: Item) -> int:
+        """
+        Returns the number of selected items of the given types.
+        """
+        return sum(self.counts.get(t, 0) for t in types)
+
+    def discard(self, item: AbstractItem) -> None:
+        """
+        Remove the given item from the selection summary, if present.
+        """
+        if self.nodes.pop(item, False) is None or self.edges.pop(item, False) is None:
+            self.counts[item.type()] -= 1
+            if not self.counts[item.type()]:
+                del self.counts[item.type()]
+
+
 class DiagramMalformedError(RuntimeError):
     """
     Raised whenever a given diagram is detected as malformed.
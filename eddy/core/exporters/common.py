@@ -33,9 +33,14 @@
 ##########################################################################
 
 
+import weakref
 from abc import ABCMeta, abstractmethod
 
 from PyQt5 import QtCore
+from PyQt5 import QtGui
+
+from eddy.core.functions.signals import connect
+from eddy.core.items.common import AbstractItem
 
 
 class AbstractExporter(QtCore.QObject):
@@ -196,3 +201,193 @@ class AbstractProjectExporter(AbstractExporter):
         :type path: str
         """
         pass
+
+
+class DiagramRenderCache(QtCore.QObject):
+    """
+    Caches a vector display list (QPicture) of the diagrams rendered by print and export facilities,
+    so that printing or exporting a diagram which did not change since the last time replays the
+    recorded picture rather than rendering the scene again. Pictures are recorded in scene coordinates
+    and cover the visible area of the diagram extended by a generous margin.
+    A picture is dropped as soon as items are added to or removed from its diagram, its font changes,
+    or a command affecting its diagram is pushed, undone or redone on the session undo stack (commands
+    which do not target a specific diagram, like IRI refactors, drop the whole cache). Changes to the
+    rendering of the node labels (rendering mode or prefix map) drop the whole cache as well.
+    """
+    Margin = 400
+
+    def __init__(self, session):
+        """
+        Initialize the cache.
+        :type session: Session
+        """
+        super().__init__(session, objectName='diagram_render_cache')
+        self.index = session.undostack.index()
+        self.pictures = weakref.WeakKeyDictionary()
+        self.watched = weakref.WeakSet()
+        self.undostack = session.undostack
+        connect(self.undostack.indexChanged, self.onIndexChanged)
+        connect(session.sgnRenderingModified, self.onRenderingModified)
+        connect(session.sgnPrefixAdded, self.onRenderingModified)
+        connect(session.sgnPrefixRemoved, self.onRenderingModified)
+        connect(session.sgnPrefixModified, self.onRenderingModified)
+
+    #############################################
+    #   EVENTS
+    #################################
+
+    def eventFilter(self, source, event):
+        """
+        Filters the events of the watched diagrams, dropping their picture when their font changes.
+        :type source: QObject
+        :type event: QEvent
+        :rtype: bool
+        """
+        if event.type() == QtCore.QEvent.FontChange:
+            self.pictures.pop(source, None)
+        return super().eventFilter(source, event)
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot()
+    def onDiagramChanged(self):
+        """
+        Executed when the content of a diagram changes outside of the undo stack.
+        """
+        self.pictures.pop(self.sender(), None)
+
+    @QtCore.pyqtSlot(int)
+    def onIndexChanged(self, index):
+        """
+        Executed when the index of the undo stack changes.
+        :type index: int
+        """
+        if index == self.index:
+            # A COMMAND WAS MERGED, OR PUSHED ON A FULL STACK
+            indexes = [index - 1]
+        else:
+            indexes = range(min(index, self.index), max(index, self.index))
+        self.index = index
+        for i in indexes:
+            command = self.undostack.command(i)
+            diagram = getattr(command, 'diagram', None)
+            if diagram is None:
+                self.pictures.clear()
+                break
+            self.pictures.pop(diagram, None)
+
+    @QtCore.pyqtSlot()
+    def onRenderingModified(self):
+        """
+        Executed when the rendering of the node labels changes.
+        """
+        self.invalidate()
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    @classmethod
+    def forSession(cls, session):
+        """
+        Returns the cache attached to the given session, creating it if needed.
+        Returns None if no session is given.
+        :type session: Session
+        :rtype: DiagramRenderCache
+        """
+        if session is None or not hasattr(session, 'undostack'):
+            return None
+        cache = session.findChild(cls, 'diagram_render_cache')
+        if cache is None:
+            cache = cls(session)
+        return cache
+
+    @classmethod
+    def get(cls, diagram, session=None):
+        """
+        Returns the picture of the given diagram along with the recorded area, using the cache
+        of the given session if any. The picture is recorded if it's not available in the cache.
+        :type diagram: Diagram
+        :type session: Session
+        :rtype: tuple
+        """
+        cache = cls.forSession(session)
+        if cache is None:
+            return cls.record(diagram)
+        return cache.picture(diagram)
+
+    def invalidate(self, diagram=None):
+        """
+        Drop the picture of the given diagram, or all the pictures if no diagram is given.
+        :type diagram: Diagram
+        """
+        if diagram is None:
+            self.pictures.clear()
+        else:
+            self.pictures.pop(diagram, None)
+
+    def picture(self, diagram):
+        """
+        Returns the picture of the given diagram along with the recorded area, recording it if needed.
+        :type diagram: Diagram
+        :rtype: tuple
+        """
+        picture = self.pictures.get(diagram)
+        if picture is None:
+            if diagram not in self.watched:
+                connect(diagram.sgnItemAdded, self.onDiagramChanged)
+                connect(diagram.sgnItemRemoved, self.onDiagramChanged)
+                connect(diagram.sgnUpdated, self.onDiagramChanged)
+                diagram.installEventFilter(self)
+                self.watched.add(diagram)
+            picture = self.pictures[diagram] = self.record(diagram)
+        return picture
+
+    @classmethod
+    def record(cls, diagram):
+        """
+        Record the given diagram into a QPicture, returning the picture along with the recorded area.
+        The picture uses scene coordinates: the recorded area is an empty rectangle for empty diagrams.
+        :type diagram: Diagram
+        :rtype: tuple
+        """
+        picture = QtGui.QPicture()
+        shape = diagram.visibleRect(margin=cls.Margin)
+        if shape:
+            painter = QtGui.QPainter()
+            if painter.begin(picture):
+                # TURN CACHING OFF
+                items = [item for item in diagram.items() if item.isNode() or item.isEdge()]
+                for item in items:
+                    item.setCacheMode(AbstractItem.NoCache)
+                # RENDER THE DIAGRAM
+                diagram.render(painter, shape, shape)
+                # TURN CACHING ON
+                for item in items:
+                    item.setCacheMode(AbstractItem.DeviceCoordinateCache)
+                painter.end()
+        return picture, shape
+
+    @staticmethod
+    def render(painter, picture, source, target):
+        """
+        Replay the given area of a recorded picture in the given target area of the painter,
+        scaling it while keeping the aspect ratio and centering it as QGraphicsScene.render() does.
+        :type painter: QPainter
+        :type picture: QPicture
+        :type source: QRectF
+        :type target: QRectF
+        """
+        if source.isEmpty() or target.isEmpty():
+            return
+        ratio = min(target.width() / source.width(), target.height() / source.height())
+        painter.save()
+        painter.translate(target.center())
+        painter.scale(ratio, ratio)
+        painter.translate(-source.center())
+        painter.setClipRect(source, QtCore.Qt.IntersectClip)
+        painter.drawPicture(0, 0, picture)
+        painter.restore()
+
@@ -39,8 +39,8 @@ from PyQt5 import QtXml
 from eddy.core.datatypes.graphol import Item
 from eddy.core.datatypes.system import File
 from eddy.core.exporters.common import AbstractDiagramExporter
-from eddy.core.functions.fsystem import fwrite
 from eddy.core.functions.misc import isEmpty
+from eddy.core.functions.path import expandPath
 from eddy.core.output import getLogger
 
 
@@ -705,6 +705,27 @@ class GraphMLDiagramExporter(AbstractDiagramExporter):
 
         return elem
 
+    @classmethod
+    def writeElement(cls, writer, element):
+        """
+        Serialize the given QDomElement, together with its subtree, using the given stream writer.
+        :type writer: QXmlStreamWriter
+        :type element: QDomElement
+        """
+        writer.writeStartElement(element.tagName())
+        attributes = element.attributes()
+        for i in range(attributes.count()):
+            attribute = attributes.item(i).toAttr()
+            writer.writeAttribute(attribute.name(), attribute.value())
+        child = element.firstChild()
+        while not child.isNull():
+            if child.isElement():
+                cls.writeElement(writer, child.toElement())
+            elif child.isText():
+                writer.writeCharacters(child.nodeValue())
+            child = child.nextSibling()
+        writer.writeEndElement()
+
     @staticmethod
     def translateAnchorPos(edge, node):
         """
@@ -754,78 +775,78 @@ class GraphMLDiagramExporter(AbstractDiagramExporter):
     def run(self, path):
         """
         Perform GraphML document generation.
+        Items are converted one at a time and streamed to the destination file,
+        which is replaced only once the whole document has been written.
         :type path: str
         """
         LOGGER.info('Exporting diagram %s to %s', self.diagram.name, path)
 
-        # 1) CREATE THE DOCUMENT
+        file = QtCore.QSaveFile(expandPath(path))
+        if not file.open(QtCore.QIODevice.WriteOnly):
+            raise IOError('could not write {0}: {1}'.format(path, file.errorString()))
+
         self.document = QtXml.QDomDocument()
-        instruction = self.document.createProcessingInstruction('xml', 'version="1.0" encoding="UTF-8"')
-        self.document.appendChild(instruction)
-
-        # 2) CREATE ROOT ELEMENT
-        root = self.document.createElement('graphml')
-        root.setAttribute('xmlns', 'http://graphml.graphdrawing.org/xmlns')
-        root.setAttribute('xmlns:xsi', 'http://www.w3.org/2001/XMLSchema-instance')
-        root.setAttribute('xmlns:y', 'http://www.yworks.com/xml/graphml')
-        root.setAttribute('xmlns:yed', 'http://www.yworks.com/xml/yed/3')
-        root.setAttribute('xsi:schemaLocation', 'http://graphml.graphdrawing.org/xmlns '
-                                                'http://www.yworks.com/xml/schema/graphml/1.1/ygraphml.xsd')
-
-        # 3) CREATE ELEMENT KEYS
-        key = self.document.createElement('key')
-        key.setAttribute('for', 'node')
-        key.setAttribute('id', GraphMLDiagramExporter.KeyNode)
-        key.setAttribute('yfiles.type', 'nodegraphics')
-        root.appendChild(key)
-
-        key = self.document.createElement('key')
-        key.setAttribute('for', 'edge')
-        key.setAttribute('id', GraphMLDiagramExporter.KeyEdge)
-        key.setAttribute('yfiles.type', 'edgegraphics')
-        root.appendChild(key)
-
-        """
-        key = self.document.createElement('key')
-        key.setAttribute('attr.name', K_PREFIX)
-        key.setAttribute('attr.type', 'string')
-        key.setAttribute('for', 'node')
-        key.setAttribute('id', GraphMLDiagramExporter.KeyPrefix)
-        root.appendChild(key)
-
-        key = self.document.createElement('key')
-        key.setAttribute('attr.name', K_IRI)
-        key.setAttribute('attr.type', 'string')
-        key.setAttribute('for', 'node')
-        key.setAttribute('id', GraphMLDiagramExporter.KeyIri)
-        root.appendChild(key)
-        """
-        key = self.document.createElement('key')
-        key.setAttribute('attr.type', 'string')
-        key.setAttribute('for', 'node')
-        key.setAttribute('id', GraphMLDiagramExporter.KeyDescription)
-        root.appendChild(key)
-
-        # 4) CREATE THE GRAPH NODE
-        graph = self.document.createElement('graph')
-        graph.setAttribute('edgedefault', 'directed')
-        graph.setAttribute('id', 'G')
-
-        # 5) GENERATE NODES
-        for node in self.diagram.nodes():
-            if node.type() not in self.missing:
-                func = self.exportFuncForItem[node.type()]
-                graph.appendChild(func(node))
-
-        # 6) GENERATE EDGES
-        for edge in self.diagram.edges():
-            if edge.source.type() not in self.missing and edge.target.type() not in self.missing:
-                func = self.exportFuncForItem[edge.type()]
-                graph.appendChild(func(edge))
-
-        # 7) APPEND THE GRAPH TO THE DOCUMENT
-        self.document.appendChild(root)
-        root.appendChild(graph)
+        writer = QtCore.QXmlStreamWriter(file)
+        writer.setAutoFormatting(True)
+        writer.setAutoFormattingIndent(2)
+
+        try:
+            # 1) CREATE THE DOCUMENT
+            writer.writeStartDocument()
+
+            # 2) CREATE ROOT ELEMENT
+            writer.writeStartElement('graphml')
+            writer.writeAttribute('xmlns', 'http://graphml.graphdrawing.org/xmlns')
+            writer.writeAttribute('xmlns:xsi', 'http://www.w3.org/2001/XMLSchema-instance')
+            writer.writeAttribute('xmlns:y', 'http://www.yworks.com/xml/graphml')
+            writer.writeAttribute('xmlns:yed', 'http://www.yworks.com/xml/yed/3')
+            writer.writeAttribute('xsi:schemaLocation', 'http://graphml.graphdrawing.org/xmlns '
+                                                        'http://www.yworks.com/xml/schema/graphml/1.1/ygraphml.xsd')
+
+            # 3) CREATE ELEMENT KEYS
+            writer.writeEmptyElement('key')
+            writer.writeAttribute('for', 'node')
+            writer.writeAttribute('id', GraphMLDiagramExporter.KeyNode)
+            writer.writeAttribute('yfiles.type', 'nodegraphics')
+
+            writer.writeEmptyElement('key')
+            writer.writeAttribute('for', 'edge')
+            writer.writeAttribute('id', GraphMLDiagramExporter.KeyEdge)
+            writer.writeAttribute('yfiles.type', 'edgegraphics')
+
+            writer.writeEmptyElement('key')
+            writer.writeAttribute('attr.type', 'string')
+            writer.writeAttribute('for', 'node')
+            writer.writeAttribute('id', GraphMLDiagramExporter.KeyDescription)
+
+            # 4) CREATE THE GRAPH NODE
+            writer.writeStartElement('graph')
+            writer.writeAttribute('edgedefault', 'directed')
+            writer.writeAttribute('id', 'G')
+
+            # 5) GENERATE NODES
+            for node in self.diagram.nodes():
+                if node.type() not in self.missing:
+                    func = self.exportFuncForItem[node.type()]
+                    self.writeElement(writer, func(node))
+
+            # 6) GENERATE EDGES
+            for edge in self.diagram.edges():
+                if edge.source.type() not in self.missing and edge.target.type() not in self.missing:
+                    func = self.exportFuncForItem[edge.type()]
+                    self.writeElement(writer, func(edge))
+
+            # 7) CLOSE THE GRAPH AND THE ROOT ELEMENT
+            writer.writeEndElement()
+            writer.writeEndElement()
+            writer.writeEndDocument()
+
+            if writer.hasError():
+                raise IOError('could not write {0}: {1}'.format(path, file.errorString()))
+        except BaseException:
+            file.cancelWriting()
+            raise
 
         # 8) GENERATE THE FILE
-        fwrite(self.document.toString(2), path)
+        if not file.commit():
+            raise IOError('could not write {0}: {1}'.format(path, file.errorString()))
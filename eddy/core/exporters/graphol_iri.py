@@ -36,11 +36,13 @@ import os
 
 from PyQt5 import QtXml
 
+from eddy.core.catalogue import DiagramCatalogue
 from eddy.core.datatypes.graphol import Item
 from eddy.core.datatypes.system import File
 from eddy.core.exporters.common import AbstractProjectExporter
 from eddy.core.functions.fsystem import mkdir, fwrite, fexists, isdir
 from eddy.core.functions.misc import postfix
+from eddy.core.items.nodes.common.base import PredicateNodeMixin
 from eddy.core.items.nodes.concept import ConceptNode
 from eddy.core.output import getLogger
 from eddy.ui.dialogs import DiagramSelectionDialog
@@ -383,10 +385,16 @@ class GrapholIRIProjectExporter(AbstractProjectExporter):
         return diagramsEl
 
     def getDiagramDomElement(self,diagram):
+        pending = self.project.pendingDiagram(diagram)
+        if pending and isinstance(pending.definition, QtXml.QDomElement):
+            return self.getPendingDiagramDomElement(pending)
         diagramEl = self.getDomElement('diagram')
         diagramEl.setAttribute('name', diagram.name)
         diagramEl.setAttribute('width', int(diagram.width()))
         diagramEl.setAttribute('height', int(diagram.height()))
+        catalogue = DiagramCatalogue.forProject(self.project)
+        if diagram.name in catalogue.names():
+            diagramEl.appendChild(catalogue.toDomElement(self.document, diagram.name))
         for node in sorted(diagram.nodes(), key=lambda n:n.id):
             func = self.exportFuncForItem[node.type()]
             diagramEl.appendChild(func(node))
@@ -395,6 +403,32 @@ class GrapholIRIProjectExporter(AbstractProjectExporter):
             diagramEl.appendChild(func(edge))
         return diagramEl
 
+    def getPendingDiagramDomElement(self, pending):
+        """
+        Create the 'diagram' element of a diagram whose items have not been built yet, by copying
+        the element the diagram was loaded from and updating the IRIs referenced by its nodes.
+        :type pending: PendingDiagram
+        """
+        diagram = pending.diagram
+        diagramEl = self.document.importNode(pending.definition, True).toElement()
+        diagramEl.setAttribute('name', diagram.name)
+        diagramEl.setAttribute('width', int(diagram.width()))
+        diagramEl.setAttribute('height', int(diagram.height()))
+        catalogue = DiagramCatalogue.forProject(self.project)
+        if diagram.name in catalogue.names():
+            catalogueEl = diagramEl.firstChildElement('catalogue')
+            if not catalogueEl.isNull():
+                diagramEl.removeChild(catalogueEl)
+            diagramEl.insertBefore(catalogue.toDomElement(self.document, diagram.name), diagramEl.firstChild())
+        nodeEl = diagramEl.firstChildElement('node')
+        while not nodeEl.isNull():
+            iriEl = nodeEl.firstChildElement('iri')
+            iri = pending.references.get(iriEl.text())
+            if iri is not None and iriEl.text() != str(iri):
+                iriEl.replaceChild(self.getDomTextNode(str(iri)), iriEl.firstChild())
+            nodeEl = nodeEl.nextSiblingElement('node')
+        return diagramEl
+
     #############################################
     #   ONTOLOGY DIAGRAMS EXPORT : NODES
     #################################
@@ -818,3 +852,73 @@ class GrapholIRIProjectExporter(AbstractProjectExporter):
         #self.createOntology()
         #self.createDiagrams()
         self.createProjectFile()
+
+
+class GrapholIRIFragmentExporter(GrapholIRIProjectExporter):
+    """
+    Extends GrapholIRIProjectExporter with facilities to export a selection of diagram items.
+    A Graphol fragment is a self-contained document holding the selected nodes, the edges
+    connecting them and the definition of every IRI referenced by the selected nodes:
+     -----------------------
+     - <graphol version="3">
+     -   <fragment project="..." diagram="..." nodes="N" edges="M">
+     -     <iris>...</iris>
+     -     <node>...</node>
+     -     <edge>...</edge>
+     -   </fragment>
+     - </graphol>
+    """
+
+    def __init__(self, diagram, nodes, edges, session=None):
+        """
+        Initialize the fragment exporter.
+        :type diagram: Diagram
+        :type nodes: T <= list | tuple
+        :type edges: T <= list | tuple
+        :type session: Session
+        """
+        super().__init__(diagram.project, session)
+        self.diagram = diagram
+        self.nodes = nodes
+        self.edges = edges
+
+    #############################################
+    #   MAIN EXPORT
+    #################################
+
+    def createDomDocument(self):
+        """
+        Create the QDomDocument where to store the fragment.
+        """
+        self.document = QtXml.QDomDocument()
+        graphol = self.getDomElement('graphol')
+        graphol.setAttribute('version', '3')
+        self.document.appendChild(graphol)
+
+        fragment = self.getDomElement('fragment')
+        fragment.setAttribute('project', self.project.name)
+        fragment.setAttribute('diagram', self.diagram.name)
+        fragment.setAttribute('nodes', len(self.nodes))
+        fragment.setAttribute('edges', len(self.edges))
+        graphol.appendChild(fragment)
+
+        irisEl = self.getDomElement('iris')
+        fragment.appendChild(irisEl)
+        for iri in sorted({n.iri for n in self.nodes if isinstance(n, PredicateNodeMixin)}, key=str):
+            irisEl.appendChild(self.getIriDomElement(iri))
+        for node in self.nodes:
+            fragment.appendChild(self.exportFuncForItem[node.type()](node))
+        for edge in self.edges:
+            fragment.appendChild(self.exportFuncForItem[edge.type()](edge))
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def run(self, *args, **kwargs):
+        """
+        Perform the fragment export, returning the serialised fragment.
+        :rtype: str
+        """
+        self.createDomDocument()
+        return self.document.toString(-1)
@@ -33,12 +33,20 @@
 ##########################################################################
 
 
-from PyQt5 import QtCore, QtXml
+from PyQt5 import QtCore
 
 from eddy.core.datatypes.graphol import Item
 from eddy.core.datatypes.system import File
 from eddy.core.exporters.common import AbstractProjectExporter
-from eddy.core.functions.fsystem import fwrite
+from eddy.core.functions.path import expandPath
+from eddy.core.functions.signals import connect
+from eddy.core.output import getLogger
+from eddy.core.worker import AbstractWorker
+from eddy.core.worker import runInThread
+from eddy.ui.progress import BusyProgressDialog
+
+
+LOGGER = getLogger()
 
 
 class GraphReferencesProjectExporter(AbstractProjectExporter):
@@ -53,7 +61,6 @@ class GraphReferencesProjectExporter(AbstractProjectExporter):
         :type session: Session
         """
         super().__init__(project, session)
-        self.document = None
         self.missing = {Item.FacetNode, Item.PropertyAssertionNode}
 
     #############################################
@@ -68,47 +75,118 @@ class GraphReferencesProjectExporter(AbstractProjectExporter):
         """
         return File.GraphReferences
 
+    def createWorker(self, path):
+        """
+        Create the worker that writes the references of all the diagrams of the project into the given path.
+        :type path: str
+        :rtype: GraphReferencesProjectExporterWorker
+        """
+        worker = GraphReferencesProjectExporterWorker(path)
+        for diagram in self.project.diagrams():
+            worker.addDiagram(diagram.name, self.references(diagram))
+        return worker
+
+    def references(self, diagram):
+        """
+        Returns the references of the given diagram, looked up in the project IRI occurrence index.
+        References are returned as (tag, iri, x, y, width, height) tuples sorted by IRI and position.
+        :type diagram: Diagram
+        :rtype: list
+        """
+        references = []
+        for node in self.project.iriOccurrences(diagram=diagram):
+            if node.isMeta():
+                references.append((
+                    node.type().realName.replace(' node', ''), str(node.iri),
+                    int(node.x()), int(node.y()), int(node.width()), int(node.height()),
+                ))
+        return sorted(references, key=lambda r: (r[1], r[2], r[3], r[0]))
+
     def run(self, path):
         """
         Perform graph references document generation.
         :type path: str
         """
-        # CREATE THE DOCUMENT
-        self.document = QtXml.QDomDocument()
-        instruction = self.document.createProcessingInstruction('xml', 'version="1.0" encoding="UTF-8" standalone="no"')
-        self.document.appendChild(instruction)
+        LOGGER.info('Exporting graph references of project %s to %s', self.project.name, path)
+        worker = self.createWorker(path)
+        # WRITE THE DOCUMENT IN A WORKER THREAD, KEEPING THE EVENT LOOP RUNNING
+        progress = BusyProgressDialog.current()
+        if progress:
+            connect(worker.sgnProgress, progress.setProgress)
+            runInThread(worker)
+        else:
+            title = 'Exporting graph references...'
+            with BusyProgressDialog(title, mtime=0, parent=self.session, modal=True) as progress:
+                connect(worker.sgnProgress, progress.setProgress)
+                runInThread(worker)
+        if worker.error:
+            raise worker.error
 
-        # CREATE ROOT ELEMENT
-        root = self.document.createElement('graphReferences')
 
-        # GENERATE NODES
-        for diagram in self.project.diagrams():
-            for node in diagram.nodes():
-                QtCore.QCoreApplication.processEvents()
-                if node.isMeta():
-                    iri = self.project.get_full_IRI(
-                        self.project.get_iri_of_node(node), None, node.remaining_characters)
-                    diagramElement = self.document.createElement('diagramName')
-                    diagramElement.appendChild(self.document.createTextNode(diagram.name))
-                    xElement = self.document.createElement('x')
-                    xElement.appendChild(self.document.createTextNode(str(int(node.x()))))
-                    yElement = self.document.createElement('y')
-                    yElement.appendChild(self.document.createTextNode(str(int(node.y()))))
-                    wElement = self.document.createElement('w')
-                    wElement.appendChild(self.document.createTextNode(str(int(node.width()))))
-                    hElement = self.document.createElement('h')
-                    hElement.appendChild(self.document.createTextNode(str(int(node.height()))))
-                    nodeElement = self.document.createElement(node.type().realName.replace(' node', ''))
-                    nodeElement.setAttribute('name', iri)
-                    nodeElement.appendChild(diagramElement)
-                    nodeElement.appendChild(xElement)
-                    nodeElement.appendChild(yElement)
-                    nodeElement.appendChild(wElement)
-                    nodeElement.appendChild(hElement)
-                    root.appendChild(nodeElement)
-
-        # APPEND THE GRAPH TO THE DOCUMENT
-        self.document.appendChild(root)
-
-        # GENERATE THE FILE
-        fwrite(self.document.toString(2), path)
\ No newline at end of file
+class GraphReferencesProjectExporterWorker(AbstractWorker):
+    """
+    Extends AbstractWorker providing a worker thread that streams graph references to an XML document.
+    """
+    sgnProgress = QtCore.pyqtSignal(int, int)
+
+    def __init__(self, path):
+        """
+        Initialize the worker.
+        :type path: str
+        """
+        super().__init__()
+        self.diagrams = []
+        self.error = None
+        self.path = path
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def addDiagram(self, name, references):
+        """
+        Append the references of a diagram to the document.
+        :type name: str
+        :type references: list
+        """
+        self.diagrams.append((name, references))
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        """
+        Main worker.
+        """
+        try:
+            file = QtCore.QSaveFile(expandPath(self.path))
+            if not file.open(QtCore.QIODevice.WriteOnly):
+                raise IOError('could not write {0}: {1}'.format(self.path, file.errorString()))
+            writer = QtCore.QXmlStreamWriter(file)
+            writer.setAutoFormatting(True)
+            writer.setAutoFormattingIndent(2)
+            writer.writeStartDocument('1.0', False)
+            writer.writeStartElement('graphReferences')
+            for n, (name, references) in enumerate(self.diagrams):
+                self.sgnProgress.emit(n, len(self.diagrams))
+                for tag, iri, x, y, w, h in references:
+                    writer.writeStartElement(tag)
+                    writer.writeAttribute('name', iri)
+                    writer.writeTextElement('diagramName', name)
+                    writer.writeTextElement('x', str(x))
+                    writer.writeTextElement('y', str(y))
+                    writer.writeTextElement('w', str(w))
+                    writer.writeTextElement('h', str(h))
+                    writer.writeEndElement()
+            writer.writeEndElement()
+            writer.writeEndDocument()
+            if writer.hasError() or not file.commit():
+                raise IOError('could not write {0}: {1}'.format(self.path, file.errorString()))
+            self.sgnProgress.emit(len(self.diagrams), len(self.diagrams))
+        except Exception as e:
+            LOGGER.exception('Graph references export failed: %s', e)
+            self.error = e
+        finally:
+            self.finished.emit()
@@ -33,13 +33,24 @@
 ##########################################################################
 
 
+import struct
+import zlib
 from abc import ABCMeta, abstractmethod
 
 from PyQt5 import QtGui, QtCore
 
 from eddy.core.datatypes.system import File
-from eddy.core.exporters.common import AbstractDiagramExporter
+from eddy.core.exporters.common import (
+    AbstractDiagramExporter,
+    DiagramRenderCache,
+)
 from eddy.core.output import getLogger
+from eddy.core.functions.signals import connect
+from eddy.core.worker import (
+    AbstractWorker,
+    runInThread,
+)
+from eddy.ui.progress import BusyProgressDialog
 
 LOGGER = getLogger()
 
@@ -47,6 +58,9 @@ LOGGER = getLogger()
 class ImageDiagramExporter(AbstractDiagramExporter):
     """
     Extends AbstractDiagramExporter with facilities to export the structure of Graphol diagrams to an image file.
+    The diagram is recorded once into a QPicture, which is then rasterized by a worker thread in
+    horizontal strips of bounded size, so that the amount of memory used during the rasterization
+    does not depend on the size of the exported image (if the output writer supports streaming).
     """
     __metaclass__ = ABCMeta
 
@@ -54,16 +68,25 @@ class ImageDiagramExporter(AbstractDiagramExporter):
     JpegFormat = 'JPEG'
     PngFormat = 'PNG'
     PpmFormat = 'PPM'
+    TiffFormat = 'TIFF'
 
-    def __init__(self, diagram, format, session=None):
+    ScreenDpi = 96
+    StripHeight = 1024
+
+    def __init__(self, diagram, format, session=None, dpi=None, budget=None):
         """
         Initialize the ImageDiagramExporter.
         :type diagram: Diagram
         :type format: str
         :type session: Session
+        :type dpi: int
+        :type budget: int
         """
         super().__init__(diagram, session)
+        settings = QtCore.QSettings()
         self._format = format
+        self.dpi = dpi or settings.value('export/image/dpi', self.ScreenDpi, int)
+        self.budget = budget or settings.value('export/image/memory', 64, int) * 1024 * 1024
 
     #############################################
     #   PROPERTIES
@@ -77,10 +100,29 @@ class ImageDiagramExporter(AbstractDiagramExporter):
         """
         return self._format
 
+    @property
+    def scale(self):
+        """
+        Returns the scale factor applied to the diagram when rasterizing it.
+        :rtype: float
+        """
+        return self.dpi / self.ScreenDpi
+
     #############################################
     #   INTERFACE
     #################################
 
+    def createWriter(self, path, width, height, rowsPerStrip):
+        """
+        Create the writer used to encode the rasterized strips.
+        :type path: str
+        :type width: int
+        :type height: int
+        :type rowsPerStrip: int
+        :rtype: ImageWriter
+        """
+        return ImageWriter(path, self.format, width, height, self.dpi)
+
     @classmethod
     @abstractmethod
     def filetype(cls):
@@ -90,23 +132,311 @@ class ImageDiagramExporter(AbstractDiagramExporter):
         """
         pass
 
+    def record(self):
+        """
+        Returns the picture of the diagram, along with the area of the diagram to export.
+        :rtype: tuple
+        """
+        picture, _ = DiagramRenderCache.get(self.diagram, self.session)
+        return picture, self.diagram.visibleRect(margin=20).toAlignedRect()
+
+    def createWorker(self, path):
+        """
+        Create the worker that rasterizes the diagram picture into the given path.
+        :type path: str
+        :rtype: ImageRenderWorker
+        """
+        picture, shape = self.record()
+        width = max(int(shape.width() * self.scale), 1)
+        height = max(int(shape.height() * self.scale), 1)
+        # EACH STRIP IS RENDERED IN RGB32 AND THEN CONVERTED TO RGB888: THE
+        # STREAMING WRITERS READ ITS SCANLINES IN PLACE, WITHOUT FURTHER COPIES
+        rowsPerStrip = max(1, min(self.StripHeight, self.budget // (width * 7)))
+        writer = self.createWriter(path, width, height, rowsPerStrip)
+        return ImageRenderWorker(picture, QtCore.QPointF(shape.topLeft()), writer, self.scale, width, height, rowsPerStrip)
+
     def run(self, path):
         """
-        Perform JPEG document generation.
+        Perform image document generation.
+        :type path: str
+        """
+        worker = self.createWorker(path)
+        # RASTERIZE THE PICTURE IN A WORKER THREAD, KEEPING THE EVENT LOOP RUNNING: A MODAL
+        # PROGRESS DIALOG PREVENTS THE DIAGRAM FROM BEING EDITED WHILE IT IS RASTERIZED
+        progress = BusyProgressDialog.current()
+        if progress and progress.isModal():
+            connect(worker.sgnProgress, progress.setProgress)
+            runInThread(worker)
+        else:
+            title = 'Exporting {0}...'.format(self.diagram.name)
+            with BusyProgressDialog(title, mtime=0, parent=self.session, modal=True) as progress:
+                connect(worker.sgnProgress, progress.setProgress)
+                runInThread(worker)
+        if worker.error:
+            raise worker.error
+        LOGGER.info('Exported diagram %s to %s (%sx%s px)', self.diagram.name, path, worker.width, worker.height)
+
+
+class ImageRenderWorker(AbstractWorker):
+    """
+    Extends AbstractWorker providing a worker thread that rasterizes a QPicture in horizontal strips.
+    """
+    sgnProgress = QtCore.pyqtSignal(int, int)
+
+    def __init__(self, picture, origin, writer, scale, width, height, rowsPerStrip):
+        """
+        Initialize the render worker.
+        :type picture: QPicture
+        :type origin: QPointF
+        :type writer: ImageWriter
+        :type scale: float
+        :type width: int
+        :type height: int
+        :type rowsPerStrip: int
+        """
+        super().__init__()
+        self.error = None
+        self.origin = origin
+        self.picture = picture
+        self.writer = writer
+        self.scale = scale
+        self.width = width
+        self.height = height
+        self.rowsPerStrip = rowsPerStrip
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        """
+        Main worker.
+        """
+        try:
+            for top in range(0, self.height, self.rowsPerStrip):
+                self.sgnProgress.emit(top, self.height)
+                rows = min(self.rowsPerStrip, self.height - top)
+                image = QtGui.QImage(self.width, rows, QtGui.QImage.Format_RGB32)
+                image.fill(QtCore.Qt.white)
+                painter = QtGui.QPainter(image)
+                painter.setRenderHint(QtGui.QPainter.Antialiasing)
+                painter.setRenderHint(QtGui.QPainter.TextAntialiasing)
+                painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+                painter.translate(0, -top)
+                painter.scale(self.scale, self.scale)
+                painter.translate(-self.origin)
+                painter.drawPicture(0, 0, self.picture)
+                painter.end()
+                self.writer.write(image.convertToFormat(QtGui.QImage.Format_RGB888))
+            self.writer.close()
+            self.sgnProgress.emit(self.height, self.height)
+        except Exception as e:
+            LOGGER.exception('Image rasterization failed: %s', e)
+            self.error = e
+        finally:
+            self.finished.emit()
+
+
+class ImageWriter(object):
+    """
+    Writes an image by painting the rasterized strips into a single QImage, saved using Qt image plugins.
+    This writer is used for formats which cannot be streamed, hence its memory usage depends on the image size.
+    """
+    def __init__(self, path, format, width, height, dpi):
+        """
+        Initialize the writer.
+        :type path: str
+        :type format: str
+        :type width: int
+        :type height: int
+        :type dpi: int
+        """
+        self.path = path
+        self.format = format
+        self.image = QtGui.QImage(width, height, QtGui.QImage.Format_RGB888)
+        if self.image.isNull():
+            raise MemoryError('could not allocate a {0}x{1} image'.format(width, height))
+        self.image.setDotsPerMeterX(round(dpi / 0.0254))
+        self.image.setDotsPerMeterY(round(dpi / 0.0254))
+        self.top = 0
+
+    @staticmethod
+    def scanlines(image):
+        """
+        Yields the scanlines of the given RGB888 image as memoryviews over the image data, without copying it.
+        The image must be kept alive (and left unmodified) while the scanlines are being consumed.
+        :type image: QImage
+        :rtype: generator
+        """
+        bits = image.constBits()
+        stride = image.bytesPerLine()
+        bits.setsize(stride * image.height())
+        data = memoryview(bits)
+        width = image.width() * 3
+        for y in range(image.height()):
+            yield data[y * stride:y * stride + width]
+
+    def write(self, image):
+        """
+        Write the given strip.
+        :type image: QImage
+        """
+        painter = QtGui.QPainter(self.image)
+        painter.drawImage(0, self.top, image)
+        painter.end()
+        self.top += image.height()
+
+    def close(self):
+        """
+        Finalize the image.
+        """
+        if not self.image.save(self.path, self.format):
+            raise IOError('could not save image to {0}'.format(self.path))
+
+
+class PngWriter(ImageWriter):
+    """
+    Streams the rasterized strips into a PNG file, compressing them as they are produced.
+    """
+    ChunkSize = 256 * 1024
+
+    def __init__(self, path, width, height, dpi):
+        """
+        Initialize the writer.
+        :type path: str
+        :type width: int
+        :type height: int
+        :type dpi: int
+        """
+        self.file = open(path, 'wb')
+        self.compressor = zlib.compressobj(6)
+        self.buffer = []
+        self.buffered = 0
+        ppm = round(dpi / 0.0254)
+        self.file.write(b'\x89PNG\r\n\x1a\n')
+        self.chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        self.chunk(b'pHYs', struct.pack('>IIB', ppm, ppm, 1))
+
+    def chunk(self, tag, data):
+        """
+        Write a PNG chunk.
+        :type tag: bytes
+        :type data: bytes
+        """
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(tag)
+        self.file.write(data)
+        self.file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(tag)) & 0xffffffff))
+
+    def flush(self, data):
+        """
+        Buffer the given compressed data, emitting an IDAT chunk whenever enough data is available.
+        :type data: bytes
+        """
+        if data:
+            self.buffer.append(data)
+            self.buffered += len(data)
+        if self.buffered >= self.ChunkSize:
+            self.chunk(b'IDAT', b''.join(self.buffer))
+            self.buffer = []
+            self.buffered = 0
+
+    def write(self, image):
+        """
+        Write the given strip.
+        :type image: QImage
+        """
+        for scanline in self.scanlines(image):
+            self.flush(self.compressor.compress(b'\x00'))
+            self.flush(self.compressor.compress(scanline))
+
+    def close(self):
+        """
+        Finalize the image.
+        """
+        try:
+            self.buffer.append(self.compressor.flush())
+            self.chunk(b'IDAT', b''.join(self.buffer))
+            self.chunk(b'IEND', b'')
+        finally:
+            self.file.close()
+
+
+class TiffWriter(ImageWriter):
+    """
+    Streams the rasterized strips into a Deflate compressed, striped TIFF file.
+    """
+    def __init__(self, path, width, height, dpi, rowsPerStrip):
+        """
+        Initialize the writer.
         :type path: str
+        :type width: int
+        :type height: int
+        :type dpi: int
+        :type rowsPerStrip: int
         """
-        shape = self.diagram.visibleRect(margin=20).toAlignedRect()
-        pixmap = QtGui.QPixmap(shape.width(), shape.height())
-        painter = QtGui.QPainter()
+        self.file = open(path, 'wb')
+        self.width = width
+        self.height = height
+        self.dpi = dpi
+        self.rowsPerStrip = rowsPerStrip
+        self.offsets = []
+        self.counts = []
+        # HEADER: THE OFFSET OF THE IMAGE FILE DIRECTORY IS PATCHED ON CLOSE
+        self.file.write(b'II*\x00\x00\x00\x00\x00')
 
-        if painter.begin(pixmap):
-            painter.setBackgroundMode(QtCore.Qt.OpaqueMode)
-            # RENDER THE DIAGRAM IN THE PAINTER
-            self.diagram.render(painter, source=QtCore.QRectF(shape))
-            # COMPLETE THE EXPORT
-            painter.end()
-            image = pixmap.toImage()
-            image.save(path, self.format)
+    def write(self, image):
+        """
+        Write the given strip.
+        :type image: QImage
+        """
+        compressor = zlib.compressobj(6)
+        data = [compressor.compress(scanline) for scanline in self.scanlines(image)]
+        data.append(compressor.flush())
+        data = b''.join(data)
+        self.offsets.append(self.file.tell())
+        self.counts.append(len(data))
+        self.file.write(data)
+
+    def close(self):
+        """
+        Finalize the image.
+        """
+        try:
+            def extra(data):
+                # Values which do not fit into the IFD entry are stored before the IFD itself.
+                if self.file.tell() % 2:
+                    self.file.write(b'\x00')
+                offset = self.file.tell()
+                self.file.write(data)
+                return offset
+
+            strips = len(self.offsets)
+            entries = [
+                (256, 4, 1, struct.pack('<I', self.width)),
+                (257, 4, 1, struct.pack('<I', self.height)),
+                (258, 3, 3, struct.pack('<I', extra(struct.pack('<HHH', 8, 8, 8)))),
+                (259, 3, 1, struct.pack('<HH', 8, 0)),
+                (262, 3, 1, struct.pack('<HH', 2, 0)),
+                (273, 4, strips, struct.pack('<I', self.offsets[0] if strips == 1 else
+                                             extra(struct.pack('<{0}I'.format(strips), *self.offsets)))),
+                (277, 3, 1, struct.pack('<HH', 3, 0)),
+                (278, 4, 1, struct.pack('<I', self.rowsPerStrip)),
+                (279, 4, strips, struct.pack('<I', self.counts[0] if strips == 1 else
+                                             extra(struct.pack('<{0}I'.format(strips), *self.counts)))),
+                (282, 5, 1, struct.pack('<I', extra(struct.pack('<II', self.dpi, 1)))),
+                (283, 5, 1, struct.pack('<I', extra(struct.pack('<II', self.dpi, 1)))),
+                (284, 3, 1, struct.pack('<HH', 1, 0)),
+                (296, 3, 1, struct.pack('<HH', 2, 0)),
+            ]
+            if self.file.tell() % 2:
+                self.file.write(b'\x00')
+            ifd = self.file.tell()
+            self.file.write(struct.pack('<H', len(entries)))
+            for tag, kind, count, value in entries:
+                self.file.write(struct.pack('<HHI', tag, kind, count) + value)
+            self.file.write(struct.pack('<I', 0))
+            self.file.seek(4)
+            self.file.write(struct.pack('<I', ifd))
+        finally:
+            self.file.close()
 
 
 class BmpDiagramExporter(ImageDiagramExporter):
@@ -175,6 +505,17 @@ class PngDiagramExporter(ImageDiagramExporter):
     #   INTERFACE
     #################################
 
+    def createWriter(self, path, width, height, rowsPerStrip):
+        """
+        Create the writer used to encode the rasterized strips.
+        :type path: str
+        :type width: int
+        :type height: int
+        :type rowsPerStrip: int
+        :rtype: ImageWriter
+        """
+        return PngWriter(path, width, height, self.dpi)
+
     @classmethod
     def filetype(cls):
         """
@@ -182,3 +523,39 @@ class PngDiagramExporter(ImageDiagramExporter):
         :return: File
         """
         return File.Png
+
+
+class TiffDiagramExporter(ImageDiagramExporter):
+    """
+    Subclass of ImageDiagramExporter that exports a diagram to a TIFF image file.
+    """
+    def __init__(self, diagram, session=None):
+        """
+        Initialize the TiffDiagramExporter.
+        :type diagram: Diagram
+        :type session: Session
+        """
+        super().__init__(diagram, ImageDiagramExporter.TiffFormat, session)
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def createWriter(self, path, width, height, rowsPerStrip):
+        """
+        Create the writer used to encode the rasterized strips.
+        :type path: str
+        :type width: int
+        :type height: int
+        :type rowsPerStrip: int
+        :rtype: ImageWriter
+        """
+        return TiffWriter(path, width, height, self.dpi, rowsPerStrip)
+
+    @classmethod
+    def filetype(cls):
+        """
+        Returns the type of the file that will be used for the export.
+        :return: File
+        """
+        return File.Tiff
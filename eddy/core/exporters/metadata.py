@@ -39,12 +39,20 @@ from abc import ABCMeta, abstractmethod
 import csv
 import io
 from copy import copy
+from itertools import (
+    chain,
+    islice,
+)
 from typing import (
     cast,
     Any,
     Dict,
+    Iterator,
     List,
+    Optional,
+    Sequence,
     Set,
+    Tuple,
     TYPE_CHECKING,
 )
 
@@ -55,6 +63,7 @@ from PyQt5 import (
 )
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import DEFAULT_FONT, Alignment, NamedStyle
 from openpyxl.utils import get_column_letter
 
@@ -62,7 +71,7 @@ from eddy.core.common import HasWidgetSystem
 from eddy.core.datatypes.graphol import Item
 from eddy.core.datatypes.system import File
 from eddy.core.exporters.common import AbstractProjectExporter
-from eddy.core.functions.fsystem import fwrite
+from eddy.core.functions.fsystem import fstream, fwrite
 from eddy.core.functions.path import openPath
 from eddy.core.functions.signals import connect
 from eddy.core.output import getLogger
@@ -74,6 +83,7 @@ from eddy.ui.fields import (
 )
 
 if TYPE_CHECKING:
+    from eddy.core.owl import IRI
     from eddy.core.project import Project
     from eddy.ui.session import Session
 
@@ -135,71 +145,70 @@ class AbstractMetadataExporter(AbstractProjectExporter):
         Returns a list containing the metadata table rows, as dictionaries
         indexed by their corresponding column name.
         """
+        header = self.metadataHeader()
+        return [dict(zip(header, row)) for row in self.metadataRows()]
+
+    def metadataResources(self) -> List[Tuple[IRI, str, bool]]:
+        """
+        Returns the list of (resource, type, imported) triples to be exported, sorted by resource.
+        """
         if self.diagrams is None:
             self.diagrams = self.project.diagrams()
         if self.annotations is None:
             self.annotations = self.project.getAnnotationPropertyIRIs()
         if self.items is None:
             self.items = self.Types.keys()
-        meta = []  # type: List[Dict[str, str]]
+        resources = []  # type: List[Tuple[IRI, str, bool]]
         processed = set()
-        # PROJECT METADATA
+        # PROJECT RESOURCES
         for diagram in self.diagrams:
             for node in self.project.iriOccurrences(diagram=diagram):
                 if node.type() not in self.items or node.iri in processed:
                     continue
-                if self.includeEntitiesWithoutAnnotations and len(
-                    node.iri.annotationAssertions) == 0:
-                    meta.append({
-                        self.KeyResource: str(node.iri),
-                        self.KeySimpleName: node.iri.getSimpleName(),
-                        self.KeyType: self.Types.get(node.type()),
-                        self.KeyAnnotation: '',
-                        self.KeyDataType: '',
-                        self.KeyLang: '',
-                        self.KeyValue: '',
-                    })
-                for annotation in node.iri.annotationAssertions:
-                    if annotation.assertionProperty in self.annotations:
-                        meta.append({
-                            self.KeyResource: str(node.iri),
-                            self.KeySimpleName: node.iri.getSimpleName(),
-                            self.KeyType: self.Types.get(node.type()),
-                            self.KeyAnnotation: annotation.assertionProperty,
-                            self.KeyDataType: annotation.datatype or '',
-                            self.KeyLang: annotation.language or '',
-                            self.KeyValue: str(annotation.value),
-                        })
+                resources.append((node.iri, self.Types.get(node.type()), False))
                 processed.add(node.iri)
-
-        # IMPORTED METADATA
+        # IMPORTED RESOURCES
         for ont in self.project.importedOntologies:
-            resources = []
+            imported = []
             if Item.ConceptNode in self.items:
-                resources.extend(map(lambda v: ('Class', v), ont.classes))
+                imported.extend(map(lambda v: ('Class', v), ont.classes))
             if Item.RoleNode in self.items:
-                resources.extend(map(lambda v: ('Object Property', v), ont.objectProperties))
+                imported.extend(map(lambda v: ('Object Property', v), ont.objectProperties))
             if Item.AttributeNode in self.items:
-                resources.extend(map(lambda v: ('Data Property', v), ont.dataProperties))
+                imported.extend(map(lambda v: ('Data Property', v), ont.dataProperties))
             if Item.IndividualNode in self.items:
-                resources.extend(map(lambda v: ('Named Individual', v), ont.individuals))
-            for entityType, resource in resources:
+                imported.extend(map(lambda v: ('Named Individual', v), ont.individuals))
+            for entityType, resource in imported:
                 if resource in processed:
                     continue
-                for annotation in resource.annotationAssertions:
-                    if annotation.assertionProperty in self.annotations:
-                        meta.append({
-                            self.KeyResource: str(resource),
-                            self.KeySimpleName: resource.getSimpleName(),
-                            self.KeyType: entityType,
-                            self.KeyAnnotation: annotation.assertionProperty,
-                            self.KeyDataType: annotation.datatype or '',
-                            self.KeyLang: annotation.language or '',
-                            self.KeyValue: str(annotation.value),
-                        })
+                resources.append((resource, entityType, True))
                 processed.add(resource)
-
-        return sorted(meta, key=lambda i: i[self.KeyResource])
+        # SORTING IS STABLE, SO RESOURCES WITH THE SAME IRI KEEP THEIR ORDER
+        resources.sort(key=lambda r: str(r[0]))
+        return resources
+
+    def metadataRows(self) -> Iterator[List[str]]:
+        """
+        Generates the metadata table rows, sorted by resource, as lists of values in header order.
+        Only the sorted resource index is kept in memory, rows are produced on demand.
+        """
+        for resource, entityType, imported in self.metadataResources():
+            resourceName = str(resource)
+            simpleName = resource.getSimpleName()
+            if self.includeEntitiesWithoutAnnotations and not imported \
+                and len(resource.annotationAssertions) == 0:
+                yield [resourceName, simpleName, entityType, '', '', '', '']
+            for annotation in resource.annotationAssertions:
+                if annotation.assertionProperty in self.annotations:
+                    yield [
+                        resourceName,
+                        simpleName,
+                        entityType,
+                        annotation.assertionProperty,
+                        annotation.datatype or '',
+                        annotation.language or '',
+                        str(annotation.value),
+                    ]
 
     @classmethod
     @abstractmethod
@@ -257,18 +266,26 @@ class CsvProjectExporter(AbstractMetadataExporter):
             # CHECK INCLUSION OF ENTITIES WITHOUT ANNOTATIONS
             self.includeEntitiesWithoutAnnotations = dialog.checked()
 
-        buffer = io.StringIO()
-        writer = csv.writer(buffer, delimiter=',', quotechar='"', quoting=csv.QUOTE_ALL)
-        writer.writerow(self.metadataHeader())
-        writer.writerows(map(lambda row: row.values(), self.metadata()))
-        fwrite(buffer.getvalue(), path, newline='')
+        self.write(path)
         if self.open:
             openPath(path)
 
+    def write(self, path: str, rows: Optional[Sequence[List[str]]] = None) -> None:
+        """
+        Write the metadata table in the given path.
+        If no rows are given, they are generated from the project while writing.
+        """
+        with fstream(path, newline='') as stream:
+            writer = csv.writer(stream, delimiter=',', quotechar='"', quoting=csv.QUOTE_ALL)
+            writer.writerow(self.metadataHeader())
+            writer.writerows(self.metadataRows() if rows is None else rows)
+
 class XlsxProjectExporter(AbstractMetadataExporter):
     """
     This class can be used to export Graphol projects into Excel 2007+ .xlsx format.
     """
+    WidthSample = 1000
+
     #############################################
     #   INTERFACE
     #################################
@@ -306,42 +323,56 @@ class XlsxProjectExporter(AbstractMetadataExporter):
             # CHECK INCLUSION OF ENTITIES WITHOUT ANNOTATIONS
             self.includeEntitiesWithoutAnnotations = dialog.checked()
 
-        workbook = Workbook()
-        worksheet = workbook.active
-        worksheet.title = self.project.name
+        self.write(path)
+        if self.open:
+            openPath(path)
+
+    def write(self, path: str, rows: Optional[Sequence[List[str]]] = None) -> None:
+        """
+        Write the metadata table in the given path.
+        If no rows are given, they are generated from the project while writing.
+        Column widths are estimated from the first WidthSample rows, so that rows are generated only once.
+        """
+        rows = iter(self.metadataRows() if rows is None else rows)
+        sample = list(islice(rows, self.WidthSample))
+
+        # ESTIMATE COLUMN WIDTHS (COLUMN DIMENSIONS MUST BE SET BEFORE STREAMING ROWS)
+        header = self.metadataHeader()
+        widths = [len(title) for title in header]
+        for row in sample:
+            for j, value in enumerate(row):
+                # Length of the longest line in a multi-line string
+                width = max(map(len, str(value).split('\n')))
+                if width > widths[j]:
+                    widths[j] = width
+
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(title=self.project.name)
         bodyFont = copy(DEFAULT_FONT)
         headFont = copy(bodyFont)
         headFont.bold = True
         alignment = Alignment(vertical='center', wrapText=True)
-        headStyle = NamedStyle(name='head', font=headFont, alignment=alignment)
-        bodyStyle = NamedStyle(name='body', font=bodyFont, alignment=alignment)
-        # HEADER ROW
-        for j, title in enumerate(self.metadataHeader(), start=1):
-            worksheet.cell(row=1, column=j, value=title).style = headStyle
+        for j, width in enumerate(widths, start=1):
+            worksheet.column_dimensions[get_column_letter(j)].width = width
         worksheet.freeze_panes = 'A2'
-        # METADATA ROWS
-        metadata = self.metadata()
-        if metadata:
-            for i, row in enumerate(metadata, start=2):
-                for j, value in enumerate(row.values(), start=1):
-                    worksheet.cell(row=i, column=j, value=str(value)).style = bodyStyle
-        # AUTOFIT COLUMN WIDTHS
-        for j, key in enumerate(self.metadataHeader(), start=1):
-            # Length of the longest line in a multi-line string
-            def maxlen(s): return max(map(len, str(s).split('\n')))
 
-            # Compute the column width as the max between the length of
-            # the column header, and the max length of all column values.
-            width = max(len(key), max(map(lambda d: maxlen(d[key]), metadata)))
-            worksheet.column_dimensions[get_column_letter(j)].width = width
-        # AUTOFIT ROW HEIGHTS
-        for i, row in enumerate(metadata, start=2):
-            height = max(map(lambda s: len(s.split('\n')), map(str, row.values())))
-            # Set height as number of lines x default font height + some padding
-            worksheet.row_dimensions[i].height = height * bodyFont.size * 1.25
+        def cell(value, font):
+            wcell = WriteOnlyCell(worksheet, value=str(value))
+            wcell.font = font
+            wcell.alignment = alignment
+            return wcell
+
+        # HEADER ROW
+        worksheet.append([cell(title, headFont) for title in header])
+        # METADATA ROWS
+        for i, row in enumerate(chain(sample, rows), start=2):
+            # AUTOFIT MULTI-LINE ROW HEIGHTS (ROW DIMENSIONS MUST BE SET BEFORE APPENDING THE ROW)
+            height = max(str(value).count('\n') for value in row) + 1
+            if height > 1:
+                # Set height as number of lines x default font height + some padding
+                worksheet.row_dimensions[i].height = height * bodyFont.size * 1.25
+            worksheet.append([cell(value, bodyFont) for value in row])
         workbook.save(path)
-        if self.open:
-            openPath(path)
 
 
 class AbstractTemplateExporter(AbstractProjectExporter):
@@ -0,0 +1,441 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+
+import json
+import os
+
+from PyQt5 import QtCore
+from PyQt5 import QtGui
+
+from eddy.core.datatypes.owl import (
+    OWLAxiom,
+    OWLSyntax,
+)
+from eddy.core.datatypes.system import File
+from eddy.core.exporters.common import DiagramRenderCache
+from eddy.core.exporters.graphml import GraphMLDiagramExporter
+from eddy.core.exporters.graphreferences import GraphReferencesProjectExporter
+from eddy.core.exporters.image import (
+    BmpDiagramExporter,
+    JpegDiagramExporter,
+    PngDiagramExporter,
+    TiffDiagramExporter,
+)
+from eddy.core.exporters.metadata import (
+    CsvProjectExporter,
+    XlsxProjectExporter,
+)
+from eddy.core.exporters.owl2 import OWLOntologyExporterWorker
+from eddy.core.exporters.pdf import PdfProjectExporter
+from eddy.core.exporters.svg import SvgDiagramExporter
+from eddy.core.functions.fsystem import (
+    fread,
+    fwrite,
+    mkdir,
+)
+from eddy.core.functions.misc import natsorted
+from eddy.core.functions.path import expandPath
+from eddy.core.functions.signals import connect
+from eddy.core.output import getLogger
+from eddy.core.worker import (
+    FunctionWorker,
+    WorkerPool,
+)
+
+LOGGER = getLogger()
+
+
+class ExportProfile(object):
+    """
+    This class describes a set of exports to perform on a project in a single run.
+    A profile is stored as a JSON document with the following structure:
+
+        {
+            "name": "release",
+            "formats": ["Owl", "Pdf", "Csv", "Png"],
+            "diagrams": ["diagram1", "diagram2"],
+            "options": {
+                "Owl": {"syntax": "Turtle", "normalize": false},
+                "Pdf": {"includeTables": true, "pageSize": "A4"},
+                "Png": {"dpi": 300}
+            }
+        }
+
+    Formats are the names of the File members to export to; diagrams (optional) restricts
+    the export to the diagrams with the given names; options are keyed by format name.
+    """
+    def __init__(self, name, formats, diagrams=None, options=None):
+        """
+        Initialize the export profile.
+        :type name: str
+        :type formats: list
+        :type diagrams: list
+        :type options: dict
+        """
+        self.name = name
+        self.formats = list(formats)
+        self.diagrams = list(diagrams) if diagrams is not None else None
+        self.options = dict(options or {})
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    @classmethod
+    def fromDict(cls, data):
+        """
+        Create a profile from the given dictionary.
+        :type data: dict
+        :rtype: ExportProfile
+        """
+        formats = []
+        for name in data.get('formats', []):
+            try:
+                formats.append(File[name])
+            except KeyError:
+                raise ValueError('unknown export format: {0}'.format(name))
+        options = {}
+        for name, value in data.get('options', {}).items():
+            try:
+                options[File[name]] = dict(value)
+            except KeyError:
+                raise ValueError('unknown export format: {0}'.format(name))
+        return cls(data.get('name', ''), formats, data.get('diagrams'), options)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load the profile stored in the given path.
+        :type path: str
+        :rtype: ExportProfile
+        """
+        return cls.fromDict(json.loads(fread(expandPath(path))))
+
+    def optionsFor(self, filetype):
+        """
+        Returns the options of the given format.
+        :type filetype: File
+        :rtype: dict
+        """
+        return self.options.get(filetype, {})
+
+    def save(self, path):
+        """
+        Store the profile in the given path.
+        :type path: str
+        """
+        fwrite(json.dumps(self.toDict(), indent=2), expandPath(path))
+
+    def toDict(self):
+        """
+        Returns the dictionary representation of the profile.
+        :rtype: dict
+        """
+        data = {
+            'name': self.name,
+            'formats': [filetype.name for filetype in self.formats],
+            'options': {filetype.name: value for filetype, value in self.options.items()},
+        }
+        if self.diagrams is not None:
+            data['diagrams'] = self.diagrams
+        return data
+
+
+class ExportOrchestrator(QtCore.QObject):
+    """
+    Runs all the exports described by an ExportProfile, concurrently where possible.
+    Exports are performed in two stages: the part of each export which needs the GUI thread
+    (recording diagrams, collecting metadata rows, etc.) is executed first, sequentially, producing
+    a snapshot of the project which is then written to disk by workers running on a WorkerPool.
+    Diagrams are recorded once in the session DiagramRenderCache and shared by all the exporters.
+    Exports failing do not interrupt the others: errors are collected and returned at the end.
+    """
+    sgnProgress = QtCore.pyqtSignal(int, int)
+
+    OWLSyntaxExtension = {
+        OWLSyntax.Functional: '.owl',
+        OWLSyntax.Manchester: '.omn',
+        OWLSyntax.RDF: '.owx',
+        OWLSyntax.Turtle: '.ttl',
+    }
+
+    def __init__(self, project, profile, session=None, maxThreadCount=None):
+        """
+        Initialize the orchestrator.
+        :type project: Project
+        :type profile: ExportProfile
+        :type session: Session
+        :type maxThreadCount: int
+        """
+        super().__init__(session)
+        self.project = project
+        self.profile = profile
+        self.session = session
+        self.maxThreadCount = maxThreadCount
+        self.completed = 0
+        self.failures = []
+        self.jobs = {}
+        self.synchronous = []
+        self.total = 0
+        self.prepareFuncForFile = {
+            File.Bmp: self.prepareDiagramExport,
+            File.Csv: self.prepareMetadataExport,
+            File.GraphML: self.prepareDiagramExport,
+            File.GraphReferences: self.prepareGraphReferencesExport,
+            File.Jpeg: self.prepareDiagramExport,
+            File.Owl: self.prepareOwlExport,
+            File.Pdf: self.preparePdfExport,
+            File.Png: self.prepareDiagramExport,
+            File.Svg: self.prepareDiagramExport,
+            File.Tiff: self.prepareDiagramExport,
+            File.Xlsx: self.prepareMetadataExport,
+        }
+        self.diagramExporterForFile = {
+            File.Bmp: BmpDiagramExporter,
+            File.GraphML: GraphMLDiagramExporter,
+            File.Jpeg: JpegDiagramExporter,
+            File.Png: PngDiagramExporter,
+            File.Svg: SvgDiagramExporter,
+            File.Tiff: TiffDiagramExporter,
+        }
+        self.metadataExporterForFile = {
+            File.Csv: CsvProjectExporter,
+            File.Xlsx: XlsxProjectExporter,
+        }
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot(QtCore.QObject)
+    def onWorkerFinished(self, worker):
+        """
+        Executed when an export worker completes its job.
+        :type worker: AbstractWorker
+        """
+        label = self.jobs[worker]
+        error = getattr(worker, 'error', None)
+        if error:
+            LOGGER.error('Export of %s failed: %s', label, error)
+            self.failures.append((label, error))
+        self.step()
+
+    @QtCore.pyqtSlot()
+    def doRunSynchronousJobs(self):
+        """
+        Run the exports that must be performed on the GUI thread.
+        """
+        while self.synchronous:
+            label, func, args = self.synchronous.pop(0)
+            try:
+                func(*args)
+            except Exception as e:
+                LOGGER.exception('Export of %s failed', label)
+                self.failures.append((label, e))
+            self.step()
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def addJob(self, label, worker):
+        """
+        Add an export performed by the given worker.
+        :type label: str
+        :type worker: AbstractWorker
+        """
+        self.jobs[worker] = label
+
+    def addSynchronousJob(self, label, func, *args):
+        """
+        Add an export performed by calling the given function on the GUI thread.
+        :type label: str
+        :type func: callable
+        """
+        self.synchronous.append((label, func, args))
+
+    def diagrams(self):
+        """
+        Returns the diagrams selected by the profile.
+        :rtype: list
+        """
+        if self.profile.diagrams is None:
+            return natsorted(self.project.diagrams(), key=lambda d: d.name)
+        diagrams = []
+        for name in self.profile.diagrams:
+            diagram = self.project.diagram(name)
+            if diagram is None:
+                raise ValueError('unknown diagram: {0}'.format(name))
+            diagrams.append(diagram)
+        return diagrams
+
+    def pathFor(self, directory, extension, diagram=None):
+        """
+        Returns the path of the file generated by an export.
+        :type directory: str
+        :type extension: str
+        :type diagram: Diagram
+        :rtype: str
+        """
+        if diagram is not None:
+            return os.path.join(directory, '{0}_{1}{2}'.format(self.project.name, diagram.name, extension))
+        return os.path.join(directory, '{0}{1}'.format(self.project.name, extension))
+
+    def prepareDiagramExport(self, filetype, directory):
+        """
+        Prepare the export of each selected diagram in the given image/graph format.
+        :type filetype: File
+        :type directory: str
+        """
+        options = self.profile.optionsFor(filetype)
+        for diagram in self.diagrams():
+            path = self.pathFor(directory, filetype.extension, diagram)
+            label = '{0} ({1})'.format(diagram.name, filetype.name)
+            exporter = self.diagramExporterForFile[filetype](diagram, self.session)
+            if hasattr(exporter, 'createWorker'):
+                if 'dpi' in options:
+                    exporter.dpi = int(options['dpi'])
+                self.addJob(label, exporter.createWorker(path))
+            else:
+                self.addSynchronousJob(label, exporter.run, path)
+
+    def prepareGraphReferencesExport(self, filetype, directory):
+        """
+        Prepare the export of the graph references of the project.
+        :type filetype: File
+        :type directory: str
+        """
+        exporter = GraphReferencesProjectExporter(self.project, self.session)
+        path = self.pathFor(directory, filetype.extension)
+        self.addJob(filetype.name, exporter.createWorker(path))
+
+    def prepareMetadataExport(self, filetype, directory):
+        """
+        Prepare the export of the project metadata in CSV or XLSX format.
+        Rows are collected here, so that the worker never accesses the project.
+        :type filetype: File
+        :type directory: str
+        """
+        options = self.profile.optionsFor(filetype)
+        exporter = self.metadataExporterForFile[filetype](
+            self.project, self.session, diagrams=self.diagrams(),
+            includeEntitiesWithoutAnnotations=options.get('includeEntitiesWithoutAnnotations', False))
+        path = self.pathFor(directory, filetype.extension)
+        self.addJob(filetype.name, FunctionWorker(exporter.write, path, list(exporter.metadataRows())))
+
+    def prepareOwlExport(self, filetype, directory):
+        """
+        Prepare the export of the project as an OWL 2 ontology.
+        :type filetype: File
+        :type directory: str
+        """
+        options = self.profile.optionsFor(filetype)
+        settings = QtCore.QSettings()
+        syntax = OWLSyntax[options.get('syntax', OWLSyntax.Functional.name)]
+        axioms = options.get('axioms')
+        if axioms is None:
+            axioms = {
+                axiom for axiom in OWLAxiom
+                if settings.value('export/axiom/{0}'.format(axiom.value), True, bool)
+            }
+        else:
+            axioms = {OWLAxiom[axiom] for axiom in axioms}
+        path = self.pathFor(directory, self.OWLSyntaxExtension[syntax])
+        self.addJob(filetype.name, OWLOntologyExporterWorker(
+            self.project, path, axioms=axioms, diagrams=self.diagrams(),
+            normalize=options.get('normalize', False), syntax=syntax))
+
+    def preparePdfExport(self, filetype, directory):
+        """
+        Prepare the export of the selected diagrams in a single PDF document.
+        :type filetype: File
+        :type directory: str
+        """
+        options = self.profile.optionsFor(filetype)
+        pageSize = options.get('pageSize')
+        if pageSize is not None:
+            pageSize = QtGui.QPageSize(getattr(QtGui.QPageSize, pageSize))
+        exporter = PdfProjectExporter(
+            self.project, self.session, diagrams=self.diagrams(),
+            includeTables=options.get('includeTables', True), pageSize=pageSize)
+        path = self.pathFor(directory, filetype.extension)
+        self.addJob(filetype.name, exporter.createWorker(path, exporter.createPrinter(path)))
+
+    def run(self, directory):
+        """
+        Perform all the exports described by the profile, writing the generated files in the given directory.
+        Returns the list of (label, exception) pairs of the exports that failed.
+        :type directory: str
+        :rtype: list
+        """
+        directory = expandPath(directory)
+        mkdir(directory)
+        self.completed = 0
+        self.failures = []
+        self.jobs = {}
+        self.synchronous = []
+        # RECORD THE DIAGRAMS ONCE: ALL THE EXPORTERS REPLAY THE SAME PICTURES
+        if any(filetype in self.diagramExporterForFile or filetype is File.Pdf for filetype in self.profile.formats):
+            for diagram in self.diagrams():
+                DiagramRenderCache.get(diagram, self.session)
+        # PREPARE THE EXPORTS ON THE GUI THREAD
+        for filetype in self.profile.formats:
+            try:
+                self.prepareFuncForFile[filetype](filetype, directory)
+            except Exception as e:
+                LOGGER.exception('Export of %s failed', filetype.name)
+                self.failures.append((filetype.name, e))
+        self.total = len(self.jobs) + len(self.synchronous)
+        LOGGER.info('Running %s exports of profile %s into %s', self.total, self.profile.name, directory)
+        self.sgnProgress.emit(0, self.total)
+        if self.jobs:
+            # GUI THREAD EXPORTS RUN WHILE THE POOL IS BUSY WITH THE WORKERS
+            # OWL 2 EXPORTS SHARE THE JVM AND THE OWL API DATA FACTORY: RUN THEM ONE AT A TIME
+            pool = WorkerPool(self.maxThreadCount, self, exclusive=(OWLOntologyExporterWorker,))
+            connect(pool.sgnWorkerFinished, self.onWorkerFinished)
+            QtCore.QTimer.singleShot(0, self.doRunSynchronousJobs)
+            pool.run(list(self.jobs))
+            pool.deleteLater()
+        # THE POOL MAY TERMINATE BEFORE THE GUI THREAD EXPORTS GET THE CHANCE TO START
+        self.doRunSynchronousJobs()
+        return self.failures
+
+    def step(self):
+        """
+        Notify the completion of an export.
+        """
+        self.completed += 1
+        self.sgnProgress.emit(self.completed, self.total)
@@ -33,6 +33,7 @@
 ##########################################################################
 
 
+import itertools
 import json
 import os
 import textwrap
@@ -68,7 +69,18 @@ from eddy.core.datatypes.owl import (
 from eddy.core.datatypes.system import File
 from eddy.core.diagram import DiagramMalformedError
 from eddy.core.exporters.common import AbstractOntologyExporter
+from eddy.core.exporters.owl2_analysis import (
+    EdgeSnapshot,
+    analyseAll,
+    analyseEdge,
+    analyseNode,
+    annotationSignature,
+    itemSignature,
+    snapshot,
+    snapshotNode,
+)
 from eddy.core.functions.fsystem import (
+    fexists,
     fwrite,
     fremove,
 )
@@ -87,7 +99,7 @@ from eddy.core.functions.path import (
     expandPath,
     openPath,
 )
-from eddy.core.functions.signals import connect
+from eddy.core.functions.signals import connect, disconnect
 from eddy.core.jvm import getJavaVM
 from eddy.core.metadata import (
     LiteralValue,
@@ -100,17 +112,21 @@ from eddy.core.ndc import (
 from eddy.core.network import NetworkManager
 from eddy.core.output import getLogger
 from eddy.core.owl import (
+    IRI,
     OWL2Datatype,
     OWL2Facet,
 )
-from eddy.core.worker import AbstractWorker
+from eddy.core.project import ProjectChangeSet
+from eddy.core.worker import (
+    AbstractWorker,
+    runInThread,
+)
 from eddy.ui.dialogs import DiagramSelectionDialog
 from eddy.ui.fields import (
     ComboBox,
     CheckBox,
 )
-
-# from eddy.ui.progress import BusyProgressDialog
+from eddy.ui.progress import BusyProgressDialog
 # from eddy.ui.syntax import SyntaxValidationWorker
 
 LOGGER = getLogger()
@@ -597,6 +613,7 @@ class OWLOntologyExporterWorker(AbstractWorker):
         self.ImportsEnum = self.vm.getJavaClass('org.semanticweb.owlapi.model.parameters.Imports')
         self.AddImportClass = self.vm.getJavaClass('org.semanticweb.owlapi.model.AddImport')
 
+        self.error = None
         self.path = path
         self.project = project
         self.nmanager = NetworkManager(self)
@@ -1924,6 +1941,101 @@ class OWLOntologyExporterWorker(AbstractWorker):
                     proj = first(dataset.projects(URIRef(str(annotation.value))))
                     self.createNDCNamedIndividual(proj)
 
+    #############################################
+    #   ONTOLOGY
+    #################################
+
+    def addImportDeclarations(self):
+        """
+        Add the import declarations of the project to the OWL 2 ontology.
+        """
+        LOGGER.debug('Adding import declarations to the OWL 2 Ontology')
+
+        for impOnt in self.project.importedOntologies:
+            try:
+                docObj = None
+                if impOnt.isLocalDocument:
+                    docObj = self.JavaFileClass(impOnt.docLocation)
+                else:
+                    docObj = self.URIClass(impOnt.docLocation)
+                docLocationIRI = self.IRI.create(docObj)
+                impOntIRI = self.IRI.create(impOnt.ontologyIRI)
+                # iriMapper = self.IRIMapperClass(impOntIRI, docLocationIRI)
+                # self.man.getIRIMappers().add(iriMapper)
+                impDecl = self.df.getOWLImportsDeclaration(impOntIRI)
+                addImp = self.AddImportClass(self.ontology, impDecl)
+                self.man.applyChange(addImp)
+            except Exception as e:
+                LOGGER.exception('The import declaration <{}> cannot be added.\nError:{}'.format(impOnt, str(e)))
+            else:
+                LOGGER.debug('Ontology declaration ({}) correctly added.'.format(impOnt))
+
+    def addOntologyAnnotations(self):
+        """
+        Add the annotations of the project ontology IRI to the OWL 2 ontology.
+        """
+        if OWLAxiom.Annotation in self.axiomsList:
+            for annotation in self.project.ontologyIRI.annotationAssertions:
+                value = self.getOWLApiAnnotation(annotation)
+                self.ontology.applyChange(self.AddOntologyAnnotation(self.ontology, value))
+
+    def initOntology(self):
+        """
+        Initialize the OWL 2 ontology manager, data factory and prefix manager, and create an empty ontology.
+        """
+        ontologyIRI = str(self.project.ontologyIRI)
+        versionIRI = self.project.version
+        if versionIRI:
+            ontologyID = self.OWLOntologyID(self.IRI.create(ontologyIRI),
+                                            self.IRI.create(versionIRI))
+        else:
+            ontologyID = self.OWLOntologyID(self.IRI.create(ontologyIRI))
+        self.man = self.OWLManager.createOWLOntologyManager()
+        self.df = self.OWLManager.getOWLDataFactory()
+        self.ontology = self.man.createOntology(ontologyID)
+        self.pm = self.DefaultPrefixManager()
+
+        for prefix, ns in self.project.prefixDictItems():
+            self.pm.setPrefix(prefix, ns)
+
+    def serialize(self, path):
+        """
+        Serialize the OWL 2 ontology in the configured syntax and write it to the given path.
+        :type path: str
+        """
+        if self.syntax is OWLSyntax.Functional:
+            DocumentFormat = self.FunctionalSyntaxDocumentFormat
+            DocumentFilter = OWLFunctionalSyntaxDocumentFilter
+        elif self.syntax is OWLSyntax.Manchester:
+            DocumentFormat = self.ManchesterSyntaxDocumentFormat
+            DocumentFilter = OWLManchesterSyntaxDocumentFilter
+        elif self.syntax is OWLSyntax.RDF:
+            DocumentFormat = self.RDFXMLDocumentFormat
+            DocumentFilter = RDFXMLDocumentFilter
+        elif self.syntax is OWLSyntax.Turtle:
+            DocumentFormat = self.TurtleDocumentFormat
+            DocumentFilter = TurtleDocumentFilter
+        else:
+            raise TypeError('unsupported syntax (%s)' % self.syntax)
+
+        LOGGER.debug('Serializing the OWL 2 Ontology in %s', self.syntax.value)
+
+        # COPY PREFIXES
+        ontoFormat = DocumentFormat()
+        ontoFormat.copyPrefixesFrom(self.pm)
+
+        # CREARE TARGET STREAM
+        stream = self.StringDocumentTarget()
+        stream = self.vm.cast(self.OWLOntologyDocumentTarget, stream)
+        # SAVE THE ONTOLOGY TO DISK
+        self.man.setOntologyFormat(self.ontology, ontoFormat)
+        self.man.saveOntology(self.ontology, stream)
+        stream = self.vm.cast(self.StringDocumentTarget, stream)
+        string = DocumentFilter(stream.toString())
+        fwrite(string, path)
+        # REMOVE RANDOM FILES GENERATED BY OWL API
+        fremove(os.path.join(os.path.dirname(path), 'catalog-v001.xml'))
+
     #############################################
     #   MAIN WORKER
     #################################
@@ -1935,44 +2047,34 @@ class OWLOntologyExporterWorker(AbstractWorker):
         """
         try:
             self.sgnStarted.emit()
-            self.vm.attachThreadToJVM()
 
             #############################################
-            # INITIALIZE ONTOLOGY
+            # AXIOMS ANALYSIS
             #################################
 
-            ontologyIRI = str(self.project.ontologyIRI)
-            versionIRI = self.project.version
-            if versionIRI:
-                ontologyID = self.OWLOntologyID(self.IRI.create(ontologyIRI),
-                                                self.IRI.create(versionIRI))
-            else:
-                ontologyID = self.OWLOntologyID(self.IRI.create(ontologyIRI))
-            self.man = self.OWLManager.createOWLOntologyManager()
-            self.df = self.OWLManager.getOWLDataFactory()
-            self.ontology = self.man.createOntology(ontologyID)
-            self.pm = self.DefaultPrefixManager()
+            # The analysis of which nodes and edges produce which axioms works on immutable
+            # snapshots of the diagrams, and is distributed over multiple processes for large
+            # projects: it runs before attaching the thread to the JVM, since only the
+            # materialization of the axioms below needs to access it.
+            plans = analyseAll(map(snapshot, self.selected_diagrams))
+
+            LOGGER.debug('Analysed %s diagrams for OWL 2 axioms generation', len(plans))
 
-            for prefix, ns in self.project.prefixDictItems():
-                self.pm.setPrefix(prefix, ns)
+            self.vm.attachThreadToJVM()
 
             #############################################
-            # ONTOLOGY ANNOTATIONS
+            # INITIALIZE ONTOLOGY
             #################################
 
-            if OWLAxiom.Annotation in self.axiomsList:
-                for annotation in self.project.ontologyIRI.annotationAssertions:
-                    value = self.getOWLApiAnnotation(annotation)
-                    self.ontology.applyChange(self.AddOntologyAnnotation(self.ontology, value))
-
+            self.initOntology()
+            self.addOntologyAnnotations()
             self.createNDCNamedIndividuals()
-            LOGGER.debug('Initialized OWL 2 Ontology: %s', ontologyIRI)
+            LOGGER.debug('Initialized OWL 2 Ontology: %s', self.project.ontologyIRI)
 
             #############################################
             # NODES PRE-PROCESSING
             #################################
 
-            # for node in self.project.nodes():
             for diagram in self.selected_diagrams:
                 for node in diagram.nodes():
                     self.convert(node)
@@ -1981,142 +2083,24 @@ class OWLOntologyExporterWorker(AbstractWorker):
             LOGGER.debug('Pre-processed %s nodes into OWL 2 expressions', len(self.converted()))
 
             #############################################
-            # AXIOMS FROM NODES
+            # AXIOMS FROM NODES AND EDGES
             #################################
 
-            # for node in self.project.nodes():
-            for diagram in self.selected_diagrams:
-                for node in diagram.nodes():
-                    if node.type() is Item.DisjointUnionNode:
-                        self.createDisjointClassesAxiom(node)
-                    elif node.type() is Item.ComplementNode:
-                        if node.identity() is Identity.Concept:
-                            self.createDisjointClassesAxiom(node)
-                    elif node.type() is Item.DomainRestrictionNode:
-                        self.createPropertyDomainAxiom(node)
-                    elif node.type() is Item.RangeRestrictionNode:
-                        self.createPropertyRangeAxiom(node)
-                    elif node.type() is Item.HasKeyNode:
-                        self.createHasKeyAxiom(node)
-
-                    if node.isPredicate():
-                        self.createAnnotationAssertionAxioms(node)
-
+            for diagram, plan in zip(self.selected_diagrams, plans):
+                nodes = {node.id: node for node in diagram.nodes()}
+                for nid, methods in plan.nodes:
+                    for method in methods:
+                        getattr(self, method)(nodes[nid])
                     self.step(+1)
-
-            LOGGER.debug('Generated OWL 2 axioms from nodes (axioms = %s)', len(self.axioms()))
-
-            #############################################
-            # AXIOMS FROM EDGES
-            #################################
-
-            # for edge in self.project.edges():
-            for diagram in self.selected_diagrams:
-                for edge in diagram.edges():
-
-                    #############################################
-                    # INCLUSION
-                    #################################
-
-                    if edge.type() is Item.InclusionEdge:
-                        # CONCEPTS
-                        if edge.source.identity() is Identity.Concept and edge.target.identity() is Identity.Concept:
-                            self.createSubclassOfAxiom(edge)
-                        # ROLES
-                        elif edge.source.identity() is Identity.Role and edge.target.identity() is Identity.Role:
-                            if edge.source.type() is Item.RoleChainNode:
-                                self.createSubPropertyChainOfAxiom(edge)
-                            elif edge.source.type() in {Item.RoleNode, Item.RoleInverseNode}:
-                                if edge.target.type() is Item.ComplementNode:
-                                    self.createDisjointObjectPropertiesAxiom(edge)
-                                elif edge.target.type() in {Item.RoleNode, Item.RoleInverseNode}:
-                                    self.createSubObjectPropertyOfAxiom(edge)
-                        # ATTRIBUTES
-                        elif edge.source.identity() is Identity.Attribute and edge.target.identity() is Identity.Attribute:
-                            if edge.source.type() is Item.AttributeNode:
-                                if edge.target.type() is Item.ComplementNode:
-                                    self.createDisjointDataPropertiesAxiom(edge)
-                                elif edge.target.type() is Item.AttributeNode:
-                                    self.createSubDataPropertyOfAxiom(edge)
-                        # VALUE DOMAIN (ONLY DATA PROPERTY RANGE)
-                        elif edge.source.type() is Item.RangeRestrictionNode and edge.target.identity() is Identity.ValueDomain:
-                            # This is being handled already in createPropertyRangeAxiom.
-                            pass
-                        else:
-                            raise DiagramMalformedError(edge, 'invalid inclusion assertion')
-
-                    #############################################
-                    # EQUIVALENCE
-                    #################################
-
-                    elif edge.type() is Item.EquivalenceEdge:
-
-                        # CONCEPTS
-                        if edge.source.identity() is Identity.Concept and edge.target.identity() is Identity.Concept:
-                            self.createEquivalentClassesAxiom(edge)
-                        # ROLES
-                        elif edge.source.identity() is Identity.Role and edge.target.identity() is Identity.Role:
-                            if Item.RoleInverseNode in {edge.source.type(), edge.target.type()}:
-                                self.createInverseObjectPropertiesAxiom(edge)
-                            else:
-                                self.createEquivalentObjectPropertiesAxiom(edge)
-                        # ATTRIBUTES
-                        elif edge.source.identity() is Identity.Attribute and edge.target.identity() is Identity.Attribute:
-                            self.createEquivalentDataPropertiesAxiom(edge)
-                        else:
-                            raise DiagramMalformedError(edge, 'invalid equivalence assertion')
-
-                    #############################################
-                    # MEMBERSHIP
-                    #################################
-
-                    elif edge.type() is Item.MembershipEdge:
-
-                        # CONCEPTS
-                        if Identity.Individual in edge.source.identities() and edge.target.identity() is Identity.Concept:
-                            self.createClassAssertionAxiom(edge)
-                        # ROLES
-                        elif edge.source.identity() is Identity.RoleInstance:
-                            if edge.target.type() is Item.ComplementNode:
-                                self.createNegativeObjectPropertyAssertionAxiom(edge)
-                            else:
-                                self.createObjectPropertyAssertionAxiom(edge)
-                        # ATTRIBUTES
-                        elif edge.source.identity() is Identity.AttributeInstance:
-                            if edge.target.type() is Item.ComplementNode:
-                                self.createNegativeDataPropertyAssertionAxiom(edge)
-                            else:
-                                self.createDataPropertyAssertionAxiom(edge)
-                        else:
-                            raise DiagramMalformedError(edge, 'invalid membership assertion')
-
-                    #############################################
-                    # SAME
-                    #################################
-
-                    elif edge.type() is Item.SameEdge:
-                        if edge.source.identity() in {Identity.Individual, Identity.Concept, Identity.Role, Identity.Attribute} and \
-                           edge.target.identity() in {Identity.Individual, Identity.Concept, Identity.Role, Identity.Attribute} and \
-                           edge.source.identities().intersection(edge.target.identities()):
-                            self.createSameIndividualAxiom(edge)
-                        else:
-                            raise DiagramMalformedError(edge, 'invalid sameIndividual assertion')
-
-                    #############################################
-                    # DIFFERENT
-                    #################################
-
-                    elif edge.type() is Item.DifferentEdge:
-                        if edge.source.identity() in {Identity.Individual, Identity.Concept, Identity.Role, Identity.Attribute} and \
-                           edge.target.identity() in {Identity.Individual, Identity.Concept, Identity.Role, Identity.Attribute} and \
-                           edge.source.identities().intersection(edge.target.identities()):
-                            self.createDifferentIndividualsAxiom(edge)
-                        else:
-                            raise DiagramMalformedError(edge, 'invalid differentIndividuals assertion')
-
+                edges = {edge.id: edge for edge in diagram.edges()}
+                for eid, method, error in plan.edges:
+                    if error:
+                        raise DiagramMalformedError(edges[eid], error)
+                    if method:
+                        getattr(self, method)(edges[eid])
                     self.step(+1)
 
-            LOGGER.debug('Generated OWL 2 axioms from edges (axioms = %s)', len(self.axioms()))
+            LOGGER.debug('Generated OWL 2 axioms from nodes and edges (axioms = %s)', len(self.axioms()))
 
             #############################################
             # APPLY GENERATED AXIOMS
@@ -2131,71 +2115,24 @@ class OWLOntologyExporterWorker(AbstractWorker):
             # IMPORT DECLARATIONS
             #################################
 
-            LOGGER.debug('Adding import declarations to the OWL 2 Ontology')
-
-            for impOnt in self.project.importedOntologies:
-                try:
-                    docObj = None
-                    if impOnt.isLocalDocument:
-                        docObj = self.JavaFileClass(impOnt.docLocation)
-                    else:
-                        docObj = self.URIClass(impOnt.docLocation)
-                    docLocationIRI = self.IRI.create(docObj)
-                    impOntIRI = self.IRI.create(impOnt.ontologyIRI)
-                    # iriMapper = self.IRIMapperClass(impOntIRI, docLocationIRI)
-                    # self.man.getIRIMappers().add(iriMapper)
-                    impDecl = self.df.getOWLImportsDeclaration(impOntIRI)
-                    addImp = self.AddImportClass(self.ontology, impDecl)
-                    self.man.applyChange(addImp)
-                except Exception as e:
-                    LOGGER.exception('The import declaration <{}> cannot be added.\nError:{}'.format(impOnt, str(e)))
-                else:
-                    LOGGER.debug('Ontology declaration ({}) correctly added.'.format(impOnt))
+            self.addImportDeclarations()
 
             #############################################
             # SERIALIZE THE ONTOLOGY
             #################################
 
             if self.path:
-                if self.syntax is OWLSyntax.Functional:
-                    DocumentFormat = self.FunctionalSyntaxDocumentFormat
-                    DocumentFilter = OWLFunctionalSyntaxDocumentFilter
-                elif self.syntax is OWLSyntax.Manchester:
-                    DocumentFormat = self.ManchesterSyntaxDocumentFormat
-                    DocumentFilter = OWLManchesterSyntaxDocumentFilter
-                elif self.syntax is OWLSyntax.RDF:
-                    DocumentFormat = self.RDFXMLDocumentFormat
-                    DocumentFilter = RDFXMLDocumentFilter
-                elif self.syntax is OWLSyntax.Turtle:
-                    DocumentFormat = self.TurtleDocumentFormat
-                    DocumentFilter = TurtleDocumentFilter
-                else:
-                    raise TypeError('unsupported syntax (%s)' % self.syntax)
-
-                LOGGER.debug('Serializing the OWL 2 Ontology in %s', self.syntax.value)
-
-                # COPY PREFIXES
-                ontoFormat = DocumentFormat()
-                ontoFormat.copyPrefixesFrom(self.pm)
-
-                # CREARE TARGET STREAM
-                stream = self.StringDocumentTarget()
-                stream = self.vm.cast(self.OWLOntologyDocumentTarget, stream)
-                # SAVE THE ONTOLOGY TO DISK
-                self.man.setOntologyFormat(self.ontology, ontoFormat)
-                self.man.saveOntology(self.ontology, stream)
-                stream = self.vm.cast(self.StringDocumentTarget, stream)
-                string = DocumentFilter(stream.toString())
-                fwrite(string, self.path)
-                # REMOVE RANDOM FILES GENERATED BY OWL API
-                fremove(os.path.join(os.path.dirname(self.path), 'catalog-v001.xml'))
+                self.serialize(self.path)
+
         except DiagramMalformedError as e:
             LOGGER.warning('Malformed expression detected on {0}: {1} ... aborting!'.format(e.item, e))
+            self.error = e
             self.sgnErrored.emit(e)
             if not self.path:
                 raise e
         except Exception as e:
             LOGGER.exception('OWL 2 export could not be completed')
+            self.error = e
             self.sgnErrored.emit(e)
             if not self.path:
                 raise e
@@ -2204,3 +2141,395 @@ class OWLOntologyExporterWorker(AbstractWorker):
         finally:
             self.vm.detachThreadFromJVM()
             self.finished.emit()
+
+
+class OWLOntologyExportState(object):
+    """
+    Keeps track of the OWL 2 axioms contributed by each project item during the last export,
+    so that subsequent exports only need to translate the items which changed in the meantime.
+    """
+    def __init__(self):
+        """
+        Initialize the export state.
+        """
+        self.contributions = dict()
+        self.ontologyContribution = dict()
+        self.ontologySignature = None
+        self.written = None
+
+
+class OWLOntologyIncrementalExporterWorker(OWLOntologyExporterWorker):
+    """
+    Extends OWLOntologyExporterWorker to perform an incremental OWL 2 ontology generation.
+    The axioms contributed by each item are stored in the given OWLOntologyExportState, and only
+    items whose signature (see owl2_analysis.itemSignature) changed since the previous export are
+    translated again. The output file is rewritten only if the resulting axiom set differs.
+    If a collection of (diagram, item) pairs is supplied, only the signature of those items is
+    recomputed and the contributions of the removed (diagram, id) keys are discarded: the
+    contributions of all the other items are retained from the previous export.
+    """
+    def __init__(self, project, path, state, items=None, removed=(), **kwargs):
+        """
+        Initialize the incremental OWL 2 Exporter worker.
+        :type project: Project
+        :type path: str
+        :type state: OWLOntologyExportState
+        :type items: T <= list|set
+        :type removed: T <= list|set
+        """
+        super().__init__(project, path, **kwargs)
+        self.changed = False
+        self.items = items
+        self.removed = removed
+        self.state = state
+        self.translated = 0
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def collect(self, func, *args):
+        """
+        Run the given function, returning the axioms it generated indexed by their string representation.
+        :type func: callable
+        :rtype: dict
+        """
+        self._axioms = set()
+        func(*args)
+        return {axiom.toString(): axiom for axiom in self._axioms}
+
+    def ontologySignature(self):
+        """
+        Returns the signature of the project level settings affecting the generated ontology.
+        :rtype: tuple
+        """
+        return (
+            str(self.project.ontologyIRI),
+            self.project.version,
+            tuple(sorted(self.project.prefixDictItems())),
+            tuple(annotationSignature(a) for a in self.project.ontologyIRI.annotationAssertions),
+            tuple((str(o.ontologyIRI), str(o.docLocation)) for o in self.project.importedOntologies),
+            tuple(sorted(axiom.value for axiom in self.axiomsList)),
+            self.normalize,
+            self.syntax,
+        )
+
+    def translateEdge(self, edge):
+        """
+        Generate the OWL 2 axioms for the given edge.
+        :type edge: AbstractEdge
+        """
+        method, error = analyseEdge(EdgeSnapshot(
+            edge.id, edge.type(), snapshotNode(edge.source), snapshotNode(edge.target)))
+        if error:
+            raise DiagramMalformedError(edge, error)
+        if method:
+            getattr(self, method)(edge)
+
+    def translateNode(self, node):
+        """
+        Generate the OWL 2 declarations and axioms for the given node.
+        :type node: AbstractNode
+        """
+        self.convert(node)
+        for method in analyseNode(snapshotNode(node)):
+            getattr(self, method)(node)
+
+    #############################################
+    #   MAIN WORKER
+    #################################
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        """
+        Main worker.
+        """
+        try:
+            self.sgnStarted.emit()
+            self.vm.attachThreadToJVM()
+            self.initOntology()
+
+            state = self.state
+            ontologySignature = self.ontologySignature()
+            if ontologySignature != state.ontologySignature:
+                state.ontologyContribution = self.collect(self.createNDCNamedIndividuals)
+
+            #############################################
+            # AXIOMS FROM CHANGED ITEMS
+            #################################
+
+            cache = dict()
+            if self.items is None:
+                contributions = dict()
+                items = [(diagram, item) for diagram in self.selected_diagrams
+                         for item in itertools.chain(diagram.nodes(), diagram.edges())]
+            else:
+                contributions = dict(state.contributions)
+                for key in self.removed:
+                    contributions.pop(key, None)
+                items = self.items
+            self._converted.clear()
+            self._converted_meta_individuals.clear()
+            self.num, self.max = 0, len(items)
+            for diagram, item in items:
+                key = (diagram, item.id)
+                signature = itemSignature(item, cache)
+                previous = state.contributions.get(key)
+                if previous and previous[0] == signature:
+                    contributions[key] = previous
+                else:
+                    translate = self.translateNode if item.isNode() else self.translateEdge
+                    contributions[key] = (signature, self.collect(translate, item))
+                    self.translated += 1
+                self.step(+1)
+            state.contributions = contributions
+
+            LOGGER.debug('Translated %s changed items into OWL 2 axioms', self.translated)
+
+            #############################################
+            # WRITE THE ONTOLOGY IF CHANGED
+            #################################
+
+            axioms = dict(state.ontologyContribution)
+            for _, contribution in contributions.values():
+                axioms.update(contribution)
+            written = frozenset(axioms)
+            self.changed = written != state.written or \
+                ontologySignature != state.ontologySignature or \
+                not fexists(self.path)
+            if self.changed:
+                self.addOntologyAnnotations()
+                for axiom in axioms.values():
+                    self.man.addAxiom(self.ontology, axiom)
+                self.addImportDeclarations()
+                self.serialize(self.path)
+                state.written = written
+            state.ontologySignature = ontologySignature
+        except DiagramMalformedError as e:
+            LOGGER.warning('Malformed expression detected on {0}: {1} ... aborting!'.format(e.item, e))
+            self.error = e
+            self.sgnErrored.emit(e)
+        except Exception as e:
+            LOGGER.exception('Incremental OWL 2 export could not be completed')
+            self.error = e
+            self.sgnErrored.emit(e)
+        else:
+            self.sgnCompleted.emit()
+        finally:
+            if QtCore.QThread.currentThread() is not QtCore.QCoreApplication.instance().thread():
+                self.vm.detachThreadFromJVM()
+            self.finished.emit()
+
+
+class OWLOntologyWatcher(QtCore.QObject):
+    """
+    Keeps an OWL 2 ontology file in sync with the project, exporting it incrementally
+    whenever the project is saved. The items changed in the meantime are collected from
+    the project change sets, so that only their axioms need to be translated again.
+    """
+    sgnExported = QtCore.pyqtSignal(str, bool)
+
+    def __init__(self, session, path, syntax=None, axioms=None):
+        """
+        Initialize the watcher.
+        :type session: Session
+        :type path: str
+        :type syntax: OWLSyntax
+        :type axioms: set
+        """
+        super().__init__(session)
+        settings = QtCore.QSettings()
+        self.path = expandPath(path)
+        self.syntax = syntax or self.syntaxForPath(self.path)
+        self.axioms = axioms or {
+            axiom for axiom in OWLAxiom
+            if settings.value('export/axiom/{0}'.format(axiom.value), True, bool)
+        }
+        self.state = OWLOntologyExportState()
+        self.dirty = set()
+        self.full = True
+        self.removed = set()
+        self.project = session.project
+        connect(self.session.sgnProjectSaved, self.doExport)
+        connect(self.project.sgnDiagramAdded, self.onDiagramsChanged)
+        connect(self.project.sgnDiagramRemoved, self.onDiagramsChanged)
+        connect(self.project.sgnItemsChanged, self.onItemsChanged)
+        connect(self.project.sgnIRIAdded, self.onIRIAdded)
+        connect(self.project.sgnIRIRemoved, self.onIRIRemoved)
+        for iri in list(self.project.stringToIRI.values()):
+            self.connectIRISignals(iri)
+
+    #############################################
+    #   PROPERTIES
+    #################################
+
+    @property
+    def session(self):
+        """
+        Returns the reference to the active session.
+        :rtype: Session
+        """
+        return self.parent()
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def changedItems(self):
+        """
+        Returns the (diagram, item) pairs whose axioms may have changed since the last export,
+        i.e. the items connected to an item recorded as dirty (the signature of an item depends
+        on the expressions of its neighbours, see owl2_analysis.itemSignature).
+        :rtype: set
+        """
+        changed = set()
+        stack = [(d, x) for d, x in self.dirty if self.project.item(d, x.id) is x]
+        while stack:
+            diagram, item = stack.pop()
+            if (diagram, item) not in changed:
+                changed.add((diagram, item))
+                if item.isNode():
+                    stack.extend((diagram, edge) for edge in item.edges)
+                else:
+                    stack.extend(((diagram, item.source), (diagram, item.target)))
+        return changed
+
+    def connectIRISignals(self, iri):
+        """
+        Connect the signals of the given IRI affecting the axioms of its occurrences.
+        :type iri: IRI
+        """
+        connect(iri.sgnAnnotationAdded, self.onIRIChanged)
+        connect(iri.sgnAnnotationRemoved, self.onIRIChanged)
+        connect(iri.sgnAnnotationModified, self.onIRIChanged)
+        connect(iri.sgnIRIModified, self.onIRIChanged)
+        connect(iri.sgnIRIPropModified, self.onIRIChanged)
+
+    def disconnectIRISignals(self, iri):
+        """
+        Disconnect the signals of the given IRI affecting the axioms of its occurrences.
+        :type iri: IRI
+        """
+        disconnect(iri.sgnAnnotationAdded, self.onIRIChanged)
+        disconnect(iri.sgnAnnotationRemoved, self.onIRIChanged)
+        disconnect(iri.sgnAnnotationModified, self.onIRIChanged)
+        disconnect(iri.sgnIRIModified, self.onIRIChanged)
+        disconnect(iri.sgnIRIPropModified, self.onIRIChanged)
+
+    def stop(self):
+        """
+        Stop watching the project.
+        """
+        disconnect(self.session.sgnProjectSaved, self.doExport)
+        disconnect(self.project.sgnDiagramAdded, self.onDiagramsChanged)
+        disconnect(self.project.sgnDiagramRemoved, self.onDiagramsChanged)
+        disconnect(self.project.sgnItemsChanged, self.onItemsChanged)
+        disconnect(self.project.sgnIRIAdded, self.onIRIAdded)
+        disconnect(self.project.sgnIRIRemoved, self.onIRIRemoved)
+        for iri in list(self.project.stringToIRI.values()):
+            self.disconnectIRISignals(iri)
+
+    @staticmethod
+    def syntaxForPath(path):
+        """
+        Returns the OWL 2 syntax matching the extension of the given path.
+        :type path: str
+        :rtype: OWLSyntax
+        """
+        if path.endswith('.ttl'):
+            return OWLSyntax.Turtle
+        elif path.endswith('.omn'):
+            return OWLSyntax.Manchester
+        elif path.endswith('.owx'):
+            return OWLSyntax.RDF
+        return OWLSyntax.Functional
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot()
+    def doExport(self):
+        """
+        Export the ontology, translating only the items changed since the last export.
+        """
+        if self.full:
+            # PENDING DIAGRAMS MUST BE BUILT ON THE MAIN THREAD
+            self.project.materialize()
+            items = None
+        else:
+            items = self.changedItems()
+        worker = OWLOntologyIncrementalExporterWorker(
+            self.project, self.path, self.state, items=items, removed=self.removed,
+            axioms=self.axioms, syntax=self.syntax)
+        connect(worker.sgnErrored, self.onErrored)
+        # TRANSLATE THE ITEMS IN A WORKER THREAD, KEEPING THE EVENT LOOP RUNNING: A MODAL
+        # PROGRESS DIALOG PREVENTS THE PROJECT FROM BEING EDITED WHILE IT IS TRANSLATED
+        title = 'Updating {0}...'.format(os.path.basename(self.path))
+        with BusyProgressDialog(title, mtime=0, parent=self.session, modal=True) as progress:
+            connect(worker.sgnProgress, progress.setProgress)
+            runInThread(worker)
+        if worker.error:
+            return
+        self.dirty.clear()
+        self.full = False
+        self.removed.clear()
+        if not worker.changed:
+            LOGGER.debug('Ontology %s is up to date', self.path)
+        self.sgnExported.emit(self.path, worker.changed)
+
+    @QtCore.pyqtSlot(QtWidgets.QGraphicsScene)
+    def onDiagramsChanged(self, _):
+        """
+        Executed whenever a diagram is added to or removed from the project.
+        """
+        self.full = True
+
+    @QtCore.pyqtSlot(Exception)
+    def onErrored(self, exception):
+        """
+        Executed when the incremental export fails.
+        :type exception: Exception
+        """
+        self.session.addNotification(textwrap.dedent("""
+        <b><font color="#7E0B17">ERROR</font></b>:
+        Could not update {0}: {1}
+        """.format(self.path, exception)))
+
+    @QtCore.pyqtSlot(IRI)
+    def onIRIAdded(self, iri):
+        """
+        Executed whenever an IRI is added to the project.
+        :type iri: IRI
+        """
+        self.connectIRISignals(iri)
+
+    @QtCore.pyqtSlot()
+    def onIRIChanged(self):
+        """
+        Executed whenever an IRI changes, marking its occurrences as dirty.
+        """
+        iri = self.sender()
+        for node in self.project.iriOccurrences(iri=iri):
+            self.dirty.add((node.diagram, node))
+
+    @QtCore.pyqtSlot(IRI)
+    def onIRIRemoved(self, iri):
+        """
+        Executed whenever an IRI is removed from the project.
+        :type iri: IRI
+        """
+        self.disconnectIRISignals(iri)
+
+    @QtCore.pyqtSlot(ProjectChangeSet)
+    def onItemsChanged(self, changes):
+        """
+        Executed whenever a set of changes is committed to the project, marking the changed items as dirty.
+        :type changes: ProjectChangeSet
+        """
+        for diagram, item in changes.items(changes.added) + changes.items(changes.modified):
+            self.dirty.add((diagram, item))
+        for diagram, item in changes.items(changes.removed):
+            self.removed.add((diagram, item.id))
+            if item.isEdge():
+                self.dirty.update(((diagram, item.source), (diagram, item.target)))
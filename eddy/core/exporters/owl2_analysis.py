@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+"""
+Pure-Python analysis of Graphol diagrams for the OWL 2 exporter.
+
+Diagrams are first reduced to immutable snapshots (see `snapshot`), which are then analysed
+independently (see `analyse`) to find out which OWL 2 axioms each node and edge produces.
+Since the analysis does not touch any Qt or Java object, large sets of diagrams are analysed in
+parallel by a pool of processes (see `analyseAll`), leaving to the JVM-attached exporter only the
+materialization of the resulting axioms. Worker processes are spawned rather than forked, since
+forking the multithreaded application process (Qt and JVM threads) may deadlock them.
+
+Item signatures (see `itemSignature`) summarize everything the axioms of an item depend on,
+and are used by the incremental exporter to find out which items need to be translated again.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from eddy.core.datatypes.graphol import (
+    Identity,
+    Item,
+)
+from eddy.core.output import getLogger
+
+LOGGER = getLogger()
+
+# Minimum number of items in the analysed diagrams before the analysis is distributed
+# over multiple processes: below this size the process startup costs more than the analysis.
+ParallelThreshold = 4000
+
+InstanceIdentities = {Identity.Individual, Identity.Concept, Identity.Role, Identity.Attribute}
+
+
+class NodeSnapshot(NamedTuple):
+    """
+    Immutable description of a node, as needed by the axiom analysis.
+    """
+    id: str
+    type: Item
+    identity: Identity
+    identities: FrozenSet[Identity]
+    isPredicate: bool
+
+
+class EdgeSnapshot(NamedTuple):
+    """
+    Immutable description of an edge, as needed by the axiom analysis.
+    """
+    id: str
+    type: Item
+    source: NodeSnapshot
+    target: NodeSnapshot
+
+
+class DiagramSnapshot(NamedTuple):
+    """
+    Immutable description of a diagram, as needed by the axiom analysis.
+    """
+    name: str
+    nodes: Tuple[NodeSnapshot, ...]
+    edges: Tuple[EdgeSnapshot, ...]
+
+
+class AxiomPlan(NamedTuple):
+    """
+    The result of the analysis of a diagram. For each node, in diagram order, it holds the node id along
+    with the names of the exporter worker methods generating its axioms; for each edge it holds the edge id,
+    the name of the method generating its axiom (or None) and an error message if the edge is malformed.
+    """
+    diagram: str
+    nodes: List[Tuple[str, Tuple[str, ...]]]
+    edges: List[Tuple[str, Optional[str], Optional[str]]]
+
+
+#############################################
+#   SNAPSHOT
+#################################
+
+def snapshotNode(node: Any) -> NodeSnapshot:
+    """
+    Returns the snapshot of the given node.
+    """
+    return NodeSnapshot(node.id, node.type(), node.identity(), frozenset(node.identities()), node.isPredicate())
+
+
+def snapshot(diagram: Any) -> DiagramSnapshot:
+    """
+    Returns the snapshot of the given diagram.
+    """
+    nodes = {node: snapshotNode(node) for node in diagram.nodes()}
+    edges = []
+    for edge in diagram.edges():
+        source = nodes.get(edge.source) or snapshotNode(edge.source)
+        target = nodes.get(edge.target) or snapshotNode(edge.target)
+        edges.append(EdgeSnapshot(edge.id, edge.type(), source, target))
+    return DiagramSnapshot(diagram.name, tuple(nodes.values()), tuple(edges))
+
+
+#############################################
+#   ANALYSIS
+#################################
+
+def analyseNode(node: NodeSnapshot) -> Tuple[str, ...]:
+    """
+    Returns the names of the worker methods generating the axioms for the given node.
+    """
+    methods = []
+    if node.type is Item.DisjointUnionNode:
+        methods.append('createDisjointClassesAxiom')
+    elif node.type is Item.ComplementNode:
+        if node.identity is Identity.Concept:
+            methods.append('createDisjointClassesAxiom')
+    elif node.type is Item.DomainRestrictionNode:
+        methods.append('createPropertyDomainAxiom')
+    elif node.type is Item.RangeRestrictionNode:
+        methods.append('createPropertyRangeAxiom')
+    elif node.type is Item.HasKeyNode:
+        methods.append('createHasKeyAxiom')
+    if node.isPredicate:
+        methods.append('createAnnotationAssertionAxioms')
+    return tuple(methods)
+
+
+def analyseEdge(edge: EdgeSnapshot) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Returns the name of the worker method generating the axiom for the given edge (None if the edge
+    does not generate any axiom), along with an error message if the edge is malformed.
+    """
+    source, target = edge.source, edge.target
+
+    #############################################
+    # INCLUSION
+    #################################
+
+    if edge.type is Item.InclusionEdge:
+        # CONCEPTS
+        if source.identity is Identity.Concept and target.identity is Identity.Concept:
+            return 'createSubclassOfAxiom', None
+        # ROLES
+        elif source.identity is Identity.Role and target.identity is Identity.Role:
+            if source.type is Item.RoleChainNode:
+                return 'createSubPropertyChainOfAxiom', None
+            elif source.type in {Item.RoleNode, Item.RoleInverseNode}:
+                if target.type is Item.ComplementNode:
+                    return 'createDisjointObjectPropertiesAxiom', None
+                elif target.type in {Item.RoleNode, Item.RoleInverseNode}:
+                    return 'createSubObjectPropertyOfAxiom', None
+            return None, None
+        # ATTRIBUTES
+        elif source.identity is Identity.Attribute and target.identity is Identity.Attribute:
+            if source.type is Item.AttributeNode:
+                if target.type is Item.ComplementNode:
+                    return 'createDisjointDataPropertiesAxiom', None
+                elif target.type is Item.AttributeNode:
+                    return 'createSubDataPropertyOfAxiom', None
+            return None, None
+        # VALUE DOMAIN (ONLY DATA PROPERTY RANGE, HANDLED IN createPropertyRangeAxiom)
+        elif source.type is Item.RangeRestrictionNode and target.identity is Identity.ValueDomain:
+            return None, None
+        return None, 'invalid inclusion assertion'
+
+    #############################################
+    # EQUIVALENCE
+    #################################
+
+    elif edge.type is Item.EquivalenceEdge:
+        # CONCEPTS
+        if source.identity is Identity.Concept and target.identity is Identity.Concept:
+            return 'createEquivalentClassesAxiom', None
+        # ROLES
+        elif source.identity is Identity.Role and target.identity is Identity.Role:
+            if Item.RoleInverseNode in {source.type, target.type}:
+                return 'createInverseObjectPropertiesAxiom', None
+            return 'createEquivalentObjectPropertiesAxiom', None
+        # ATTRIBUTES
+        elif source.identity is Identity.Attribute and target.identity is Identity.Attribute:
+            return 'createEquivalentDataPropertiesAxiom', None
+        return None, 'invalid equivalence assertion'
+
+    #############################################
+    # MEMBERSHIP
+    #################################
+
+    elif edge.type is Item.MembershipEdge:
+        # CONCEPTS
+        if Identity.Individual in source.identities and target.identity is Identity.Concept:
+            return 'createClassAssertionAxiom', None
+        # ROLES
+        elif source.identity is Identity.RoleInstance:
+            if target.type is Item.ComplementNode:
+                return 'createNegativeObjectPropertyAssertionAxiom', None
+            return 'createObjectPropertyAssertionAxiom', None
+        # ATTRIBUTES
+        elif source.identity is Identity.AttributeInstance:
+            if target.type is Item.ComplementNode:
+                return 'createNegativeDataPropertyAssertionAxiom', None
+            return 'createDataPropertyAssertionAxiom', None
+        return None, 'invalid membership assertion'
+
+    #############################################
+    # SAME
+    #################################
+
+    elif edge.type is Item.SameEdge:
+        if source.identity in InstanceIdentities and target.identity in InstanceIdentities and \
+           source.identities.intersection(target.identities):
+            return 'createSameIndividualAxiom', None
+        return None, 'invalid sameIndividual assertion'
+
+    #############################################
+    # DIFFERENT
+    #################################
+
+    elif edge.type is Item.DifferentEdge:
+        if source.identity in InstanceIdentities and target.identity in InstanceIdentities and \
+           source.identities.intersection(target.identities):
+            return 'createDifferentIndividualsAxiom', None
+        return None, 'invalid differentIndividuals assertion'
+
+    return None, None
+
+
+def analyse(diagram: DiagramSnapshot) -> AxiomPlan:
+    """
+    Analyse the given diagram snapshot, returning its axiom plan.
+    """
+    nodes = [(node.id, analyseNode(node)) for node in diagram.nodes]
+    edges = [(edge.id,) + analyseEdge(edge) for edge in diagram.edges]
+    return AxiomPlan(diagram.name, nodes, edges)
+
+
+def analyseAll(snapshots: Iterable[DiagramSnapshot], workers: Optional[int] = None) -> List[AxiomPlan]:
+    """
+    Analyse the given diagram snapshots, returning their axiom plans in the same order.
+    Large sets of diagrams are analysed in parallel, using a pool of spawned processes
+    (by default as many as the available cores).
+    """
+    snapshots = list(snapshots)
+    workers = min(workers or os.cpu_count() or 1, len(snapshots))
+    size = sum(len(s.nodes) + len(s.edges) for s in snapshots)
+    if workers > 1 and size >= ParallelThreshold:
+        try:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                return list(executor.map(analyse, snapshots))
+        except (BrokenProcessPool, OSError) as e:
+            LOGGER.warning('Parallel OWL 2 axiom analysis unavailable (%s), falling back to sequential', e)
+    return [analyse(s) for s in snapshots]
+
+
+#############################################
+#   SIGNATURES
+#################################
+
+def annotationSignature(annotation: Any) -> Tuple:
+    """
+    Returns the signature of the given annotation.
+    """
+    return (
+        str(annotation.assertionProperty),
+        str(annotation.value),
+        annotation.language,
+        str(annotation.datatype),
+    )
+
+
+def expressionSignature(node: Any, cache: Dict[Any, Tuple]) -> Tuple:
+    """
+    Returns a signature of the OWL 2 expression denoted by the given node: two nodes with the
+    same signature translate to the same OWL 2 expression (and declaration axioms).
+    Signatures are memoized in the given cache, which should be reused across all the items
+    of a project (a cache is only valid as long as the project does not change).
+    """
+    signature = cache.get(node)
+    if signature is None:
+        # GUARD AGAINST (MALFORMED) CYCLIC EXPRESSIONS
+        cache[node] = ('cycle', node.id)
+        parts = [node.type(), node.identity(), node.text()]
+        iri = getattr(node, 'iri', None)
+        if iri is not None and hasattr(iri, 'annotationAssertions'):
+            parts.append(str(iri))
+            parts.append(tuple(annotationSignature(a) for a in iri.annotationAssertions))
+            parts.append(tuple(sorted(iri.getMetaProperties().items(), key=lambda x: str(x[0]))))
+        if getattr(node, 'inputs', None) is not None:
+            # OPERANDS ORDER MATTERS (E.G. ROLE CHAINS, PROPERTY ASSERTIONS)
+            operands = [node.diagram.edge(eid).other(node) for eid in node.inputs]
+            parts.append(tuple(expressionSignature(operand, cache) for operand in operands))
+        else:
+            operands = node.incomingNodes(lambda x: x.type() is Item.InputEdge)
+            parts.append(tuple(sorted((expressionSignature(o, cache) for o in operands), key=repr)))
+        signature = cache[node] = tuple(parts)
+    return signature
+
+
+def itemSignature(item: Any, cache: Dict[Any, Tuple]) -> Tuple:
+    """
+    Returns a signature of everything the OWL 2 axioms generated by the given item depend on:
+    if the signature of an item did not change, its axioms did not change either.
+    """
+    if item.isEdge():
+        return (
+            item.type(),
+            expressionSignature(item.source, cache),
+            expressionSignature(item.target, cache),
+            tuple(annotationSignature(a) for a in getattr(item, 'annotations', ())),
+        )
+    adjacency = []
+    for edge in item.edges:
+        other = edge.other(item)
+        adjacency.append((edge.type(), edge.source is item, expressionSignature(other, cache)))
+    return expressionSignature(item, cache), tuple(sorted(adjacency, key=repr))
@@ -49,11 +49,11 @@ from eddy.core.datatypes.system import File
 from eddy.core.exporters.common import (
     AbstractDiagramExporter,
     AbstractProjectExporter,
+    DiagramRenderCache,
 )
 from eddy.core.functions.misc import natsorted
 from eddy.core.functions.path import openPath
 from eddy.core.functions.signals import connect
-from eddy.core.items.common import AbstractItem
 from eddy.core.output import getLogger
 from eddy.core.project import (
     K_ASYMMETRIC,
@@ -64,6 +64,10 @@ from eddy.core.project import (
     K_SYMMETRIC,
     K_TRANSITIVE,
 )
+from eddy.core.worker import (
+    AbstractWorker,
+    runInThread,
+)
 from eddy.ui.dialogs import DiagramSelectionDialog
 
 LOGGER = getLogger()
@@ -106,18 +110,11 @@ class PdfDiagramExporter(AbstractDiagramExporter):
             printer.setOutputFileName(path)
             printer.setPaperSize(QtPrintSupport.QPrinter.Custom)
             printer.setPageSize(QtGui.QPageSize(QtCore.QSizeF(shape.width(), shape.height()), QtGui.QPageSize.Point))
+            picture, _ = DiagramRenderCache.get(self.diagram, self.session)
             painter = QtGui.QPainter()
             if painter.begin(printer):
-                # TURN CACHING OFF
-                for item in self.diagram.items():
-                    if item.isNode() or item.isEdge():
-                        item.setCacheMode(AbstractItem.NoCache)
-                # RENDER THE DIAGRAM IN THE PAINTER
-                self.diagram.render(painter, source=shape)
-                # TURN CACHING ON
-                for item in self.diagram.items():
-                    if item.isNode() or item.isEdge():
-                        item.setCacheMode(AbstractItem.DeviceCoordinateCache)
+                # REPLAY THE DIAGRAM PICTURE IN THE PAINTER
+                DiagramRenderCache.render(painter, picture, shape, QtCore.QRectF(painter.viewport()))
                 # COMPLETE THE EXPORT
                 painter.end()
                 # OPEN THE DOCUMENT
@@ -128,6 +125,9 @@ class PdfDiagramExporter(AbstractDiagramExporter):
 class PdfProjectExporter(AbstractProjectExporter):
     """
     Extends AbstractProjectExporter with facilities to export the structure of Graphol diagrams in PDF format.
+    Diagrams are recorded into QPictures on the GUI thread (reusing the pictures held by the session
+    DiagramRenderCache for diagrams that did not change in the meantime), while the PDF document is
+    generated by a PdfProjectExporterWorker in a separate thread.
     """
 
     def __init__(self, project, session=None, **kwargs):
@@ -155,17 +155,158 @@ class PdfProjectExporter(AbstractProjectExporter):
         """
         return File.Pdf
 
-    def run(self, path):
+    def predicateRows(self):
+        """
+        Returns the rows of the roles and attributes table.
+        :rtype: list
+        """
+        predicateRows = []
+        predicates = set()
+        for item in (Item.RoleNode, Item.AttributeNode):
+            for iri in self.project.itemIRIs(item):
+                if not iri.isTopBottomEntity():
+                    predicates.add(iri)
+
+        for predicate in sorted(predicates, key=str):
+            meta = predicate.getMetaProperties()
+            attributes = [
+                meta.get(K_FUNCTIONAL, False),
+                meta.get(K_INVERSE_FUNCTIONAL, False),
+                meta.get(K_REFLEXIVE, False),
+                meta.get(K_IRREFLEXIVE, False),
+                meta.get(K_SYMMETRIC, False),
+                meta.get(K_ASYMMETRIC, False),
+                meta.get(K_TRANSITIVE, False),
+            ]
+            predicateRows.append('''
+                <tr>
+                    <td width=30%>{0}</td>
+                    <td width=10%><center>{1}</center></td>
+                    <td width=10%><center>{2}</center></td>
+                    <td width=10%><center>{3}</center></td>
+                    <td width=10%><center>{4}</center></td>
+                    <td width=10%><center>{5}</center></td>
+                    <td width=10%><center>{6}</center></td>
+                    <td width=10%><center>{7}</center></td>
+                </tr>
+            '''.format(str(predicate), *map(lambda x: u'\u2713' if x else '', attributes)))
+        return predicateRows
+
+    def prefixRows(self):
+        """
+        Returns the rows of the prefixes table.
+        :rtype: list
+        """
+        prefixRows = []
+        for prefix in sorted(self.project.getManagedPrefixes()):
+            ns = self.project.getPrefixResolution(prefix)
+            prefixRows.append(dedent('''
+                    <tr>
+                        <td width=25%>{0}</td>
+                        <td width=75%>{1}</td>
+                    </tr>
+                '''.format(prefix, ns)))
+        return prefixRows
+
+    def createPrinter(self, path):
         """
-        Perform PDF document generation.
+        Create the printer describing the pages of the document to generate in the given path.
         :type path: str
+        :rtype: QPrinter
         """
         printer = QtPrintSupport.QPrinter(QtPrintSupport.QPrinter.HighResolution)
         printer.setOutputFormat(QtPrintSupport.QPrinter.PdfFormat)
         printer.setOutputFileName(path)
         printer.setOrientation(QtPrintSupport.QPrinter.Landscape)
         printer.setPrinterName(self.project.name)
-        painter = QtGui.QPainter()
+        if self.pageSize is not None:
+            printer.setPageSize(self.pageSize)
+        return printer
+
+    def createWorker(self, path, printer):
+        """
+        Create the worker that generates the document in the given path, using the pages described by the given printer.
+        Diagrams are recorded on the calling thread, hence this method must be called from the GUI thread.
+        :type path: str
+        :type printer: QPrinter
+        :rtype: PdfProjectExporterWorker
+        """
+        worker = PdfProjectExporterWorker(path, self.project.name, printer.resolution())
+
+        ##############################################################
+        # DIAGRAMS
+        ##############################################################
+
+        pageLayout = printer.pageLayout()
+        for diagram in natsorted(self.diagrams, key=lambda diagram: diagram.name):
+            picture, source = DiagramRenderCache.get(diagram, self.session)
+            if source:
+                worker.addDiagramPage(pageLayout, diagram.name, picture, source)
+
+        ##############################################################
+        # ENTITY TABLES
+        ##############################################################
+
+        if self.includeTables:
+            # RESET PAGE SIZE AND ORIENTATION FOR PREDICATE TABLES
+            tableLayout = QtGui.QPageLayout(
+                QtGui.QPageSize(QtGui.QPageSize.A4), QtGui.QPageLayout.Landscape,
+                QtCore.QMarginsF(12.5, 12.5, 12.5, 12.5), QtGui.QPageLayout.Millimeter)
+
+            ##############################################################
+            # IRI TABLE
+            ##############################################################
+
+            prefixRows = self.prefixRows()
+            for i in range(0, len(prefixRows), self.rowsPerPage):
+                htmlTable = '''
+                <table width=100% border=5 cellspacing=0 cellpadding=60>
+                    <thead>
+                        <tr>
+                            <th bgcolor=#c8c8c8>PREFIX</th>
+                            <th bgcolor=#c8c8c8>IRI</th>
+                        </tr>
+                    </thead>
+                 <tbody>'''
+                htmlTable += '\n'.join(prefixRows[i:i+self.rowsPerPage])
+                htmlTable += '</tbody>'
+                htmlTable += '</table>'
+                worker.addTablePage(tableLayout, htmlTable)
+
+            ##############################################################
+            # ROLES AND ATTRIBUTES TABLE
+            ##############################################################
+
+            predicateRows = self.predicateRows()
+            for i in range(0, len(predicateRows), self.rowsPerPage):
+                htmlTable = '''
+                <table width=100% border=5 cellspacing=0 cellpadding=60>
+                    <thead>
+                        <tr>
+                            <th bgcolor=#c8c8c8>ENTITY</th>
+                            <th bgcolor=#c8c8c8>FUNCT</th>
+                            <th bgcolor=#c8c8c8>INVERSE FUNCT</th>
+                            <th bgcolor=#c8c8c8>TRANS</th>
+                            <th bgcolor=#c8c8c8>REFL</th>
+                            <th bgcolor=#c8c8c8>IRREFL</th>
+                            <th bgcolor=#c8c8c8>SYMM</th>
+                            <th bgcolor=#c8c8c8>ASYMM</th>
+                        </tr>
+                    </thead>
+                 <tbody>'''
+                htmlTable += '\n'.join(predicateRows[i:i+self.rowsPerPage])
+                htmlTable += '</tbody>'
+                htmlTable += '</table>'
+                worker.addTablePage(tableLayout, htmlTable)
+
+        return worker
+
+    def run(self, path):
+        """
+        Perform PDF document generation.
+        :type path: str
+        """
+        printer = self.createPrinter(path)
 
         # DIAGRAM SELECTION
         if self.diagrams is None:
@@ -178,8 +319,6 @@ class PdfProjectExporter(AbstractProjectExporter):
             dialog = PageSetupDialog(printer, self.session)
             if not dialog.exec_():
                 return
-        else:
-            printer.setPageSize(self.pageSize)
         # ENTITY TABLES SELECTION
         if self.includeTables is None:
             dialog = QtWidgets.QMessageBox(
@@ -198,158 +337,105 @@ class PdfProjectExporter(AbstractProjectExporter):
                 return
             self.includeTables = result == QtWidgets.QMessageBox.Yes
 
-        ##############################################################
-        # DIAGRAMS
-        ##############################################################
+        worker = self.createWorker(path, printer)
 
-        for n, diagram in enumerate(natsorted(self.diagrams, key=lambda diagram: diagram.name)):
-            shape = diagram.visibleRect(margin=400)
-            if shape:
-                if n > 0:
-                    printer.newPage()
-                if painter.isActive() or painter.begin(printer):
-                    # TURN CACHING OFF
-                    for item in diagram.items():
-                        if item.isNode() or item.isEdge():
-                            item.setCacheMode(AbstractItem.NoCache)
-                    # RENDER THE DIAGRAM
-                    diagram.render(painter, source=shape)
-                    # RENDER DIAGRAM NAME
-                    title = QtGui.QTextDocument()
-                    title.setDefaultFont(Font(pixelSize=140))
-                    title.setHtml('{0}<hr width=100%/>'.format(diagram.name))
-                    title.setTextWidth(printer.pageRect().width())
-                    title.drawContents(painter)
-                    # TURN CACHING ON
-                    for item in diagram.items():
-                        if item.isNode() or item.isEdge():
-                            item.setCacheMode(AbstractItem.DeviceCoordinateCache)
+        # GENERATE THE DOCUMENT IN A SEPARATE THREAD
+        runInThread(worker)
+        if worker.error:
+            raise worker.error
 
-        ##############################################################
-        # ENTITY TABLES
-        ##############################################################
+        # OPEN THE DOCUMENT
+        if self.open:
+            openPath(path)
 
-        if self.includeTables:
 
-            ##############################################################
-            # IRI TABLE
-            ##############################################################
+class PdfProjectExporterWorker(AbstractWorker):
+    """
+    Extends AbstractWorker providing a worker thread that generates a PDF document from recorded pages.
+    """
+    def __init__(self, path, title, resolution):
+        """
+        Initialize the worker.
+        :type path: str
+        :type title: str
+        :type resolution: int
+        """
+        super().__init__()
+        self.error = None
+        self.pages = []
+        self.path = path
+        self.resolution = resolution
+        self.title = title
 
-            # RESET PAGE SIZE AND ORIENTATION FOR PREDICATE TABLES
-            printer.setPageSize(QtPrintSupport.QPrinter.A4)
-            printer.setOrientation(QtPrintSupport.QPrinter.Landscape)
-            printer.setPageMargins(12.5, 12.5, 12.5, 12.5, QtPrintSupport.QPrinter.Millimeter)
-
-            prefixRows = []
-            for prefix in sorted(self.project.getManagedPrefixes()):
-                ns = self.project.getPrefixResolution(prefix)
-                prefixRows.append(dedent('''
-                        <tr>
-                            <td width=25%>{0}</td>
-                            <td width=75%>{1}</td>
-                        </tr>
-                    '''.format(prefix, ns)))
-            sections = [
-                prefixRows[i:i+self.rowsPerPage]
-                for i in range(0, len(prefixRows), self.rowsPerPage)
-            ]
+    #############################################
+    #   INTERFACE
+    #################################
 
-            for section in sections:
-                if len(section) > 0:
-                    if len(self.diagrams) > 0:
-                        printer.newPage()
-                    doc = QtGui.QTextDocument()
-                    htmlTable = '''
-                    <table width=100% border=5 cellspacing=0 cellpadding=60>
-                        <thead>
-                            <tr>
-                                <th bgcolor=#c8c8c8>PREFIX</th>
-                                <th bgcolor=#c8c8c8>IRI</th>
-                            </tr>
-                        </thead>
-                     <tbody>'''
-                    htmlTable += '\n'.join(section)
-                    htmlTable += '</tbody>'
-                    htmlTable += '</table>'
-                    doc.setDefaultFont(Font(pixelSize=180))
-                    doc.setHtml(htmlTable)
-                    doc.setPageSize(QtCore.QSizeF(printer.pageRect().size()))
-                    doc.drawContents(painter)
+    def addDiagramPage(self, pageLayout, name, picture, source):
+        """
+        Append a page rendering the given diagram picture.
+        :type pageLayout: QPageLayout
+        :type name: str
+        :type picture: QPicture
+        :type source: QRectF
+        """
+        self.pages.append((pageLayout, name, picture, source))
 
-            ##############################################################
-            # ROLES AND ATTRIBUTES TABLE
-            ##############################################################
+    def addTablePage(self, pageLayout, html):
+        """
+        Append a page rendering the given HTML table.
+        :type pageLayout: QPageLayout
+        :type html: str
+        """
+        self.pages.append((pageLayout, html, None, None))
 
-            predicateRows = []
-            predicates = set()
-            for item in {Item.RoleNode, Item.AttributeNode}:
-                for node in self.project.iriOccurrences(item=item):
-                    if not node.iri.isTopBottomEntity():
-                        predicates.add(node.iri)
-
-            for predicate in sorted(predicates, key=str):
-                meta = predicate.getMetaProperties()
-                attributes = [
-                    meta.get(K_FUNCTIONAL, False),
-                    meta.get(K_INVERSE_FUNCTIONAL, False),
-                    meta.get(K_REFLEXIVE, False),
-                    meta.get(K_IRREFLEXIVE, False),
-                    meta.get(K_SYMMETRIC, False),
-                    meta.get(K_ASYMMETRIC, False),
-                    meta.get(K_TRANSITIVE, False),
-                ]
-                predicateRows.append('''
-                    <tr>
-                        <td width=30%>{0}</td>
-                        <td width=10%><center>{1}</center></td>
-                        <td width=10%><center>{2}</center></td>
-                        <td width=10%><center>{3}</center></td>
-                        <td width=10%><center>{4}</center></td>
-                        <td width=10%><center>{5}</center></td>
-                        <td width=10%><center>{6}</center></td>
-                        <td width=10%><center>{7}</center></td>
-                    </tr>
-                '''.format(str(predicate), *map(lambda x: u'\u2713' if x else '', attributes)))
-            sections = [
-                predicateRows[i:i+self.rowsPerPage]
-                for i in range(0, len(predicateRows), self.rowsPerPage)
-            ]
+    #############################################
+    #   SLOTS
+    #################################
 
-            for section in sections:
-                if len(section) > 0:
-                    if len(self.diagrams) > 0:
-                        printer.newPage()
+    @QtCore.pyqtSlot()
+    def run(self):
+        """
+        Main worker.
+        """
+        try:
+            if not self.pages:
+                return
+            writer = QtGui.QPdfWriter(self.path)
+            writer.setCreator(self.title)
+            writer.setTitle(self.title)
+            writer.setResolution(self.resolution)
+            painter = QtGui.QPainter()
+            for n, (pageLayout, text, picture, source) in enumerate(self.pages):
+                writer.setPageLayout(pageLayout)
+                if n == 0:
+                    painter.begin(writer)
+                else:
+                    writer.newPage()
+                rect = QtCore.QRectF(painter.viewport())
+                if picture is not None:
+                    # RENDER THE DIAGRAM (SCALED AS QGraphicsScene.render() WOULD DO)
+                    ratio = min(rect.width() / source.width(), rect.height() / source.height())
+                    target = QtCore.QRectF(0, 0, source.width() * ratio, source.height() * ratio)
+                    DiagramRenderCache.render(painter, picture, source, target)
+                    # RENDER DIAGRAM NAME
+                    title = QtGui.QTextDocument()
+                    title.setDefaultFont(Font(pixelSize=140))
+                    title.setHtml('{0}<hr width=100%/>'.format(text))
+                    title.setTextWidth(rect.width())
+                    title.drawContents(painter)
+                else:
                     doc = QtGui.QTextDocument()
-                    htmlTable = '''
-                    <table width=100% border=5 cellspacing=0 cellpadding=60>
-                        <thead>
-                            <tr>
-                                <th bgcolor=#c8c8c8>ENTITY</th>
-                                <th bgcolor=#c8c8c8>FUNCT</th>
-                                <th bgcolor=#c8c8c8>INVERSE FUNCT</th>
-                                <th bgcolor=#c8c8c8>TRANS</th>
-                                <th bgcolor=#c8c8c8>REFL</th>
-                                <th bgcolor=#c8c8c8>IRREFL</th>
-                                <th bgcolor=#c8c8c8>SYMM</th>
-                                <th bgcolor=#c8c8c8>ASYMM</th>
-                            </tr>
-                        </thead>
-                     <tbody>'''
-                    htmlTable += '\n'.join(section)
-                    htmlTable += '</tbody>'
-                    htmlTable += '</table>'
                     doc.setDefaultFont(Font(pixelSize=180))
-                    doc.setHtml(htmlTable)
-                    doc.setPageSize(QtCore.QSizeF(printer.pageRect().size()))
+                    doc.setHtml(text)
+                    doc.setPageSize(rect.size())
                     doc.drawContents(painter)
-
-        # COMPLETE THE EXPORT
-        if painter.isActive():
             painter.end()
-
-        # OPEN THE DOCUMENT
-        if self.open:
-            openPath(printer.outputFileName())
+        except Exception as e:
+            LOGGER.exception('PDF generation failed: %s', e)
+            self.error = e
+        finally:
+            self.finished.emit()
 
 
 class PageSetupDialog(QtWidgets.QDialog, HasWidgetSystem):
@@ -33,11 +33,12 @@
 ##########################################################################
 
 
+from PyQt5 import QtCore
 from PyQt5 import QtGui
 from PyQt5 import QtPrintSupport
 
 from eddy.core.exporters.common import AbstractDiagramExporter
-from eddy.core.items.common import AbstractItem
+from eddy.core.exporters.common import DiagramRenderCache
 
 
 class PrinterDiagramExporter(AbstractDiagramExporter):
@@ -76,18 +77,11 @@ class PrinterDiagramExporter(AbstractDiagramExporter):
             printer.setOutputFormat(QtPrintSupport.QPrinter.NativeFormat)
             dialog = QtPrintSupport.QPrintDialog(printer)
             if dialog.exec_() == QtPrintSupport.QPrintDialog.Accepted:
+                picture, _ = DiagramRenderCache.get(self.diagram, self.session)
                 painter = QtGui.QPainter()
                 if painter.begin(printer):
-                    # TURN CACHING OFF
-                    for item in self.diagram.items():
-                        if item.isNode() or item.isEdge():
-                            item.setCacheMode(AbstractItem.NoCache)
-                    # RENDER THE DIAGRAM IN THE PAINTER
-                    self.diagram.render(painter, source=shape)
-                    # TURN CACHING ON
-                    for item in self.diagram.items():
-                        if item.isNode() or item.isEdge():
-                            item.setCacheMode(AbstractItem.DeviceCoordinateCache)
+                    # REPLAY THE DIAGRAM PICTURE IN THE PAINTER
+                    DiagramRenderCache.render(painter, picture, shape, QtCore.QRectF(painter.viewport()))
                     # COMPLETE THE PRINT
                     painter.end()
 
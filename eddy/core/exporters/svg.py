@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+
+import os
+
+from PyQt5 import QtCore
+from PyQt5 import QtGui
+from PyQt5 import QtSvg
+
+from eddy.core.datatypes.system import File
+from eddy.core.exporters.common import (
+    AbstractDiagramExporter,
+    AbstractProjectExporter,
+    DiagramRenderCache,
+)
+from eddy.core.functions.fsystem import mkdir
+from eddy.core.functions.misc import natsorted
+from eddy.core.functions.path import expandPath
+from eddy.core.output import getLogger
+
+LOGGER = getLogger()
+
+
+class SvgDiagramExporter(AbstractDiagramExporter):
+    """
+    Extends AbstractDiagramExporter with facilities to export Graphol diagrams in SVG format.
+    The diagram picture held by the DiagramRenderCache is replayed on a QSvgGenerator, so that
+    shapes are written as vector primitives and labels as selectable text elements: the size of
+    the document grows with the number of items in the diagram rather than with its area.
+    """
+    Margin = 20
+    Resolution = 96
+
+    def __init__(self, diagram, session=None):
+        """
+        Initialize the SVG exporter.
+        :type diagram: Diagram
+        :type session: Session
+        """
+        super().__init__(diagram, session)
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    @classmethod
+    def filetype(cls):
+        """
+        Returns the type of the file that will be used for the export.
+        :return: File
+        """
+        return File.Svg
+
+    def run(self, path):
+        """
+        Perform SVG document generation.
+        :type path: str
+        """
+        shape = self.diagram.visibleRect(margin=self.Margin)
+        if not shape:
+            return
+        LOGGER.info('Exporting diagram %s to %s', self.diagram.name, path)
+        picture, _ = DiagramRenderCache.get(self.diagram, self.session)
+        # THE DOCUMENT IS WRITTEN TO A TEMPORARY FILE WHICH REPLACES THE DESTINATION ON COMMIT
+        file = QtCore.QSaveFile(expandPath(path))
+        if not file.open(QtCore.QIODevice.WriteOnly):
+            raise IOError('could not write {0}: {1}'.format(path, file.errorString()))
+        target = QtCore.QRectF(0, 0, shape.width(), shape.height())
+        generator = QtSvg.QSvgGenerator()
+        generator.setOutputDevice(file)
+        generator.setResolution(self.Resolution)
+        generator.setSize(target.size().toSize())
+        generator.setViewBox(target)
+        generator.setTitle(self.diagram.name)
+        generator.setDescription('Graphol diagram {0} ({1} items)'.format(self.diagram.name, len(self.diagram.items())))
+        painter = QtGui.QPainter()
+        if not painter.begin(generator):
+            file.cancelWriting()
+            raise IOError('could not write {0}'.format(path))
+        DiagramRenderCache.render(painter, picture, shape, target)
+        painter.end()
+        if not file.commit():
+            raise IOError('could not write {0}: {1}'.format(path, file.errorString()))
+
+
+class SvgProjectExporter(AbstractProjectExporter):
+    """
+    Extends AbstractProjectExporter with facilities to export all the diagrams of a project in SVG format.
+    The given path identifies a directory, in which a separate SVG document is written for each diagram,
+    one diagram at a time.
+    """
+    def __init__(self, project, session=None, **kwargs):
+        """
+        Initialize the SVG exporter.
+        :type project: Project
+        :type session: Session
+        """
+        super().__init__(project, session)
+        self.diagrams = kwargs.get('diagrams', None)
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    @classmethod
+    def filetype(cls):
+        """
+        Returns the type of the file that will be used for the export.
+        :return: File
+        """
+        return File.Svg
+
+    def run(self, path):
+        """
+        Perform SVG documents generation.
+        :type path: str
+        """
+        mkdir(path)
+        diagrams = self.project.diagrams() if self.diagrams is None else self.diagrams
+        for diagram in natsorted(diagrams, key=lambda diagram: diagram.name):
+            exporter = SvgDiagramExporter(diagram, self.session)
+            exporter.run(os.path.join(path, '{0}{1}'.format(diagram.name, File.Svg.extension)))
@@ -129,6 +129,9 @@ class MenuFactory(QtCore.QObject):
             menu.addAction(self.session.action('paste'))
         menu.addAction(self.session.action('select_all'))
         menu.addSeparator()
+        menu.addAction(self.session.action('layout_hierarchical'))
+        menu.addAction(self.session.action('layout_force_directed'))
+        menu.addSeparator()
         menu.addAction(self.session.action('diagram_properties'))
         self.session.action('diagram_properties').setData(diagram)
         return menu
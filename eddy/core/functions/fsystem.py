@@ -36,6 +36,7 @@
 import io
 import os
 import shutil
+from contextlib import contextmanager
 
 from eddy.core.functions.path import expandPath
 
@@ -111,6 +112,28 @@ def frename(src, dst):
     os.rename(expandPath(src), expandPath(dst))
 
 
+@contextmanager
+def fstream(path, newline=None):
+    """
+    Context manager yielding a text stream to write the file identified by the given 'path' incrementally.
+    As with fwrite, if the given path identifies an already existing file, its content
+    is not replaced unless the block completes successfully.
+    Optional newline parameter has the same role as `newline` in :func:`io.open`.
+    :type path: str
+    :type newline: str, optional
+    """
+    components = os.path.split(expandPath(path))
+    stage = os.path.join(components[0], '.{0}'.format(components[1]))
+    try:
+        with io.open(stage, 'w', encoding='utf8', newline=newline) as ptr:
+            yield ptr
+    except BaseException:
+        fremove(stage)
+        raise
+    fremove(path)
+    frename(stage, path)
+
+
 def fwrite(content, path, newline=None):
     """
     Safely write the given 'content' in the file identified by the given 'path'.
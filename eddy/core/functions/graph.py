@@ -70,10 +70,11 @@ def bfs(source, filter_on_edges=lambda x: True, filter_on_nodes=lambda x: True,
     visited = set()
     while queue:
         node = queue.popleft()
-        ordered.append(node)
-        visited.add(node)
-        if filter_on_visit(node):
-            extend([n for n in [e.other(node) for e in node.edges if filter_on_edges(e)] if n not in visited and filter_on_nodes(n)])
+        if node not in visited:
+            ordered.append(node)
+            visited.add(node)
+            if filter_on_visit(node):
+                extend([n for n in [e.other(node) for e in node.edges if filter_on_edges(e)] if n not in visited and filter_on_nodes(n)])
     return ordered
 
 
@@ -116,4 +117,4 @@ def dfs(source, filter_on_edges=lambda x: True, filter_on_nodes=lambda x: True,
             visited.add(node)
             if filter_on_visit(node):
                 extend([n for n in [e.other(node) for e in node.edges if filter_on_edges(e)] if n not in visited and filter_on_nodes(n)])
-    return visited
\ No newline at end of file
+    return ordered
\ No newline at end of file
@@ -85,6 +85,18 @@ def format_exception(e):
     return ''.join(f_exc(type(e), e, e.__traceback__))
 
 
+def format_size(num):
+    """
+    Format the given amount of bytes returning a human readable representation of it.
+    :type num: int
+    :rtype: str
+    """
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(num) < 1024 or unit == 'GB':
+            return '{0:.0f} {1}'.format(num, unit) if unit == 'B' else '{0:.1f} {1}'.format(num, unit)
+        num /= 1024
+
+
 def isEmpty(string):
     """
     Safely detect whether the given string is empty.
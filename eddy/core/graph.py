@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+from array import array
+from collections import deque
+
+from eddy.core.datatypes.misc import Direction
+
+
+class GraphSnapshot(object):
+    """
+    Compact snapshot of the nodes and edges of a diagram (or of a whole project).
+    Adjacency is compiled into CSR (compressed sparse row) arrays: the outgoing edges of
+    node i are stored in the slice [outOffsets[i], outOffsets[i + 1]) of outNodes/outEdges,
+    while the incoming ones are stored in the same slice of inNodes/inEdges. Nodes and edges
+    are referenced by their integer index: the original keys can be retrieved through the
+    `nodeKeys` and `edgeKeys` lists, while `nodeTypes` and `edgeTypes` hold their Item type.
+    Since the snapshot holds no reference to graphical items, it can be freely used outside
+    of the GUI thread.
+    """
+    def __init__(self, nodes, edges):
+        """
+        Initialize the snapshot.
+        :type nodes: list
+        :type edges: list
+        """
+        self.nodeKeys = [key for key, _ in nodes]
+        self.nodeTypes = array('l', (int(item) for _, item in nodes))
+        self.nodeIndex = {key: i for i, key in enumerate(self.nodeKeys)}
+        self.edgeKeys = [key for key, _, _, _ in edges]
+        self.edgeTypes = array('l', (int(item) for _, _, _, item in edges))
+        self.edgeIndex = {key: i for i, key in enumerate(self.edgeKeys)}
+        self.sources = array('l', (self.nodeIndex[source] for _, source, _, _ in edges))
+        self.targets = array('l', (self.nodeIndex[target] for _, _, target, _ in edges))
+        self.outOffsets, self.outNodes, self.outEdges = self.compile(self.sources, self.targets)
+        self.inOffsets, self.inNodes, self.inEdges = self.compile(self.targets, self.sources)
+
+    #############################################
+    #   FACTORY
+    #################################
+
+    @classmethod
+    def fromDiagram(cls, diagram):
+        """
+        Create a snapshot of the given diagram, using node and edge ids as keys.
+        :type diagram: Diagram
+        :rtype: GraphSnapshot
+        """
+        nodes = [(node.id, node.type()) for node in diagram.nodes()]
+        edges = [(edge.id, edge.source.id, edge.target.id, edge.type()) for edge in diagram.edges()]
+        return cls(nodes, edges)
+
+    @classmethod
+    def fromProject(cls, project):
+        """
+        Create a snapshot of the given project, using (diagram name, item id) pairs as keys.
+        :type project: Project
+        :rtype: GraphSnapshot
+        """
+        nodes = []
+        edges = []
+        for diagram in project.diagrams():
+            name = diagram.name
+            nodes.extend(((name, node.id), node.type()) for node in project.nodes(diagram))
+            edges.extend(((name, edge.id), (name, edge.source.id), (name, edge.target.id), edge.type())
+                         for edge in project.edges(diagram))
+        return cls(nodes, edges)
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def compile(self, sources, targets):
+        """
+        Compile the given edge endpoints into CSR arrays (offsets, adjacent nodes, edges).
+        :type sources: array
+        :type targets: array
+        :rtype: tuple
+        """
+        offsets = array('l', [0] * (len(self.nodeKeys) + 1))
+        for source in sources:
+            offsets[source + 1] += 1
+        for i in range(len(self.nodeKeys)):
+            offsets[i + 1] += offsets[i]
+        cursor = array('l', offsets[:-1])
+        nodes = array('l', [0] * len(sources))
+        edges = array('l', [0] * len(sources))
+        for edge, (source, target) in enumerate(zip(sources, targets)):
+            position = cursor[source]
+            nodes[position] = target
+            edges[position] = edge
+            cursor[source] = position + 1
+        return offsets, nodes, edges
+
+    def adjacent(self, node, direction=Direction.Outgoing, types=None):
+        """
+        Returns the list of (node, edge) pairs adjacent to the given node index.
+        :type node: int
+        :type direction: Direction
+        :type types: T <= set | frozenset
+        :rtype: list
+        """
+        result = []
+        if direction in (Direction.Outgoing, Direction.Both):
+            start, end = self.outOffsets[node], self.outOffsets[node + 1]
+            result.extend(zip(self.outNodes[start:end], self.outEdges[start:end]))
+        if direction in (Direction.Incoming, Direction.Both):
+            start, end = self.inOffsets[node], self.inOffsets[node + 1]
+            result.extend(zip(self.inNodes[start:end], self.inEdges[start:end]))
+        if types is not None:
+            edgeTypes = self.edgeTypes
+            result = [(n, e) for n, e in result if edgeTypes[e] in types]
+        return result
+
+    def neighbours(self, node, direction=Direction.Outgoing, types=None):
+        """
+        Returns the list of node indices adjacent to the given node index.
+        :type node: int
+        :type direction: Direction
+        :type types: T <= set | frozenset
+        :rtype: list
+        """
+        return [n for n, _ in self.adjacent(node, direction, types)]
+
+    def bfs(self, source, direction=Direction.Outgoing, types=None):
+        """
+        Perform a BFS starting from the given node index, returning node indices in visit order.
+        :type source: int
+        :type direction: Direction
+        :type types: T <= set | frozenset
+        :rtype: list
+        """
+        ordered = [source]
+        visited = {source}
+        queue = deque([source])
+        while queue:
+            for n in self.neighbours(queue.popleft(), direction, types):
+                if n not in visited:
+                    visited.add(n)
+                    ordered.append(n)
+                    queue.append(n)
+        return ordered
+
+    def dfs(self, source, direction=Direction.Outgoing, types=None):
+        """
+        Perform a DFS starting from the given node index, returning node indices in visit (pre-)order.
+        :type source: int
+        :type direction: Direction
+        :type types: T <= set | frozenset
+        :rtype: list
+        """
+        ordered = []
+        visited = set()
+        stack = [source]
+        while stack:
+            node = stack.pop()
+            if node not in visited:
+                visited.add(node)
+                ordered.append(node)
+                stack.extend(reversed([n for n in self.neighbours(node, direction, types) if n not in visited]))
+        return ordered
+
+    def components(self, types=None):
+        """
+        Returns the weakly connected components of the snapshot as lists of node indices.
+        :type types: T <= set | frozenset
+        :rtype: list
+        """
+        parent = list(range(len(self.nodeKeys)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for edge, (source, target) in enumerate(zip(self.sources, self.targets)):
+            if types is None or self.edgeTypes[edge] in types:
+                rs, rt = find(source), find(target)
+                if rs != rt:
+                    parent[rs] = rt
+        components = {}
+        for i in range(len(self.nodeKeys)):
+            components.setdefault(find(i), []).append(i)
+        return list(components.values())
+
+    def shortestPath(self, source, target, direction=Direction.Outgoing, types=None):
+        """
+        Returns the shortest path (as a list of node indices) between the given node indices,
+        or None if the target node is not reachable from the source node.
+        :type source: int
+        :type target: int
+        :type direction: Direction
+        :type types: T <= set | frozenset
+        :rtype: list
+        """
+        parents = {source: None}
+        queue = deque([source])
+        while queue and target not in parents:
+            node = queue.popleft()
+            for n in self.neighbours(node, direction, types):
+                if n not in parents:
+                    parents[n] = node
+                    queue.append(n)
+        if target not in parents:
+            return None
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        return path[::-1]
+
+    def findCycle(self, types=None):
+        """
+        Returns a directed cycle (as a list of node indices) or None if the snapshot is acyclic.
+        :type types: T <= set | frozenset
+        :rtype: list
+        """
+        # 0 = unvisited, 1 = on the current DFS path, 2 = completed
+        state = [0] * len(self.nodeKeys)
+        for root in range(len(self.nodeKeys)):
+            if state[root]:
+                continue
+            state[root] = 1
+            path = [root]
+            stack = [iter(self.neighbours(root, Direction.Outgoing, types))]
+            while stack:
+                for n in stack[-1]:
+                    if state[n] == 1:
+                        return path[path.index(n):]
+                    if state[n] == 0:
+                        state[n] = 1
+                        path.append(n)
+                        stack.append(iter(self.neighbours(n, Direction.Outgoing, types)))
+                        break
+                else:
+                    state[path.pop()] = 2
+                    stack.pop()
+        return None
+
+    def hasCycle(self, types=None):
+        """
+        Returns True if the snapshot contains a directed cycle, False otherwise.
+        :type types: T <= set | frozenset
+        :rtype: bool
+        """
+        return self.findCycle(types) is not None
+
+    def __len__(self):
+        """
+        Returns the number of nodes in the snapshot.
+        :rtype: int
+        """
+        return len(self.nodeKeys)
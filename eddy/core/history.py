@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+
+import sys
+import time
+
+from PyQt5 import (
+    QtCore,
+    QtWidgets,
+)
+
+from eddy.core.functions.misc import format_size
+from eddy.core.functions.signals import connect
+from eddy.core.qt import sip
+
+
+def footprint(command):
+    """
+    Estimate the memory footprint (in bytes) of the given undo command, including its children.
+    Qt objects referenced by the command (graphics items, diagrams, IRIs, ...) are shared
+    with the rest of the application, hence only the size of their wrapper is accounted.
+    :type command: QUndoCommand
+    :rtype: int
+    """
+    seen = set()
+    stack = [command]
+    size = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj, 64)
+        if isinstance(obj, QtWidgets.QUndoCommand):
+            stack.extend(vars(obj).values())
+            stack.extend(obj.child(i) for i in range(obj.childCount()))
+        elif isinstance(obj, sip.simplewrapper):
+            continue
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return size
+
+
+class UndoEntry(QtWidgets.QUndoCommand):
+    """
+    This class implements the entries of the UndoStack, each one wrapping a command pushed on it.
+    Entries do not own the wrapped commands, hence they can be moved onto new entries when the
+    oldest commands of the history are trimmed: a restored entry skips the given number of
+    redo/undo invocations, which the stack issues while rebuilding its history.
+    Commands are merged (see QUndoCommand.mergeWith) only if pushed within MergeInterval seconds
+    from the previous one, so that only the steps of a single interaction (e.g. a node moved by
+    holding down an arrow key) are compressed, while separate interactions stay separate steps.
+    """
+    MergeInterval = 1.0
+
+    def __init__(self, command, parent=None, skip=0):
+        """
+        Initialize the entry.
+        :type command: QUndoCommand
+        :type parent: QUndoCommand
+        :type skip: int
+        """
+        super().__init__(command.text(), parent)
+        self.command = command
+        self.restored = skip > 0
+        self.skip = skip
+        self.time = time.monotonic()
+
+    def __getattr__(self, name):
+        """
+        Forwards the lookup of attributes not defined by the entry to the wrapped command.
+        :type name: str
+        """
+        if name == 'command':
+            raise AttributeError(name)
+        return getattr(self.command, name)
+
+    def id(self):
+        """
+        Returns the id of the wrapped command, used for command compression.
+        :rtype: int
+        """
+        return self.command.id()
+
+    def mergeWith(self, entry):
+        """
+        Merge the command wrapped by the given entry into the wrapped command.
+        Restored entries are never merged since they were distinct steps of the history.
+        :type entry: UndoEntry
+        :rtype: bool
+        """
+        if entry.restored or entry.time - self.time > self.MergeInterval:
+            return False
+        if not self.command.mergeWith(entry.command):
+            return False
+        self.setText(self.command.text())
+        self.time = entry.time
+        return True
+
+    def redo(self):
+        """
+        Executes the wrapped command.
+        """
+        if self.skip:
+            self.skip -= 1
+        else:
+            self.command.redo()
+
+    def undo(self):
+        """
+        Reverts the wrapped command.
+        """
+        if self.skip:
+            self.skip -= 1
+        else:
+            self.command.undo()
+
+    @classmethod
+    def restore(cls, command, parent=None, skip=1):
+        """
+        Returns a copy of the given stack command (either an entry or a macro), whose entries
+        wrap the same commands and skip the given number of redo/undo invocations.
+        :type command: QUndoCommand
+        :type parent: QUndoCommand
+        :type skip: int
+        :rtype: QUndoCommand
+        """
+        if isinstance(command, cls):
+            restored = cls(command.command, parent, skip)
+            restored.time = command.time
+            return restored
+        restored = QtWidgets.QUndoCommand(command.text(), parent)
+        for i in range(command.childCount()):
+            cls.restore(command.child(i), restored, skip)
+        return restored
+
+
+class UndoStack(QtWidgets.QUndoStack):
+    """
+    Extension of QtWidgets.QUndoStack which keeps the undo history bounded.
+    The number of undoable commands is bounded by the stack undo limit, hence the oldest commands
+    are deleted once the configured limit is exceeded. Whenever the estimated memory footprint of
+    the history exceeds the configured budget, or the limit is lowered below the number of commands
+    on the stack, the history is trimmed: the oldest commands are deleted, the most recent ones
+    fitting the configured bounds are kept on the stack, and the undo limit is lowered to their
+    number so that the history fits the budget from then on. Since QUndoStack deletes the commands
+    it holds, commands are pushed wrapped into UndoEntry objects, which can be restored onto the
+    trimmed stack. Additionally to built-in signals, this class emits:
+
+    * sgnFootprintChanged: whenever the estimated memory footprint of the history changes.
+    """
+    sgnFootprintChanged = QtCore.pyqtSignal(int)
+
+    def __init__(self, parent=None, limit=0, budget=0):
+        """
+        Initialize the undo stack.
+        :type parent: QObject
+        :type limit: int
+        :type budget: int
+        """
+        super().__init__(parent)
+        self.base = 0
+        self.budget = budget
+        self.limit = limit
+        self.macros = 0
+        self.sizes = []
+        self.undoActions = []
+        self.setUndoLimit(limit)
+        connect(self.indexChanged, self.onIndexChanged)
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot()
+    def clear(self):
+        """
+        Clean the undo stack by deleting all the commands on it.
+        """
+        super().clear()
+        self.macros = 0
+        self.sizes = []
+        self.setUndoLimit(self.limit)
+        self.onIndexChanged()
+        self.sgnFootprintChanged.emit(0)
+
+    @QtCore.pyqtSlot(int)
+    def onIndexChanged(self, _=None):
+        """
+        Executed when the index of the undo stack changes.
+        """
+        tip = 'Undo history: {0} step(s), {1}'.format(self.count(), format_size(self.footprint()))
+        for action in self.undoActions:
+            action.setStatusTip(tip)
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def beginMacro(self, text):
+        """
+        Begins composition of a macro command with the given text description.
+        :type text: str
+        """
+        if not self.macros:
+            self.base = self.index()
+        super().beginMacro(text)
+        self.macros += 1
+
+    def createUndoAction(self, parent, prefix=''):
+        """
+        Creates an undo QAction object with the given parent, whose
+        status tip reports the estimated footprint of the undo history.
+        :type parent: QObject
+        :type prefix: str
+        :rtype: QAction
+        """
+        action = super().createUndoAction(parent, prefix)
+        self.undoActions.append(action)
+        self.onIndexChanged()
+        return action
+
+    def endMacro(self):
+        """
+        Ends composition of a macro command.
+        """
+        super().endMacro()
+        self.macros = max(self.macros - 1, 0)
+        if not self.macros:
+            self.update(self.base)
+
+    def footprint(self):
+        """
+        Returns the estimated memory footprint (in bytes) of the undo history.
+        :rtype: int
+        """
+        return sum(self.sizes)
+
+    def push(self, command):
+        """
+        Pushes the given command on the stack, executing it.
+        :type command: QUndoCommand
+        """
+        base = self.index()
+        entry = UndoEntry(command)
+        super().push(entry)
+        if not self.macros:
+            # Macros are accounted for as a whole once composed.
+            count = self.count()
+            self.update(base, merged=bool(count) and self.command(count - 1) is not entry)
+
+    def setBudget(self, budget):
+        """
+        Set the maximum memory footprint (in bytes) of the undo history (0 = unbounded).
+        :type budget: int
+        """
+        self.budget = budget
+        self.update()
+
+    def setLimit(self, limit):
+        """
+        Set the maximum number of undoable commands (0 = unbounded).
+        The limit is applied when the stack is cleared or trimmed.
+        :type limit: int
+        """
+        self.limit = limit
+        if not self.count():
+            self.setUndoLimit(limit)
+        self.update()
+
+    def trim(self):
+        """
+        Trim the undo history so that it fits the configured bounds: the oldest commands are deleted,
+        while the most recent ones are restored onto the stack, together with its index and clean
+        state. The redo history is kept only if it fits the bounds as a whole. The undo limit is then
+        lowered to the number of commands kept, so that the oldest ones are deleted from then on.
+        """
+        def window(top):
+            keep = total = 0
+            for size in reversed(self.sizes[:top]):
+                if keep and (self.limit and keep >= self.limit or
+                             self.budget and total + size > self.budget):
+                    break
+                keep += 1
+                total += size
+            return top - keep
+
+        count = self.count()
+        index = self.index()
+        top = count
+        floor = window(top)
+        if floor > index:
+            top = index
+            floor = window(top)
+        clean = self.cleanIndex()
+        clean = clean - floor if floor <= clean <= top else -1
+        # Restored entries skip the redo issued by the push, and the undo issued by
+        # the rewind of the index in case they belong to the redo history.
+        entries = [UndoEntry.restore(self.command(i), skip=1 if i < index else 2)
+                   for i in range(floor, top)]
+        sizes = self.sizes[floor:top]
+        super().clear()
+        self.setUndoLimit(len(entries) or self.limit)
+        for entry in entries:
+            if self.index() == clean:
+                self.setClean()
+            super().push(entry)
+        if self.index() == clean:
+            self.setClean()
+        elif clean < 0:
+            self.resetClean()
+        self.setIndex(index - floor)
+        self.sizes = sizes
+
+    def update(self, base=None, merged=False):
+        """
+        Account for the footprint of the command pushed on the stack at the given index, if any,
+        and trim the undo history if it exceeds the configured bounds. Commands
+        which have been merged into the pushed one, dropped from the redo history by the push,
+        or deleted from the bottom of the stack because of the undo limit are accounted for as well.
+        :type base: int
+        :type merged: bool
+        """
+        count = self.count()
+        if base is not None and count:
+            sizes = self.sizes[:base - 1 if merged else base]
+            sizes = sizes[max(len(sizes) + 1 - count, 0):]
+            sizes.append(footprint(self.command(count - 1)))
+            self.sizes = sizes
+        if not self.macros and (self.limit and count > self.limit or
+                                self.budget and self.footprint() > self.budget):
+            self.trim()
+        self.onIndexChanged()
+        self.sgnFootprintChanged.emit(self.footprint())
@@ -434,6 +434,8 @@ class AbstractEdge(AbstractItem):
         """
         if change == AbstractEdge.ItemSelectedHasChanged:
             self.updateEdge(selected=value)
+            if self.diagram:
+                self.diagram.onItemSelectedChanged(self, value)
         return super().itemChange(change, value)
 
     def mouseDoubleClickEvent(self, mouseEvent):
@@ -47,6 +47,7 @@ from eddy.core.datatypes.misc import DiagramMode
 from eddy.core.items.common import AbstractItem, Polygon
 from eddy.core.items.nodes.common.label import PredicateLabel
 from eddy.core.owl import IRIRender
+from eddy.core.rendering import IRILabelRenderer
 
 
 class AbstractNode(AbstractItem):
@@ -445,6 +446,8 @@ class AbstractNode(AbstractItem):
         """
         if change == AbstractNode.ItemSelectedHasChanged:
             self.updateNode(selected=value)
+            if self.diagram:
+                self.diagram.onItemSelectedChanged(self, value)
         return super().itemChange(change, value)
 
     def mousePressEvent(self, mouseEvent):
@@ -644,6 +647,7 @@ class AbstractResizableNode(AbstractNode):
         if change == AbstractNode.ItemSelectedHasChanged:
             if self.diagram.mode is not DiagramMode.NodeResize:
                 self.updateNode(selected=value)
+            self.diagram.onItemSelectedChanged(self, value)
         return super(AbstractNode, self).itemChange(change, value)
 
     def mousePressEvent(self, mouseEvent):
@@ -783,17 +787,11 @@ class PredicateNodeMixin:
 
     def connectSignals(self):
         if self.diagram:
-            connect(self.project.sgnPrefixAdded, self.onPrefixAdded)
-            connect(self.project.sgnPrefixRemoved, self.onPrefixRemoved)
-            connect(self.project.sgnPrefixModified, self.onPrefixModified)
             #connect(self.session.sgnRenderingModified, self.onRenderingModified)
             self.connectIRISignals()
 
     def disconnectSignals(self):
         if self.diagram:
-            disconnect(self.project.sgnPrefixAdded, self.onPrefixAdded)
-            disconnect(self.project.sgnPrefixRemoved, self.onPrefixRemoved)
-            disconnect(self.project.sgnPrefixModified, self.onPrefixModified)
             #disconnect(self.session.sgnRenderingModified, self.onRenderingModified)
             self.disconnectIRISignals()
 
@@ -803,6 +801,8 @@ class PredicateNodeMixin:
         connect(self.iri.sgnAnnotationAdded, self.onAnnotationAdded)
         connect(self.iri.sgnAnnotationRemoved, self.onAnnotationRemoved)
         connect(self.iri.sgnAnnotationModified, self.onAnnotationModified)
+        if self.diagram:
+            self.labelRenderer().subscribe(self, self.iri)
         self.connectIRIMetaSignals()
 
     def disconnectIRISignals(self):
@@ -811,6 +811,8 @@ class PredicateNodeMixin:
         disconnect(self.iri.sgnAnnotationAdded, self.onAnnotationAdded)
         disconnect(self.iri.sgnAnnotationRemoved, self.onAnnotationRemoved)
         disconnect(self.iri.sgnAnnotationModified, self.onAnnotationModified)
+        if self.diagram:
+            self.labelRenderer().unsubscribe(self, self.iri)
         self.disconnectIRIMetaSignals()
 
     def connectIRIMetaSignals(self):
@@ -819,6 +821,15 @@ class PredicateNodeMixin:
     def disconnectIRIMetaSignals(self):
         pass
 
+    def labelRenderer(self):
+        """
+        Returns the renderer used to compute the label of this node, if the node belongs to a diagram.
+        :rtype: IRILabelRenderer
+        """
+        if self.diagram:
+            return IRILabelRenderer.forProject(self.project)
+        return None
+
     #############################################
     #   SLOTS
     #################################
@@ -830,7 +841,11 @@ class PredicateNodeMixin:
 
     @QtCore.pyqtSlot()
     def doUpdateNodeLabel(self):
-        newLabelString = IRIRender.iriLabelString(self._iri)
+        renderer = self.labelRenderer()
+        if renderer:
+            newLabelString = renderer.label(self._iri)
+        else:
+            newLabelString = IRIRender.iriLabelString(self._iri)
         if self.label and not self.labelString == newLabelString:
             self.labelString = newLabelString
             labelPos = lambda:self.label.pos()
@@ -851,10 +866,6 @@ class PredicateNodeMixin:
         """
         :type annotation: AnnotationAssertion
         """
-        settings = QtCore.QSettings()
-        rendering = settings.value('ontology/iri/render', IRIRender.PREFIX.value)
-        if rendering == IRIRender.LABEL.value:
-            self.doUpdateNodeLabel()
         if self.diagram:
             self.diagram.project.sgnUpdated.emit()
 
@@ -863,10 +874,6 @@ class PredicateNodeMixin:
         """
         :type annotation: AnnotationAssertion
         """
-        settings = QtCore.QSettings()
-        rendering = settings.value('ontology/iri/render', IRIRender.PREFIX.value, )
-        if rendering == IRIRender.LABEL.value:
-            self.doUpdateNodeLabel()
         if self.diagram:
             self.diagram.project.sgnUpdated.emit()
 
@@ -875,38 +882,15 @@ class PredicateNodeMixin:
         """
         :type annotation: AnnotationAssertion
         """
-        settings = QtCore.QSettings()
-        rendering = settings.value('ontology/iri/render', IRIRender.PREFIX.value, str)
-        if rendering == IRIRender.LABEL.value:
-            self.doUpdateNodeLabel()
         if self.diagram:
             self.diagram.project.sgnUpdated.emit()
 
     #@QtCore.pyqtSlot()
     def onIRIModified(self):
-        self.doUpdateNodeLabel()
+        # The label of nodes belonging to a diagram is updated by the label renderer
         if self.diagram:
             self.diagram.project.sgnUpdated.emit()
-
-    #@QtCore.pyqtSlot('QString','QString')
-    def onPrefixAdded(self,pref,ns):
-        settings = QtCore.QSettings()
-        rendering = settings.value('ontology/iri/render', IRIRender.PREFIX.value, str)
-        if rendering==IRIRender.PREFIX.value or rendering==IRIRender.LABEL.value:
-            self.doUpdateNodeLabel()
-
-    #@QtCore.pyqtSlot(str)
-    def onPrefixRemoved(self,pref):
-        settings = QtCore.QSettings()
-        rendering = settings.value('ontology/iri/render', IRIRender.PREFIX.value, str)
-        if rendering==IRIRender.PREFIX.value or rendering==IRIRender.LABEL.value:
-            self.doUpdateNodeLabel()
-
-    #@QtCore.pyqtSlot(str)
-    def onPrefixModified(self,pref):
-        settings = QtCore.QSettings()
-        rendering = settings.value('ontology/iri/render', IRIRender.PREFIX.value, str)
-        if rendering==IRIRender.PREFIX.value or rendering==IRIRender.LABEL.value:
+        else:
             self.doUpdateNodeLabel()
 
     #############################################
@@ -0,0 +1,657 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+from abc import ABCMeta, abstractmethod
+import math
+
+from PyQt5 import QtCore
+
+from eddy.core.output import getLogger
+from eddy.core.worker import AbstractWorker
+
+LOGGER = getLogger()
+
+
+class LayoutGraph(object):
+    """
+    Snapshot of a set of diagram nodes and of the edges connecting them.
+    The snapshot only holds plain Python data, hence it can be safely handed over to a worker thread.
+    """
+    def __init__(self):
+        """
+        Initialize the snapshot.
+        """
+        self.diagram = None
+        self.ids = []
+        self.index = {}
+        self.pos = []
+        self.size = []
+        self.edges = []
+
+    @classmethod
+    def fromNodes(cls, diagram, nodes):
+        """
+        Create a snapshot of the given diagram nodes and of the edges connecting them.
+        The diagram reference is only kept to apply the layout result and is never accessed by the algorithms.
+        :type diagram: Diagram
+        :type nodes: T <= list | set
+        :rtype: LayoutGraph
+        """
+        graph = cls()
+        graph.diagram = diagram
+        for node in nodes:
+            graph.index[node.id] = len(graph.ids)
+            graph.ids.append(node.id)
+            graph.pos.append((node.pos().x(), node.pos().y()))
+            graph.size.append((node.width(), node.height()))
+        visited = set()
+        for node in nodes:
+            for edge in node.edges:
+                if edge.id not in visited:
+                    visited.add(edge.id)
+                    source = graph.index.get(edge.source.id)
+                    target = graph.index.get(edge.target.id)
+                    if source is not None and target is not None and source != target:
+                        graph.edges.append((edge.id, source, target))
+        return graph
+
+    def bounds(self):
+        """
+        Returns the bounding box of the snapshot nodes in the form (left, top, right, bottom).
+        :rtype: tuple
+        """
+        if not self.ids:
+            return 0, 0, 0, 0
+        return (min(x - w / 2 for (x, _), (w, _) in zip(self.pos, self.size)),
+                min(y - h / 2 for (_, y), (_, h) in zip(self.pos, self.size)),
+                max(x + w / 2 for (x, _), (w, _) in zip(self.pos, self.size)),
+                max(y + h / 2 for (_, y), (_, h) in zip(self.pos, self.size)))
+
+    def components(self):
+        """
+        Returns the weakly connected components of the snapshot as lists of node indices.
+        :rtype: list
+        """
+        parent = list(range(len(self.ids)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for _, source, target in self.edges:
+            rs, rt = find(source), find(target)
+            if rs != rt:
+                parent[rs] = rt
+        components = {}
+        for i in range(len(self.ids)):
+            components.setdefault(find(i), []).append(i)
+        return sorted(components.values(), key=len, reverse=True)
+
+    def __len__(self):
+        """
+        Returns the number of nodes in the snapshot.
+        :rtype: int
+        """
+        return len(self.ids)
+
+
+class LayoutResult(object):
+    """
+    Holds the outcome of a layout algorithm: new node centers and new edge breakpoints.
+    """
+    def __init__(self, graph, pos, breakpoints=None):
+        """
+        Initialize the layout result.
+        :type graph: LayoutGraph
+        :type pos: list
+        :type breakpoints: dict
+        """
+        self.graph = graph
+        self.layout = None
+        self.pos = pos
+        self.breakpoints = breakpoints or {}
+
+    def translate(self, dx, dy):
+        """
+        Translate the whole result by the given deltas.
+        :type dx: float
+        :type dy: float
+        """
+        self.pos = [(x + dx, y + dy) for x, y in self.pos]
+        self.breakpoints = {k: [(x + dx, y + dy) for x, y in v] for k, v in self.breakpoints.items()}
+
+    def bounds(self):
+        """
+        Returns the bounding box of the laid out nodes in the form (left, top, right, bottom).
+        :rtype: tuple
+        """
+        size = self.graph.size
+        if not self.pos:
+            return 0, 0, 0, 0
+        return (min(x - w / 2 for (x, _), (w, _) in zip(self.pos, size)),
+                min(y - h / 2 for (_, y), (_, h) in zip(self.pos, size)),
+                max(x + w / 2 for (x, _), (w, _) in zip(self.pos, size)),
+                max(y + h / 2 for (_, y), (_, h) in zip(self.pos, size)))
+
+
+class AbstractLayout(object):
+    """
+    Base class for all the layout algorithms.
+    Layout algorithms operate on a LayoutGraph snapshot and never access diagram items directly.
+    """
+    __metaclass__ = ABCMeta
+
+    name = None
+
+    def __init__(self, spacing=80):
+        """
+        Initialize the layout algorithm.
+        :type spacing: int
+        """
+        self.spacing = spacing
+
+    def apply(self, graph, progress=None):
+        """
+        Lay out the given snapshot, keeping the result anchored to the original top-left corner.
+        :type graph: LayoutGraph
+        :type progress: callable
+        :rtype: LayoutResult
+        """
+        result = self.run(graph, progress or (lambda step, total: None))
+        l1, t1, _, _ = graph.bounds()
+        l2, t2, _, _ = result.bounds()
+        result.translate(l1 - l2, t1 - t2)
+        result.layout = self
+        return result
+
+    def pack(self, graph, results):
+        """
+        Pack the given per-component results (lists of (indices, positions, breakpoints)) into rows.
+        :type graph: LayoutGraph
+        :type results: list
+        :rtype: LayoutResult
+        """
+        boxes = []
+        for indices, pos, breakpoints in results:
+            points = [p for v in breakpoints.values() for p in v]
+            l = min([x - graph.size[i][0] / 2 for i, (x, _) in zip(indices, pos)] + [x for x, _ in points])
+            t = min([y - graph.size[i][1] / 2 for i, (_, y) in zip(indices, pos)] + [y for _, y in points])
+            r = max([x + graph.size[i][0] / 2 for i, (x, _) in zip(indices, pos)] + [x for x, _ in points])
+            b = max([y + graph.size[i][1] / 2 for i, (_, y) in zip(indices, pos)] + [y for _, y in points])
+            boxes.append((l, t, r - l, b - t))
+        area = sum(w * h for _, _, w, h in boxes)
+        limit = max(max(w for _, _, w, _ in boxes), math.sqrt(area) * 1.5)
+        position = [(0, 0)] * len(graph)
+        breakpoints = {}
+        cursorX = cursorY = rowHeight = 0
+        for (indices, pos, points), (l, t, w, h) in sorted(zip(results, boxes), key=lambda x: -x[1][3]):
+            if cursorX and cursorX + w > limit:
+                cursorX = 0
+                cursorY += rowHeight + self.spacing
+                rowHeight = 0
+            dx, dy = cursorX - l, cursorY - t
+            for i, (x, y) in zip(indices, pos):
+                position[i] = (x + dx, y + dy)
+            for k, v in points.items():
+                breakpoints[k] = [(x + dx, y + dy) for x, y in v]
+            cursorX += w + self.spacing
+            rowHeight = max(rowHeight, h)
+        return LayoutResult(graph, position, breakpoints)
+
+    @abstractmethod
+    def run(self, graph, progress):
+        """
+        Lay out the given snapshot.
+        :type graph: LayoutGraph
+        :type progress: callable
+        :rtype: LayoutResult
+        """
+        pass
+
+
+class LayeredLayout(AbstractLayout):
+    """
+    Sugiyama-style layered layout, best suited for ISA hierarchies.
+    Edges are directed from source (bottom) to target (top), so that superclasses are drawn above subclasses.
+    """
+    name = 'hierarchical'
+
+    def __init__(self, spacing=80, layerSpacing=120, sweeps=4):
+        """
+        Initialize the layout algorithm.
+        :type spacing: int
+        :type layerSpacing: int
+        :type sweeps: int
+        """
+        super().__init__(spacing)
+        self.layerSpacing = layerSpacing
+        self.sweeps = sweeps
+
+    def run(self, graph, progress):
+        """
+        Lay out the given snapshot.
+        :type graph: LayoutGraph
+        :type progress: callable
+        :rtype: LayoutResult
+        """
+        components = graph.components()
+        edges = {}
+        for edge in graph.edges:
+            edges.setdefault(edge[1], []).append(edge)
+        results = []
+        for step, indices in enumerate(components):
+            progress(step, len(components))
+            members = set(indices)
+            results.append(self.layoutComponent(graph, indices, [e for i in indices for e in edges.get(i, ()) if e[2] in members]))
+        progress(len(components), len(components))
+        return self.pack(graph, results)
+
+    def layoutComponent(self, graph, indices, edges):
+        """
+        Lay out a single connected component, returning a tuple (indices, positions, breakpoints).
+        :type graph: LayoutGraph
+        :type indices: list
+        :type edges: list
+        :rtype: tuple
+        """
+        if len(indices) == 1:
+            return indices, [graph.pos[indices[0]]], {}
+
+        local = {g: i for i, g in enumerate(indices)}
+        n = len(indices)
+
+        ## CYCLE REMOVAL: REVERSE BACK EDGES FOUND BY AN ITERATIVE DFS
+        successors = [[] for _ in range(n)]
+        for eid, source, target in edges:
+            successors[local[source]].append((local[target], eid))
+        state = [0] * n
+        dag = []
+        for root in sorted(range(n), key=lambda i: graph.pos[indices[i]][1], reverse=True):
+            if state[root]:
+                continue
+            state[root] = 1
+            stack = [(root, iter(successors[root]))]
+            while stack:
+                u, children = stack[-1]
+                for v, eid in children:
+                    if state[v] == 1:
+                        dag.append((v, u, eid, True))
+                    else:
+                        dag.append((u, v, eid, False))
+                        if state[v] == 0:
+                            state[v] = 1
+                            stack.append((v, iter(successors[v])))
+                            break
+                else:
+                    state[u] = 2
+                    stack.pop()
+
+        ## LAYERING: LONGEST PATH FROM THE TOP-MOST NODES
+        parents = [[] for _ in range(n)]
+        children = [[] for _ in range(n)]
+        for u, v, _, _ in dag:
+            parents[u].append(v)
+            children[v].append(u)
+        remaining = [len(p) for p in parents]
+        rank = [0] * n
+        queue = [i for i in range(n) if not remaining[i]]
+        while queue:
+            v = queue.pop()
+            for u in children[v]:
+                rank[u] = max(rank[u], rank[v] + 1)
+                remaining[u] -= 1
+                if not remaining[u]:
+                    queue.append(u)
+
+        ## DUMMY NODES FOR EDGES SPANNING MULTIPLE LAYERS
+        width = [graph.size[g][0] for g in indices]
+        height = [graph.size[g][1] for g in indices]
+        key = [graph.pos[g][0] for g in indices]
+        up = [[] for _ in range(n)]
+        down = [[] for _ in range(n)]
+        chains = {}
+        for u, v, eid, reversed_ in dag:
+            previous = u
+            chain = []
+            for r in range(rank[u] - 1, rank[v], -1):
+                dummy = len(rank)
+                rank.append(r)
+                width.append(0)
+                height.append(0)
+                key.append(key[u])
+                up.append([])
+                down.append([])
+                down[dummy].append(previous)
+                up[previous].append(dummy)
+                chain.append(dummy)
+                previous = dummy
+            up[previous].append(v)
+            down[v].append(previous)
+            if chain:
+                chains[eid] = chain if not reversed_ else chain[::-1]
+
+        layers = [[] for _ in range(max(rank) + 1)]
+        for w in sorted(range(len(rank)), key=lambda x: key[x]):
+            layers[rank[w]].append(w)
+
+        ## CROSSING REDUCTION: BARYCENTER HEURISTIC
+        order = [0] * len(rank)
+
+        def reorder(layer, neighbours):
+            keys = {}
+            for w in layer:
+                adjacent = neighbours[w]
+                keys[w] = sum(order[x] for x in adjacent) / len(adjacent) if adjacent else order[w]
+            layer.sort(key=lambda x: keys[x])
+            for i, w in enumerate(layer):
+                order[w] = i
+
+        for layer in layers:
+            for i, w in enumerate(layer):
+                order[w] = i
+        for _ in range(self.sweeps):
+            for layer in layers[1:]:
+                reorder(layer, up)
+            for layer in reversed(layers[:-1]):
+                reorder(layer, down)
+
+        ## COORDINATE ASSIGNMENT
+        x = [0.0] * len(rank)
+        for layer in layers:
+            cursor = 0
+            for w in layer:
+                x[w] = cursor + width[w] / 2
+                cursor += width[w] + self.gap(w, width)
+
+        def place(layer, neighbours):
+            desired = [sum(x[a] for a in neighbours[w]) / len(neighbours[w]) if neighbours[w] else x[w] for w in layer]
+            left = list(desired)
+            for i in range(1, len(layer)):
+                left[i] = max(left[i], left[i - 1] + self.separation(layer[i - 1], layer[i], width))
+            right = list(desired)
+            for i in range(len(layer) - 2, -1, -1):
+                right[i] = min(right[i], right[i + 1] - self.separation(layer[i], layer[i + 1], width))
+            for i, w in enumerate(layer):
+                x[w] = (left[i] + right[i]) / 2
+
+        for _ in range(self.sweeps):
+            for layer in layers[1:]:
+                place(layer, up)
+            for layer in reversed(layers[:-1]):
+                place(layer, down)
+
+        y = []
+        cursor = 0
+        for layer in layers:
+            layerHeight = max(height[w] for w in layer)
+            y.append(cursor + layerHeight / 2)
+            cursor += layerHeight + self.layerSpacing
+
+        positions = [(x[i], y[rank[i]]) for i in range(n)]
+        breakpoints = {eid: [(x[w], y[rank[w]]) for w in chain] for eid, chain in chains.items()}
+        return indices, positions, breakpoints
+
+    def gap(self, w, width):
+        """
+        Returns the horizontal space to leave after the given layer element.
+        :type w: int
+        :type width: list
+        :rtype: float
+        """
+        return self.spacing if width[w] else self.spacing / 4
+
+    def separation(self, a, b, width):
+        """
+        Returns the minimum distance between the centers of two adjacent layer elements.
+        :type a: int
+        :type b: int
+        :type width: list
+        :rtype: float
+        """
+        return (width[a] + width[b]) / 2 + min(self.gap(a, width), self.gap(b, width))
+
+
+class _Cell(object):
+    """
+    Quadtree cell used by the Barnes-Hut approximation.
+    """
+    __slots__ = ('body', 'children', 'cx', 'cy', 'mass', 'size')
+
+
+class ForceDirectedLayout(AbstractLayout):
+    """
+    Force-directed layout (spring-electrical model) using the Barnes-Hut approximation of the repulsive forces,
+    which reduces the cost of each iteration from quadratic to O(n log n).
+    """
+    name = 'force-directed'
+    MaxDepth = 32
+
+    def __init__(self, spacing=80, distance=180, iterations=None, theta=0.9, repulsion=0.2, gravity=0.05):
+        """
+        Initialize the layout algorithm.
+        :type spacing: int
+        :type distance: int
+        :type iterations: int
+        :type theta: float
+        :type repulsion: float
+        :type gravity: float
+        """
+        super().__init__(spacing)
+        self.distance = distance
+        self.iterations = iterations
+        self.theta = theta
+        self.repulsion = repulsion
+        self.gravity = gravity
+
+    def build(self, xs, ys, indices, x0, y0, size, depth=0):
+        """
+        Build the quadtree cell containing the given bodies.
+        :type xs: list
+        :type ys: list
+        :type indices: list
+        :type x0: float
+        :type y0: float
+        :type size: float
+        :type depth: int
+        :rtype: _Cell
+        """
+        cell = _Cell()
+        cell.size = size
+        cell.mass = len(indices)
+        if len(indices) == 1 or depth >= self.MaxDepth:
+            cell.body = indices[0] if len(indices) == 1 else None
+            cell.children = None
+            cell.cx = sum(xs[i] for i in indices) / cell.mass
+            cell.cy = sum(ys[i] for i in indices) / cell.mass
+            return cell
+        half = size / 2
+        mx, my = x0 + half, y0 + half
+        quadrants = ([], [], [], [])
+        for i in indices:
+            quadrants[(xs[i] >= mx) + 2 * (ys[i] >= my)].append(i)
+        cell.body = None
+        cell.children = []
+        cx = cy = 0
+        for q, bodies in enumerate(quadrants):
+            if bodies:
+                child = self.build(xs, ys, bodies, x0 + half * (q & 1), y0 + half * (q >> 1), half, depth + 1)
+                cell.children.append(child)
+                cx += child.cx * child.mass
+                cy += child.cy * child.mass
+        cell.cx = cx / cell.mass
+        cell.cy = cy / cell.mass
+        return cell
+
+    def run(self, graph, progress):
+        """
+        Lay out the given snapshot.
+        :type graph: LayoutGraph
+        :type progress: callable
+        :rtype: LayoutResult
+        """
+        edges = {}
+        for edge in graph.edges:
+            edges.setdefault(edge[1], []).append(edge)
+        results = []
+        done = 0
+        for indices in graph.components():
+            progress(done, len(graph))
+            results.append(self.layoutComponent(graph, indices, [(s, t) for i in indices for _, s, t in edges.get(i, ())]))
+            done += len(indices)
+        progress(done, len(graph))
+        return self.pack(graph, results)
+
+    def layoutComponent(self, graph, indices, edges):
+        """
+        Lay out a single connected component, returning a tuple (indices, positions, breakpoints).
+        :type graph: LayoutGraph
+        :type indices: list
+        :type edges: list
+        :rtype: tuple
+        """
+        n = len(indices)
+        if n == 1:
+            return indices, [graph.pos[indices[0]]], {}
+
+        local = {g: i for i, g in enumerate(indices)}
+        edges = [(local[s], local[t]) for s, t in edges]
+        xs = [graph.pos[g][0] for g in indices]
+        ys = [graph.pos[g][1] for g in indices]
+        # Spread coincident nodes apart, otherwise they would never be separated.
+        occupied = set()
+        for i in range(n):
+            while (xs[i], ys[i]) in occupied:
+                xs[i] += self.distance * math.cos(i)
+                ys[i] += self.distance * math.sin(i)
+            occupied.add((xs[i], ys[i]))
+
+        k = self.distance + sum(max(graph.size[g]) for g in indices) / n
+        k2 = self.repulsion * k * k
+        theta2 = self.theta * self.theta
+        iterations = self.iterations or (300 if n < 500 else 150 if n < 2000 else 60)
+        temperature = k * math.sqrt(n) / 2
+        cooling = temperature / (iterations + 1)
+
+        for _ in range(iterations):
+            dx = [0.0] * n
+            dy = [0.0] * n
+
+            ## REPULSION (BARNES-HUT)
+            x0, y0 = min(xs), min(ys)
+            size = max(max(xs) - x0, max(ys) - y0) + 1
+            root = self.build(xs, ys, list(range(n)), x0, y0, size)
+            for i in range(n):
+                xi, yi = xs[i], ys[i]
+                fx = fy = 0.0
+                stack = [root]
+                while stack:
+                    cell = stack.pop()
+                    ddx = xi - cell.cx
+                    ddy = yi - cell.cy
+                    d2 = ddx * ddx + ddy * ddy
+                    if cell.children is None or cell.size * cell.size < theta2 * d2:
+                        if cell.body == i:
+                            continue
+                        if d2 < 0.01:
+                            d2 = 0.01
+                        f = k2 * cell.mass / d2
+                        fx += ddx * f
+                        fy += ddy * f
+                    else:
+                        stack.extend(cell.children)
+                dx[i] = fx
+                dy[i] = fy
+
+            ## ATTRACTION ALONG EDGES
+            for source, target in edges:
+                ddx = xs[source] - xs[target]
+                ddy = ys[source] - ys[target]
+                f = math.sqrt(ddx * ddx + ddy * ddy) / k
+                dx[source] -= ddx * f
+                dy[source] -= ddy * f
+                dx[target] += ddx * f
+                dy[target] += ddy * f
+
+            ## GRAVITY AND DISPLACEMENT
+            cx = sum(xs) / n
+            cy = sum(ys) / n
+            for i in range(n):
+                fx = dx[i] - self.gravity * (xs[i] - cx)
+                fy = dy[i] - self.gravity * (ys[i] - cy)
+                d = math.sqrt(fx * fx + fy * fy)
+                if d > 0:
+                    scale = min(d, temperature) / d
+                    xs[i] += fx * scale
+                    ys[i] += fy * scale
+            temperature -= cooling
+
+        return indices, list(zip(xs, ys)), {}
+
+
+class LayoutWorker(AbstractWorker):
+    """
+    Extends AbstractWorker providing a worker thread that will compute a layout over a diagram snapshot.
+    """
+    sgnCompleted = QtCore.pyqtSignal(object)
+    sgnErrored = QtCore.pyqtSignal(Exception)
+    sgnProgress = QtCore.pyqtSignal(int, int)
+
+    def __init__(self, layout, graph):
+        """
+        Initialize the layout worker.
+        :type layout: AbstractLayout
+        :type graph: LayoutGraph
+        """
+        super().__init__()
+        self.layout = layout
+        self.graph = graph
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        """
+        Main worker.
+        """
+        try:
+            LOGGER.debug('Computing %s layout for %s node(s)', self.layout.name, len(self.graph))
+            result = self.layout.apply(self.graph, self.sgnProgress.emit)
+        except Exception as e:
+            LOGGER.exception('Layout computation failed: %s', e)
+            self.sgnErrored.emit(e)
+        else:
+            self.sgnCompleted.emit(result)
+        finally:
+            self.finished.emit()
@@ -47,8 +47,8 @@ from eddy.core.diagram import DiagramNotFoundError
 from eddy.core.diagram import DiagramNotValidError
 from eddy.core.diagram import DiagramParseError
 from eddy.core.functions.fsystem import fexists
-from eddy.core.functions.fsystem import fread
 from eddy.core.functions.misc import snapF, isEmpty, rstrip, snap
+from eddy.core.functions.path import expandPath
 from eddy.core.functions.signals import connect
 from eddy.core.loaders.common import AbstractOntologyLoader
 from eddy.core.output import getLogger
@@ -61,7 +61,13 @@ LOGGER = getLogger()
 class GraphMLOntologyLoader(AbstractOntologyLoader):
     """
     Extends AbstractOntologyLoader with facilities to load ontologies from GraphML file format.
+    The GraphML document is streamed: every top-level element is read into a standalone
+    QDomElement, dispatched through the element handler table, and discarded. Elements which
+    cannot be imported are reported in the warnings list rather than aborting the import,
+    and are summarized to the user by the session once the import completes.
     """
+    BatchSize = 250
+
     def __init__(self, path, project, session):
         """
         Initialize the GraphML importer.
@@ -75,8 +81,20 @@ class GraphMLOntologyLoader(AbstractOntologyLoader):
         self.edges = dict()
         self.nodes = dict()
         self.diagram = None
-        self.document = None
         self.nproject = None
+        self.pending = []
+        self.deferred = []
+        self.predicates = []
+        self.warnings = []
+        self.streaming = False
+        self.line = 0
+
+        self.ignoredElements = {'data', 'desc'}
+        self.importFuncForElement = {
+            'key': self.importKeyElement,
+            'node': self.importNodeElement,
+            'edge': self.importEdgeElement,
+        }
 
         self.importFuncForItem = {
             Item.AttributeNode: self.importAttributeNode,
@@ -103,6 +121,57 @@ class GraphMLOntologyLoader(AbstractOntologyLoader):
             Item.DifferentEdge: self.importDifferentEdge,
         }
 
+    #############################################
+    #   ELEMENTS
+    #################################
+
+    def importKeyElement(self, element):
+        """
+        Import the GraphML key declared by the given QDomElement.
+        :type element: QDomElement
+        """
+        if element.attribute('yfiles.type', '') == 'nodegraphics':
+            self.keys['node_key'] = element.attribute('id')
+        if element.attribute('yfiles.type', '') == 'edgegraphics':
+            self.keys['edge_key'] = element.attribute('id')
+
+    def importNodeElement(self, element):
+        """
+        Build the node described by the given QDomElement and queue it for insertion in the diagram.
+        :type element: QDomElement
+        raise DiagramParseError: If the node cannot be generated.
+        """
+        item = self.itemFromXmlNode(element)
+        if not item:
+            raise DiagramParseError('could not identify item for XML node')
+        node = self.importFuncForItem[item](element)
+        if not node:
+            raise DiagramParseError('could not generate item for XML node')
+        self.nodes[node.id] = node
+        self.pending.append(node)
+
+    def importEdgeElement(self, element):
+        """
+        Build the edge described by the given QDomElement and queue it for insertion in the diagram.
+        Edges are postponed until the end of the document if any of their endpoints has not been read yet.
+        :type element: QDomElement
+        raise DiagramParseError: If the edge cannot be generated.
+        """
+        if self.streaming:
+            if element.attribute('source') not in self.nodes or element.attribute('target') not in self.nodes:
+                self.deferred.append((self.line, element))
+                return
+        item = self.itemFromXmlNode(element)
+        if not item:
+            raise DiagramParseError('could not identify item for XML node')
+        edge = self.importFuncForItem[item](element)
+        if not edge:
+            raise DiagramParseError('could not generate item for XML node')
+        if edge.type() is Item.InputEdge:
+            self.predicates.append(element)
+        self.edges[edge.id] = edge
+        self.pending.append(edge)
+
     #############################################
     #   NODES
     #################################
@@ -656,81 +725,148 @@ class GraphMLOntologyLoader(AbstractOntologyLoader):
                         node.label.setPos(pos)
 
     #############################################
-    #   MAIN IMPORT
+    #   STREAMING
     #################################
 
-    def createDomDocument(self):
+    def addWarning(self, tag, id, message):
+        """
+        Record a warning for a GraphML element which could not be imported.
+        Warnings are collected in the form of (line, tag, id, message) tuples.
+        :type tag: str
+        :type id: str
+        :type message: str
+        """
+        LOGGER.warning('Failed to import %s %s (line %s): %s', tag, id, self.line, message)
+        self.warnings.append((self.line, tag, id, message))
+
+    def flush(self):
         """
-        Create the QDomDocument from where to parse information.
+        Add to the diagram the items generated since the last flush.
         """
+        for item in self.pending:
+            self.diagram.addItem(item)
+            self.diagram.guid.update(item.id)
+        self.pending.clear()
         QtWidgets.QApplication.processEvents()
 
-        LOGGER.info('Loading diagram: %s', self.path)
+    def importElement(self, element):
+        """
+        Import the given top-level GraphML element using the element handler table.
+        :type element: QDomElement
+        """
+        try:
+            func = self.importFuncForElement.get(element.tagName())
+            if not func:
+                raise DiagramParseError('unexpected element <{0}>'.format(element.tagName()))
+            func(element)
+        except DiagramParseError as err:
+            self.addWarning(element.tagName(), element.attribute('id'), str(err))
+        except Exception as err:
+            LOGGER.exception('Failed to import %s %s', element.tagName(), element.attribute('id'))
+            self.addWarning(element.tagName(), element.attribute('id'), str(err))
+
+    def readDocument(self, reader):
+        """
+        Read the GraphML document from the given stream reader, importing its top-level elements one at a time.
+        :type reader: QXmlStreamReader
+        raise DiagramNotValidError: If the document does not contain a valid GraphML graph.
+        """
+        graph = False
+        self.streaming = True
+        while not reader.atEnd():
+            if reader.readNext() != QtCore.QXmlStreamReader.StartElement:
+                continue
+            name = reader.qualifiedName()
+            if name == 'graphml':
+                continue
+            if name == 'graph':
+                if not 'node_key' in self.keys:
+                    raise DiagramNotValidError('could not parse node keys from {0}'.format(self.path))
+                if not 'edge_key' in self.keys:
+                    raise DiagramNotValidError('could not parse edge keys from {0}'.format(self.path))
+                LOGGER.debug('Using node key: %s', self.keys['node_key'])
+                LOGGER.debug('Using edge key: %s', self.keys['edge_key'])
+                graph = True
+                continue
+            if name in self.ignoredElements:
+                reader.skipCurrentElement()
+                continue
+            self.line = reader.lineNumber()
+            element = self.readElement(reader)
+            if reader.hasError():
+                break
+            self.importElement(element)
+            if len(self.pending) >= self.BatchSize:
+                self.flush()
+
+        if reader.hasError():
+            if not graph:
+                raise DiagramNotValidError('could not parse diagram from {0}: {1}'.format(self.path, reader.errorString()))
+            self.line = reader.lineNumber()
+            self.addWarning('graphml', '', reader.errorString())
 
-        if not fexists(self.path):
-            raise DiagramNotFoundError('diagram not found: {0}'.format(self.path))
+    @staticmethod
+    def readElement(reader):
+        """
+        Read the element the given stream reader is positioned on, together with its subtree, into a standalone QDomElement.
+        :type reader: QXmlStreamReader
+        :rtype: QDomElement
+        """
+        document = QtXml.QDomDocument()
+        root = current = document.createElement(reader.qualifiedName())
+        document.appendChild(root)
+        while True:
+            for attribute in reader.attributes():
+                current.setAttribute(attribute.qualifiedName(), attribute.value())
+            while not reader.atEnd():
+                token = reader.readNext()
+                if token == QtCore.QXmlStreamReader.StartElement:
+                    child = document.createElement(reader.qualifiedName())
+                    current.appendChild(child)
+                    current = child
+                    break
+                if token == QtCore.QXmlStreamReader.Characters and not reader.isWhitespace():
+                    current.appendChild(document.createTextNode(reader.text()))
+                elif token == QtCore.QXmlStreamReader.EndElement:
+                    if current == root:
+                        return root
+                    current = current.parentNode().toElement()
+            else:
+                return root
 
-        self.document = QtXml.QDomDocument()
-        if not self.document.setContent(fread(self.path)):
-            raise DiagramNotValidError('could not parse diagram from {0}'.format(self.path))
+    #############################################
+    #   MAIN IMPORT
+    #################################
 
     def createDiagram(self):
         """
         Creates a diagram and reverse the content of the GraphML document in it.
         """
+        LOGGER.info('Loading diagram: %s', self.path)
+
+        if not fexists(self.path):
+            raise DiagramNotFoundError('diagram not found: {0}'.format(self.path))
+
         LOGGER.debug('Initializing empty diagram with size: %s', Diagram.MaxSize)
         name = os.path.basename(self.path)
         name = rstrip(name, File.GraphML.extension)
         self.diagram = Diagram.create(name, Diagram.MaxSize, self.nproject)
 
-        root = self.document.documentElement()
-        graph = root.firstChildElement('graph')
-        e = graph.firstChildElement('node')
-        while not e.isNull():
-            try:
-                QtWidgets.QApplication.processEvents()
-                item = self.itemFromXmlNode(e)
-                if not item:
-                    raise DiagramParseError('could not identify item for XML node')
-                func = self.importFuncForItem[item]
-                node = func(e)
-                if not node:
-                    raise DiagramParseError('could not generate item for XML node')
-            except DiagramParseError as err:
-                LOGGER.warning('Failed to create node %s: %s', e.attribute('id'), err)
-            except Exception:
-                LOGGER.exception('Failed to create node %s', e.attribute('id'))
-            else:
-                self.diagram.addItem(node)
-                self.diagram.guid.update(node.id)
-                self.nodes[node.id] = node
-            finally:
-                e = e.nextSiblingElement('node')
-
-        LOGGER.debug('Loaded nodes: %s', len(self.nodes))
+        file = QtCore.QFile(expandPath(self.path))
+        if not file.open(QtCore.QIODevice.ReadOnly):
+            raise DiagramNotValidError('could not open diagram {0}: {1}'.format(self.path, file.errorString()))
+        try:
+            self.readDocument(QtCore.QXmlStreamReader(file))
+        finally:
+            file.close()
 
-        e = graph.firstChildElement('edge')
-        while not e.isNull():
-            try:
-                QtWidgets.QApplication.processEvents()
-                item = self.itemFromXmlNode(e)
-                if not item:
-                    raise DiagramParseError('could not identify item for XML node')
-                func = self.importFuncForItem[item]
-                edge = func(e)
-                if not edge:
-                    raise DiagramParseError('could not generate item for XML node')
-            except DiagramParseError as err:
-                LOGGER.warning('Failed to create edge %s: %s', e.attribute('id'), err)
-            except Exception:
-                LOGGER.exception('Failed to create edge %s', e.attribute('id'))
-            else:
-                self.diagram.addItem(edge)
-                self.diagram.guid.update(edge.id)
-                self.edges[edge.id] = edge
-            finally:
-                e = e.nextSiblingElement('edge')
+        self.streaming = False
+        for self.line, element in self.deferred:
+            self.importElement(element)
+        self.deferred.clear()
+        self.flush()
 
+        LOGGER.debug('Loaded nodes: %s', len(self.nodes))
         LOGGER.debug('Loaded edges: %s', len(self.edges))
 
         nodes = [n for n in self.nodes.values() if Identity.Neutral in n.identities()]
@@ -744,7 +880,7 @@ class GraphMLOntologyLoader(AbstractOntologyLoader):
 
         connect(self.diagram.sgnItemAdded, self.nproject.doAddItem)
         connect(self.diagram.sgnItemRemoved, self.nproject.doRemoveItem)
-        connect(self.diagram.selectionChanged, self.session.doUpdateState)
+        connect(self.diagram.selectionChanged, self.session.doScheduleUpdateState)
 
         self.nproject.addDiagram(self.diagram)
 
@@ -767,13 +903,10 @@ class GraphMLOntologyLoader(AbstractOntologyLoader):
         """
         Import predicate metadata into the new project.
         """
-        r = self.document.documentElement()
-        g = r.firstChildElement('graph')
-        e = g.firstChildElement('edge')
-        while not e.isNull():
+        for element in self.predicates:
             QtWidgets.QApplication.processEvents()
-            self.importPredicateMetaFromElement(e)
-            e = e.nextSiblingElement('edge')
+            self.importPredicateMetaFromElement(element)
+        self.predicates.clear()
 
         LOGGER.debug('Loaded predicate metadata from original diagram: %s', self.path)
 
@@ -805,29 +938,6 @@ class GraphMLOntologyLoader(AbstractOntologyLoader):
             self.optimizeLabelPos(node)
         LOGGER.debug('Performed geometrical optimization on %s nodes', len(self.diagram.nodes()))
 
-    def parseDocumentMeta(self):
-        """
-        Read metadata from the open QDomDocument, necessary to parse the GraphML diagram structure.
-        """
-        QtWidgets.QApplication.processEvents()
-
-        root = self.document.documentElement()
-        key = root.firstChildElement('key')
-        while not key.isNull():
-            if key.attribute('yfiles.type', '') == 'nodegraphics':
-                self.keys['node_key'] = key.attribute('id')
-            if key.attribute('yfiles.type', '') == 'edgegraphics':
-                self.keys['edge_key'] = key.attribute('id')
-            key = key.nextSiblingElement('key')
-
-        if not 'node_key' in self.keys:
-            raise DiagramNotValidError('could not parse node keys from {0}'.format(self.path))
-        if not 'edge_key' in self.keys:
-            raise DiagramNotValidError('could not parse edge keys from {0}'.format(self.path))
-
-        LOGGER.debug('Using node key: %s', self.keys['node_key'])
-        LOGGER.debug('Using edge key: %s', self.keys['edge_key'])
-
     def projectMerge(self):
         """
         Merge the loaded project with the one currently loaded in Eddy session.
@@ -844,7 +954,8 @@ class GraphMLOntologyLoader(AbstractOntologyLoader):
         Render all the elements in the new project ontology.
         """
         LOGGER.debug('Refreshing project "%s" elements state', self.nproject.name)
-        for item in self.nproject.items():
+        # PROCESSING EVENTS MAY ADD OR REMOVE ITEMS, HENCE ITERATE A SNAPSHOT OF THE LIVE VIEW
+        for item in tuple(self.nproject.items()):
             QtWidgets.QApplication.processEvents()
             item.updateEdgeOrNode()
 
@@ -864,8 +975,6 @@ class GraphMLOntologyLoader(AbstractOntologyLoader):
         """
         Perform ontology import from GraphML file format and merge it with the current project.
         """
-        self.createDomDocument()
-        self.parseDocumentMeta()
         self.createProject()
         self.createDiagram()
         self.optimizeDiagram()
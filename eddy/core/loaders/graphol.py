@@ -607,7 +607,7 @@ class GrapholDiagramLoader_v1(AbstractDiagramLoader):
 
         connect(self.diagram.sgnItemAdded, self.project.doAddItem)
         connect(self.diagram.sgnItemRemoved, self.project.doRemoveItem)
-        connect(self.diagram.selectionChanged, self.session.doUpdateState)
+        connect(self.diagram.selectionChanged, self.session.doScheduleUpdateState)
 
         LOGGER.debug('Diagram created: %s', self.diagram.name)
 
@@ -1405,7 +1405,7 @@ class GrapholLoaderMixin_v2(object):
         ## CONFIGURE DIAGRAM SIGNALS
         connect(diagram.sgnItemAdded, self.nproject.doAddItem)
         connect(diagram.sgnItemRemoved, self.nproject.doRemoveItem)
-        connect(diagram.selectionChanged, self.session.doUpdateState)
+        connect(diagram.selectionChanged, self.session.doScheduleUpdateState)
         ## RETURN GENERATED DIAGRAM
         return diagram
 
@@ -1524,7 +1524,8 @@ class GrapholLoaderMixin_v2(object):
         """
         Render all the elements in the Project ontology.
         """
-        for item in self.nproject.items():
+        # PROCESSING EVENTS MAY ADD OR REMOVE ITEMS, HENCE ITERATE A SNAPSHOT OF THE LIVE VIEW
+        for item in tuple(self.nproject.items()):
             QtWidgets.QApplication.processEvents()
             item.updateEdgeOrNode()
 
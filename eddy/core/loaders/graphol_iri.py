@@ -35,6 +35,7 @@
 
 import os
 import textwrap
+from functools import partial
 from time import time
 
 from PyQt5 import (
@@ -45,6 +46,7 @@ from PyQt5 import (
 )
 
 from eddy import APPNAME
+from eddy.core.catalogue import DiagramCatalogue
 from eddy.core.commands.diagram import CommandDiagramAdd
 from eddy.core.commands.project import (
     CommandProjectAddAnnotationProperty,
@@ -71,6 +73,11 @@ from eddy.core.loaders.common import (
     AbstractOntologyLoader,
     AbstractProjectLoader,
 )
+from eddy.core.loaders.graphol_model import (
+    ItemFromXml,
+    parse,
+    parseIRI,
+)
 from eddy.core.loaders.owl2 import OwlOntologyImportWorker
 from eddy.core.output import getLogger
 from eddy.core.owl import (
@@ -91,6 +98,7 @@ from eddy.core.project import (
     K_REFLEXIVE,
     K_SYMMETRIC,
     K_TRANSITIVE,
+    PendingDiagram,
     Project,
     ProjectNotFoundError,
     ProjectNotValidError,
@@ -99,7 +107,13 @@ from eddy.core.project import (
     ProjectVersionError,
 )
 from eddy.core.regex import RE_FACET
+from eddy.core.worker import (
+    FunctionWorker,
+    runInChunks,
+    runInThread,
+)
 from eddy.ui.dialogs import DiagramSelectionDialog
+from eddy.ui.progress import BusyProgressDialog
 
 LOGGER = getLogger()
 
@@ -669,7 +683,7 @@ class GrapholDiagramLoader_v1(AbstractDiagramLoader):
 
         connect(self.diagram.sgnItemAdded, self.project.doAddItem)
         connect(self.diagram.sgnItemRemoved, self.project.doRemoveItem)
-        connect(self.diagram.selectionChanged, self.session.doUpdateState)
+        connect(self.diagram.selectionChanged, self.session.doScheduleUpdateState)
 
         LOGGER.debug('Diagram created: %s', self.diagram.name)
 
@@ -1232,7 +1246,8 @@ class GrapholProjectIRILoaderMixin_2(object):
         """
         Render all the elements in the Project ontology.
         """
-        for item in self.nproject.items():
+        # PROCESSING EVENTS MAY ADD OR REMOVE ITEMS, HENCE ITERATE A SNAPSHOT OF THE LIVE VIEW
+        for item in tuple(self.nproject.items()):
             QtWidgets.QApplication.processEvents()
             item.updateEdgeOrNode()
 
@@ -1308,7 +1323,7 @@ class GrapholProjectIRILoaderMixin_2(object):
         ## CONFIGURE DIAGRAM SIGNALS
         connect(diagram.sgnItemAdded, self.nproject.doAddItem)
         connect(diagram.sgnItemRemoved, self.nproject.doRemoveItem)
-        connect(diagram.selectionChanged, self.session.doUpdateState)
+        connect(diagram.selectionChanged, self.session.doScheduleUpdateState)
         ## RETURN GENERATED DIAGRAM
         return diagram
 
@@ -1956,35 +1971,13 @@ class GrapholProjectIRILoaderMixin_3(object):
 
         self.buffer = dict()
         self.document = None
+        self.lazy = False
+        self.model = None
         self.nproject = None
+        self.references = dict()
+        self.renderNum = None
 
-        self.itemFromXml = {
-            'attribute': Item.AttributeNode,
-            'complement': Item.ComplementNode,
-            'concept': Item.ConceptNode,
-            'datatype-restriction': Item.DatatypeRestrictionNode,
-            'disjoint-union': Item.DisjointUnionNode,
-            'domain-restriction': Item.DomainRestrictionNode,
-            'enumeration': Item.EnumerationNode,
-            'facet': Item.FacetNode,
-            'individual': Item.IndividualNode,
-            'literal': Item.LiteralNode,
-            'intersection': Item.IntersectionNode,
-            'property-assertion': Item.PropertyAssertionNode,
-            'range-restriction': Item.RangeRestrictionNode,
-            'role': Item.RoleNode,
-            'role-chain': Item.RoleChainNode,
-            'role-inverse': Item.RoleInverseNode,
-            'union': Item.UnionNode,
-            'value-domain': Item.ValueDomainNode,
-            'inclusion': Item.InclusionEdge,
-            'equivalence': Item.EquivalenceEdge,
-            'input': Item.InputEdge,
-            'membership': Item.MembershipEdge,
-            'same': Item.SameEdge,
-            'different': Item.DifferentEdge,
-            'has-key': Item.HasKeyNode
-        }
+        self.itemFromXml = dict(ItemFromXml)
 
         self.importFuncForItem = {
             Item.AttributeNode: self.importAttributeNode,
@@ -2015,141 +2008,127 @@ class GrapholProjectIRILoaderMixin_3(object):
         }
 
     #############################################
-    #   DOCUMENT (Prefixes,OntologyIRI)
+    #   MODEL
     #################################
-    def createDomDocument(self):
+
+    def createModel(self):
         """
-        Create the QDomDocument from where to parse Project information.
+        Parse the project file on a worker thread, creating the model the Project is built from.
         """
-        if not fexists(self.path):
-            raise ProjectNotFoundError('missing project ontology: %s' % self.path)
-        self.document = QtXml.QDomDocument()
-        if not self.document.setContent(fread(self.path)):
-            raise ProjectNotValidError('invalid project ontology supplied: %s' % self.path)
-        e = self.document.documentElement()
-        version = int(e.attribute('version', '3'))
-        if version != 3:
-            raise ProjectVersionError('project version mismatch: %s != 3' % version)
+        worker = FunctionWorker(parse, self.path)
+        runInThread(worker)
+        if worker.error:
+            raise worker.error
+        self.model = worker.result
+
+    def stepNum(self):
+        """
+        Returns the number of steps needed to build the Project out of the model: a step for each
+        IRI and item record, plus a step for each item to render. The number of items to render
+        is estimated from the model until the diagrams have been built (item records which fail
+        to import produce no item, while lazily loaded diagrams are not rendered at all).
+        :rtype: int
+        """
+        steps = len(self.model.iris) + self.model.itemNum()
+        if self.renderNum is not None:
+            return steps + self.renderNum
+        return steps if self.lazy else steps + self.model.itemNum()
 
     #############################################
     #   PROJECT (Prefixes,OntologyIRI)
     #################################
-    def createProject(self):
+
+    def buildProject(self):
         """
-        Create the Project by reading data from the parsed QDomDocument.
+        Build the Project out of the model on the calling thread. This is a generator yielding
+        the number of steps completed so far after each step of the construction (see stepNum),
+        so that the construction can be carried out in chunks (see runInChunks).
+        :rtype: generator
         """
-        projectEl = self.document.documentElement().firstChildElement('project')
-        projectVersion = projectEl.attribute('version')
-        projectName = projectEl.attribute('name')
-        ontologyEl = projectEl.firstChildElement('ontology')
-        ontologyIri = ontologyEl.attribute('iri')
-        ontologyPrefix =  ontologyEl.attribute('prefix',None) if ontologyEl.hasAttribute('prefix') else None
-        labelBoolean = False
-        if ontologyEl.attribute('addLabelFromSimpleName'):
-            labelBoolean = bool(int(ontologyEl.attribute('addLabelFromSimpleName')))
-        labelUserInputBoolean = False
-        if ontologyEl.attribute('addLabelFromUserInput'):
-            labelUserInputBoolean = bool(int(ontologyEl.attribute('addLabelFromUserInput')))
-
-        ontologyLang = ontologyEl.attribute('lang')
-        prefixMap = self.getPrefixMap(ontologyEl)
-        datatypes = self.getDatatypes(ontologyEl)
-        facets = self.getFacets(ontologyEl)
-        annotationProperties = self.getAnnotationproperties(ontologyEl)
-        languages = self.getLanguages(ontologyEl)
-        imports = self.getImports(ontologyEl)
+        model = self.model
+        imports = set()
+        for record in model.imports:
+            try:
+                imports.add(ImportedOntology(record.iri, record.location, record.version, record.isLocal))
+            except Exception as e:
+                LOGGER.exception('Failed to import element. {}'.format(str(e)))
         self.nproject = Project(
             parent=self.session,
-            name=projectName,
+            name=model.name,
             path=self.path,
-            version=projectVersion,
+            version=model.version,
             profile=self.session.createProfile('OWL 2'),
-            prefixMap=prefixMap,
-            ontologyIRI=ontologyIri,
-            ontologyPrefix=ontologyPrefix,
-            annotationProperties=annotationProperties,
-            datatypes=datatypes,
-            facets=facets,
+            prefixMap=dict(model.prefixes),
+            ontologyIRI=model.ontologyIRI,
+            ontologyPrefix=model.ontologyPrefix,
+            annotationProperties=set(model.annotationProperties),
+            datatypes=set(model.datatypes),
+            facets=set(model.facets),
             imports=imports,
-            languages=languages,
-            defaultLanguage=ontologyLang,
-            addLabelFromSimpleName=labelBoolean,
-            addLabelFromUserInput=labelUserInputBoolean,
+            languages=set(model.languages),
+            defaultLanguage=model.language,
+            addLabelFromSimpleName=model.addLabelFromSimpleName,
+            addLabelFromUserInput=model.addLabelFromUserInput,
         )
         LOGGER.info('Loaded ontology: %s...', self.nproject.name)
-
-        irisEl = ontologyEl.firstChildElement('iris')
-        iriEl = irisEl.firstChildElement('iri')
-        while not iriEl.isNull():
+        steps = 0
+        ## CREATE IRIS
+        for record in model.iris:
             try:
-                self.getIri(iriEl, datatypes,facets,annotationProperties)
+                self.createIRI(record)
             except Exception as e:
                 LOGGER.exception('Failed to import iri element [{}]'.format(e))
-            finally:
-                iriEl = iriEl.nextSiblingElement('iri')
-
-
+            steps += 1
+            yield steps
+        ## CREATE DIAGRAMS
+        catalogue = DiagramCatalogue.forProject(self.nproject)
+        for record in model.diagrams:
+            catalogue.fromDomElement(record.name, record.element.firstChildElement('catalogue'))
+            if self.lazy:
+                self.nproject.addPendingDiagram(self.importPendingDiagram(record))
+                steps += record.itemNum()
+                yield steps
+            else:
+                diagram = self.importDiagram(record)
+                for _ in self.importDiagramItems(diagram, record):
+                    steps += 1
+                    yield steps
+                self.nproject.addDiagram(diagram)
+        ## RENDER ITEMS
+        items = tuple(self.nproject.index.items())
+        self.renderNum = len(items)
+        for item in items:
+            item.updateEdgeOrNode()
+            steps += 1
+            yield steps
 
-    def getIri(self,iriEl,datatypes,facets,annotationProperties):
-        iriString = iriEl.firstChildElement('value').text()
-        if not (iriString in datatypes or iriString in facets or iriString in annotationProperties):
-            result = self.nproject.getIRI(iriString)
-            if not iriEl.firstChildElement('functional').isNull():
-                result.functional = True
-            if not iriEl.firstChildElement('inverseFunctional').isNull():
-                result.inverseFunctional = True
-            if not iriEl.firstChildElement('symmetric').isNull():
-                result.symmetric = True
-            if not iriEl.firstChildElement('asymmetric').isNull():
-                result.asymmetric = True
-            if not iriEl.firstChildElement('reflexive').isNull():
-                result.reflexive = True
-            if not iriEl.firstChildElement('irreflexive').isNull():
-                result.irreflexive = True
-            if not iriEl.firstChildElement('transitive').isNull():
-                result.transitive = True
-            '''
-            result.functional = bool(int(iriEl.firstChildElement('functional').text()))
-            result.inverseFunctional = bool(int(iriEl.firstChildElement('inverseFunctional').text()))
-            result.symmetric = bool(int(iriEl.firstChildElement('symmetric').text()))
-            result.asymmetric = bool(int(iriEl.firstChildElement('asymmetric').text()))
-            result.reflexive = bool(int(iriEl.firstChildElement('reflexive').text()))
-            result.irreflexive = bool(int(iriEl.firstChildElement('irreflexive').text()))
-            result.transitive = bool(int(iriEl.firstChildElement('transitive').text()))
-            '''
-            annotationsEl = iriEl.firstChildElement('annotations')
-            if not annotationsEl.isNull():
-                annotationEl = annotationsEl.firstChildElement('annotation')
-                while not annotationEl.isNull():
-                    try:
-                        result.addAnnotationAssertion(self.getAnnotationAssertion(annotationEl))
-                    except Exception as e:
-                        LOGGER.exception('Failed to import annotation element for iri {} [{}]'.format(iriString,e))
-                    finally:
-                        annotationEl = annotationEl.nextSiblingElement('annotation')
-            return result
+    def createIRI(self, record):
+        """
+        Create the IRI described by the given record.
+        :type record: IRIRecord
+        :rtype: IRI
+        """
+        iri = self.nproject.getIRI(record.value)
+        for flag in record.flags:
+            setattr(iri, flag, True)
+        for annotation in record.annotations:
+            try:
+                iri.addAnnotationAssertion(self.createAnnotationAssertion(annotation))
+            except Exception as e:
+                LOGGER.exception('Failed to import annotation element for iri {} [{}]'.format(record.value, e))
+        return iri
 
-    def getAnnotationAssertion(self,annotationEl):
-        subjectEl = annotationEl.firstChildElement('subject')
-        subject = self.nproject.getIRI(subjectEl.text())
-        propertyEl = annotationEl.firstChildElement('property')
-        property = self.nproject.getIRI(propertyEl.text())
-        value = None
-        type = None
-        language = None
-        objectEl = annotationEl.firstChildElement('object')
-        iriObjEl = objectEl.firstChildElement('iri')
-        if not iriObjEl.isNull():
-            value = self.nproject.getIRI(iriObjEl.text())
-        else:
-            value = objectEl.firstChildElement('lexicalForm').text()
-            datatypeEl = objectEl.firstChildElement('datatype')
-            if datatypeEl.text():
-                type = self.nproject.getIRI(datatypeEl.text())
-            languageEl = objectEl.firstChildElement('language')
-            if languageEl.text():
-                language = languageEl.text()
-        return AnnotationAssertion(subject,property,value,type,language)
+    def createAnnotationAssertion(self, record):
+        """
+        Create the annotation assertion described by the given record.
+        :type record: AnnotationRecord
+        :rtype: AnnotationAssertion
+        """
+        subject = self.nproject.getIRI(record.subject)
+        property = self.nproject.getIRI(record.property)
+        value = self.nproject.getIRI(record.value) if record.isIRI else record.value
+        type = self.nproject.getIRI(record.datatype) if record.datatype else None
+        return AnnotationAssertion(subject, property, value, type, record.language)
 
     def getAnnotation(self,annotationEl):
         propertyEl = annotationEl.firstChildElement('property')
@@ -2171,180 +2150,102 @@ class GrapholProjectIRILoaderMixin_3(object):
                 language = languageEl.text()
         return Annotation(property,value,type,language)
 
-    def getPrefixMap(self, ontologyEl):
-        prefixMap = dict()
-        prefixesEl = ontologyEl.firstChildElement('prefixes')
-        prefixEl = prefixesEl.firstChildElement('prefix')
-        while not prefixEl.isNull():
-            try:
-                value = prefixEl.firstChildElement('value').text()
-                ns = prefixEl.firstChildElement('namespace').text()
-                prefixMap[value] = ns
-            except Exception as e:
-                LOGGER.exception('Failed to import prefix element ')
-            finally:
-                prefixEl = prefixEl.nextSiblingElement('prefix')
-        return prefixMap
-
-    def getAnnotationproperties(self, ontologyEl):
-        result = set()
-        annotationPropertiesEl = ontologyEl.firstChildElement('annotationProperties')
-        annotationPropertyEl = annotationPropertiesEl.firstChildElement('annotationProperty')
-        while not annotationPropertyEl.isNull():
-            try:
-                iriStr = annotationPropertyEl.text()
-                result.add(iriStr)
-            except Exception as e:
-                LOGGER.exception('Failed to import annotationProperty element ')
-            finally:
-                annotationPropertyEl = annotationPropertyEl.nextSiblingElement('annotationProperty')
-        return result
-
-    def getDatatypes(self, ontologyEl):
-        result = set()
-        datatypesEl = ontologyEl.firstChildElement('datatypes')
-        datatypeEl = datatypesEl.firstChildElement('datatype')
-        while not datatypeEl.isNull():
-            try:
-                iriStr = datatypeEl.text()
-                result.add(iriStr)
-            except Exception as e:
-                LOGGER.exception('Failed to import datatype element ')
-            finally:
-                datatypeEl = datatypeEl.nextSiblingElement('datatype')
-        return result
-
-    def getFacets(self, ontologyEl):
-        result = set()
-        facetsEls = ontologyEl.firstChildElement('facets')
-        facetEl = facetsEls.firstChildElement('facet')
-        while not facetEl.isNull():
-            try:
-                iriStr = facetEl.text()
-                result.add(iriStr)
-            except Exception as e:
-                LOGGER.exception('Failed to import facet element ')
-            finally:
-                facetEl = facetEl.nextSiblingElement('facet')
-        return result
-
-    def getLanguages(self, ontologyEl):
-        result = set()
-        languagesEl = ontologyEl.firstChildElement('languages')
-        languageEl = languagesEl.firstChildElement('language')
-        while not languageEl.isNull():
-            try:
-                lang = languageEl.text()
-                result.add(lang)
-            except Exception as e:
-                LOGGER.exception('Failed to import language element ')
-            finally:
-                languageEl = languageEl.nextSiblingElement('language')
-        return result
-
-    def getImports(self, ontologyEl):
-        result = set()
-        importsEl = ontologyEl.firstChildElement('imports')
-        importEl = importsEl.firstChildElement('import')
-        while not importEl.isNull():
-            try:
-                ontIri = importEl.attribute('iri')
-                versionIri = importEl.attribute('version')
-                location = importEl.attribute('location')
-                isLocal = False
-                if importEl.attribute('isLocal'):
-                    isLocal = bool(int(importEl.attribute('isLocal')))
-                ontImp = ImportedOntology(ontIri, location, versionIri, isLocal, self.nproject)
-                result.add(ontImp)
-            except Exception as e:
-                LOGGER.exception('Failed to import element. {}'.format(str(e)))
-            finally:
-                importEl = importEl.nextSiblingElement('import')
-        return result
-
-    def projectRender(self):
-        """
-        Render all the elements in the Project ontology.
-        """
-        for item in self.nproject.items():
-            QtWidgets.QApplication.processEvents()
-            item.updateEdgeOrNode()
-
     #############################################
     #   DIAGRAM
     #################################
-    def createDiagrams(self):
+
+    def importDiagram(self, record):
         """
-        Create ontology diagrams by parsing the 'diagrams' section of the QDomDocument.
+        Create an empty diagram from the given record.
+        :type record: DiagramRecord
+        :rtype: Diagram
         """
-        counter = 1
-        section = self.document.documentElement().firstChildElement('project').firstChildElement('diagrams')
-        element = section.firstChildElement('diagram')
-        while not element.isNull():
-            self.nproject.addDiagram(self.importDiagram(element, counter))
-            element = element.nextSiblingElement('diagram')
-            counter += 1
+        LOGGER.info('Loading diagram: %s', record.name)
+        diagram = Diagram.create(record.name, record.size, self.nproject)
+        ## CONFIGURE DIAGRAM SIGNALS
+        connect(diagram.sgnItemAdded, self.nproject.doAddItem)
+        connect(diagram.sgnItemRemoved, self.nproject.doRemoveItem)
+        connect(diagram.selectionChanged, self.session.doScheduleUpdateState)
+        return diagram
 
-    def importDiagram(self, diagramElement, i):
+    def importDiagramItems(self, diagram, record):
         """
-        Create a diagram from the given QDomElement.
-        :type e: QDomElement
-        :type i: int
-        :rtype: Diagram
+        Create the nodes and edges of the given diagram from the given record. This is
+        a generator yielding each item once created (None if the item could not be created).
+        :type diagram: Diagram
+        :type record: DiagramRecord
+        :rtype: generator
         """
-        QtWidgets.QApplication.processEvents()
-        ## PARSE DIAGRAM INFORMATION
-        name = diagramElement.attribute('name', 'diagram_{0}'.format(i))
-        size = max(int(diagramElement.attribute('width', '10000')), int(diagramElement.attribute('height', '10000')))
-        ## CREATE NEW DIAGRAM
-        LOGGER.info('Loading diagram: %s', name)
-        diagram = Diagram.create(name, size, self.nproject)
         self.buffer[diagram.name] = dict()
-        ## LOAD DIAGRAM NODES
-        nodeElement = diagramElement.firstChildElement('node')
-        while not nodeElement.isNull():
-            try:
-                QtWidgets.QApplication.processEvents()
-                item = self.itemFromXmlNode(nodeElement)
-                func = self.importFuncForItem[item]
-                node = func(diagram, nodeElement)
-            except Exception as e:
-                LOGGER.exception('Failed to create node {}. [{}]'.format(nodeElement.attribute('id'), e))
-            else:
-                diagram.addItem(node)
-                diagram.guid.update(node.id)
-                self.buffer[diagram.name][node.id] = node
-            finally:
-                nodeElement = nodeElement.nextSiblingElement('node')
-
-        ## LOAD DIAGRAM EDGES
-        edgeElement = diagramElement.firstChildElement('edge')
-        while not edgeElement.isNull():
-            try:
-                QtWidgets.QApplication.processEvents()
-                item = self.itemFromXmlNode(edgeElement)
-                func = self.importFuncForItem[item]
-                edge = func(diagram, edgeElement)
-            except Exception as e:
-                LOGGER.exception('Failed to create edge {}. [{}]'.format(edgeElement.attribute('id'), e))
-            else:
-                diagram.addItem(edge)
-                diagram.guid.update(edge.id)
-                self.buffer[diagram.name][edge.id] = edge
-            finally:
-                edgeElement = edgeElement.nextSiblingElement('edge')
+        ## LOAD DIAGRAM NODES AND EDGES
+        for item in record.nodes + record.edges:
+            yield self.importDiagramItem(diagram, item)
         ## IDENTIFY NEUTRAL NODES
         nodes = [x for x in diagram.items(edges=False) if Identity.Neutral in x.identities()]
         if nodes:
             LOGGER.debug('Running identification algorithm for %s nodes', len(nodes))
             for node in nodes:
                 diagram.sgnNodeIdentification.emit(node)
+
+    def importDiagramItem(self, diagram, record):
+        """
+        Create the diagram item described by the given record, returning None in case of failure.
+        :type diagram: Diagram
+        :type record: ItemRecord
+        :rtype: AbstractItem
+        """
+        try:
+            func = self.importFuncForItem[record.type]
+            item = func(diagram, record.element)
+        except Exception as e:
+            LOGGER.exception('Failed to create {} {}. [{}]'.format(record.element.tagName(), record.id, e))
+            return None
+        diagram.addItem(item)
+        diagram.guid.update(item.id)
+        self.buffer[diagram.name][item.id] = item
+        return item
+
+    def importPendingDiagram(self, record):
+        """
+        Create a pending diagram from the given record: diagram items are not created, the
+        record is only scanned to collect the number of items of each type and the IRIs
+        occurring in the diagram, which are enough to index the diagram content.
+        :type record: DiagramRecord
+        :rtype: PendingDiagram
+        """
+        LOGGER.info('Scanning diagram: %s', record.name)
+        diagram = Diagram.create(record.name, record.size, self.nproject)
+        references = {}
+        types = {}
+        iris = {}
+        for item in record.nodes + record.edges:
+            if item.iri is not None:
+                if item.iri not in references:
+                    references[item.iri] = self.nproject.getIRI(item.iri)
+                iris.setdefault(item.type, set()).add(references[item.iri])
+            if item.type:
+                types[item.type] = types.get(item.type, 0) + 1
         ## CONFIGURE DIAGRAM SIGNALS
         connect(diagram.sgnItemAdded, self.nproject.doAddItem)
         connect(diagram.sgnItemRemoved, self.nproject.doRemoveItem)
-        connect(diagram.selectionChanged, self.session.doUpdateState)
-        ## RETURN GENERATED DIAGRAM
-        return diagram
+        connect(diagram.selectionChanged, self.session.doScheduleUpdateState)
+        builder = partial(self.importPendingDiagramItems, record)
+        return PendingDiagram(diagram, builder, record.element, references, types, iris)
+
+    def importPendingDiagramItems(self, record, pending):
+        """
+        Create the nodes and edges of the given pending diagram from the given record.
+        :type record: DiagramRecord
+        :type pending: PendingDiagram
+        """
+        LOGGER.info('Loading diagram: %s', pending.diagram.name)
+        self.references = pending.references
+        try:
+            for _ in self.importDiagramItems(pending.diagram, record):
+                pass
+        finally:
+            self.references = dict()
+            self.buffer.pop(pending.diagram.name, None)
 
     #############################################
     #   NODES
@@ -2373,7 +2274,7 @@ class GrapholProjectIRILoaderMixin_3(object):
     def getIriPredicateNode(self, diagram, nodeElement, itemType):
         labelElement = nodeElement.firstChildElement('label')
         iriEl = nodeElement.firstChildElement('iri')
-        iri = self.nproject.getIRI(iriEl.text())
+        iri = self.references.get(iriEl.text()) or self.nproject.getIRI(iriEl.text())
         geometryElement = nodeElement.firstChildElement('geometry')
         node = diagram.factory.create(itemType, **{
             'id': nodeElement.attribute('id'),
@@ -2836,10 +2737,8 @@ class GrapholOntologyIRILoader_v3(AbstractOntologyLoader, GrapholProjectIRILoade
         """
         Perform ontology import from Graphol file format and merge the loaded ontology with the current project.
         """
-        self.createDomDocument()
-        self.createProject()
-        self.createDiagrams()
-        self.projectRender()
+        self.createModel()
+        runInChunks(self.buildProject())
         self.projectMerge()
 
 
@@ -2858,6 +2757,7 @@ class GrapholIRIProjectLoader_v3(AbstractProjectLoader, GrapholProjectIRILoaderM
         #path = os.path.join(path, os.path.basename(path))
         #path = postfix(path, File.Graphol.extension)
         super().__init__(path, session)
+        self.lazy = QtCore.QSettings().value('project/lazy', False, bool)
 
     def createLegacyProject(self):
         """
@@ -2886,20 +2786,37 @@ class GrapholIRIProjectLoader_v3(AbstractProjectLoader, GrapholProjectIRILoaderM
         """
         return File.Graphol
 
-    def run(self):
+    def load(self, progress):
         """
-        Perform project import.
+        Perform project import, displaying its progress in the given dialog.
+        The project file is parsed on a worker thread, and the project is then
+        built in chunks, so that the dialog is updated while loading.
+        :type progress: BusyProgressDialog
         """
+        progress.setProgress(0, 0, 'Parsing project: {0}'.format(os.path.basename(self.path)))
         try:
-            self.createDomDocument()
+            self.createModel()
         except (ProjectNotFoundError, ProjectVersionError):
             self.createLegacyProject()
         else:
-            self.createProject()
-            self.createDiagrams()
-            self.projectRender()
+            text = 'Loading project: {0} (%p%)'.format(self.model.name)
+            progress.setProgress(0, self.stepNum(), text)
+            runInChunks(self.buildProject(), callback=lambda steps: progress.setProgress(steps, self.stepNum()))
             self.projectLoaded()
 
+    def run(self):
+        """
+        Perform project import. Loading is carried out within a modal progress
+        dialog (unless one is already displayed), which prevents interacting
+        with the application until the project has been loaded.
+        """
+        progress = BusyProgressDialog.current()
+        if progress:
+            self.load(progress)
+        else:
+            with BusyProgressDialog(mtime=0, parent=self.session, modal=True) as progress:
+                self.load(progress)
+
 
 class ProjectIRIMergeWorker_v3(QtCore.QObject):
     """
@@ -3095,3 +3012,99 @@ class ProjectIRIMergeWorker_v3(QtCore.QObject):
 
 
 
+
+
+class GrapholIRIFragmentLoader(GrapholProjectIRILoaderMixin_3):
+    """
+    Mixin specialization which rebuilds the items stored in a Graphol fragment into a diagram.
+    Rebuilt items are given fresh identifiers in the target diagram, while the IRIs they reference
+    are resolved against the target project, importing the ones that are not defined there yet.
+    """
+    def __init__(self, data, diagram):
+        """
+        Initialize the fragment loader.
+        :type data: T <= bytes | str
+        :type diagram: Diagram
+        """
+        super().__init__()
+        self.data = data
+        self.diagram = diagram
+        self.nproject = diagram.project
+
+    #############################################
+    #   DOCUMENT
+    #################################
+
+    def createDomDocument(self):
+        """
+        Create the QDomDocument from where to parse the fragment.
+        """
+        self.document = QtXml.QDomDocument()
+        if not self.document.setContent(self.data):
+            raise ProjectNotValidError('invalid graphol fragment supplied')
+        e = self.document.documentElement()
+        version = int(e.attribute('version', '3'))
+        if version != 3:
+            raise ProjectVersionError('fragment version mismatch: %s != 3' % version)
+
+    def importIRIs(self, fragmentEl):
+        """
+        Import the IRIs defined in the fragment which are not yet part of the target project.
+        :type fragmentEl: QDomElement
+        """
+        datatypes = set(map(str, self.nproject.getDatatypeIRIs()))
+        facets = set(map(str, self.nproject.constrainingFacets))
+        annotationProperties = set(map(str, self.nproject.getAnnotationPropertyIRIs()))
+        reserved = datatypes | facets | annotationProperties
+        iriEl = fragmentEl.firstChildElement('iris').firstChildElement('iri')
+        while not iriEl.isNull():
+            try:
+                value = iriEl.firstChildElement('value').text()
+                if value not in reserved and not self.nproject.existIRI(value):
+                    self.createIRI(parseIRI(iriEl))
+            except Exception as e:
+                LOGGER.exception('Failed to import iri element [{}]'.format(e))
+            finally:
+                iriEl = iriEl.nextSiblingElement('iri')
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def run(self):
+        """
+        Rebuild the items stored in the fragment, returning the rebuilt nodes and edges.
+        :rtype: tuple
+        """
+        self.createDomDocument()
+        fragmentEl = self.document.documentElement().firstChildElement('fragment')
+        self.importIRIs(fragmentEl)
+        self.buffer[self.diagram.name] = buffer = dict()
+        nodes = []
+        edges = []
+        nodeElement = fragmentEl.firstChildElement('node')
+        while not nodeElement.isNull():
+            try:
+                func = self.importFuncForItem[self.itemFromXmlNode(nodeElement)]
+                node = func(self.diagram, nodeElement)
+            except Exception as e:
+                LOGGER.exception('Failed to create node {}. [{}]'.format(nodeElement.attribute('id'), e))
+            else:
+                buffer[node.id] = node
+                node.id = self.diagram.guid.next('n')
+                nodes.append(node)
+            finally:
+                nodeElement = nodeElement.nextSiblingElement('node')
+        edgeElement = fragmentEl.firstChildElement('edge')
+        while not edgeElement.isNull():
+            try:
+                func = self.importFuncForItem[self.itemFromXmlNode(edgeElement)]
+                edge = func(self.diagram, edgeElement)
+            except Exception as e:
+                LOGGER.exception('Failed to create edge {}. [{}]'.format(edgeElement.attribute('id'), e))
+            else:
+                edge.id = self.diagram.guid.next('e')
+                edges.append(edge)
+            finally:
+                edgeElement = edgeElement.nextSiblingElement('edge')
+        return nodes, edges
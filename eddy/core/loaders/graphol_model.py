@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+
+"""
+Intermediate model of Graphol (v3) projects.
+
+Loading a project is split in two stages: the project file is first parsed (see `parse`) into an
+immutable model holding the ontology header, the IRIs with their annotations and a record for each
+diagram item. Since parsing does not create any QObject it can run on a worker thread, leaving to
+the GUI thread only the construction of the project (see `GrapholProjectIRILoaderMixin_3`).
+
+Item records keep a reference to the document element they were parsed from, which is used to
+build the item: the document is never accessed by the worker thread once parsing completed.
+"""
+
+from typing import (
+    FrozenSet,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from PyQt5 import QtXml
+
+from eddy.core.datatypes.graphol import Item
+from eddy.core.functions.fsystem import fexists, fread
+from eddy.core.output import getLogger
+from eddy.core.project import (
+    ProjectNotFoundError,
+    ProjectNotValidError,
+    ProjectVersionError,
+)
+
+LOGGER = getLogger()
+
+ItemFromXml = {
+    'attribute': Item.AttributeNode,
+    'complement': Item.ComplementNode,
+    'concept': Item.ConceptNode,
+    'datatype-restriction': Item.DatatypeRestrictionNode,
+    'disjoint-union': Item.DisjointUnionNode,
+    'domain-restriction': Item.DomainRestrictionNode,
+    'enumeration': Item.EnumerationNode,
+    'facet': Item.FacetNode,
+    'individual': Item.IndividualNode,
+    'literal': Item.LiteralNode,
+    'intersection': Item.IntersectionNode,
+    'property-assertion': Item.PropertyAssertionNode,
+    'range-restriction': Item.RangeRestrictionNode,
+    'role': Item.RoleNode,
+    'role-chain': Item.RoleChainNode,
+    'role-inverse': Item.RoleInverseNode,
+    'union': Item.UnionNode,
+    'value-domain': Item.ValueDomainNode,
+    'inclusion': Item.InclusionEdge,
+    'equivalence': Item.EquivalenceEdge,
+    'input': Item.InputEdge,
+    'membership': Item.MembershipEdge,
+    'same': Item.SameEdge,
+    'different': Item.DifferentEdge,
+    'has-key': Item.HasKeyNode
+}
+
+IRIFlags = ('functional', 'inverseFunctional', 'symmetric', 'asymmetric', 'reflexive', 'irreflexive', 'transitive')
+
+PredicateItems = {Item.AttributeNode, Item.ConceptNode, Item.IndividualNode, Item.RoleNode, Item.ValueDomainNode}
+
+
+class AnnotationRecord(NamedTuple):
+    """
+    Immutable description of an annotation assertion.
+    """
+    subject: str
+    property: str
+    value: str
+    isIRI: bool
+    datatype: Optional[str]
+    language: Optional[str]
+
+
+class IRIRecord(NamedTuple):
+    """
+    Immutable description of an IRI, along with the names of the flags set on it and its annotations.
+    """
+    value: str
+    flags: FrozenSet[str]
+    annotations: Tuple[AnnotationRecord, ...]
+
+
+class ImportRecord(NamedTuple):
+    """
+    Immutable description of an imported ontology.
+    """
+    iri: str
+    location: str
+    version: str
+    isLocal: bool
+
+
+class ItemRecord(NamedTuple):
+    """
+    Immutable description of a diagram item: the type is None if the element type is unknown,
+    while the IRI is set only for predicate nodes.
+    """
+    id: str
+    type: Optional[Item]
+    iri: Optional[str]
+    element: QtXml.QDomElement
+
+
+class DiagramRecord(NamedTuple):
+    """
+    Immutable description of a diagram.
+    """
+    name: str
+    size: int
+    element: QtXml.QDomElement
+    nodes: Tuple[ItemRecord, ...]
+    edges: Tuple[ItemRecord, ...]
+
+    def itemNum(self) -> int:
+        """
+        Returns the number of items of the diagram.
+        """
+        return len(self.nodes) + len(self.edges)
+
+
+class ProjectModel(NamedTuple):
+    """
+    Immutable description of a Graphol project.
+    """
+    name: str
+    version: str
+    ontologyIRI: str
+    ontologyPrefix: Optional[str]
+    language: str
+    addLabelFromSimpleName: bool
+    addLabelFromUserInput: bool
+    prefixes: Tuple[Tuple[str, str], ...]
+    datatypes: FrozenSet[str]
+    facets: FrozenSet[str]
+    annotationProperties: FrozenSet[str]
+    languages: FrozenSet[str]
+    imports: Tuple[ImportRecord, ...]
+    iris: Tuple[IRIRecord, ...]
+    diagrams: Tuple[DiagramRecord, ...]
+
+    def itemNum(self) -> int:
+        """
+        Returns the number of items of the project diagrams.
+        """
+        return sum(diagram.itemNum() for diagram in self.diagrams)
+
+
+#############################################
+#   ELEMENTS
+#################################
+
+def children(element: QtXml.QDomElement, tag: str) -> Tuple[QtXml.QDomElement, ...]:
+    """
+    Returns the child elements of the given element having the given tag name.
+    """
+    result = []
+    child = element.firstChildElement(tag)
+    while not child.isNull():
+        result.append(child)
+        child = child.nextSiblingElement(tag)
+    return tuple(result)
+
+
+def texts(element: QtXml.QDomElement, tag: str) -> FrozenSet[str]:
+    """
+    Returns the text of the child elements of the given element having the given tag name.
+    """
+    return frozenset(child.text() for child in children(element, tag))
+
+
+#############################################
+#   PARSE
+#################################
+
+def parseAnnotation(element: QtXml.QDomElement) -> AnnotationRecord:
+    """
+    Returns the record of the given 'annotation' element.
+    """
+    objectEl = element.firstChildElement('object')
+    iriEl = objectEl.firstChildElement('iri')
+    if not iriEl.isNull():
+        return AnnotationRecord(
+            element.firstChildElement('subject').text(),
+            element.firstChildElement('property').text(),
+            iriEl.text(), True, None, None)
+    return AnnotationRecord(
+        element.firstChildElement('subject').text(),
+        element.firstChildElement('property').text(),
+        objectEl.firstChildElement('lexicalForm').text(), False,
+        objectEl.firstChildElement('datatype').text() or None,
+        objectEl.firstChildElement('language').text() or None)
+
+
+def parseIRI(element: QtXml.QDomElement) -> IRIRecord:
+    """
+    Returns the record of the given 'iri' element.
+    """
+    value = element.firstChildElement('value').text()
+    annotations = []
+    for annotationEl in children(element.firstChildElement('annotations'), 'annotation'):
+        try:
+            annotations.append(parseAnnotation(annotationEl))
+        except Exception as e:
+            LOGGER.exception('Failed to import annotation element for iri {} [{}]'.format(value, e))
+    flags = frozenset(flag for flag in IRIFlags if not element.firstChildElement(flag).isNull())
+    return IRIRecord(value, flags, tuple(annotations))
+
+
+def parseItem(element: QtXml.QDomElement) -> ItemRecord:
+    """
+    Returns the record of the given 'node' or 'edge' element.
+    """
+    item = ItemFromXml.get(element.attribute('type').lower().strip())
+    if item is Item.IndividualNode and '"' in element.firstChildElement('label').text():
+        item = Item.LiteralNode
+    iri = element.firstChildElement('iri').text() if item in PredicateItems else None
+    return ItemRecord(element.attribute('id'), item, iri, element)
+
+
+def parseDiagram(element: QtXml.QDomElement, i: int) -> DiagramRecord:
+    """
+    Returns the record of the given 'diagram' element.
+    """
+    name = element.attribute('name', 'diagram_{0}'.format(i))
+    size = max(int(element.attribute('width', '10000')), int(element.attribute('height', '10000')))
+    nodes = tuple(map(parseItem, children(element, 'node')))
+    edges = tuple(map(parseItem, children(element, 'edge')))
+    return DiagramRecord(name, size, element, nodes, edges)
+
+
+def parseProject(document: QtXml.QDomDocument) -> ProjectModel:
+    """
+    Returns the model of the project described by the given document.
+    """
+    projectEl = document.documentElement().firstChildElement('project')
+    ontologyEl = projectEl.firstChildElement('ontology')
+    datatypes = texts(ontologyEl.firstChildElement('datatypes'), 'datatype')
+    facets = texts(ontologyEl.firstChildElement('facets'), 'facet')
+    annotationProperties = texts(ontologyEl.firstChildElement('annotationProperties'), 'annotationProperty')
+    reserved = datatypes | facets | annotationProperties
+
+    prefixes = []
+    for prefixEl in children(ontologyEl.firstChildElement('prefixes'), 'prefix'):
+        prefixes.append((prefixEl.firstChildElement('value').text(), prefixEl.firstChildElement('namespace').text()))
+
+    imports = []
+    for importEl in children(ontologyEl.firstChildElement('imports'), 'import'):
+        imports.append(ImportRecord(
+            importEl.attribute('iri'),
+            importEl.attribute('location'),
+            importEl.attribute('version'),
+            bool(int(importEl.attribute('isLocal') or '0'))))
+
+    iris = []
+    for iriEl in children(ontologyEl.firstChildElement('iris'), 'iri'):
+        try:
+            if iriEl.firstChildElement('value').text() not in reserved:
+                iris.append(parseIRI(iriEl))
+        except Exception as e:
+            LOGGER.exception('Failed to import iri element [{}]'.format(e))
+
+    diagrams = []
+    for i, diagramEl in enumerate(children(projectEl.firstChildElement('diagrams'), 'diagram'), start=1):
+        diagrams.append(parseDiagram(diagramEl, i))
+
+    return ProjectModel(
+        name=projectEl.attribute('name'),
+        version=projectEl.attribute('version'),
+        ontologyIRI=ontologyEl.attribute('iri'),
+        ontologyPrefix=ontologyEl.attribute('prefix') if ontologyEl.hasAttribute('prefix') else None,
+        language=ontologyEl.attribute('lang'),
+        addLabelFromSimpleName=bool(int(ontologyEl.attribute('addLabelFromSimpleName') or '0')),
+        addLabelFromUserInput=bool(int(ontologyEl.attribute('addLabelFromUserInput') or '0')),
+        prefixes=tuple(prefixes),
+        datatypes=datatypes,
+        facets=facets,
+        annotationProperties=annotationProperties,
+        languages=texts(ontologyEl.firstChildElement('languages'), 'language'),
+        imports=tuple(imports),
+        iris=tuple(iris),
+        diagrams=tuple(diagrams),
+    )
+
+
+def parseDocument(path: str) -> QtXml.QDomDocument:
+    """
+    Returns the document stored in the Graphol (v3) file identified by the given path.
+    """
+    if not fexists(path):
+        raise ProjectNotFoundError('missing project ontology: %s' % path)
+    document = QtXml.QDomDocument()
+    if not document.setContent(fread(path)):
+        raise ProjectNotValidError('invalid project ontology supplied: %s' % path)
+    version = int(document.documentElement().attribute('version', '3'))
+    if version != 3:
+        raise ProjectVersionError('project version mismatch: %s != 3' % version)
+    return document
+
+
+def parse(path: str) -> ProjectModel:
+    """
+    Returns the model of the project stored in the Graphol (v3) file identified by the given path.
+    """
+    return parseProject(parseDocument(path))
@@ -36,9 +36,14 @@ from __future__ import annotations
 
 from typing import (
     cast,
+    AbstractSet,
     Any,
+    Callable,
+    Dict,
+    List,
     Optional,
     Set,
+    Tuple,
     TYPE_CHECKING,
 )
 
@@ -124,6 +129,167 @@ K_NAME = 'name'
 K_PROPERTY = 'property'
 
 
+class ProjectChangeSet(object):
+    """
+    This class collects the changes applied to a Project while a transaction is open.
+    Changes are aggregated per diagram so that an item which is added and then removed
+    within the same transaction (or vice versa) does not appear in the change set.
+    """
+    def __init__(self) -> None:
+        """
+        Initialize the change set.
+        """
+        self.added = {}  # type: Dict[Diagram, Set[AbstractItem]]
+        self.removed = {}  # type: Dict[Diagram, Set[AbstractItem]]
+        self.modified = {}  # type: Dict[Diagram, Set[AbstractItem]]
+        self.removedIRIs = set()  # type: Set[IRI]
+        self.switchedIRIs = []  # type: List[Tuple[AbstractNode, IRI]]
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def addItem(self, diagram: Diagram, item: AbstractItem) -> None:
+        """
+        Record the addition of the given item to the given diagram.
+        """
+        removed = self.removed.get(diagram, set())
+        if item in removed:
+            # The item was removed and added back: from a subscriber
+            # point of view it still exists, although it may have changed.
+            removed.discard(item)
+            self.modified.setdefault(diagram, set()).add(item)
+        else:
+            self.added.setdefault(diagram, set()).add(item)
+
+    def diagrams(self) -> Set[Diagram]:
+        """
+        Returns the set of diagrams affected by this change set.
+        """
+        return {d for c in (self.added, self.removed, self.modified) for d in c if c[d]}
+
+    def isEmpty(self) -> bool:
+        """
+        Returns True if this change set contains no change, False otherwise.
+        """
+        return not self.diagrams() and not self.removedIRIs and not self.switchedIRIs
+
+    def items(self, changes: Dict[Diagram, Set[AbstractItem]]) -> List[Tuple[Diagram, AbstractItem]]:
+        """
+        Returns a flattened list of (diagram, item) pairs for the given change dictionary.
+        """
+        return [(diagram, item) for diagram in changes for item in changes[diagram]]
+
+    def modifyItem(self, diagram: Diagram, item: AbstractItem) -> None:
+        """
+        Record the modification of the given item in the given diagram.
+        """
+        if item not in self.added.get(diagram, set()):
+            self.modified.setdefault(diagram, set()).add(item)
+
+    def removeItem(self, diagram: Diagram, item: AbstractItem) -> None:
+        """
+        Record the removal of the given item from the given diagram.
+        """
+        added = self.added.get(diagram, set())
+        if item in added:
+            added.discard(item)
+        else:
+            self.removed.setdefault(diagram, set()).add(item)
+        self.modified.get(diagram, set()).discard(item)
+
+    def __len__(self) -> int:
+        return sum(len(c[d]) for c in (self.added, self.removed, self.modified) for d in c)
+
+
+class ProjectTransaction(object):
+    """
+    Context manager which keeps a Project transaction open for the duration of a `with` block.
+    """
+    def __init__(self, project: Project) -> None:
+        """
+        Initialize the transaction.
+        """
+        self.project = project
+
+    #############################################
+    #   CONTEXT MANAGER
+    #################################
+
+    def __enter__(self) -> ProjectTransaction:
+        """
+        Open the transaction.
+        """
+        self.project.beginTransaction()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Commit the transaction.
+        """
+        self.project.commitTransaction()
+
+
+class PendingDiagram(object):
+    """
+    This class describes a diagram whose items have not been built yet.
+    It holds the definition the items are built from (e.g. the diagram element of a Graphol
+    document), the function building them, and a summary of the diagram content obtained
+    from a lightweight parse of the definition: the number of items of each type and the
+    IRIs occurring as each type of predicate node. The summary is used by the project index
+    to answer counting and IRI queries without building the diagram.
+    IRIs referenced by the definition are resolved once, when the summary is created, so
+    that the diagram is built using the same IRI objects even if they are modified meanwhile.
+    """
+    __slots__ = ('diagram', 'builder', 'definition', 'references', 'types', 'iris')
+
+    def __init__(
+        self,
+        diagram: Diagram,
+        builder: Callable[[PendingDiagram], None],
+        definition: Any,
+        references: Dict[str, IRI],
+        types: Dict[Item, int],
+        iris: Dict[Item, Set[IRI]],
+    ) -> None:
+        """
+        Initialize the pending diagram.
+        """
+        self.diagram = diagram
+        self.builder = builder
+        self.definition = definition
+        self.references = references
+        self.types = types
+        self.iris = iris
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def edgeNum(self) -> int:
+        """
+        Returns the number of edges of the pending diagram.
+        """
+        return sum(v for k, v in self.types.items() if Item.InclusionEdge <= k <= Item.DifferentEdge)
+
+    def hasIRI(self, iri: IRI, item: Item = None) -> bool:
+        """
+        Returns True if the given IRI occurs in the pending diagram (as the given type of node if any).
+        """
+        if item:
+            return iri in self.iris.get(item, ())
+        return any(iri in iris for iris in self.iris.values())
+
+    def nodeNum(self) -> int:
+        """
+        Returns the number of nodes of the pending diagram.
+        """
+        return sum(v for k, v in self.types.items() if Item.ConceptNode <= k < Item.InclusionEdge)
+
+    def __len__(self) -> int:
+        return sum(self.types.values())
+
+
 class Project(IRIManager):
     """
     Extension of QtCore.QObject which implements a Graphol project.
@@ -133,6 +299,7 @@ class Project(IRIManager):
     * sgnDiagramRemoved: whenever a Diagram is removed from the Project.
     * sgnItemAdded: whenever an item is added to the Project.
     * sgnItemRemoved: whenever an item is removed from the Project.
+    * sgnItemsChanged: whenever a set of changes (see ProjectChangeSet) is committed to the Project.
     * sgnMetaAdded: whenever predicate metadata are added to the Project.
     * sgnMetaRemoved: whenever predicate metadata are removed from the Project.
     * sgnUpdated: whenever the Project is updated in any of its parts.
@@ -141,6 +308,7 @@ class Project(IRIManager):
     sgnDiagramRemoved = QtCore.pyqtSignal(QtWidgets.QGraphicsScene)
     sgnItemAdded = QtCore.pyqtSignal(QtWidgets.QGraphicsScene, QtWidgets.QGraphicsItem)
     sgnItemRemoved = QtCore.pyqtSignal(QtWidgets.QGraphicsScene, QtWidgets.QGraphicsItem)
+    sgnItemsChanged = QtCore.pyqtSignal(ProjectChangeSet)
     sgnUpdated = QtCore.pyqtSignal()
 
     sgnIRIRemovedFromAllDiagrams = QtCore.pyqtSignal(IRI)
@@ -166,6 +334,9 @@ class Project(IRIManager):
         self.profile = profile
         self.profile.setParent(self)
         self.version = version if version is not None else '1.0'
+        self.changes = None  # type: Optional[ProjectChangeSet]
+        self.transactionDepth = 0
+        self.committing = False
 
         # FIXME: delete once all references have been dropped
         self.IRI_prefixes_nodes_dict = kwargs.get('IRI_prefixes_nodes_dict')
@@ -201,6 +372,59 @@ class Project(IRIManager):
                     diagram.sgnItemAdded.emit(diagram, item)
             self.sgnUpdated.emit()
 
+    def addPendingDiagram(self, pending: PendingDiagram) -> None:
+        """
+        Add the given diagram to the Project without building its items (see PendingDiagram).
+        Items are built as soon as they are needed, i.e. when the diagram is focused or when
+        its items are looked up, either directly or by a query spanning the whole Project.
+        """
+        if self.index.addDiagram(pending.diagram):
+            self.index.addPendingDiagram(pending)
+            pending.diagram.setParent(self)
+            self.sgnDiagramAdded.emit(pending.diagram)
+            self.sgnUpdated.emit()
+
+    def beginTransaction(self) -> None:
+        """
+        Open a new transaction on the Project: while the transaction is open, item and IRI
+        notifications are buffered and then delivered at once when the transaction is committed.
+        Transactions can be nested, in which case changes are delivered by the outermost commit.
+        """
+        if not self.transactionDepth:
+            self.changes = ProjectChangeSet()
+        self.transactionDepth += 1
+
+    def commitTransaction(self) -> None:
+        """
+        Commit the currently open transaction.
+        Per-item signals are replayed for subscribers which are not transaction
+        aware, then the aggregated change set is delivered through sgnItemsChanged.
+        """
+        if not self.transactionDepth:
+            return
+        self.transactionDepth -= 1
+        if not self.transactionDepth:
+            changes = self.changes
+            self.changes = None
+            self.committing = True
+            try:
+                for diagram in changes.diagrams():
+                    diagram.doPendingNodeIdentification()
+                for diagram, item in changes.items(changes.removed):
+                    self.sgnItemRemoved.emit(diagram, item)
+                for diagram, item in changes.items(changes.added):
+                    self.sgnItemAdded.emit(diagram, item)
+                for node, iri in changes.switchedIRIs:
+                    self.sgnSingleNodeSwitchIRI.emit(node, iri)
+                for iri in changes.removedIRIs:
+                    if not self.existIriOccurrence(iri):
+                        self.sgnIRIRemovedFromAllDiagrams.emit(iri)
+            finally:
+                self.committing = False
+            if not changes.isEmpty():
+                self.sgnItemsChanged.emit(changes)
+                self.sgnUpdated.emit()
+
     def diagram(self, did: str) -> Optional[Diagram]:
         """
         Returns the diagram matching the given id or None if no diagram is found.
@@ -217,13 +441,15 @@ class Project(IRIManager):
         """
         Returns the edge matching the given id or None if no edge is found.
         """
+        self.materialize(diagram)
         return self.index.edge(diagram, eid)
 
-    def edges(self, diagram: Diagram = None) -> Set[AbstractEdge]:
+    def edges(self, diagram: Diagram = None) -> AbstractSet[AbstractEdge]:
         """
         Returns a collection with all the edges in the given diagram.
-        If no diagram is supplied a collection with all the edges in the Project will be returned.
+        If no diagram is supplied a read-only view of all the edges in the Project will be returned.
         """
+        self.materialize(diagram)
         return self.index.edges(diagram)
 
     def isEmpty(self) -> bool:
@@ -232,10 +458,25 @@ class Project(IRIManager):
         """
         return self.index.isEmpty()
 
+    def isInTransaction(self) -> bool:
+        """
+        Returns True if a transaction is currently open or being committed, False otherwise.
+        Subscribers of per-item signals can use this to postpone expensive work
+        (e.g. sorting, repainting) until the aggregated sgnItemsChanged is emitted.
+        """
+        return self.transactionDepth > 0 or self.committing
+
+    def isPending(self, diagram: Diagram) -> bool:
+        """
+        Returns True if the items of the given diagram have not been built yet, False otherwise.
+        """
+        return self.index.pendingDiagram(diagram) is not None
+
     def item(self, diagram: Diagram, iid: str) -> Optional[AbstractItem]:
         """
         Returns the item matching the given id or None if no item is found.
         """
+        self.materialize(diagram)
         return self.index.item(diagram, iid)
 
     def itemNum(self, item: Item, diagram: Diagram = None) -> int:
@@ -245,26 +486,54 @@ class Project(IRIManager):
         """
         return self.index.itemNum(item, diagram)
 
-    def items(self, diagram: Diagram = None) -> Set[AbstractItem]:
+    def items(self, diagram: Diagram = None) -> AbstractSet[AbstractItem]:
         """
         Returns a collection with all the items in the given diagram.
-        If no diagram is supplied a collection with all the items in the Project will be returned.
+        If no diagram is supplied a read-only view of all the items in the Project will be returned.
         """
+        self.materialize(diagram)
         return self.index.items(diagram)
 
+    def materialize(self, diagram: Diagram = None, iri: IRI = None, item: Item = None) -> None:
+        """
+        Build the items of the given diagram, if it is pending (see addPendingDiagram()).
+        If no diagram is supplied all the pending diagrams are built, or only the ones
+        where the given IRI occurs (as the given type of node) if an IRI is supplied.
+        """
+        if not self.index.pending:
+            return
+        for pending in self.index.pendingDiagrams(diagram, iri, item):
+            self.index.removePendingDiagram(pending.diagram)
+            LOGGER.debug('Building pending diagram: %s', pending.diagram.name)
+            with self.transaction():
+                pending.builder(pending)
+                items = [x for x in pending.diagram.items() if x.isNode() or x.isEdge()]
+                for x in items:
+                    pending.diagram.sgnItemAdded.emit(pending.diagram, x)
+            for x in items:
+                x.updateEdgeOrNode()
+
     def node(self, diagram: Diagram, nid: str) -> Optional[AbstractNode]:
         """
         Returns the node matching the given id or None if no node is found.
         """
+        self.materialize(diagram)
         return self.index.node(diagram, nid)
 
-    def nodes(self, diagram: Diagram = None) -> Set[AbstractNode]:
+    def nodes(self, diagram: Diagram = None) -> AbstractSet[AbstractNode]:
         """
         Returns a collection with all the nodes in the given diagram.
-        If no diagram is supplied a collection with all the nodes in the Project will be returned.
+        If no diagram is supplied a read-only view of all the nodes in the Project will be returned.
         """
+        self.materialize(diagram)
         return self.index.nodes(diagram)
 
+    def pendingDiagram(self, diagram: Diagram) -> Optional[PendingDiagram]:
+        """
+        Returns the description of the given diagram if its items have not been built yet, None otherwise.
+        """
+        return self.index.pendingDiagram(diagram)
+
     '''
     def predicateNum(self, item, diagram=None):
         """
@@ -287,6 +556,7 @@ class Project(IRIManager):
         Returns a collection of nodes identified by the given IRI belonging to the given diagram.
         If no diagram is supplied the lookup is performed across the whole Project Index.
         """
+        self.materialize(diagram, iri, item)
         return self.index.iriOccurrences(item, iri, diagram)
 
     def existIriOccurrence(
@@ -307,20 +577,33 @@ class Project(IRIManager):
         """
         Remove the given diagram from the project index, together with all its items.
         """
+        self.materialize(diagram)
         if self.index.removeDiagram(diagram):
             for item in self.items(diagram):
                 diagram.sgnItemRemoved.emit(diagram, item)
             self.sgnDiagramRemoved.emit(diagram)
             self.sgnUpdated.emit()
 
+    def transaction(self) -> ProjectTransaction:
+        """
+        Returns a context manager which keeps a transaction open on this Project, i.e:
+
+            with project.transaction():
+                for item in items:
+                    diagram.addItem(item)
+                    diagram.sgnItemAdded.emit(diagram, item)
+        """
+        return ProjectTransaction(self)
+
     #############################################
     #   IRI
     #################################
 
     def isDLCompliant(self) -> bool:
+        self.materialize()
         return self.index.isDLCompliant()
 
-    def itemIRIs(self,item, diagram=None) -> Set[IRI]:
+    def itemIRIs(self,item, diagram=None) -> AbstractSet[IRI]:
         return self.index.itemIRIs(item, diagram)
 
     #############################################
@@ -336,7 +619,13 @@ class Project(IRIManager):
             if isinstance(item, PredicateNodeMixin):
                 self.addIRI(item.iri)
                 self.index.addIRIOccurenceToDiagram(diagram, item)
+            if self.transactionDepth:
+                self.changes.addItem(diagram, item)
+                return
             self.sgnItemAdded.emit(diagram, item)
+            changes = ProjectChangeSet()
+            changes.addItem(diagram, item)
+            self.sgnItemsChanged.emit(changes)
             self.sgnUpdated.emit()
 
     @QtCore.pyqtSlot(QtWidgets.QGraphicsScene, QtWidgets.QGraphicsItem)
@@ -346,18 +635,46 @@ class Project(IRIManager):
         This slot will remove the given element from the project index.
         """
         if self.index.removeItem(diagram, item):
+            if self.transactionDepth:
+                if isinstance(item, PredicateNodeMixin):
+                    if self.index.removeIRIOccurenceFromDiagram(diagram, item):
+                        self.changes.removedIRIs.add(item.iri)
+                self.changes.removeItem(diagram, item)
+                return
             if isinstance(item, PredicateNodeMixin):
                 if self.index.removeIRIOccurenceFromDiagram(diagram, item):
                     self.sgnIRIRemovedFromAllDiagrams.emit(item.iri)
             self.sgnItemRemoved.emit(diagram, item)
+            changes = ProjectChangeSet()
+            changes.removeItem(diagram, item)
+            self.sgnItemsChanged.emit(changes)
             self.sgnUpdated.emit()
 
+    @QtCore.pyqtSlot(QtWidgets.QGraphicsScene, QtWidgets.QGraphicsItem)
+    def doModifyItem(self, diagram: Diagram, item: AbstractItem) -> None:
+        """
+        Executed whenever the semantics of an item belonging to this Project changes
+        without the item being added or removed (e.g. edge swap, inputs reordering).
+        """
+        if self.index.item(diagram, item.id) is not item:
+            return
+        if self.transactionDepth:
+            self.changes.modifyItem(diagram, item)
+            return
+        changes = ProjectChangeSet()
+        changes.modifyItem(diagram, item)
+        self.sgnItemsChanged.emit(changes)
+
     @QtCore.pyqtSlot(IRI, IRI)
     def doSwitchIRI(self, sub: IRI, master: IRI) -> None:
         """
         Executed whenever the IRI sub must be replaced by the IRI master
         """
+        self.materialize(iri=sub)
         self.index.switchIRI(sub,master)
+        if self.transactionDepth:
+            self.changes.removedIRIs.add(sub)
+            return
         self.sgnIRIRemovedFromAllDiagrams.emit(sub)
 
     @QtCore.pyqtSlot(QtWidgets.QGraphicsItem, IRI)
@@ -365,6 +682,13 @@ class Project(IRIManager):
         """
         Executed whenever the iri associated to node change
         """
+        if self.transactionDepth:
+            if self.index.switchIRIForNode(node, oldIri):
+                self.changes.removedIRIs.add(oldIri)
+            else:
+                self.changes.switchedIRIs.append((node, oldIri))
+            self.changes.modifyItem(node.diagram, node)
+            return
         if self.index.switchIRIForNode(node, oldIri):
             self.sgnIRIRemovedFromAllDiagrams.emit(oldIri)
         else:
@@ -374,6 +698,11 @@ class Project(IRIManager):
 class ProjectIndex(dict):
     """
     Extends built-in dict and implements the Project index.
+
+    Besides the per-diagram dictionaries, the index keeps project-wide aggregates
+    (the collections of all the items, nodes and edges, and the number of items of
+    each type) which are updated incrementally when items are added or removed, so
+    that project-wide lookups do not need to merge the dictionaries of every diagram.
     """
     def __init__(self, project):
         """
@@ -387,6 +716,11 @@ class ProjectIndex(dict):
         self[K_NODE] = dict()
         self[K_TYPE] = dict()
         self.project = project
+        self.allEdges = dict()
+        self.allItems = dict()
+        self.allNodes = dict()
+        self.typeCount = dict()
+        self.pending = dict()
 
     def addDiagram(self, diagram):
         """
@@ -399,6 +733,56 @@ class ProjectIndex(dict):
             return True
         return False
 
+    def addPendingDiagram(self, pending):
+        """
+        Add the given pending diagram to the Project index, accounting for the items it will contain.
+        :type pending: PendingDiagram
+        """
+        self.pending[pending.diagram.name] = pending
+        for item, count in pending.types.items():
+            self.typeCount[item] = self.typeCount.get(item, 0) + count
+
+    def pendingDiagram(self, diagram):
+        """
+        Returns the pending diagram matching the given diagram, or None if the diagram is not pending.
+        :type diagram: Diagram
+        :rtype: PendingDiagram
+        """
+        try:
+            return self.pending.get(diagram.name)
+        except AttributeError:
+            return None
+
+    def pendingDiagrams(self, diagram=None, iri=None, item=None):
+        """
+        Returns the pending diagrams matching the given diagram, or all the pending diagrams where
+        the given IRI occurs (as the given type of node), or all the pending diagrams.
+        :type diagram: Diagram
+        :type iri: IRI
+        :type item: Item
+        :rtype: list
+        """
+        if diagram:
+            pending = self.pendingDiagram(diagram)
+            return [pending] if pending else []
+        if iri:
+            return [p for p in self.pending.values() if p.hasIRI(iri, item)]
+        return list(self.pending.values())
+
+    def removePendingDiagram(self, diagram):
+        """
+        Remove the given diagram from the pending diagrams of the Project index.
+        :type diagram: Diagram
+        :rtype: PendingDiagram
+        """
+        pending = self.pending.pop(diagram.name, None)
+        if pending:
+            for item, count in pending.types.items():
+                self.typeCount[item] -= count
+                if not self.typeCount[item]:
+                    del self.typeCount[item]
+        return pending
+
     def removeDiagram(self, diagram):
         """
         Remove the given diagram from the Project index.
@@ -445,14 +829,19 @@ class ProjectIndex(dict):
             if i not in self[K_TYPE][diagram.name]:
                 self[K_TYPE][diagram.name][i] = set()
             self[K_TYPE][diagram.name][i] |= {item}
+            if item not in self.allItems:
+                self.allItems[item] = None
+                self.typeCount[i] = self.typeCount.get(i, 0) + 1
             if item.isNode():
                 if diagram.name not in self[K_NODE]:
                     self[K_NODE][diagram.name] = dict()
                 self[K_NODE][diagram.name][item.id] = item
+                self.allNodes[item] = None
             if item.isEdge():
                 if diagram.name not in self[K_EDGE]:
                     self[K_EDGE][diagram.name] = dict()
                 self[K_EDGE][diagram.name][item.id] = item
+                self.allEdges[item] = None
             return True
         return False
 
@@ -471,13 +860,13 @@ class ProjectIndex(dict):
     def edges(self, diagram=None):
         """
         Returns a collection with all the edges in the given diagram.
-        If no diagram is supplied a collection with all the edges in the Project Index will be returned.
+        If no diagram is supplied a read-only view of all the edges in the Project Index will be returned.
         :type diagram: Diagram
-        :rtype: set
+        :rtype: T <= set|KeysView
         """
         try:
             if not diagram:
-                return set.union(*(set(self[K_EDGE][i].values()) for i in self[K_EDGE]))
+                return self.allEdges.keys()
             return set(self[K_EDGE][diagram.name].values())
         except (KeyError, TypeError):
             return set()
@@ -487,10 +876,7 @@ class ProjectIndex(dict):
         Returns True if the Project Index contains no element, False otherwise.
         :rtype: bool
         """
-        for i in self[K_ITEMS]:
-            for _ in self[K_ITEMS][i]:
-                return False
-        return True
+        return not self.allItems and not any(self.pending.values())
 
     def item(self, diagram, iid):
         """
@@ -513,23 +899,24 @@ class ProjectIndex(dict):
         :rtype: int
         """
         try:
-            subdict = self[K_TYPE]
             if not diagram:
-                return len(set.union(*(subdict[i][item] for i in subdict if item in subdict[i])))
-            return len(subdict[diagram.name][item])
+                return self.typeCount.get(item, 0)
+            if diagram.name in self.pending:
+                return self.pending[diagram.name].types.get(item, 0)
+            return len(self[K_TYPE][diagram.name][item])
         except (KeyError, TypeError):
             return 0
 
     def items(self, diagram=None):
         """
         Returns a collection with all the items in the given diagram.
-        If no diagram is supplied a collection with all the items in the Project Index will be returned.
+        If no diagram is supplied a read-only view of all the items in the Project Index will be returned.
         :type diagram: Diagram
-        :rtype: set
+        :rtype: T <= set|KeysView
         """
         try:
             if not diagram:
-                return set.union(*(set(self[K_ITEMS][i].values()) for i in self[K_ITEMS]))
+                return self.allItems.keys()
             return set(self[K_ITEMS][diagram.name].values())
         except (KeyError, TypeError):
             return set()
@@ -549,13 +936,13 @@ class ProjectIndex(dict):
     def nodes(self, diagram=None):
         """
         Returns a collection with all the nodes in the given diagram.
-        If no diagram is supplied a collection with all the nodes in the Project Index will be returned.
+        If no diagram is supplied a read-only view of all the nodes in the Project Index will be returned.
         :type diagram: Diagram
-        :rtype: set
+        :rtype: T <= set|KeysView
         """
         try:
             if not diagram:
-                return set.union(*(set(self[K_NODE][i].values()) for i in self[K_NODE]))
+                return self.allNodes.keys()
             return set(self[K_NODE][diagram.name].values())
         except (KeyError, TypeError):
             return set()
@@ -573,6 +960,12 @@ class ProjectIndex(dict):
                 del self[K_ITEMS][diagram.name][item.id]
                 if not self[K_ITEMS][diagram.name]:
                     del self[K_ITEMS][diagram.name]
+            if self.allItems.pop(item, False) is None:
+                self.typeCount[i] -= 1
+                if not self.typeCount[i]:
+                    del self.typeCount[i]
+            self.allNodes.pop(item, None)
+            self.allEdges.pop(item, None)
             if diagram.name in self[K_TYPE]:
                 if i in self[K_TYPE][diagram.name]:
                     self[K_TYPE][diagram.name][i] -= {item}
@@ -836,7 +1229,7 @@ class ProjectIRIIndex(ProjectIndex):
                     self[K_OCCURRENCES][iri].pop(diagram.name)
                     if not self[K_OCCURRENCES][iri]:
                         self[K_OCCURRENCES].pop(iri)
-                        return True
+                        return not any(p.hasIRI(iri) for p in self.pending.values())
         return False
 
     def removeTypedIRIOccurenceFromDiagram(self, diagram, node, k_metatype, k_iri_metatype):
@@ -863,30 +1256,41 @@ class ProjectIRIIndex(ProjectIndex):
     def itemIRIs(self,item, diagram=None):
         """
         Returns the set of IRIs occurring as item in the given diagram.
-        If no diagram is supplied the lookup is performed across the whole Project Index.
+        If no diagram is supplied a read-only view of the IRIs occurring as item
+        in the whole Project Index is returned (i.e. the keys of the typed occurrences).
         :type diagram: Diagram
         :item: Item
-        :rtype: set
+        :rtype: T <= set|KeysView
         """
         try:
             k_metatype = None
+            k_iri_metatype = None
             if item is Item.ConceptNode:
-                k_metatype = K_IRI_CLASS
+                k_metatype = K_CLASS_OCCURRENCES
+                k_iri_metatype = K_IRI_CLASS
             elif item is Item.RoleNode:
-                k_metatype = K_IRI_OBJ_PROP
+                k_metatype = K_OBJ_PROP_OCCURRENCES
+                k_iri_metatype = K_IRI_OBJ_PROP
             elif item is Item.AttributeNode:
-                k_metatype = K_IRI_DATA_PROP
+                k_metatype = K_DATA_PROP_OCCURRENCES
+                k_iri_metatype = K_IRI_DATA_PROP
             elif item is Item.IndividualNode:
-                k_metatype = K_IRI_INDIVIDUAL
+                k_metatype = K_INDIVIDUAL_OCCURRENCES
+                k_iri_metatype = K_IRI_INDIVIDUAL
             elif item is Item.ValueDomainNode:
-                k_metatype = K_IRI_DATATYPE
+                k_metatype = K_DATATYPE_OCCURRENCES
+                k_iri_metatype = K_IRI_DATATYPE
             if not diagram:
-                result = set()
-                for diag,diagSet in self[k_metatype].items():
-                    result = result|diagSet
-                return result
+                if self.pending:
+                    iris = set(self[k_metatype])
+                    for pending in self.pending.values():
+                        iris.update(pending.iris.get(item, ()))
+                    return iris
+                return self[k_metatype].keys()
+            elif diagram.name in self.pending:
+                return self.pending[diagram.name].iris.get(item, set())
             else:
-                return self[k_metatype][diagram.name]
+                return self[k_iri_metatype][diagram.name]
         except (KeyError, TypeError):
             return set()
 
@@ -947,6 +1351,10 @@ class ProjectIRIIndex(ProjectIndex):
         :item: Item
         :rtype: bool
         """
+        if diagram and diagram.name in self.pending:
+            return self.pending[diagram.name].hasIRI(iri, item)
+        if not diagram and any(p.hasIRI(iri, item) for p in self.pending.values()):
+            return True
         try:
             k_metatype = None
             if item:
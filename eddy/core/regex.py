@@ -58,6 +58,7 @@ RE_FACET = re.compile(r'^(?P<facet>[\w:]*)[\s\^]*"(?P<value>.*)"$') # tokenize f
 RE_ITEM_PREFIX = re.compile(r'^(?P<prefix>[^\d])(?P<value>\d+)$') # split items prefix/id
 RE_LOG_MESSAGE = re.compile(r'^(?P<date>.{10})\s(?P<time>.{8})\s(?P<level>\w+)\s+(?P<message>.*)$') # tokenize log messages
 RE_QUOTED = re.compile(r'^".*"$') # identify strings fully embraced into quotes
+RE_SEARCH_WORD = re.compile(r'[^\W_]+') # split text into words for the search index
 RE_OWL_INVALID_CHAR = re.compile(r'[^{}]'.format(iunreserved)) # identify OWL invalid characters
 RE_OWL_ONTOLOGY_FUNCTIONAL_TAG = re.compile(r'^Ontology\s*\(.*$') # identify OWL ontology tag in Functional OWL
 RE_OWL_ONTOLOGY_MANCHESTER_TAG = re.compile(r'^Ontology:\s*.*$') # identify OWL ontology tag in Mancherster OWL
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+
+from weakref import WeakSet
+
+from PyQt5 import QtCore
+
+from eddy.core.functions.signals import connect, disconnect
+from eddy.core.owl import IRIRender
+
+
+class IRILabelRenderer(QtCore.QObject):
+    """
+    This class renders the IRIs of a project according to the current rendering mode
+    (full IRI, prefixed IRI, label or simple name), caching the rendered string of each
+    IRI so that it is computed only once no matter how many nodes share the same IRI.
+
+    Predicate nodes subscribe to the renderer for their IRI: whenever the rendered string
+    of an IRI changes (because the IRI itself, one of its annotations, the prefix map or
+    the rendering mode changes) the cache is invalidated only for the affected IRIs and
+    the label of the subscribed nodes is updated using a single computation per IRI.
+    """
+    def __init__(self, project):
+        """
+        Initialize the label renderer.
+        :type project: Project
+        """
+        super().__init__(project)
+        self.setObjectName('iri_label_renderer')
+        settings = QtCore.QSettings()
+        rendering = settings.value('ontology/iri/render', IRIRender.PREFIX.value, str)
+        self.mode = IRIRender.valueOf(rendering) or IRIRender.PREFIX
+        self.language = settings.value('ontology/iri/render/language', 'it', str)
+        self.cache = {}
+        self.iris = {}
+        self.subscribers = {}
+        connect(project.sgnPrefixAdded, self.onPrefixChanged)
+        connect(project.sgnPrefixRemoved, self.onPrefixChanged)
+        connect(project.sgnPrefixModified, self.onPrefixChanged)
+        connect(project.sgnPrefixMapCleared, self.onPrefixChanged)
+
+    #############################################
+    #   PROPERTIES
+    #################################
+
+    @property
+    def project(self):
+        """
+        Returns the project whose IRIs are rendered.
+        :rtype: Project
+        """
+        return self.parent()
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot()
+    def onAnnotationChanged(self):
+        """
+        Executed when an annotation of a subscribed IRI is added, removed or modified.
+        """
+        if self.mode is IRIRender.LABEL:
+            self.relabel([self.sender()])
+
+    @QtCore.pyqtSlot()
+    def onIRIModified(self):
+        """
+        Executed when a subscribed IRI is modified.
+        """
+        self.relabel([self.sender()])
+
+    @QtCore.pyqtSlot()
+    def onPrefixChanged(self):
+        """
+        Executed when the prefix map of the project changes.
+        """
+        if self.mode is not IRIRender.FULL:
+            self.relabel()
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    @classmethod
+    def forProject(cls, project):
+        """
+        Returns the label renderer of the given project, creating it if needed.
+        :type project: Project
+        :rtype: IRILabelRenderer
+        """
+        renderer = project.findChild(cls, 'iri_label_renderer', QtCore.Qt.FindDirectChildrenOnly)
+        if renderer is None:
+            renderer = cls(project)
+        return renderer
+
+    def label(self, iri):
+        """
+        Returns the rendered string of the given IRI.
+        The string is cached only for subscribed IRIs, whose changes are tracked by the renderer.
+        :type iri: IRI
+        :rtype: str
+        """
+        key = id(iri)
+        text = self.cache.get(key)
+        if text is None:
+            text = self.render(iri)
+            if key in self.iris:
+                self.cache[key] = text
+        return text
+
+    def relabel(self, iris=None):
+        """
+        Discard the cached string of the given IRIs (or of all the IRIs if none is
+        supplied) and update the label of the nodes subscribed to them.
+        :type iris: list
+        """
+        if iris is None:
+            self.cache.clear()
+            iris = list(self.iris.values())
+        else:
+            for iri in iris:
+                self.cache.pop(id(iri), None)
+        for iri in iris:
+            for node in list(self.subscribers.get(id(iri), ())):
+                node.doUpdateNodeLabel()
+
+    def render(self, iri):
+        """
+        Render the given IRI according to the current rendering mode, bypassing the cache.
+        :type iri: IRI
+        :rtype: str
+        """
+        if self.mode is IRIRender.FULL:
+            return IRIRender.renderByFullIRI(iri)
+        elif self.mode is IRIRender.LABEL:
+            return IRIRender.renderByLabel(iri, self.language)
+        elif self.mode is IRIRender.SIMPLE_NAME:
+            return IRIRender.renderBySimpleName(iri)
+        return IRIRender.renderByPrefixedIRI(iri)
+
+    def setMode(self, mode, language=None):
+        """
+        Change the rendering mode (and the label language), updating the label of all the subscribed nodes.
+        :type mode: IRIRender
+        :type language: str
+        """
+        self.mode = mode
+        if language:
+            self.language = language
+        self.relabel()
+
+    def subscribe(self, node, iri):
+        """
+        Subscribe the given node to changes in the rendered string of the given IRI.
+        :type node: PredicateNodeMixin
+        :type iri: IRI
+        """
+        key = id(iri)
+        if key not in self.iris:
+            self.iris[key] = iri
+            self.subscribers[key] = WeakSet()
+            connect(iri.sgnIRIModified, self.onIRIModified)
+            connect(iri.sgnAnnotationAdded, self.onAnnotationChanged)
+            connect(iri.sgnAnnotationRemoved, self.onAnnotationChanged)
+            connect(iri.sgnAnnotationModified, self.onAnnotationChanged)
+        self.subscribers[key].add(node)
+
+    def unsubscribe(self, node, iri):
+        """
+        Remove the subscription of the given node to the given IRI.
+        :type node: PredicateNodeMixin
+        :type iri: IRI
+        """
+        key = id(iri)
+        subscribers = self.subscribers.get(key)
+        if subscribers is not None:
+            subscribers.discard(node)
+            if not subscribers:
+                disconnect(iri.sgnIRIModified, self.onIRIModified)
+                disconnect(iri.sgnAnnotationAdded, self.onAnnotationChanged)
+                disconnect(iri.sgnAnnotationRemoved, self.onAnnotationChanged)
+                disconnect(iri.sgnAnnotationModified, self.onAnnotationChanged)
+                del self.subscribers[key]
+                del self.iris[key]
+                self.cache.pop(key, None)
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+
+from bisect import bisect_left
+
+from PyQt5 import QtCore
+
+from eddy.core.functions.signals import connect, disconnect
+from eddy.core.owl import IRI
+from eddy.core.regex import RE_CAMEL_SPACE, RE_SEARCH_WORD
+
+
+class EntitySearchIndex(QtCore.QObject):
+    """
+    This class implements a token/trigram index over the IRIs of a project, which can be
+    used to look up entities by approximate spelling of their IRI, simple name, prefixed
+    form or annotation values (in any language).
+
+    The index is two-level: each IRI is split into a set of tokens, and each distinct token
+    is split into trigrams, so that fuzzy lookups only need to scan the (small) vocabulary
+    of the project rather than the IRIs themselves. The index is built on first use, and it
+    is then kept up to date using the signals of the project and of the indexed IRIs.
+    """
+    ExactScore = 1.0
+    PrefixScore = 0.8
+    SubstringScore = 0.6
+    FuzzyScore = 0.5
+    FuzzyThreshold = 0.45
+
+    def __init__(self, project):
+        """
+        Initialize the search index.
+        :type project: Project
+        """
+        super().__init__(project)
+        self.setObjectName('entity_search_index')
+        self.built = False
+        self.iris = {}
+        self.grams = {}
+        self.postings = {}
+        self.tokensFor = {}
+        self.vocabulary = []
+        self.vocabularyDirty = False
+        connect(project.sgnIRIAdded, self.onIRIAdded)
+        connect(project.sgnIRIRemoved, self.onIRIRemoved)
+        connect(project.sgnPrefixAdded, self.invalidate)
+        connect(project.sgnPrefixRemoved, self.invalidate)
+        connect(project.sgnPrefixModified, self.invalidate)
+        connect(project.sgnPrefixMapCleared, self.invalidate)
+
+    #############################################
+    #   PROPERTIES
+    #################################
+
+    @property
+    def project(self):
+        """
+        Returns the project whose IRIs are indexed.
+        :rtype: Project
+        """
+        return self.parent()
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot()
+    def invalidate(self):
+        """
+        Discard the whole index, which will be rebuilt on the next lookup.
+        This is used when a change affects a large number of IRIs (e.g. prefix changes).
+        """
+        for iri in self.iris.values():
+            self.disconnectIRISignals(iri)
+        self.built = False
+        self.iris = {}
+        self.grams = {}
+        self.postings = {}
+        self.tokensFor = {}
+        self.vocabulary = []
+        self.vocabularyDirty = False
+
+    @QtCore.pyqtSlot()
+    def onIRIChanged(self):
+        """
+        Executed when an indexed IRI, or one of its annotations, changes.
+        """
+        iri = self.sender()
+        self.remove(iri)
+        self.add(iri)
+
+    @QtCore.pyqtSlot(IRI)
+    def onIRIAdded(self, iri):
+        """
+        Executed when an IRI is added to the project.
+        :type iri: IRI
+        """
+        if self.built:
+            self.connectIRISignals(iri)
+            self.add(iri)
+
+    @QtCore.pyqtSlot(IRI)
+    def onIRIRemoved(self, iri):
+        """
+        Executed when an IRI is removed from the project.
+        :type iri: IRI
+        """
+        if self.built:
+            self.remove(iri)
+            self.disconnectIRISignals(iri)
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def add(self, iri):
+        """
+        Add the given IRI to the index (signals of the IRI are not connected by this method).
+        :type iri: IRI
+        """
+        key = id(iri)
+        if key not in self.iris:
+            tokens = set()
+            for text in self.documentsFor(iri):
+                tokens.update(self.tokenize(text))
+            self.iris[key] = iri
+            self.tokensFor[key] = tokens
+            for token in tokens:
+                postings = self.postings.get(token)
+                if postings is None:
+                    postings = self.postings[token] = set()
+                    for gram in self.trigrams(token):
+                        self.grams.setdefault(gram, set()).add(token)
+                    self.vocabularyDirty = True
+                postings.add(key)
+
+    def build(self):
+        """
+        Build the index from scratch, indexing all the IRIs known to the project.
+        """
+        self.invalidate()
+        for iri in list(self.project.stringToIRI.values()):
+            self.connectIRISignals(iri)
+            self.add(iri)
+        self.built = True
+
+    def connectIRISignals(self, iri):
+        """
+        Connect the signals of the given IRI affecting its indexed documents.
+        :type iri: IRI
+        """
+        connect(iri.sgnAnnotationAdded, self.onIRIChanged)
+        connect(iri.sgnAnnotationRemoved, self.onIRIChanged)
+        connect(iri.sgnAnnotationModified, self.onIRIChanged)
+        connect(iri.sgnIRIModified, self.onIRIChanged)
+
+    def disconnectIRISignals(self, iri):
+        """
+        Disconnect the signals of the given IRI affecting its indexed documents.
+        :type iri: IRI
+        """
+        disconnect(iri.sgnAnnotationAdded, self.onIRIChanged)
+        disconnect(iri.sgnAnnotationRemoved, self.onIRIChanged)
+        disconnect(iri.sgnAnnotationModified, self.onIRIChanged)
+        disconnect(iri.sgnIRIModified, self.onIRIChanged)
+
+    @staticmethod
+    def documentsFor(iri):
+        """
+        Returns the texts under which the given IRI can be found.
+        :type iri: IRI
+        :rtype: list
+        """
+        documents = [str(iri), iri.getSimpleName()]
+        if iri.manager:
+            prefixed = iri.manager.getShortestPrefixedForm(iri)
+            if prefixed:
+                documents.append(str(prefixed))
+        for assertion in iri.annotationAssertions:
+            documents.append(str(assertion.value))
+        return documents
+
+    @classmethod
+    def forProject(cls, project):
+        """
+        Returns the search index of the given project, creating it if needed.
+        :type project: Project
+        :rtype: EntitySearchIndex
+        """
+        index = project.findChild(cls, 'entity_search_index', QtCore.Qt.FindDirectChildrenOnly)
+        if index is None:
+            index = cls(project)
+        return index
+
+    def match(self, term):
+        """
+        Returns the score of the IRIs matching the given term, indexed by IRI id.
+        :type term: str
+        :rtype: dict
+        """
+        scores = {}
+        for token, score in self.matchTokens(term).items():
+            for key in self.postings[token]:
+                if scores.get(key, 0) < score:
+                    scores[key] = score
+        return scores
+
+    def matchTokens(self, term):
+        """
+        Returns the score of the tokens of the vocabulary matching the given term.
+        :type term: str
+        :rtype: dict
+        """
+        matches = {}
+        # PREFIX MATCHES: RANGE LOOKUP IN THE SORTED VOCABULARY
+        if self.vocabularyDirty:
+            self.vocabulary = sorted(self.postings)
+            self.vocabularyDirty = False
+        for i in range(bisect_left(self.vocabulary, term), len(self.vocabulary)):
+            token = self.vocabulary[i]
+            if not token.startswith(term):
+                break
+            matches[token] = self.ExactScore if token == term else self.PrefixScore
+        # FUZZY MATCHES: DICE COEFFICIENT OVER THE TRIGRAMS OF THE TERM
+        if len(term) >= 3:
+            grams = self.trigrams(term)
+            shared = {}
+            for gram in grams:
+                for token in self.grams.get(gram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            for token, count in shared.items():
+                if token in matches:
+                    continue
+                if term in token:
+                    matches[token] = self.SubstringScore
+                else:
+                    similarity = 2 * count / (len(grams) + len(token))
+                    if similarity >= self.FuzzyThreshold:
+                        matches[token] = self.FuzzyScore * similarity
+        return matches
+
+    def remove(self, iri):
+        """
+        Remove the given IRI from the index.
+        :type iri: IRI
+        """
+        key = id(iri)
+        if self.iris.pop(key, None) is not None:
+            for token in self.tokensFor.pop(key):
+                postings = self.postings[token]
+                postings.discard(key)
+                if not postings:
+                    del self.postings[token]
+                    for gram in self.trigrams(token):
+                        tokens = self.grams[gram]
+                        tokens.discard(token)
+                        if not tokens:
+                            del self.grams[gram]
+                    self.vocabularyDirty = True
+
+    def search(self, text, limit=None, accept=None):
+        """
+        Returns the IRIs matching the given text, sorted by decreasing relevance.
+        Every word of the text must match (exactly, as a prefix, as a substring or
+        approximately) at least one token of the returned IRIs.
+        :type text: str
+        :type limit: int
+        :type accept: callable
+        :rtype: list
+        """
+        if not self.built:
+            self.build()
+        scores = None
+        for term in set(self.tokenize(text)):
+            matches = self.match(term)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {k: v + matches[k] for k, v in scores.items() if k in matches}
+            if not scores:
+                return []
+        if not scores:
+            return []
+        results = [self.iris[key] for key in scores if accept is None or accept(self.iris[key])]
+        results.sort(key=lambda iri: (-scores[id(iri)], len(iri.getSimpleName()), str(iri)))
+        return results[:limit] if limit is not None else results
+
+    @staticmethod
+    def tokenize(text):
+        """
+        Split the given text into lowercase tokens: words are split on non alphanumeric
+        characters and on camel case boundaries (keeping the whole word as a token too).
+        :type text: str
+        :rtype: list
+        """
+        tokens = []
+        for word in RE_SEARCH_WORD.findall(text):
+            tokens.append(word.lower())
+            parts = RE_CAMEL_SPACE.sub(r'\1 \2', word).split()
+            if len(parts) > 1:
+                tokens.extend(part.lower() for part in parts)
+        return tokens
+
+    @staticmethod
+    def trigrams(token):
+        """
+        Returns the set of trigrams of the given token (padded at both ends).
+        :type token: str
+        :rtype: set
+        """
+        padded = '${0}$'.format(token)
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
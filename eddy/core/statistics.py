@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+
+from PyQt5 import QtCore
+from PyQt5 import QtWidgets
+
+from eddy.core.datatypes.graphol import Item
+from eddy.core.functions.signals import connect
+from eddy.core.owl import IRI
+
+
+class ProjectStatistics(QtCore.QObject):
+    """
+    This class publishes statistics about the content of a project (the number of distinct
+    entities of each kind and the number of items of each type, in the whole project or in
+    a single diagram).
+
+    Counters are read from the project index, which keeps them up to date incrementally
+    as items are added and removed, so that each counter is available in constant time.
+    Changes are not published right away: a snapshot of the counters is taken at most once
+    every PublishInterval milliseconds, and only the counters whose value differs from the
+    previous snapshot are emitted through sgnStatisticsChanged.
+    """
+    PublishInterval = 250
+    Entities = (
+        Item.ConceptNode,
+        Item.RoleNode,
+        Item.AttributeNode,
+        Item.IndividualNode,
+        Item.ValueDomainNode,
+    )
+
+    sgnStatisticsChanged = QtCore.pyqtSignal(dict)
+
+    def __init__(self, project):
+        """
+        Initialize the project statistics.
+        :type project: Project
+        """
+        super().__init__(project)
+        self.setObjectName('project_statistics')
+        self.snapshot = {}
+        self.timer = QtCore.QTimer(self, singleShot=True, interval=self.PublishInterval)
+        connect(self.timer.timeout, self.doPublish)
+        connect(project.sgnDiagramAdded, self.doSchedulePublish)
+        connect(project.sgnDiagramRemoved, self.doSchedulePublish)
+        connect(project.sgnItemAdded, self.onItemChanged)
+        connect(project.sgnItemRemoved, self.onItemChanged)
+        connect(project.sgnIRIRemovedFromAllDiagrams, self.onIRIRemoved)
+        connect(project.sgnSingleNodeSwitchIRI, self.onNodeIRISwitched)
+        connect(project.sgnUpdated, self.doSchedulePublish)
+        self.snapshot = self.collect()
+
+    #############################################
+    #   PROPERTIES
+    #################################
+
+    @property
+    def project(self):
+        """
+        Returns the project whose statistics are published.
+        :rtype: Project
+        """
+        return self.parent()
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot()
+    def doPublish(self):
+        """
+        Take a snapshot of the project counters and publish the ones which changed.
+        """
+        self.timer.stop()
+        snapshot = self.collect()
+        changed = {k: v for k, v in snapshot.items() if self.snapshot.get(k) != v}
+        changed.update({k: 0 for k in self.snapshot if k not in snapshot})
+        self.snapshot = snapshot
+        if changed:
+            self.sgnStatisticsChanged.emit(changed)
+
+    @QtCore.pyqtSlot()
+    def doSchedulePublish(self):
+        """
+        Schedule the publication of the project counters.
+        """
+        if not self.timer.isActive():
+            self.timer.start()
+
+    @QtCore.pyqtSlot(IRI)
+    def onIRIRemoved(self, _):
+        """
+        Executed when an IRI does not occur anymore in any diagram.
+        """
+        self.doSchedulePublish()
+
+    @QtCore.pyqtSlot(QtWidgets.QGraphicsScene, QtWidgets.QGraphicsItem)
+    def onItemChanged(self, *_):
+        """
+        Executed when an item is added to or removed from the project.
+        """
+        self.doSchedulePublish()
+
+    @QtCore.pyqtSlot(QtWidgets.QGraphicsItem, IRI)
+    def onNodeIRISwitched(self, *_):
+        """
+        Executed when the IRI of a node is switched.
+        """
+        self.doSchedulePublish()
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    @classmethod
+    def forProject(cls, project):
+        """
+        Returns the statistics of the given project, creating them if needed.
+        :type project: Project
+        :rtype: ProjectStatistics
+        """
+        statistics = project.findChild(cls, 'project_statistics', QtCore.Qt.FindDirectChildrenOnly)
+        if statistics is None:
+            statistics = cls(project)
+        return statistics
+
+    def collect(self):
+        """
+        Returns the current value of the project counters, indexed by (kind, Item) pairs, where kind
+        is 'entities' for the number of distinct IRIs occurring as the given item and 'items' for
+        the number of items of the given type.
+        :rtype: dict
+        """
+        counters = {('entities', item): len(self.project.itemIRIs(item)) for item in self.Entities}
+        counters.update({('items', item): count for item, count in self.project.index.typeCount.items()})
+        return counters
+
+    def entities(self, item):
+        """
+        Returns the number of distinct IRIs occurring as the given item, as of the last snapshot.
+        :type item: Item
+        :rtype: int
+        """
+        return self.snapshot.get(('entities', item), 0)
+
+    def items(self, item, diagram=None):
+        """
+        Returns the number of items of the given type in the given diagram, or in the
+        whole project if no diagram is given (as of the last snapshot).
+        :type item: Item
+        :type diagram: Diagram
+        :rtype: int
+        """
+        if diagram is not None:
+            return self.project.itemNum(item, diagram)
+        return self.snapshot.get(('items', item), 0)
@@ -33,10 +33,13 @@
 ##########################################################################
 
 
+import collections
 from abc import ABCMeta, abstractmethod
 
 from PyQt5 import QtCore
 
+from eddy.core.functions.signals import connect
+
 
 class AbstractWorker(QtCore.QObject):
     """
@@ -53,4 +56,187 @@ class AbstractWorker(QtCore.QObject):
         """
         Run the worker.
         """
-        pass
\ No newline at end of file
+        pass
+
+
+class FunctionWorker(AbstractWorker):
+    """
+    Extends AbstractWorker providing a worker that runs the given function with the given arguments.
+    The value returned by the function is stored in the result attribute, while
+    the exception raised by the function, if any, is stored in the error attribute.
+    """
+    def __init__(self, func, *args, **kwargs):
+        """
+        Initialize the worker.
+        :type func: callable
+        """
+        super().__init__()
+        self.args = args
+        self.error = None
+        self.func = func
+        self.kwargs = kwargs
+        self.result = None
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        """
+        Main worker.
+        """
+        try:
+            self.result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished.emit()
+
+
+class WorkerPool(QtCore.QObject):
+    """
+    Runs a set of workers concurrently, each one in a dedicated thread,
+    keeping at most maxThreadCount threads running at the same time.
+    Workers which are instances of one of the exclusive types never run concurrently
+    with another worker of the same type (e.g. workers sharing a non thread-safe resource).
+    """
+    sgnWorkerFinished = QtCore.pyqtSignal(QtCore.QObject)
+
+    def __init__(self, maxThreadCount=None, parent=None, exclusive=()):
+        """
+        Initialize the pool.
+        :type maxThreadCount: int
+        :type parent: QObject
+        :type exclusive: tuple
+        """
+        super().__init__(parent)
+        self.exclusive = tuple(exclusive)
+        self.loop = None
+        self.maxThreadCount = max(maxThreadCount or QtCore.QThread.idealThreadCount(), 1)
+        self.queue = collections.deque()
+        self.running = {}
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot()
+    def onWorkerFinished(self):
+        """
+        Executed when a worker of the pool completes its job.
+        """
+        worker = self.sender()
+        qthread = self.running.pop(worker, None)
+        if qthread is None:
+            return
+        qthread.quit()
+        qthread.wait()
+        self.sgnWorkerFinished.emit(worker)
+        self.startQueued()
+        if not self.running:
+            self.loop.quit()
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def isRunnable(self, worker):
+        """
+        Returns True if the given worker can be started alongside the running ones, False otherwise.
+        :type worker: AbstractWorker
+        :rtype: bool
+        """
+        for kind in self.exclusive:
+            if isinstance(worker, kind) and any(isinstance(x, kind) for x in self.running):
+                return False
+        return True
+
+    def run(self, workers):
+        """
+        Run the given workers, returning when all of them emitted their finished signal.
+        The calling thread keeps processing its events in the meantime (so the UI stays responsive).
+        :type workers: list
+        """
+        self.queue.extend(workers)
+        if not self.queue:
+            return
+        self.loop = QtCore.QEventLoop()
+        self.startQueued()
+        self.loop.exec_()
+
+    def start(self, worker):
+        """
+        Start the given worker in a new thread.
+        :type worker: AbstractWorker
+        """
+        qthread = QtCore.QThread()
+        worker.moveToThread(qthread)
+        connect(qthread.started, worker.run)
+        connect(worker.finished, self.onWorkerFinished)
+        self.running[worker] = qthread
+        qthread.start()
+
+    def startQueued(self):
+        """
+        Start the queued workers, in order, as long as there are threads available.
+        """
+        for worker in list(self.queue):
+            if len(self.running) >= self.maxThreadCount:
+                break
+            if self.isRunnable(worker):
+                self.queue.remove(worker)
+                self.start(worker)
+
+
+def runInThread(worker):
+    """
+    Run the given worker in a dedicated thread, returning when the worker emits its finished signal.
+    The calling thread keeps processing its events in the meantime (so the UI stays responsive).
+    :type worker: AbstractWorker
+    """
+    loop = QtCore.QEventLoop()
+    qthread = QtCore.QThread()
+    worker.moveToThread(qthread)
+    connect(qthread.started, worker.run)
+    connect(worker.finished, qthread.quit)
+    connect(qthread.finished, loop.quit)
+    qthread.start()
+    loop.exec_()
+    qthread.wait()
+
+
+def runInChunks(steps, budget=50, callback=None):
+    """
+    Consume the given iterable on the calling thread in chunks lasting about 'budget' milliseconds,
+    returning when the iterable is exhausted. The calling thread processes its events in between
+    chunks (so the UI stays responsive), and the last value produced by each chunk is passed to
+    the given callback, if any. Exceptions raised while consuming the iterable are re-raised.
+    :type steps: iterable
+    :type budget: int
+    :type callback: callable
+    """
+    error = None
+    iterator = iter(steps)
+    clock = QtCore.QElapsedTimer()
+    loop = QtCore.QEventLoop()
+    timer = QtCore.QTimer(interval=0)
+
+    def chunk():
+        nonlocal error
+        value = None
+        clock.start()
+        try:
+            while not clock.hasExpired(budget):
+                value = next(iterator)
+        except StopIteration:
+            timer.stop()
+            loop.quit()
+        except Exception as e:
+            error = e
+            timer.stop()
+            loop.quit()
+        if callback and value is not None:
+            callback(value)
+
+    connect(timer.timeout, chunk)
+    timer.start()
+    loop.exec_()
+    if error:
+        raise error
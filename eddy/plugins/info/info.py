@@ -67,10 +67,12 @@ from eddy.core.functions.signals import (
     connect,
     disconnect,
 )
-from eddy.core.items.common import AbstractItem
 from eddy.core.items.edges.common.base import AbstractEdge
 from eddy.core.items.nodes.common.base import AbstractNode
-from eddy.core.owl import OWL2Profiles
+from eddy.core.owl import (
+    IRI,
+    OWL2Profiles,
+)
 from eddy.core.plugin import AbstractPlugin
 from eddy.core.project import (
     K_ASYMMETRIC,
@@ -84,6 +86,7 @@ from eddy.core.project import (
 )
 from eddy.core.project import Project
 from eddy.core.regex import RE_CAMEL_SPACE
+from eddy.core.statistics import ProjectStatistics
 from eddy.ui.dock import DockWidget
 from eddy.ui.fields import (
     CheckBox,
@@ -144,28 +147,26 @@ class InfoPlugin(AbstractPlugin):
         """
         Executed whenever the active diagram is updated.
         """
-        self.widget('info').stack()
+        widget = self.widget('info')
+        # THE PROJECT BOX IS KEPT UP TO DATE BY THE PROJECT STATISTICS
+        if widget.diagram and len(widget.diagram.selection) == 1:
+            widget.stack()
 
-    @QtCore.pyqtSlot(QtWidgets.QGraphicsScene, QtWidgets.QGraphicsItem)
-    def onProjectItemAdded(self, _diagram: Diagram, _item: AbstractItem) -> None:
+    @QtCore.pyqtSlot(IRI)
+    def onOntologyIRIModified(self, _iri: IRI) -> None:
         """
-        Executed whenever a new element is added to the active project.
+        Executed whenever the ontology IRI of the current project is modified.
         """
-        self.widget('info').stack()
+        widget = self.widget('info')
+        if widget.stacked.currentWidget() is widget.infoProject:
+            widget.infoProject.updateData(self.project)
 
-    @QtCore.pyqtSlot(QtWidgets.QGraphicsScene, QtWidgets.QGraphicsItem)
-    def onProjectItemRemoved(self, _diagram: Diagram, _item: AbstractItem) -> None:
+    @QtCore.pyqtSlot(dict)
+    def onStatisticsChanged(self, statistics: dict) -> None:
         """
-        Executed whenever a new element is removed from the active project.
+        Executed whenever the statistics of the current project change.
         """
-        self.widget('info').stack()
-
-    @QtCore.pyqtSlot()
-    def onProjectUpdated(self) -> None:
-        """
-        Executed whenever the current project is updated.
-        """
-        self.widget('info').stack()
+        self.widget('info').infoProject.updateStatistics(statistics)
 
     @QtCore.pyqtSlot()
     def onSessionReady(self) -> None:
@@ -173,12 +174,10 @@ class InfoPlugin(AbstractPlugin):
         Executed whenever the main session completes the startup sequence.
         """
         self.debug('Connecting to project: %s', self.project.name)
-        connect(self.project.sgnUpdated, self.onProjectUpdated)
+        connect(self.project.sgnOntologyIRIModified, self.onOntologyIRIModified)
         connect(self.project.sgnDiagramAdded, self.onDiagramAdded)
         connect(self.project.sgnDiagramRemoved, self.onDiagramRemoved)
-        connect(self.project.sgnItemAdded, self.onProjectItemAdded)
-        connect(self.project.sgnItemRemoved, self.onProjectItemRemoved)
-        connect(self.project.sgnUpdated, self.onProjectUpdated)
+        connect(ProjectStatistics.forProject(self.project).sgnStatisticsChanged, self.onStatisticsChanged)
         self.widget('info').stack()
 
     @QtCore.pyqtSlot(QtWidgets.QMdiSubWindow)
@@ -226,11 +225,10 @@ class InfoPlugin(AbstractPlugin):
         """
         # DISCONNECT FROM CURRENT PROJECT
         self.debug('Disconnecting from project: %s', self.project.name)
-        disconnect(self.project.sgnUpdated, self.onProjectUpdated)
+        disconnect(self.project.sgnOntologyIRIModified, self.onOntologyIRIModified)
         disconnect(self.project.sgnDiagramAdded, self.onDiagramAdded)
         disconnect(self.project.sgnDiagramRemoved, self.onDiagramRemoved)
-        disconnect(self.project.sgnItemAdded, self.onProjectItemAdded)
-        disconnect(self.project.sgnItemRemoved, self.onProjectItemRemoved)
+        disconnect(ProjectStatistics.forProject(self.project).sgnStatisticsChanged, self.onStatisticsChanged)
 
         # DISCONNECT FROM ACTIVE SESSION
         self.debug('Disconnecting from active session')
@@ -463,12 +461,12 @@ class InfoWidget(QtWidgets.QScrollArea):
         Set the current stacked widget.
         """
         if self.diagram:
-            selected = self.diagram.selectedItems()
-            if not selected or len(selected) > 1:
+            selection = self.diagram.selection
+            if len(selection) != 1:
                 show = self.infoProject
                 show.updateData(self.project)
             else:
-                item = first(selected)
+                item = first(selection.nodes) or first(selection.edges)
                 if item.isNode():
                     if item.isPredicate():
                         if item.type() is Item.AttributeNode:
@@ -720,6 +718,13 @@ class ProjectInfo(AbstractInfo):
         self.atomicPredLayout.addRow(self.attributesKey, self.attributesField)
         self.atomicPredLayout.addRow(self.individualsKey, self.individualsField)
 
+        self.entityFields = {
+            Item.ConceptNode: self.conceptsField,
+            Item.RoleNode: self.rolesField,
+            Item.AttributeNode: self.attributesField,
+            Item.IndividualNode: self.individualsField,
+        }
+
         # self.assertionsHeader = Header('Assertions', self)
         # self.assertionsLayout = QtWidgets.QFormLayout()
         # self.assertionsLayout.setSpacing(0)
@@ -804,13 +809,21 @@ class ProjectInfo(AbstractInfo):
         #         self.profileField.setCurrentIndex(i)
         #         break
 
-        self.attributesField.setValue(len(project.itemIRIs(Item.AttributeNode)))
-        self.conceptsField.setValue(len(project.itemIRIs(Item.ConceptNode)))
-        self.rolesField.setValue(len(project.itemIRIs(Item.RoleNode)))
-        self.individualsField.setValue(len(project.itemIRIs(Item.IndividualNode)))
+        statistics = ProjectStatistics.forProject(project)
+        self.updateStatistics({('entities', item): statistics.entities(item) for item in self.entityFields})
         # self.inclusionsField.setValue(project.itemNum(Item.InclusionEdge))
         # self.membershipField.setValue(project.itemNum(Item.MembershipEdge))
 
+    def updateStatistics(self, statistics: dict) -> None:
+        """
+        Update the metric fields affected by the given project statistics.
+        Fields are only updated when their value actually changes.
+        """
+        for (kind, item), value in statistics.items():
+            field = self.entityFields.get(item) if kind == 'entities' else None
+            if field is not None and field.text() != str(value):
+                field.setValue(value)
+
 
 class EdgeInfo(AbstractInfo):
     """
@@ -33,6 +33,8 @@
 ##########################################################################
 
 
+from bisect import bisect_left
+
 from PyQt5 import (
     QtCore,
     QtGui,
@@ -48,12 +50,12 @@ from eddy.core.items.nodes.common.base import (
     PredicateNodeMixin,
 )
 from eddy.core.owl import (
-    AnnotationAssertion,
     ImportedOntology,
     IRI,
     IRIRender,
 )
 from eddy.core.plugin import AbstractPlugin
+from eddy.core.search import EntitySearchIndex
 from eddy.ui.dock import DockWidget
 from eddy.ui.fields import StringField
 
@@ -62,8 +64,6 @@ class OntologyExplorerPlugin(AbstractPlugin):
     """
     This plugin provides the Ontology Explorer widget.
     """
-    sgnFakeItemAdded = QtCore.pyqtSignal(QtWidgets.QGraphicsScene, QtWidgets.QGraphicsItem)
-    sgnFakeImportedOntologyAdded = QtCore.pyqtSignal(ImportedOntology)
 
     #############################################
     #   SLOTS
@@ -89,15 +89,8 @@ class OntologyExplorerPlugin(AbstractPlugin):
         connect(self.session.sgnConsistencyCheckReset, widget.doResetReasonerHighlight)
 
         # FILL IN ONTOLOGY EXPLORER WITH DATA
-        connect(self.sgnFakeImportedOntologyAdded, widget.onImportedOntologyAdded)
-        for impOnt in self.project.importedOntologies:
-            self.sgnFakeImportedOntologyAdded.emit(impOnt)
-        connect(self.sgnFakeItemAdded, widget.doAddNode)
-        for node in self.project.nodes():
-            self.sgnFakeItemAdded.emit(node.diagram, node)
+        widget.model.reset()
         widget.doFilterItem('')
-        disconnect(self.sgnFakeItemAdded, widget.doAddNode)
-        disconnect(self.sgnFakeImportedOntologyAdded, widget.onImportedOntologyAdded)
 
     #############################################
     #   HOOKS
@@ -170,6 +163,8 @@ class OntologyExplorerPlugin(AbstractPlugin):
         self.session.addDockWidget(QtCore.Qt.RightDockWidgetArea, self.widget('ontology_explorer_dock'))
 
 
+
+
 class OntologyExplorerWidget(QtWidgets.QWidget):
     """
     This class implements the ontology explorer used to list ontology predicates.
@@ -192,23 +187,6 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
         super().__init__(plugin.session)
 
         self.plugin = plugin
-        self.items = [
-            Item.ConceptNode,
-            Item.RoleNode,
-            Item.AttributeNode,
-            Item.IndividualNode,
-            Item.ValueDomainNode
-        ]
-        self.unsatisfiableItems = list()
-        self.unsatisfiableClasses = list()
-        self.unsatisfiableObjProps = list()
-        self.unsatisfiableDataProps = list()
-
-        self.iconAttribute = QtGui.QIcon(':/icons/18/ic_treeview_attribute')
-        self.iconConcept = QtGui.QIcon(':/icons/18/ic_treeview_concept')
-        self.iconInstance = QtGui.QIcon(':/icons/18/ic_treeview_instance')
-        self.iconRole = QtGui.QIcon(':/icons/18/ic_treeview_role')
-        self.iconValue = QtGui.QIcon(':/icons/18/ic_treeview_value')
 
         self.searchShortcut = QtWidgets.QShortcut(QtGui.QKeySequence('Ctrl+f'), self.session)
         self.search = StringField(self)
@@ -217,11 +195,9 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
         self.search.setPlaceholderText('Search...')
         self.search.setToolTip('Search ({})'.format(self.searchShortcut.key().toString(QtGui.QKeySequence.NativeText)))
         self.search.setFixedHeight(30)
-        self.model = QtGui.QStandardItemModel(self)
+        self.model = OntologyExplorerModel(self)
         self.proxy = OntologyExplorerFilterProxyModel(self)
-        self.proxy.setDynamicSortFilter(False)
-        self.proxy.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
-        self.proxy.setSortCaseSensitivity(QtCore.Qt.CaseSensitive)
+        self.proxy.setDynamicSortFilter(True)
         self.proxy.setSourceModel(self.model)
         self.ontoview = OntologyExplorerView(self)
         self.ontoview.setModel(self.proxy)
@@ -307,127 +283,53 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
     #################################
 
     @QtCore.pyqtSlot(str)
-    def onRenderingModified(self, rendering):
-        # RESET MODEL DISPLAY DATA
-        # Here we force te explorer view to become invisible while we update
-        # its model in order to avoid unnecessary UI updates that could
-        # otherwise cause the entire application to become unresponsive.
-        # This is kind of a hack but it works for the moment.
-        self.ontoview.setVisible(False)
-        for index in range(self.model.rowCount()):
-            item = self.model.item(index)
-            data = item.data(OntologyExplorerView.IRIRole)
-            if isinstance(data, IRI):
-                item.setText(self.parentKeyForIRI(data))
-                f = item.font()
-                f.setStrikeOut(data.deprecated)
-                item.setFont(f)
-        self.model.dataChanged.emit(self.model.index(0, 0),
-                                    self.model.index(self.model.rowCount() - 1, 0))
-        self.ontoview.setVisible(True)
-        # APPLY FILTERS AND SORT
-        self.proxy.invalidateFilter()
-        self.proxy.sort(0, QtCore.Qt.AscendingOrder)
+    def onRenderingModified(self, _rendering):
+        self.model.refresh()
 
     @QtCore.pyqtSlot(str, str)
     def onPrefixAdded(self, _prefix: str, _ns: str):
         settings = QtCore.QSettings()
         rendering = settings.value('ontology/iri/render', IRIRender.PREFIX.value, str)
         if rendering == IRIRender.PREFIX.value or rendering == IRIRender.LABEL.value:
-            self.redrawIRIItem()
+            self.model.refresh()
 
     @QtCore.pyqtSlot(str)
     def onPrefixRemoved(self, _: str):
         settings = QtCore.QSettings()
         rendering = settings.value('ontology/iri/render', IRIRender.PREFIX.value, str)
         if rendering == IRIRender.PREFIX.value or rendering == IRIRender.LABEL.value:
-            self.redrawIRIItem()
+            self.model.refresh()
 
     @QtCore.pyqtSlot(str)
     def onPrefixModified(self, _: str):
         settings = QtCore.QSettings()
         rendering = settings.value('ontology/iri/render', IRIRender.PREFIX.value, str)
         if rendering == IRIRender.PREFIX.value or rendering == IRIRender.LABEL.value:
-            self.redrawIRIItem()
-
-    @QtCore.pyqtSlot(str)
-    def onIRIModified(self, _: str):
-        iri = self.sender()
-        self.redrawIRIItem(iri)
-
-    @QtCore.pyqtSlot(AnnotationAssertion)
-    def onIRIAnnotationAssertionAdded(self, _):
-        iri = self.sender()
-        self.redrawIRIItem(iri)
-
-    @QtCore.pyqtSlot(AnnotationAssertion)
-    def onIRIAnnotationAssertionRemoved(self, _):
-        iri = self.sender()
-        self.redrawIRIItem(iri)
-
-    @QtCore.pyqtSlot(AnnotationAssertion)
-    def onIRIAnnotationAssertionModified(self, _):
-        iri = self.sender()
-        self.redrawIRIItem(iri)
-
-    @QtCore.pyqtSlot()
-    def onNodeIRISwitched(self):
-        node = self.sender()
-        self.doAddNode(node.diagram, node)
+            self.model.refresh()
 
     @QtCore.pyqtSlot(AbstractNode, IRI)
     def onSingleNodeIRISwitched(self, node, oldIRI):
-        oldParentK = self.parentKeyForIRI(oldIRI)
-        for parent in self.model.findItems(oldParentK, QtCore.Qt.MatchExactly):
-            rowCount = parent.rowCount()
-            for i in range(rowCount):
-                child = parent.child(i)
-                if child.data(OntologyExplorerView.IRIRole) is node:
-                    parent.removeRow(i)
-                    break
-            if not parent.rowCount():
-                if isinstance(node, PredicateNodeMixin):
-                    self.disconnectIRISignals(parent.data(OntologyExplorerView.IRIRole))
-                self.model.removeRow(parent.index().row())
+        self.model.removeNode(node, oldIRI)
 
     @QtCore.pyqtSlot(IRI)
     def onIRIRemovedFromAllDiagrams(self, iri):
-        parentK = self.parentKeyForIRI(iri)
-        for parent in self.model.findItems(parentK, QtCore.Qt.MatchExactly):
-            self.model.removeRow(parent.index().row())
+        self.model.removeIRI(iri)
 
     @QtCore.pyqtSlot(IRI)
     def onUnsatisfiableClass(self, iri):
-        parent = self.parentForIRI(iri)
-        if parent:
-            parent.setData(OntologyExplorerView.UnsatisfiableBrush, QtCore.Qt.ForegroundRole)
-            self.unsatisfiableItems.append(parent)
-            self.unsatisfiableClasses.append(parent)
+        self.model.setUnsatisfiable(iri, Item.ConceptNode)
 
     @QtCore.pyqtSlot(IRI)
     def onUnsatisfiableObjectProperty(self, iri):
-        parent = self.parentForIRI(iri)
-        if parent:
-            parent.setData(OntologyExplorerView.UnsatisfiableBrush, QtCore.Qt.ForegroundRole)
-            self.unsatisfiableItems.append(parent)
-            self.unsatisfiableObjProps.append(parent)
+        self.model.setUnsatisfiable(iri, Item.RoleNode)
 
     @QtCore.pyqtSlot(IRI)
     def onUnsatisfiableDataProperty(self, iri):
-        parent = self.parentForIRI(iri)
-        if parent:
-            parent.setData(OntologyExplorerView.UnsatisfiableBrush, QtCore.Qt.ForegroundRole)
-            self.unsatisfiableItems.append(parent)
-            self.unsatisfiableDataProps.append(parent)
+        self.model.setUnsatisfiable(iri, Item.AttributeNode)
 
     @QtCore.pyqtSlot()
     def doResetReasonerHighlight(self):
-        for item in self.unsatisfiableItems:
-            item.setData(None, QtCore.Qt.ForegroundRole)
-        self.unsatisfiableItems = list()
-        self.unsatisfiableClasses = list()
-        self.unsatisfiableObjProps = list()
-        self.unsatisfiableDataProps = list()
+        self.model.clearUnsatisfiable()
 
     @QtCore.pyqtSlot(ImportedOntology)
     def onImportedOntologyAdded(self, impOnt):
@@ -435,86 +337,7 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
         :param impOnt:ImportedOntology
         :return:
         """
-        for classIRI in impOnt.classes:
-            parent = self.parentForIRI(classIRI)
-            if not parent:
-                parent = QtGui.QStandardItem(self.parentKeyForIRI(classIRI))
-                parent.setData(classIRI, OntologyExplorerView.IRIRole)
-                iri = self.project.getIRI(str(classIRI))
-                f = parent.font()
-                f.setStrikeOut(iri.deprecated)
-                parent.setFont(f)
-                self.connectIRISignals(classIRI)
-                self.model.appendRow(parent)
-            child = QtGui.QStandardItem(self.childKeyForImported(impOnt,classIRI))
-            # CHECK FOR DUPLICATE NODES
-            children = [parent.child(i) for i in range(parent.rowCount())]
-            if not any([(child.text() == c.text() and c.icon() is self.iconConcept) for c in children]):
-                child.setIcon(self.iconConcept)
-                childData = [classIRI, Item.ConceptNode.value]
-                child.setData(childData, OntologyExplorerView.IRIRole)
-                parent.appendRow(child)
-        for objPropIRI in impOnt.objectProperties:
-            parent = self.parentForIRI(objPropIRI)
-            if not parent:
-                parent = QtGui.QStandardItem(self.parentKeyForIRI(objPropIRI))
-                parent.setData(objPropIRI, OntologyExplorerView.IRIRole)
-                iri = self.project.getIRI(str(objPropIRI))
-                f = parent.font()
-                f.setStrikeOut(iri.deprecated)
-                parent.setFont(f)
-                self.connectIRISignals(objPropIRI)
-                self.model.appendRow(parent)
-            child = QtGui.QStandardItem(self.childKeyForImported(impOnt,objPropIRI))
-            # CHECK FOR DUPLICATE NODES
-            children = [parent.child(i) for i in range(parent.rowCount())]
-            if not any([(child.text() == c.text() and c.icon() is self.iconRole) for c in children]):
-                child.setIcon(self.iconRole)
-                childData = [objPropIRI, Item.RoleNode.value]
-                child.setData(childData, OntologyExplorerView.IRIRole)
-                parent.appendRow(child)
-        for dataPropIRI in impOnt.dataProperties:
-            parent = self.parentForIRI(dataPropIRI)
-            if not parent:
-                parent = QtGui.QStandardItem(self.parentKeyForIRI(dataPropIRI))
-                parent.setData(dataPropIRI, OntologyExplorerView.IRIRole)
-                iri = self.project.getIRI(str(dataPropIRI))
-                f = parent.font()
-                f.setStrikeOut(iri.deprecated)
-                parent.setFont(f)
-                self.connectIRISignals(dataPropIRI)
-                self.model.appendRow(parent)
-            child = QtGui.QStandardItem(self.childKeyForImported(impOnt,dataPropIRI))
-            # CHECK FOR DUPLICATE NODES
-            children = [parent.child(i) for i in range(parent.rowCount())]
-            if not any([(child.text() == c.text() and c.icon() is self.iconAttribute) for c in children]):
-                child.setIcon(self.iconAttribute)
-                childData = [dataPropIRI, Item.AttributeNode.value]
-                child.setData(childData, OntologyExplorerView.IRIRole)
-                parent.appendRow(child)
-        for indIRI in impOnt.individuals:
-            parent = self.parentForIRI(indIRI)
-            if not parent:
-                parent = QtGui.QStandardItem(self.parentKeyForIRI(indIRI))
-                parent.setData(indIRI, OntologyExplorerView.IRIRole)
-                iri = self.project.getIRI(str(indIRI))
-                f = parent.font()
-                f.setStrikeOut(iri.deprecated)
-                parent.setFont(f)
-                self.connectIRISignals(indIRI)
-                self.model.appendRow(parent)
-            child = QtGui.QStandardItem(self.childKeyForImported(impOnt,indIRI))
-            # CHECK FOR DUPLICATE NODES
-            children = [parent.child(i) for i in range(parent.rowCount())]
-            if not any([(child.text() == c.text() and c.icon() is self.iconInstance) for c in children]):
-                child.setIcon(self.iconInstance)
-                childData = [indIRI, Item.IndividualNode.value]
-                child.setData(childData, OntologyExplorerView.IRIRole)
-                parent.appendRow(child)
-        # APPLY FILTERS AND SORT
-        if self.sender() != self.plugin:
-            self.proxy.invalidateFilter()
-            self.proxy.sort(0, QtCore.Qt.AscendingOrder)
+        self.model.addImportedOntology(impOnt)
 
     @QtCore.pyqtSlot(ImportedOntology)
     def onImportedOntologyRemoved(self, impOnt):
@@ -522,46 +345,7 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
         :param impOnt:ImportedOntology
         :return:
         """
-        for classIRI in impOnt.classes:
-            parent = self.parentForIRI(classIRI)
-            if parent:
-                child = self.childForImported(parent,impOnt,classIRI)
-                if child:
-                    parent.removeRow((child.index().row()))
-                if not parent.rowCount():
-                    self.disconnectIRISignals(classIRI)
-                    self.model.removeRow(parent.index().row())
-        for objPropIRI in impOnt.objectProperties:
-            parent = self.parentForIRI(objPropIRI)
-            if parent:
-                child = self.childForImported(parent, impOnt, objPropIRI)
-                if child:
-                    parent.removeRow((child.index().row()))
-                if not parent.rowCount():
-                    self.disconnectIRISignals(objPropIRI)
-                    self.model.removeRow(parent.index().row())
-        for dataPropIRI in impOnt.dataProperties:
-            parent = self.parentForIRI(dataPropIRI)
-            if parent:
-                child = self.childForImported(parent, impOnt, dataPropIRI)
-                if child:
-                    parent.removeRow((child.index().row()))
-                if not parent.rowCount():
-                    self.disconnectIRISignals(dataPropIRI)
-                    self.model.removeRow(parent.index().row())
-        for indIRI in impOnt.individuals:
-            parent = self.parentForIRI(indIRI)
-            if parent:
-                child = self.childForImported(parent, impOnt, indIRI)
-                if child:
-                    parent.removeRow((child.index().row()))
-                if not parent.rowCount():
-                    self.disconnectIRISignals(indIRI)
-                    self.model.removeRow(parent.index().row())
-        # APPLY FILTERS AND SORT
-        if self.sender() != self.plugin:
-            self.proxy.invalidateFilter()
-            self.proxy.sort(0, QtCore.Qt.AscendingOrder)
+        self.model.removeImportedOntology(impOnt)
 
     @QtCore.pyqtSlot(QtWidgets.QGraphicsScene, QtWidgets.QGraphicsItem)
     def doAddNode(self, diagram, node):
@@ -570,31 +354,7 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
         :type diagram: QGraphicsScene
         :type node: AbstractItem
         """
-        if node.type() in self.items:
-            parent = self.parentFor(node)
-            if not parent:
-                if not isinstance(node, PredicateNodeMixin):
-                    parent = QtGui.QStandardItem(self.parentKey(node))
-                    parent.setIcon(self.iconFor(node))
-                else:
-                    parent = QtGui.QStandardItem(self.parentKeyForIRI(node.iri))
-                    parent.setData(node.iri, OntologyExplorerView.IRIRole)
-                    iri = self.project.getIRI(str(node.iri))
-                    f = parent.font()
-                    f.setStrikeOut(iri.deprecated)
-                    parent.setFont(f)
-                    self.connectIRISignals(node.iri)
-                self.model.appendRow(parent)
-            child = QtGui.QStandardItem(self.childKey(diagram, node))
-            if isinstance(node, PredicateNodeMixin):
-                child.setIcon(self.iconFor(node))
-                connect(node.sgnIRISwitched,self.onNodeIRISwitched)
-            child.setData(node, OntologyExplorerView.IRIRole)
-            parent.appendRow(child)
-            # APPLY FILTERS AND SORT
-            if self.sender() != self.plugin:
-                self.proxy.invalidateFilter()
-                self.proxy.sort(0, QtCore.Qt.AscendingOrder)
+        self.model.addNode(node)
 
     @QtCore.pyqtSlot(QtWidgets.QGraphicsScene, QtWidgets.QGraphicsItem)
     def doRemoveNode(self, diagram, node):
@@ -603,25 +363,22 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
         :type diagram: QGraphicsScene
         :type node: AbstractItem
         """
-        if node.type() in self.items:
-            parent = self.parentFor(node)
-            if parent:
-                child = self.childFor(parent, diagram, node)
-                if child:
-                    parent.removeRow(child.index().row())
-                if not parent.rowCount():
-                    if isinstance(node, PredicateNodeMixin):
-                        self.disconnectIRISignals(parent.data(OntologyExplorerView.IRIRole))
-                    self.model.removeRow(parent.index().row())
+        if isinstance(node, PredicateNodeMixin):
+            self.model.removeNode(node, node.iri)
 
     @QtCore.pyqtSlot(str)
     def doFilterItem(self, key):
         """
         Executed when the search box is filled with data.
+        Entities are looked up in the project search index, so that they can be found
+        by IRI, simple name, prefixed form or annotation value, and by approximate spelling.
         :type key: str
         """
-        self.proxy.setFilterFixedString(key)
-        self.proxy.sort(QtCore.Qt.AscendingOrder)
+        if key.strip():
+            index = EntitySearchIndex.forProject(self.project)
+            self.proxy.setAcceptedIRIs({id(iri) for iri in index.search(key)})
+        else:
+            self.proxy.setAcceptedIRIs(None)
 
     @QtCore.pyqtSlot()
     def doFocusSearch(self):
@@ -646,17 +403,17 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
         """
         # noinspection PyArgumentList
         if QtWidgets.QApplication.mouseButtons() == QtCore.Qt.NoButton:
-            item = self.model.itemFromIndex(self.proxy.mapToSource(index))
-            if item and item.data(OntologyExplorerView.IRIRole):
-                if isinstance(item.data(OntologyExplorerView.IRIRole),IRI):
-                    self.sgnIRIItemActivated.emit(item.data(OntologyExplorerView.IRIRole))
-                else:
-                    self.sgnItemActivated.emit(item.data(OntologyExplorerView.IRIRole))
+            data = index.data(OntologyExplorerView.IRIRole)
+            if isinstance(data, IRI):
+                self.sgnIRIItemActivated.emit(data)
+            elif isinstance(data, AbstractNode):
+                self.sgnItemActivated.emit(data)
+            if data is not None:
                 # KEEP FOCUS ON THE TREE VIEW UNLESS SHIFT IS PRESSED
                 if QtWidgets.QApplication.queryKeyboardModifiers() & QtCore.Qt.SHIFT:
                     return
                 self.ontoview.setFocus()
-            elif item:
+            elif index.isValid():
                 # EXPAND/COLLAPSE PARENT ITEM
                 if self.ontoview.isExpanded(index):
                     self.ontoview.collapse(index)
@@ -671,12 +428,11 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
         """
         # noinspection PyArgumentList
         if QtWidgets.QApplication.mouseButtons() & QtCore.Qt.LeftButton:
-            item = self.model.itemFromIndex(self.proxy.mapToSource(index))
-            if item and item.data(OntologyExplorerView.IRIRole):
-                if isinstance(item.data(OntologyExplorerView.IRIRole), IRI):
-                    self.sgnIRIItemDoubleClicked.emit(item.data(OntologyExplorerView.IRIRole))
-                elif isinstance(item.data(OntologyExplorerView.IRIRole), AbstractNode):
-                    self.sgnItemDoubleClicked.emit(item.data(OntologyExplorerView.IRIRole))
+            data = index.data(OntologyExplorerView.IRIRole)
+            if isinstance(data, IRI):
+                self.sgnIRIItemDoubleClicked.emit(data)
+            elif isinstance(data, AbstractNode):
+                self.sgnItemDoubleClicked.emit(data)
 
     @QtCore.pyqtSlot(QtCore.QModelIndex)
     def onItemPressed(self, index):
@@ -686,12 +442,11 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
         """
         # noinspection PyArgumentList
         if QtWidgets.QApplication.mouseButtons() & QtCore.Qt.LeftButton:
-            item = self.model.itemFromIndex(self.proxy.mapToSource(index))
-            if item and item.data(OntologyExplorerView.IRIRole):
-                if isinstance(item.data(OntologyExplorerView.IRIRole), IRI):
-                    self.sgnIRIItemClicked.emit(item.data(OntologyExplorerView.IRIRole))
-                elif isinstance(item.data(OntologyExplorerView.IRIRole), AbstractNode):
-                    self.sgnItemClicked.emit(item.data(OntologyExplorerView.IRIRole))
+            data = index.data(OntologyExplorerView.IRIRole)
+            if isinstance(data, IRI):
+                self.sgnIRIItemClicked.emit(data)
+            elif isinstance(data, AbstractNode):
+                self.sgnItemClicked.emit(data)
 
     @QtCore.pyqtSlot()
     def onReturnPressed(self):
@@ -704,84 +459,290 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
     #   INTERFACE
     #################################
 
-    def connectNodeSignals(self, node):
+    def sizeHint(self):
         """
-        :type node: PredicateNodeMixin
+        Returns the recommended size for this widget.
+        :rtype: QtCore.QSize
         """
-        connect(node.sgnIRISwitched, self.onNodeIRISwitched)
+        return QtCore.QSize(216, 266)
 
-    def connectIRISignals(self, iri):
+
+class OntologyExplorerEntry(object):
+    """
+    This class represents an IRI listed in the ontology explorer (i.e. a top level row of the model).
+    Occurrences of the IRI are materialized only when the entry is expanded for the first time.
+    """
+    __slots__ = ('iri', 'text', 'key', 'deprecated', 'imports', 'children', 'keys', 'unsatisfiable')
+
+    def __init__(self, iri, text):
         """
+        Initialize the entry.
         :type iri: IRI
+        :type text: str
         """
-        connect(iri.sgnAnnotationAdded, self.onIRIAnnotationAssertionAdded)
-        connect(iri.sgnAnnotationRemoved, self.onIRIAnnotationAssertionRemoved)
-        connect(iri.sgnAnnotationModified, self.onIRIAnnotationAssertionModified)
-        connect(iri.sgnIRIModified, self.onIRIModified)
+        self.iri = iri
+        self.text = text
+        self.key = (text, id(iri))
+        self.deprecated = iri.deprecated
+        self.imports = {}
+        self.children = None
+        self.keys = None
+        self.unsatisfiable = None
 
-    def disconnectIRISignals(self, iri):
+    def setText(self, text):
         """
-        :type iri: IRI
+        Update the text of the entry, along with its sort key.
+        :type text: str
         """
-        disconnect(iri.sgnAnnotationAdded, self.onIRIAnnotationAssertionAdded)
-        disconnect(iri.sgnAnnotationRemoved, self.onIRIAnnotationAssertionRemoved)
-        disconnect(iri.sgnAnnotationModified, self.onIRIAnnotationAssertionModified)
-        disconnect(iri.sgnIRIModified, self.onIRIModified)
-
-    def redrawIRIItem(self, iri=None):
-        self.ontoview.setSortingEnabled(False)
-        for row in range(self.model.rowCount()):
-            currItem = self.model.item(row)
-            if iri:
-                currIRI = currItem.data(OntologyExplorerView.IRIRole)
-                if currIRI is iri:
-                    currItem.setText(self.parentKeyForIRI(iri))
-                    f = currItem.font()
-                    f.setStrikeOut(iri.deprecated)
-                    currItem.setFont(f)
-                    break
-            else:
-                if isinstance(currItem.data(OntologyExplorerView.IRIRole), IRI):
-                    currItem.setText(self.parentKeyForIRI(currItem.data(OntologyExplorerView.IRIRole)))
-                    iri = self.project.getIRI(str(currItem.data(OntologyExplorerView.IRIRole)))
-                    f = currItem.font()
-                    f.setStrikeOut(iri.deprecated)
-                    currItem.setFont(f)
-        self.ontoview.setSortingEnabled(True)
-        if self.sender() != self.plugin:
-            self.proxy.invalidateFilter()
-            self.proxy.sort(0, QtCore.Qt.AscendingOrder)
-
-    def childFor(self, parent, diagram, node):
-        """
-        Search the item representing this node among parent children.
-        :type parent: QtGui.QStandardItem
-        :type diagram: Diagram
-        :type node: AbstractNode
+        self.text = text
+        self.key = (text, id(self.iri))
+
+
+class OntologyExplorerChild(object):
+    """
+    This class represents an occurrence of an IRI listed in the ontology explorer, that is a
+    node of the project or an entity declared in an imported ontology.
+    """
+    __slots__ = ('data', 'text', 'key', 'item')
+
+    def __init__(self, data, text, item):
+        """
+        Initialize the child.
+        :type data: object
+        :type text: str
+        :type item: Item
+        """
+        self.data = data
+        self.text = text
+        self.key = (text, id(data))
+        self.item = item
+
+
+class OntologyExplorerModel(QtCore.QAbstractItemModel):
+    """
+    Extends QAbstractItemModel to list the IRIs of the project, along with their occurrences.
+    The model reads directly from the project IRI index and from the signature of the imported ontologies:
+    top level rows are kept sorted by text, so that each change results in a single row insertion,
+    removal or move, while children are fetched from the index only when their parent is expanded.
+    """
+    BulkInsertThreshold = 256
+
+    def __init__(self, widget):
+        """
+        Initialize the model.
+        :type widget: OntologyExplorerWidget
+        """
+        super().__init__(widget)
+        self.widget = widget
+        self.entries = []
+        self.keys = []
+        self.entryForIRI = {}
+        self.unsatisfiable = set()
+        self.iconForItem = {
+            Item.AttributeNode: QtGui.QIcon(':/icons/18/ic_treeview_attribute'),
+            Item.ConceptNode: QtGui.QIcon(':/icons/18/ic_treeview_concept'),
+            Item.IndividualNode: QtGui.QIcon(':/icons/18/ic_treeview_instance'),
+            Item.RoleNode: QtGui.QIcon(':/icons/18/ic_treeview_role'),
+            Item.ValueDomainNode: QtGui.QIcon(':/icons/18/ic_treeview_value'),
+        }
+
+    #############################################
+    #   PROPERTIES
+    #################################
+
+    @property
+    def project(self):
+        """
+        Returns the reference to the active project.
+        :rtype: Project
+        """
+        return self.widget.project
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot()
+    def onIRIChanged(self):
+        """
+        Executed when the IRI of an entry, or one of its annotations, changes.
         """
-        key = self.childKey(diagram, node)
-        for i in range(parent.rowCount()):
-            child = parent.child(i)
-            if child.text() == key:
-                return child
+        self.refresh(self.sender())
+
+    @QtCore.pyqtSlot()
+    def onNodeIRISwitched(self):
+        """
+        Executed when a node listed in the model is assigned a different IRI.
+        """
+        self.insertNode(self.sender())
+
+    #############################################
+    #   MODEL INTERFACE
+    #################################
+
+    def canFetchMore(self, parent):
+        """
+        Returns True if the occurrences of the given entry have not been fetched yet.
+        :type parent: QModelIndex
+        :rtype: bool
+        """
+        if parent.isValid() and parent.internalPointer() is None:
+            return self.entries[parent.row()].children is None
+        return False
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """
+        Returns the number of columns of the model.
+        :type parent: QModelIndex
+        :rtype: int
+        """
+        return 1
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """
+        Returns the data stored under the given role for the given index.
+        :type index: QModelIndex
+        :type role: int
+        :rtype: object
+        """
+        if not index.isValid():
+            return None
+        entry = index.internalPointer()
+        if entry is None:
+            entry = self.entries[index.row()]
+            if role == QtCore.Qt.DisplayRole:
+                return entry.text
+            if role == OntologyExplorerView.IRIRole:
+                return entry.iri
+            if role == QtCore.Qt.FontRole and entry.deprecated:
+                font = QtGui.QFont()
+                font.setStrikeOut(True)
+                return font
+            if role == QtCore.Qt.ForegroundRole and entry.unsatisfiable:
+                return OntologyExplorerView.UnsatisfiableBrush
+            return None
+        child = entry.children[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return child.text
+        if role == OntologyExplorerView.IRIRole:
+            return child.data
+        if role == QtCore.Qt.DecorationRole:
+            return self.iconForItem.get(child.item)
         return None
 
-    def childForImported(self, parent, impOnt, iri):
+    def fetchMore(self, parent):
+        """
+        Fetch the occurrences of the given entry from the project index.
+        :type parent: QModelIndex
+        """
+        entry = self.entries[parent.row()]
+        children = []
+        for node in self.project.iriOccurrences(iri=entry.iri):
+            if node.type() in self.iconForItem:
+                children.append(OntologyExplorerChild(node, self.childKey(node.diagram, node), node.type()))
+        for impOnt, item in entry.imports.values():
+            children.append(self.importedChild(entry.iri, impOnt, item))
+        children.sort(key=lambda c: c.key)
+        if children:
+            self.beginInsertRows(parent, 0, len(children) - 1)
+        entry.children = children
+        entry.keys = [c.key for c in children]
+        if children:
+            self.endInsertRows()
+
+    def flags(self, index):
+        """
+        Returns the item flags for the given index.
+        :type index: QModelIndex
+        :rtype: int
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
         """
-        Search the item representing this node among parent children.
-        :type parent: QtGui.QStandardItem
+        Returns True if the given index has children: entries always have at least one occurrence.
+        :type parent: QModelIndex
+        :rtype: bool
+        """
+        if not parent.isValid():
+            return bool(self.entries)
+        return parent.internalPointer() is None
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        """
+        Returns the index of the item at the given row and column, below the given parent.
+        Children indexes store a reference to their entry, top level indexes store nothing.
+        :type row: int
+        :type column: int
+        :type parent: QModelIndex
+        :rtype: QModelIndex
+        """
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        if parent.isValid():
+            return self.createIndex(row, column, self.entries[parent.row()])
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        """
+        Returns the parent of the given index.
+        :type index: QModelIndex
+        :rtype: QModelIndex
+        """
+        if index is None:
+            return super().parent()
+        if not index.isValid() or index.internalPointer() is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(self.rowForEntry(index.internalPointer()), 0)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """
+        Returns the number of rows below the given parent.
+        :type parent: QModelIndex
+        :rtype: int
+        """
+        if not parent.isValid():
+            return len(self.entries)
+        if parent.internalPointer() is None:
+            children = self.entries[parent.row()].children
+            return len(children) if children is not None else 0
+        return 0
+
+    #############################################
+    #   INTERFACE
+    #################################
+
+    def addImportedOntology(self, impOnt):
+        """
+        Add the signature of the given imported ontology to the model.
         :type impOnt: ImportedOntology
-        :type iri: IRI
         """
-        key = self.childKeyForImported(impOnt, iri)
-        for i in range(parent.rowCount()):
-            child = parent.child(i)
-            if child.text() == key:
-                return child
-        return None
+        created = []
+        for item, iris in self.importedSignature(impOnt):
+            for iri in iris:
+                entry = self.entryForIRI.get(id(iri))
+                if entry is None:
+                    entry = self.createEntry(iri)
+                    created.append(entry)
+                key = (impOnt.docLocation, item)
+                if key not in entry.imports:
+                    entry.imports[key] = (impOnt, item)
+                    if entry.children is not None:
+                        self.insertChild(entry, self.importedChild(iri, impOnt, item))
+        self.insertEntries(created)
+
+    def addNode(self, node):
+        """
+        Add the given node to the model, tracking the changes of its IRI.
+        :type node: AbstractNode
+        """
+        if node.type() in self.iconForItem:
+            connect(node.sgnIRISwitched, self.onNodeIRISwitched)
+            self.insertNode(node)
 
-    @staticmethod
-    def childKey(diagram, node):
+    def childKey(self, diagram, node):
         """
         Returns the child key (text) used to place the given node in the treeview.
         :type diagram: Diagram
@@ -789,92 +750,322 @@ class OntologyExplorerWidget(QtWidgets.QWidget):
         :rtype: str
         """
         diagram = rstrip(diagram.name, File.Graphol.extension)
+        return '{0} - {1}'.format(diagram, node.id)
 
-        if isinstance(node, PredicateNodeMixin):
-            return '{0} - {1}'.format(diagram, node.id)
-        else:
-            predicate = node.text().replace('\n', '')
-            return '{0} ({1} - {2})'.format(predicate, diagram, node.id)
+    def clearUnsatisfiable(self):
+        """
+        Reset the unsatisfiable status of all the entries.
+        """
+        for entry in self.unsatisfiable:
+            entry.unsatisfiable = None
+            if id(entry.iri) in self.entryForIRI:
+                index = self.createIndex(self.rowForEntry(entry), 0)
+                self.dataChanged.emit(index, index, [QtCore.Qt.ForegroundRole])
+        self.unsatisfiable = set()
+
+    def connectIRISignals(self, iri):
+        """
+        Connect the signals of the given IRI affecting the text of its entry.
+        :type iri: IRI
+        """
+        connect(iri.sgnAnnotationAdded, self.onIRIChanged)
+        connect(iri.sgnAnnotationRemoved, self.onIRIChanged)
+        connect(iri.sgnAnnotationModified, self.onIRIChanged)
+        connect(iri.sgnIRIModified, self.onIRIChanged)
+
+    def createEntry(self, iri):
+        """
+        Create a new entry for the given IRI (the entry is not inserted in the model).
+        :type iri: IRI
+        :rtype: OntologyExplorerEntry
+        """
+        return OntologyExplorerEntry(iri, self.entryKey(iri))
+
+    def disconnectIRISignals(self, iri):
+        """
+        Disconnect the signals of the given IRI affecting the text of its entry.
+        :type iri: IRI
+        """
+        disconnect(iri.sgnAnnotationAdded, self.onIRIChanged)
+        disconnect(iri.sgnAnnotationRemoved, self.onIRIChanged)
+        disconnect(iri.sgnAnnotationModified, self.onIRIChanged)
+        disconnect(iri.sgnIRIModified, self.onIRIChanged)
 
     @staticmethod
-    def childKeyForImported(impOnt, iri):
+    def entryKey(iri):
         """
-        Returns the child key (text) used to place the given node in the treeview.
-        :type impOnt: ImportedOntology
+        Returns the text used to place the given IRI in the treeview.
         :type iri: IRI
         :rtype: str
         """
-        return 'Imported from {}'.format(impOnt.docLocation)
+        return IRIRender.iriLabelString(iri).replace('\n', '')
 
-    def iconFor(self, node):
+    def firstChildData(self, index):
         """
-        Returns the icon for the given node.
-        :type node:
+        Returns the data of the first occurrence of the entry at the given index.
+        :type index: QModelIndex
+        :rtype: object
         """
-        if node.type() is Item.AttributeNode:
-            return self.iconAttribute
-        if node.type() is Item.ConceptNode:
-            return self.iconConcept
-        if node.type() is Item.IndividualNode:
-            return self.iconInstance
-        if node.type() is Item.RoleNode:
-            return self.iconRole
-        if node.type() is Item.ValueDomainNode:
-            return self.iconValue
+        if self.canFetchMore(index):
+            self.fetchMore(index)
+        children = self.entries[index.row()].children
+        return children[0].data if children else None
 
-    def parentFor(self, node):
+    @staticmethod
+    def importedChild(iri, impOnt, item):
         """
-        Search the parent element of the given node.
-        :type node: AbstractNode
-        :rtype: QtGui.QStandardItem
+        Create the child representing the given IRI in the given imported ontology.
+        :type iri: IRI
+        :type impOnt: ImportedOntology
+        :type item: Item
+        :rtype: OntologyExplorerChild
         """
-        if isinstance(node, PredicateNodeMixin):
-            parentK = self.parentKeyForIRI(node.iri)
-            for i in self.model.findItems(parentK, QtCore.Qt.MatchExactly):
-                parentIRI = i.data(OntologyExplorerView.IRIRole)
-                if node.iri is parentIRI:
-                    return i
+        return OntologyExplorerChild([iri, item.value], 'Imported from {}'.format(impOnt.docLocation), item)
+
+    @staticmethod
+    def importedSignature(impOnt):
+        """
+        Returns the signature of the given imported ontology, as a list of (item, IRIs) pairs.
+        :type impOnt: ImportedOntology
+        :rtype: list
+        """
+        return [
+            (Item.ConceptNode, impOnt.classes),
+            (Item.RoleNode, impOnt.objectProperties),
+            (Item.AttributeNode, impOnt.dataProperties),
+            (Item.IndividualNode, impOnt.individuals),
+        ]
+
+    def insertChild(self, entry, child):
+        """
+        Insert the given child among the (already fetched) occurrences of the given entry.
+        :type entry: OntologyExplorerEntry
+        :type child: OntologyExplorerChild
+        """
+        row = bisect_left(entry.keys, child.key)
+        self.beginInsertRows(self.createIndex(self.rowForEntry(entry), 0), row, row)
+        entry.children.insert(row, child)
+        entry.keys.insert(row, child.key)
+        self.endInsertRows()
+
+    def insertEntries(self, entries):
+        """
+        Insert the given entries in the model.
+        Few entries are inserted one row at a time, while large batches are merged with a single reset.
+        :type entries: list
+        """
+        for entry in entries:
+            self.entryForIRI[id(entry.iri)] = entry
+            self.connectIRISignals(entry.iri)
+        if len(entries) > self.BulkInsertThreshold:
+            self.beginResetModel()
+            self.entries.extend(entries)
+            self.entries.sort(key=lambda e: e.key)
+            self.keys = [e.key for e in self.entries]
+            self.endResetModel()
         else:
-            parentK = self.parentKey(node)
-            for i in self.model.findItems(parentK, QtCore.Qt.MatchExactly):
-                n = i.child(0).data(OntologyExplorerView.IRIRole)
-                if node.type() is n.type():
-                    return i
-        return None
+            for entry in entries:
+                row = bisect_left(self.keys, entry.key)
+                self.beginInsertRows(QtCore.QModelIndex(), row, row)
+                self.entries.insert(row, entry)
+                self.keys.insert(row, entry.key)
+                self.endInsertRows()
 
-    def parentForIRI(self, iri):
+    def insertNode(self, node):
         """
-        Search the parent element of the given iri.
-        :type node: IRI
-        :rtype: QtGui.QStandardItem
+        Insert the given node among the occurrences of its IRI.
+        :type node: AbstractNode
         """
-        parentK = self.parentKeyForIRI(iri)
-        for i in self.model.findItems(parentK, QtCore.Qt.MatchExactly):
-            parentIRI = i.data(OntologyExplorerView.IRIRole)
-            if iri is parentIRI:
-                return i
-        return None
+        entry = self.entryForIRI.get(id(node.iri))
+        if entry is None:
+            self.insertEntries([self.createEntry(node.iri)])
+        elif entry.children is not None:
+            key = (self.childKey(node.diagram, node), id(node))
+            row = bisect_left(entry.keys, key)
+            if row == len(entry.keys) or entry.keys[row] != key:
+                self.insertChild(entry, OntologyExplorerChild(node, key[0], node.type()))
 
-    @staticmethod
-    def parentKeyForIRI(iri):
-        return IRIRender.iriLabelString(iri).replace('\n', '')
+    def refresh(self, iri=None):
+        """
+        Update the text of the entry of the given IRI, or of all the entries if no IRI is given,
+        moving the updated entries so as to keep the model sorted.
+        :type iri: IRI
+        """
+        if iri is not None:
+            entry = self.entryForIRI.get(id(iri))
+            if entry is None:
+                return
+            row = self.rowForEntry(entry)
+            text = self.entryKey(iri)
+            entry.deprecated = iri.deprecated
+            if text != entry.text:
+                key = (text, id(iri))
+                dest = bisect_left(self.keys, key)
+                if dest != row and dest != row + 1:
+                    self.beginMoveRows(QtCore.QModelIndex(), row, row, QtCore.QModelIndex(), dest)
+                    del self.entries[row]
+                    del self.keys[row]
+                    row = dest - 1 if dest > row else dest
+                    entry.setText(text)
+                    self.entries.insert(row, entry)
+                    self.keys.insert(row, entry.key)
+                    self.endMoveRows()
+                else:
+                    entry.setText(text)
+                    self.keys[row] = entry.key
+            index = self.createIndex(row, 0)
+            self.dataChanged.emit(index, index)
+        else:
+            self.layoutAboutToBeChanged.emit()
+            persistent = self.persistentIndexList()
+            anchors = [(i.internalPointer(), i.row(), i.internalPointer() or self.entries[i.row()]) for i in persistent]
+            for entry in self.entries:
+                entry.setText(self.entryKey(entry.iri))
+                entry.deprecated = entry.iri.deprecated
+            self.entries.sort(key=lambda e: e.key)
+            self.keys = [e.key for e in self.entries]
+            self.changePersistentIndexList(persistent, [
+                self.createIndex(row, 0, parent) if parent is not None else self.createIndex(self.rowForEntry(entry), 0)
+                for parent, row, entry in anchors
+            ])
+            self.layoutChanged.emit()
+
+    def removeEntry(self, entry):
+        """
+        Remove the given entry from the model.
+        :type entry: OntologyExplorerEntry
+        """
+        row = self.rowForEntry(entry)
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self.entries[row]
+        del self.keys[row]
+        del self.entryForIRI[id(entry.iri)]
+        self.unsatisfiable.discard(entry)
+        self.endRemoveRows()
+        self.disconnectIRISignals(entry.iri)
+
+    def removeChild(self, entry, row):
+        """
+        Remove the (already fetched) occurrence at the given row of the given entry.
+        :type entry: OntologyExplorerEntry
+        :type row: int
+        """
+        self.beginRemoveRows(self.createIndex(self.rowForEntry(entry), 0), row, row)
+        del entry.children[row]
+        del entry.keys[row]
+        self.endRemoveRows()
+
+    def removeImportedOntology(self, impOnt):
+        """
+        Remove the signature of the given imported ontology from the model.
+        :type impOnt: ImportedOntology
+        """
+        for item, iris in self.importedSignature(impOnt):
+            for iri in iris:
+                entry = self.entryForIRI.get(id(iri))
+                if entry is None or entry.imports.pop((impOnt.docLocation, item), None) is None:
+                    continue
+                if entry.children is not None:
+                    text = 'Imported from {}'.format(impOnt.docLocation)
+                    for row, child in enumerate(entry.children):
+                        if isinstance(child.data, list) and child.item is item and child.text == text:
+                            self.removeChild(entry, row)
+                            break
+                if not entry.imports and not self.project.existIriOccurrence(iri):
+                    self.removeEntry(entry)
+
+    def removeIRI(self, iri):
+        """
+        Remove the occurrences of the given IRI, which is no longer used in the project.
+        The entry is kept if the IRI is part of the signature of an imported ontology.
+        :type iri: IRI
+        """
+        entry = self.entryForIRI.get(id(iri))
+        if entry is not None:
+            if not entry.imports:
+                self.removeEntry(entry)
+            elif entry.children is not None:
+                for row in reversed(range(len(entry.children))):
+                    if not isinstance(entry.children[row].data, list):
+                        self.removeChild(entry, row)
 
-    @staticmethod
-    def parentKey(node):
+    def removeNode(self, node, iri):
         """
-        Returns the parent key (text) used to place the given node in the treeview.
+        Remove the given node from the occurrences of the given IRI.
         :type node: AbstractNode
-        :type project Project
-        :rtype: str
+        :type iri: IRI
         """
-        return node.text().replace('\n', '')
+        if node.diagram is None or not self.project.node(node.diagram, node.id):
+            disconnect(node.sgnIRISwitched, self.onNodeIRISwitched)
+        entry = self.entryForIRI.get(id(iri))
+        if entry is None or node.type() not in self.iconForItem:
+            return
+        if entry.children is not None:
+            key = (self.childKey(node.diagram, node), id(node))
+            row = bisect_left(entry.keys, key)
+            if row < len(entry.keys) and entry.keys[row] == key:
+                self.removeChild(entry, row)
+        if not entry.imports and not self.project.existIriOccurrence(iri):
+            self.removeEntry(entry)
+
+    def reset(self):
+        """
+        Rebuild the model from the project IRI index and from the imported ontologies.
+        """
+        self.beginResetModel()
+        for entry in self.entries:
+            self.disconnectIRISignals(entry.iri)
+        entries = {}
+        for item in self.iconForItem:
+            for iri in self.project.itemIRIs(item):
+                if id(iri) not in entries:
+                    entries[id(iri)] = self.createEntry(iri)
+        for impOnt in self.project.importedOntologies:
+            for item, iris in self.importedSignature(impOnt):
+                for iri in iris:
+                    if id(iri) not in entries:
+                        entries[id(iri)] = self.createEntry(iri)
+                    entries[id(iri)].imports[(impOnt.docLocation, item)] = (impOnt, item)
+        # NODES OF DIAGRAMS WHICH ARE NOT BUILT YET ARE CONNECTED WHEN ADDED TO THE PROJECT
+        for node in self.project.index.iriOccurrences():
+            connect(node.sgnIRISwitched, self.onNodeIRISwitched)
+        for entry in entries.values():
+            self.connectIRISignals(entry.iri)
+        self.entries = sorted(entries.values(), key=lambda e: e.key)
+        self.keys = [e.key for e in self.entries]
+        self.entryForIRI = entries
+        self.unsatisfiable = set()
+        self.endResetModel()
+
+    def rowForEntry(self, entry):
+        """
+        Returns the row of the given entry.
+        :type entry: OntologyExplorerEntry
+        :rtype: int
+        """
+        return bisect_left(self.keys, entry.key)
 
-    def sizeHint(self):
+    def setUnsatisfiable(self, iri, item):
         """
-        Returns the recommended size for this widget.
-        :rtype: QtCore.QSize
+        Mark the entry of the given IRI as unsatisfiable.
+        :type iri: IRI
+        :type item: Item
         """
-        return QtCore.QSize(216, 266)
+        entry = self.entryForIRI.get(id(iri))
+        if entry is not None:
+            entry.unsatisfiable = item
+            self.unsatisfiable.add(entry)
+            index = self.createIndex(self.rowForEntry(entry), 0)
+            self.dataChanged.emit(index, index, [QtCore.Qt.ForegroundRole])
+
+    def unsatisfiableType(self, iri):
+        """
+        Returns the type of the unsatisfiable entity identified by the given IRI, if any.
+        :type iri: IRI
+        :rtype: Item
+        """
+        entry = self.entryForIRI.get(id(iri))
+        return entry.unsatisfiable if entry is not None else None
 
 
 class OntologyExplorerItemDelegate(QtWidgets.QStyledItemDelegate):
@@ -926,7 +1117,7 @@ class OntologyExplorerView(QtWidgets.QTreeView):
         self.setHorizontalScrollMode(QtWidgets.QTreeView.ScrollPerPixel)
         self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
         self.setSelectionMode(QtWidgets.QTreeView.SingleSelection)
-        self.setSortingEnabled(True)
+        self.setUniformRowHeights(True)
         self.setWordWrap(True)
         self.setItemDelegate(OntologyExplorerItemDelegate(self))
 
@@ -974,13 +1165,10 @@ class OntologyExplorerView(QtWidgets.QTreeView):
             if distance >= QtWidgets.QApplication.startDragDistance():
                 index = first(self.selectedIndexes())
                 if index:
-                    model = self.model().sourceModel()
-                    index = self.model().mapToSource(index)
-                    item = model.itemFromIndex(index)
-                    data = item.data(OntologyExplorerView.IRIRole)
+                    data = index.data(OntologyExplorerView.IRIRole)
                     # Pick the first child when dragging an IRI from the explorer
-                    if not isinstance(data, AbstractNode) and item.hasChildren():
-                        data = item.child(0).data(OntologyExplorerView.IRIRole)
+                    if isinstance(data, IRI):
+                        data = self.widget.model.firstChildData(self.model().mapToSource(index))
                     if data:
                         if isinstance(data, PredicateNodeMixin):
                             mimeData = QtCore.QMimeData()
@@ -1015,26 +1203,18 @@ class OntologyExplorerView(QtWidgets.QTreeView):
         if mouseEvent.button() == QtCore.Qt.RightButton:
             index = first(self.selectedIndexes())
             if index:
-                model = self.model().sourceModel()
-                index = self.model().mapToSource(index)
-                item = model.itemFromIndex(index)
-                data = item.data(OntologyExplorerView.IRIRole)
+                data = index.data(OntologyExplorerView.IRIRole)
                 if isinstance(data, IRI):
                     self.widget.sgnIRIItemRightClicked.emit(data)
-                    if item in self.parent().unsatisfiableItems:
+                    unsatisfiable = self.widget.model.unsatisfiableType(data)
+                    if unsatisfiable:
                         self.session.currentEmptyEntityIRI = data
-                        if item in self.parent().unsatisfiableClasses:
-                            self.session.currentEmptyEntityType = Item.ConceptNode
-                        elif item in self.parent().unsatisfiableObjProps:
-                            self.session.currentEmptyEntityType = Item.RoleNode
-                        elif item in self.parent().unsatisfiableDataProps:
-                            self.session.currentEmptyEntityType = Item.AttributeNode
+                        self.session.currentEmptyEntityType = unsatisfiable
                         menu = self.session.mf.buildEmptyEntityMenu()
                         menu.exec_(mouseEvent.screenPos().toPoint())
                 elif isinstance(data, AbstractNode):
-                    node = item.data(OntologyExplorerView.IRIRole)
-                    self.widget.sgnItemRightClicked.emit(node)
-                    menu = self.session.mf.create(node.diagram, [node])
+                    self.widget.sgnItemRightClicked.emit(data)
+                    menu = self.session.mf.create(data.diagram, [data])
                     menu.exec_(mouseEvent.screenPos().toPoint())
 
         super().mouseReleaseEvent(mouseEvent)
@@ -1055,10 +1235,13 @@ class OntologyExplorerView(QtWidgets.QTreeView):
 
 class OntologyExplorerFilterProxyModel(QtCore.QSortFilterProxyModel):
     """
-    Extends QSortFilterProxyModel adding filtering functionalities for the explorer widget
+    Extends QSortFilterProxyModel adding filtering functionalities for the explorer widget.
+    Sorting is not performed by the proxy, since the source model is kept sorted, while
+    filtering only checks top level rows against the IRIs matched by the search index.
     """
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.accepted = None
 
     #############################################
     #   PROPERTIES
@@ -1083,4 +1266,14 @@ class OntologyExplorerFilterProxyModel(QtCore.QSortFilterProxyModel):
         :type sourceParent: QModelIndex
         :rtype: bool
         """
-        return sourceParent.isValid() or super().filterAcceptsRow(sourceRow, sourceParent)
+        if sourceParent.isValid() or self.accepted is None:
+            return True
+        return id(self.sourceModel().entries[sourceRow].iri) in self.accepted
+
+    def setAcceptedIRIs(self, accepted):
+        """
+        Set the ids of the IRIs to show, or None to show all the IRIs.
+        :type accepted: set
+        """
+        self.accepted = accepted
+        self.invalidateFilter()
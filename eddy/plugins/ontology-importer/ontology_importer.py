@@ -848,7 +848,7 @@ class OntologyImporterPlugin(AbstractPlugin):
                 diagram = Diagram.create(form.name(), form.diagramSize(), self.project)
                 connect(diagram.sgnItemAdded, self.project.doAddItem)
                 connect(diagram.sgnItemRemoved, self.project.doRemoveItem)
-                connect(diagram.selectionChanged, self.session.doUpdateState)
+                connect(diagram.selectionChanged, self.session.doScheduleUpdateState)
                 self.session.undostack.push(CommandDiagramAdd(diagram, self.project))
                 self.session.sgnFocusDiagram.emit(diagram)
 
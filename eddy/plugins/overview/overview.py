@@ -79,7 +79,7 @@ class OverviewPlugin(AbstractPlugin):
         """
         Executed whenever the active diagram is updated.
         """
-        self.widget('overview').redraw()
+        self.widget('overview').invalidateBounds()
 
     @QtCore.pyqtSlot(QtWidgets.QMdiSubWindow)
     def onSubWindowActivated(self, subwindow):
@@ -102,9 +102,7 @@ class OverviewPlugin(AbstractPlugin):
             self.debug('Connecting to diagram: %s', subwindow.diagram.name)
             connect(subwindow.diagram.selectionChanged, self.onDiagramSelectionChanged)
             connect(subwindow.diagram.sgnUpdated, self.onDiagramUpdated)
-            widget.setScene(subwindow.diagram)
             widget.setView(subwindow.view)
-            widget.redraw()
         else:
             if not self.session.mdi.subWindowList():
                 # If we don't have any active subwindow (which means that
@@ -115,9 +113,7 @@ class OverviewPlugin(AbstractPlugin):
                     self.debug('Disconnecting from diagram: %s', widget.diagram.name)
                     disconnect(widget.diagram.selectionChanged, self.onDiagramSelectionChanged)
                     disconnect(widget.diagram.sgnUpdated, self.onDiagramUpdated)
-                widget.setScene(None)
                 widget.setView(None)
-                widget.redraw()
 
     #############################################
     #   HOOKS
@@ -133,6 +129,7 @@ class OverviewPlugin(AbstractPlugin):
             self.debug('Disconnecting from diagram: %s', widget.diagram.name)
             disconnect(widget.diagram.selectionChanged, self.onDiagramSelectionChanged)
             disconnect(widget.diagram.sgnUpdated, self.onDiagramUpdated)
+            widget.setView(None)
 
         # DISCONNECT FROM ACTIVE SESSION
         self.debug('Disconnecting to active session')
@@ -189,7 +186,17 @@ class OverviewPlugin(AbstractPlugin):
 class OverviewWidget(QtWidgets.QGraphicsView):
     """
     This class is used to display the active diagram overview.
+
+    The overview does not render the diagram scene directly: it displays a low resolution
+    snapshot of the diagram, which is refreshed when the diagram has not been changing for
+    a while, and it keeps track of the diagram bounds incrementally, using the regions
+    reported by the scene, so that the overview can follow drags and bulk edits without
+    mapping the bounding rectangle of every item. Redraws are coalesced to a maximum rate.
     """
+    Margin = 10
+    RedrawRate = 15
+    SnapshotDelay = 300
+
     def __init__(self, plugin):
         """
         Initialize the Overview.
@@ -203,8 +210,17 @@ class OverviewWidget(QtWidgets.QGraphicsView):
         self.setOptimizationFlags(QtWidgets.QGraphicsView.DontSavePainterState)
         self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         self.setViewportUpdateMode(QtWidgets.QGraphicsView.NoViewportUpdate)
+        self.setScene(QtWidgets.QGraphicsScene(self))
+        self.bounds = QtCore.QRectF()
+        self.boundsStale = True
+        self.redrawTimer = QtCore.QTimer(self, singleShot=True, interval=1000 // self.RedrawRate)
+        self.snapshot = None
+        self.snapshotRect = QtCore.QRectF()
+        self.snapshotTimer = QtCore.QTimer(self, singleShot=True, interval=self.SnapshotDelay)
         self._mousePressed = False
         self._view = None
+        connect(self.redrawTimer.timeout, self.doRedraw)
+        connect(self.snapshotTimer.timeout, self.doRefreshSnapshot)
 
     #############################################
     #   PROPERTIES
@@ -224,6 +240,16 @@ class OverviewWidget(QtWidgets.QGraphicsView):
     #   EVENTS
     #################################
 
+    def drawBackground(self, painter, rect):
+        """
+        Draw the snapshot of the inspected diagram.
+        :type painter: QPainter
+        :type rect: QRectF
+        """
+        super().drawBackground(painter, rect)
+        if self.snapshot is not None:
+            painter.drawImage(self.snapshotRect, self.snapshot)
+
     def mouseDoubleClickEvent(self, mouseEvent):
         """
         Executed when the mouse is double clicked on the view.
@@ -259,6 +285,15 @@ class OverviewWidget(QtWidgets.QGraphicsView):
             if self._view:
                 self._mousePressed = False
 
+    def resizeEvent(self, resizeEvent):
+        """
+        Executed when the view is resized: the snapshot resolution depends on the view size.
+        :type resizeEvent: QResizeEvent
+        """
+        super().resizeEvent(resizeEvent)
+        if self._view:
+            self.snapshotTimer.start()
+
     def wheelEvent(self, wheelEvent):
         """
         Turn off wheel event since we don't need to scroll anything.
@@ -266,27 +301,104 @@ class OverviewWidget(QtWidgets.QGraphicsView):
         """
         pass
 
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot('QList<QRectF>')
+    def onDiagramChanged(self, regions):
+        """
+        Executed when the content of the inspected diagram changes.
+        :type regions: list
+        """
+        sceneRect = self.diagram.sceneRect()
+        for region in regions:
+            if region.contains(sceneRect):
+                # THE WHOLE SCENE HAS BEEN INVALIDATED: WE DON'T KNOW WHERE ITEMS ARE
+                self.boundsStale = True
+            elif not self.boundsStale:
+                self.bounds |= region.adjusted(-self.Margin, -self.Margin, self.Margin, self.Margin)
+        self.snapshotTimer.start()
+        self.redraw()
+
+    @QtCore.pyqtSlot()
+    def doRedraw(self):
+        """
+        Fit the diagram bounds within the overview and repaint it.
+        """
+        self.redrawTimer.stop()
+        if self._view:
+            if self.boundsStale:
+                self.bounds = QtCore.QRectF()
+                rect = self.diagram.itemsBoundingRect()
+                if not rect.isEmpty():
+                    self.bounds = rect.adjusted(-self.Margin, -self.Margin, self.Margin, self.Margin)
+                self.boundsStale = False
+            if not self.bounds.isEmpty():
+                self.scene().setSceneRect(self.bounds)
+                self.fitInView(self.bounds, QtCore.Qt.KeepAspectRatio)
+        self.viewport().update()
+
+    @QtCore.pyqtSlot()
+    def doRefreshSnapshot(self):
+        """
+        Render the inspected diagram into the low resolution snapshot displayed by the overview.
+        """
+        self.snapshotTimer.stop()
+        self.snapshot = None
+        self.snapshotRect = QtCore.QRectF()
+        if self._view:
+            if self.boundsStale:
+                self.doRedraw()
+            if not self.bounds.isEmpty():
+                target = self.mapFromScene(self.bounds).boundingRect().intersected(self.viewport().rect())
+                if not target.isEmpty():
+                    ratio = self.devicePixelRatioF()
+                    size = QtCore.QSize(round(target.width() * ratio), round(target.height() * ratio))
+                    snapshot = QtGui.QImage(size, QtGui.QImage.Format_ARGB32_Premultiplied)
+                    snapshot.setDevicePixelRatio(ratio)
+                    snapshot.fill(QtCore.Qt.white)
+                    painter = QtGui.QPainter(snapshot)
+                    self.diagram.render(painter, QtCore.QRectF(0, 0, target.width(), target.height()), self.bounds)
+                    painter.end()
+                    self.snapshot = snapshot
+                    self.snapshotRect = QtCore.QRectF(self.bounds)
+        self.viewport().update()
+
     #############################################
     #   INTERFACE
     #################################
 
+    def invalidateBounds(self):
+        """
+        Mark the diagram bounds as outdated (e.g. because items have been removed from the diagram),
+        so that they are computed again on the next redraw.
+        """
+        self.boundsStale = True
+        self.snapshotTimer.start()
+        self.redraw()
+
     def redraw(self):
         """
-        Redraw the diagram within the overview.
+        Schedule a redraw of the diagram within the overview.
+        Redraws requested while one is already pending are coalesced.
         """
-        if self._view:
-            polygon = self.diagram.visibleRect(margin=10)
-            if polygon:
-                self.fitInView(polygon, QtCore.Qt.KeepAspectRatio)
-        viewport = self.viewport()
-        viewport.update()
+        if not self.redrawTimer.isActive():
+            self.redrawTimer.start()
 
     def setView(self, view):
         """
         Sets the widget to inspect the given Diagram view.
         :type: view: DiagramView
         """
+        if self._view:
+            disconnect(self._view.scene().changed, self.onDiagramChanged)
         self._view = view
+        self.bounds = QtCore.QRectF()
+        self.boundsStale = True
+        if self._view:
+            connect(self._view.scene().changed, self.onDiagramChanged)
+        self.doRefreshSnapshot()
 
     def sizeHint(self):
         """
@@ -294,10 +406,10 @@ class OverviewWidget(QtWidgets.QGraphicsView):
         :rtype: QtCore.QSize
         """
         return QtCore.QSize(216, 216)
-    
+
     def view(self):
         """
         Returns the reference to the view currently inspected by this widget.
-        :rtype: DiagramView 
+        :rtype: DiagramView
         """
-        return self._view
\ No newline at end of file
+        return self._view
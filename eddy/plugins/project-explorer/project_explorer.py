@@ -33,12 +33,15 @@
 ##########################################################################
 
 
+import html
+
 from PyQt5 import (
     QtCore,
     QtGui,
     QtWidgets,
 )
 
+from eddy.core.catalogue import DiagramCatalogue
 from eddy.core.datatypes.qt import Font
 from eddy.core.diagram import Diagram
 from eddy.core.functions.misc import first, natsorted
@@ -136,8 +139,8 @@ class ProjectExplorerPlugin(AbstractPlugin):
 class ProjectExplorerWidget(QtWidgets.QWidget):
     """
     This class implements the project explorer used to display the project structure.
+    Diagram rows are indexed by diagram name and described using the project diagram catalogue.
     """
-    sgnFakeDiagramAdded = QtCore.pyqtSignal(QtWidgets.QGraphicsScene)
     sgnItemActivated = QtCore.pyqtSignal(QtWidgets.QGraphicsScene)
     sgnItemClicked = QtCore.pyqtSignal(QtWidgets.QGraphicsScene)
     sgnItemDoubleClicked = QtCore.pyqtSignal(QtWidgets.QGraphicsScene)
@@ -151,6 +154,7 @@ class ProjectExplorerWidget(QtWidgets.QWidget):
 
         self.plugin = plugin
         self.project = None
+        self.items = {}
 
         self.iconRoot = QtGui.QIcon(':/icons/18/ic_folder_open_black')
         self.iconBlank = QtGui.QIcon(':/icons/18/ic_document_blank')
@@ -212,11 +216,7 @@ class ProjectExplorerWidget(QtWidgets.QWidget):
         :type diagram: Diagram
         """
         if not self.findItem(diagram.name):
-            item = QtGui.QStandardItem(diagram.name)
-            item.setData(diagram)
-            item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
-            item.setIcon(self.iconGraphol)
-            self.root.appendRow(item)
+            self.root.appendRow(self.createItem(diagram))
             self.proxy.sort(0, QtCore.Qt.AscendingOrder)
 
     @QtCore.pyqtSlot(QtWidgets.QGraphicsScene)
@@ -225,7 +225,7 @@ class ProjectExplorerWidget(QtWidgets.QWidget):
         Remove a diagram from the treeview.
         :type diagram: Diagram
         """
-        item = self.findItem(diagram.name)
+        item = self.items.pop(diagram.name, None)
         if item:
             self.root.removeRow(item.index().row())
 
@@ -315,16 +315,45 @@ class ProjectExplorerWidget(QtWidgets.QWidget):
     #   INTERFACE
     #################################
 
+    def createItem(self, diagram):
+        """
+        Create the item representing the given diagram, and index it by diagram name.
+        :type diagram: Diagram
+        :rtype: QStandardItem
+        """
+        item = QtGui.QStandardItem(diagram.name)
+        item.setData(diagram)
+        item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
+        item.setIcon(self.iconGraphol)
+        self.items[diagram.name] = item
+        return item
+
+    def diagramToolTip(self, diagram):
+        """
+        Returns the tooltip describing the given diagram, built from the project diagram catalogue.
+        :type diagram: Diagram
+        :rtype: str
+        """
+        entry = DiagramCatalogue.forProject(self.project).refresh(diagram.name)
+        if entry is None:
+            return diagram.name
+        tooltip = '<b>{0}</b><br/>{1} nodes, {2} edges'.format(html.escape(entry.name), entry.nodes, entry.edges)
+        if not entry.thumbnail.isNull():
+            data = QtCore.QByteArray()
+            buffer = QtCore.QBuffer(data)
+            buffer.open(QtCore.QIODevice.WriteOnly)
+            entry.thumbnail.save(buffer, 'PNG')
+            buffer.close()
+            tooltip += '<br/><img src="data:image/png;base64,{0}"/>'.format(bytes(data.toBase64()).decode('ascii'))
+        return tooltip
+
     def findItem(self, name):
         """
         Find the item with the given name inside the root element.
         :type name: str
+        :rtype: QStandardItem
         """
-        for i in range(self.root.rowCount()):
-            item = self.root.child(i)
-            if item.text() == name:
-                return item
-        return None
+        return self.items.get(name)
 
     def setProject(self, project):
         """
@@ -332,14 +361,13 @@ class ProjectExplorerWidget(QtWidgets.QWidget):
         :type project: Project
         """
         self.project = project
+        self.items = {}
         self.model.clear()
         self.model.appendRow(self.root)
         self.root.setText(project.name)
         self.root.setData(project)
-        connect(self.sgnFakeDiagramAdded, self.doAddDiagram)
-        for diagram in project.diagrams():
-            self.sgnFakeDiagramAdded.emit(diagram)
-        disconnect(self.sgnFakeDiagramAdded)
+        self.root.appendRows([self.createItem(diagram) for diagram in project.diagrams()])
+        self.proxy.sort(0, QtCore.Qt.AscendingOrder)
         sindex = self.root.index()
         pindex = self.proxy.mapFromSource(sindex)
         self.projectview.expand(pindex)
@@ -460,6 +488,20 @@ class ProjectExplorerSortedProxyModel(QtCore.QSortFilterProxyModel):
         """
         super().__init__(*args, **kwargs)
 
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """
+        Returns the data stored under the given role for the item referred to by the index.
+        Diagram tooltips are computed when requested, so that they always reflect the diagram content.
+        :type index: QModelIndex
+        :type role: int
+        :rtype: object
+        """
+        if role == QtCore.Qt.ToolTipRole:
+            item = self.sourceModel().itemFromIndex(self.mapToSource(index))
+            if item and isinstance(item.data(), Diagram):
+                return self.parent().diagramToolTip(item.data())
+        return super().data(index, role)
+
     def lessThan(self, index1, index2):
         """
         Implements < operator.
@@ -762,7 +762,7 @@ class AnnotationBuilderDialog(QtWidgets.QDialog, HasWidgetSystem):
                 'datatype': typeIRI,
                 'language': language,
             }
-            command = CommandEdgeModifyAnnotation(self.project, self.annotation, undo, redo)
+            command = CommandEdgeModifyAnnotation(self.project, self.annotation, undo, redo, edge=self.edge)
             self.session.undostack.push(command)
             self.sgnAnnotationCorrectlyModified.emit(self.annotation)
         super().accept()
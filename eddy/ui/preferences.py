@@ -46,6 +46,7 @@ from eddy.core.datatypes.owl import OWLAxiom
 from eddy.core.datatypes.qt import Font
 from eddy.core.datatypes.system import Channel
 from eddy.core.diagram import Diagram
+from eddy.core.functions.misc import format_size
 from eddy.core.functions.signals import connect
 from eddy.ui.fields import CheckBox
 from eddy.ui.fields import ComboBox
@@ -93,9 +94,44 @@ class PreferencesDialog(QtWidgets.QDialog, HasWidgetSystem):
         spinbox.setValue(settings.value('diagram/fontsize', QtWidgets.qApp.font().pixelSize(), int))
         self.addWidget(spinbox)
 
+        prefix = QtWidgets.QLabel(self, objectName='history_limit_prefix')
+        prefix.setText('Undo history size (steps)')
+        self.addWidget(prefix)
+
+        spinbox = SpinBox(self, objectName='history_limit_field')
+        spinbox.setRange(0, 100000)
+        spinbox.setSingleStep(100)
+        spinbox.setToolTip('Maximum number of undoable actions (0 = unlimited)')
+        spinbox.setValue(settings.value('history/limit', 1000, int))
+        self.addWidget(spinbox)
+
+        prefix = QtWidgets.QLabel(self, objectName='history_memory_prefix')
+        prefix.setText('Undo history memory (MB)')
+        self.addWidget(prefix)
+
+        spinbox = SpinBox(self, objectName='history_memory_field')
+        spinbox.setRange(0, 16384)
+        spinbox.setSingleStep(64)
+        spinbox.setToolTip('Maximum memory used by the undo history (0 = unlimited), '
+                           'currently {0}'.format(format_size(session.undostack.footprint())))
+        spinbox.setValue(settings.value('history/memory', 256, int))
+        self.addWidget(spinbox)
+
+        prefix = QtWidgets.QLabel(self, objectName='project_lazy_prefix')
+        prefix.setText('Build diagrams on first use')
+        self.addWidget(prefix)
+
+        checkbox = CheckBox(self, objectName='project_lazy_checkbox')
+        checkbox.setChecked(settings.value('project/lazy', False, bool))
+        checkbox.setToolTip('Whether or not the items of a diagram are built only when the diagram is first needed')
+        self.addWidget(checkbox)
+
         formlayout = QtWidgets.QFormLayout()
         formlayout.addRow(self.widget('diagram_size_prefix'), self.widget('diagram_size_field'))
         formlayout.addRow(self.widget('diagram_font_size_prefix'), self.widget('diagram_font_size_field'))
+        formlayout.addRow(self.widget('history_limit_prefix'), self.widget('history_limit_field'))
+        formlayout.addRow(self.widget('history_memory_prefix'), self.widget('history_memory_field'))
+        formlayout.addRow(self.widget('project_lazy_prefix'), self.widget('project_lazy_checkbox'))
         groupbox = QtWidgets.QGroupBox('Editor', self, objectName='editor_widget')
         groupbox.setLayout(formlayout)
         self.addWidget(groupbox)
@@ -222,6 +258,38 @@ class PreferencesDialog(QtWidgets.QDialog, HasWidgetSystem):
         widget.setLayout(layout)
         self.addWidget(widget)
 
+        ## IMAGES GROUP
+
+        prefix = QtWidgets.QLabel(self, objectName='export_image_dpi_prefix')
+        prefix.setText('Image resolution (DPI)')
+        self.addWidget(prefix)
+
+        spinbox = SpinBox(self, objectName='export_image_dpi_field')
+        spinbox.setRange(72, 1200)
+        spinbox.setSingleStep(24)
+        spinbox.setToolTip('Resolution of exported raster images')
+        spinbox.setValue(settings.value('export/image/dpi', 96, int))
+        self.addWidget(spinbox)
+
+        prefix = QtWidgets.QLabel(self, objectName='export_image_memory_prefix')
+        prefix.setText('Image rendering memory (MB)')
+        self.addWidget(prefix)
+
+        spinbox = SpinBox(self, objectName='export_image_memory_field')
+        spinbox.setRange(8, 1024)
+        spinbox.setSingleStep(8)
+        spinbox.setToolTip('Maximum memory used when rasterizing an image (PNG and TIFF exports are '
+                           'written in strips, BMP and JPEG exports also need to hold the whole image)')
+        spinbox.setValue(settings.value('export/image/memory', 64, int))
+        self.addWidget(spinbox)
+
+        formlayout = QtWidgets.QFormLayout()
+        formlayout.addRow(self.widget('export_image_dpi_prefix'), self.widget('export_image_dpi_field'))
+        formlayout.addRow(self.widget('export_image_memory_prefix'), self.widget('export_image_memory_field'))
+        groupbox = QtWidgets.QGroupBox('Images', self, objectName='images_widget')
+        groupbox.setLayout(formlayout)
+        self.addWidget(groupbox)
+
         ## EXPORT TAB LAYOUT CONFIGURATION
 
         layout = QtWidgets.QVBoxLayout()
@@ -232,6 +300,7 @@ class PreferencesDialog(QtWidgets.QDialog, HasWidgetSystem):
         layout = QtWidgets.QVBoxLayout()
         layout.setContentsMargins(10, 10, 10, 10)
         layout.addWidget(groupbox)
+        layout.addWidget(self.widget('images_widget'))
         widget = QtWidgets.QWidget(self, objectName='axioms_widget')
         widget.setLayout(layout)
         self.addWidget(widget)
@@ -371,6 +440,8 @@ class PreferencesDialog(QtWidgets.QDialog, HasWidgetSystem):
 
         for axiom, checkbox in self.checks.items():
             settings.setValue('export/axiom/{0}'.format(axiom.value), checkbox.isChecked())
+        settings.setValue('export/image/dpi', self.widget('export_image_dpi_field').value())
+        settings.setValue('export/image/memory', self.widget('export_image_memory_field').value())
 
         #############################################
         # GENERAL TAB
@@ -378,9 +449,15 @@ class PreferencesDialog(QtWidgets.QDialog, HasWidgetSystem):
 
         settings.setValue('diagram/size', self.widget('diagram_size_field').value())
         settings.setValue('diagram/fontsize', self.widget('diagram_font_size_field').value())
+        settings.setValue('history/limit', self.widget('history_limit_field').value())
+        settings.setValue('history/memory', self.widget('history_memory_field').value())
+        settings.setValue('project/lazy', self.widget('project_lazy_checkbox').isChecked())
         settings.setValue('update/channel', self.widget('update_channel_switch').currentText())
         settings.setValue('update/check_on_startup', self.widget('update_startup_checkbox').isChecked())
 
+        self.session.undostack.setLimit(self.widget('history_limit_field').value())
+        self.session.undostack.setBudget(self.widget('history_memory_field').value() * 1024 * 1024)
+
         for diagram in self.session.project.diagrams():
             QtWidgets.QApplication.processEvents()
             diagram.setFont(Font(font=diagram.font(), pixelSize=self.widget('diagram_font_size_field').value()))
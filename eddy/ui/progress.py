@@ -45,14 +45,19 @@ from eddy.core.functions.misc import rangeF
 
 class BusyProgressDialog(QtWidgets.QDialog):
     """
-    This class implements a dialog showing a busy progress bar.
+    This class implements a dialog showing a busy progress bar, which can be switched to
+    show the actual progress of the operation. Modal dialogs block the input to all the
+    other windows of the application while they are displayed.
     """
-    def __init__(self, title='', mtime=0.5, parent=None):
+    stack = []
+
+    def __init__(self, title='', mtime=0.5, parent=None, modal=False):
         """
         Initialize the form dialog.
         :type title: str
         :type mtime: float
         :type parent: QWidget
+        :type modal: bool
         """
         super().__init__(parent)
         self.mtime = time() + mtime
@@ -67,11 +72,60 @@ class BusyProgressDialog(QtWidgets.QDialog):
         self.setWindowIcon(QtGui.QIcon(':/icons/128/ic_eddy'))
         self.setWindowTitle(title or 'Busy ...')
         self.setFixedSize(self.sizeHint())
+        if modal:
+            self.setWindowModality(QtCore.Qt.ApplicationModal)
+
+    #############################################
+    #   EVENTS
+    #################################
+
+    def closeEvent(self, closeEvent):
+        """
+        Executed when the dialog is closed: the dialog cannot be closed while the operation is running.
+        :type closeEvent: QCloseEvent
+        """
+        if self in BusyProgressDialog.stack:
+            closeEvent.ignore()
+        else:
+            super().closeEvent(closeEvent)
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot()
+    def reject(self):
+        """
+        Executed when the dialog is dismissed (e.g. by pressing Escape): the dialog
+        cannot be dismissed while the operation is running.
+        """
+        if self not in BusyProgressDialog.stack:
+            super().reject()
 
     #############################################
     #   INTERFACE
     #################################
 
+    @classmethod
+    def current(cls):
+        """
+        Returns the innermost dialog currently displayed as a context manager, if any.
+        :rtype: BusyProgressDialog
+        """
+        return cls.stack[-1] if cls.stack else None
+
+    def setProgress(self, value, maximum, text=None):
+        """
+        Set the progress displayed by the dialog: a maximum of 0 switches it back to busy.
+        :type value: int
+        :type maximum: int
+        :type text: str
+        """
+        self.progressBar.setRange(0, maximum)
+        self.progressBar.setValue(min(value, maximum))
+        if text is not None:
+            self.progressBar.setFormat(text)
+
     def sleep(self):
         """
         Wait for the splash screen to be drawn for at least 'mtime' seconds.
@@ -90,6 +144,7 @@ class BusyProgressDialog(QtWidgets.QDialog):
         """
         Draw the dialog.
         """
+        BusyProgressDialog.stack.append(self)
         self.show()
         return self
 
@@ -97,5 +152,6 @@ class BusyProgressDialog(QtWidgets.QDialog):
         """
         Close the dialog.
         """
+        BusyProgressDialog.stack.remove(self)
         self.sleep()
         self.close()
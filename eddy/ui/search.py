@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+
+from PyQt5 import QtCore
+from PyQt5 import QtGui
+from PyQt5 import QtWidgets
+
+from eddy.core.functions.misc import first
+from eddy.core.functions.signals import connect
+from eddy.core.owl import IRIRender
+from eddy.core.search import EntitySearchIndex
+from eddy.ui.fields import StringField
+
+
+class EntitySearchDialog(QtWidgets.QDialog):
+    """
+    Extends QtWidgets.QDialog providing a search box which can be used to jump to any entity of the project.
+    Entities are looked up in the project EntitySearchIndex, hence they can be found by IRI, simple name,
+    prefixed form or annotation value, even if the search text is not spelled exactly.
+    """
+    MaxResults = 50
+
+    def __init__(self, session):
+        """
+        Initialize the dialog.
+        :type session: Session
+        """
+        super().__init__(session)
+        self.search = StringField(self)
+        self.search.setClearButtonEnabled(True)
+        self.search.setPlaceholderText('Search entities by name, label or annotation...')
+        self.search.setMinimumWidth(420)
+        self.results = QtWidgets.QListWidget(self)
+        self.results.setUniformItemSizes(True)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.addWidget(self.search)
+        layout.addWidget(self.results)
+        self.setWindowIcon(QtGui.QIcon(':/icons/128/ic_eddy'))
+        self.setWindowTitle('Go to Entity')
+
+        connect(self.search.textChanged, self.doSearch)
+        connect(self.search.returnPressed, self.onReturnPressed)
+        connect(self.results.itemActivated, self.onItemActivated)
+
+    #############################################
+    #   PROPERTIES
+    #################################
+
+    @property
+    def project(self):
+        """
+        Returns the active project.
+        :rtype: Project
+        """
+        return self.session.project
+
+    @property
+    def session(self):
+        """
+        Returns the active session (alias for self.parent()).
+        :rtype: Session
+        """
+        return self.parent()
+
+    #############################################
+    #   SLOTS
+    #################################
+
+    @QtCore.pyqtSlot(str)
+    def doSearch(self, text):
+        """
+        Executed when the search text changes.
+        :type text: str
+        """
+        self.results.clear()
+        if text.strip():
+            index = EntitySearchIndex.forProject(self.project)
+            for iri in index.search(text, self.MaxResults, self.project.existIriOccurrence):
+                item = QtWidgets.QListWidgetItem(IRIRender.iriLabelString(iri).replace('\n', ''))
+                item.setData(QtCore.Qt.UserRole, iri)
+                item.setToolTip(str(iri))
+                self.results.addItem(item)
+            self.results.setCurrentRow(0)
+
+    @QtCore.pyqtSlot(QtWidgets.QListWidgetItem)
+    def onItemActivated(self, item):
+        """
+        Executed when a search result is activated: focus the first occurrence of the entity.
+        :type item: QListWidgetItem
+        """
+        node = first(self.project.iriOccurrences(iri=item.data(QtCore.Qt.UserRole)))
+        if node:
+            self.accept()
+            self.session.doFocusItem(node)
+
+    @QtCore.pyqtSlot()
+    def onReturnPressed(self):
+        """
+        Executed when the Return or Enter key is pressed in the search field.
+        """
+        item = self.results.currentItem()
+        if item:
+            self.onItemActivated(item)
+
+    #############################################
+    #   EVENTS
+    #################################
+
+    def keyPressEvent(self, keyEvent):
+        """
+        Executed when a key is pressed: arrow keys move through the results while typing.
+        :type keyEvent: QKeyEvent
+        """
+        if keyEvent.key() in (QtCore.Qt.Key_Up, QtCore.Qt.Key_Down) and self.results.count():
+            step = -1 if keyEvent.key() == QtCore.Qt.Key_Up else 1
+            row = min(max(self.results.currentRow() + step, 0), self.results.count() - 1)
+            self.results.setCurrentRow(row)
+            return
+        super().keyPressEvent(keyEvent)
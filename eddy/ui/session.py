@@ -129,15 +129,18 @@ from eddy.core.exporters.image import (
     BmpDiagramExporter,
     JpegDiagramExporter,
     PngDiagramExporter,
+    TiffDiagramExporter,
 )
 from eddy.core.exporters.metadata import (
     AnnotationsOverridingDialog,
     CsvProjectExporter,
     XlsxProjectExporter,
 )
-from eddy.core.exporters.owl2 import OWLOntologyExporter
+from eddy.core.exporters.orchestrator import ExportOrchestrator, ExportProfile
+from eddy.core.exporters.owl2 import OWLOntologyExporter, OWLOntologyWatcher
 from eddy.core.exporters.pdf import PdfProjectExporter
 from eddy.core.exporters.printer import PrinterDiagramExporter
+from eddy.core.exporters.svg import SvgDiagramExporter
 from eddy.core.factory import (
     MenuFactory,
     PropertyFactory,
@@ -154,6 +157,7 @@ from eddy.core.functions.path import (
     shortPath,
 )
 from eddy.core.functions.signals import connect
+from eddy.core.history import UndoStack
 from eddy.core.items.common import AbstractItem
 from eddy.core.items.edges.common.base import AxiomEdge
 from eddy.core.items.nodes.common.base import (
@@ -162,6 +166,13 @@ from eddy.core.items.nodes.common.base import (
 )
 from eddy.core.items.nodes.facet import FacetNode
 from eddy.core.items.nodes.literal import LiteralNode
+from eddy.core.layout import (
+    ForceDirectedLayout,
+    LayeredLayout,
+    LayoutGraph,
+    LayoutResult,
+    LayoutWorker,
+)
 from eddy.core.loaders.annotations import CsvLoader, XlsxLoader
 from eddy.core.loaders.graphml import GraphMLOntologyLoader
 from eddy.core.loaders.graphol_iri import (
@@ -196,6 +207,7 @@ from eddy.core.project import (
     Project,
 )
 from eddy.core.regex import RE_CAMEL_SPACE
+from eddy.core.rendering import IRILabelRenderer
 from eddy.ui.about import AboutDialog
 from eddy.ui.annotation import (
     AnnotationAssertionBuilderDialog,
@@ -236,6 +248,7 @@ from eddy.ui.mdi import (
 from eddy.ui.plugin import PluginInstallDialog
 from eddy.ui.preferences import PreferencesDialog
 from eddy.ui.progress import BusyProgressDialog
+from eddy.ui.search import EntitySearchDialog
 from eddy.ui.syntax import SyntaxValidationDialog
 from eddy.ui.view import DiagramView
 
@@ -343,13 +356,18 @@ class Session(
 
         self.app = application
         self.clipboard = Clipboard(self)
-        self.undostack = QtWidgets.QUndoStack(self)
+        settings = QtCore.QSettings()
+        self.undostack = UndoStack(self,
+            limit=settings.value('history/limit', 1000, int),
+            budget=settings.value('history/memory', 256, int) * 1024 * 1024)
         self.mdi = MdiArea(self)
         self.mf = MenuFactory(self)
         self.pf = PropertyFactory(self)
         self.pmanager = PluginManager(self)
         self.nmanager = NetworkManager(self)
+        self.owlWatcher = None
         self.project = None
+        self.stateTimer = QtCore.QTimer(self, singleShot=True, interval=0)
 
         #############################################
         # INITIALIZE REASONER STATE VARIABLES
@@ -693,6 +711,15 @@ class Session(
             'Export Ontology', self, objectName='export_ontology', triggered=self.doExportOntology,
             shortcut='CTRL+E', statusTip='Export the current project in a different format'))
 
+        self.addAction(QtWidgets.QAction(
+            'Export Ontology on Save', self, objectName='export_ontology_on_save',
+            checkable=True, triggered=self.doToggleOntologyExportOnSave,
+            statusTip='Keep an OWL 2 ontology file up to date whenever the project is saved'))
+
+        self.addAction(QtWidgets.QAction(
+            'Export Bundle...', self, objectName='export_bundle', triggered=self.doExportBundle,
+            statusTip='Run all the exports described by an export profile'))
+
         self.addAction(QtWidgets.QAction(
             'Export Diagrams', self, objectName='export_diagrams', triggered=self.doExportDiagram,
             shortcut='CTRL+SHIFT+E', statusTip='Export a in a different format'))
@@ -781,6 +808,22 @@ class Session(
             statusTip='Align the elements in the active diagram to the grid',
             triggered=self.doSnapTopGrid))
 
+        action = QtWidgets.QAction(
+            QtGui.QIcon(':/icons/24/ic_format_shapes_black'), 'Hierarchical layout',
+            self, objectName='layout_hierarchical', enabled=False,
+            statusTip='Arrange the selected elements (or the whole diagram) in layers',
+            triggered=self.doApplyLayout)
+        action.setData(LayeredLayout)
+        self.addAction(action)
+
+        action = QtWidgets.QAction(
+            QtGui.QIcon(':/icons/24/ic_format_shapes_black'), 'Force-directed layout',
+            self, objectName='layout_force_directed', enabled=False,
+            statusTip='Arrange the selected elements (or the whole diagram) using a force-directed layout',
+            triggered=self.doApplyLayout)
+        action.setData(ForceDirectedLayout)
+        self.addAction(action)
+
         icon = QtGui.QIcon()
         icon.addFile(':/icons/24/ic_grid_on_black', QtCore.QSize(), QtGui.QIcon.Normal,
                      QtGui.QIcon.On)
@@ -838,6 +881,11 @@ class Session(
             statusTip='Select all items in the active diagram',
             shortcut=QtGui.QKeySequence.SelectAll, triggered=self.doSelectAll))
 
+        self.addAction(QtWidgets.QAction(
+            'Go to Entity...', self, objectName='goto_entity',
+            shortcut='CTRL+SHIFT+F', statusTip='Search an entity of the project and focus it',
+            triggered=self.doGoToEntity))
+
         #############################################
         # EDGE RELATED
         #################################
@@ -1172,6 +1220,8 @@ class Session(
         self.addDiagramExporter(BmpDiagramExporter)
         self.addDiagramExporter(JpegDiagramExporter)
         self.addDiagramExporter(PngDiagramExporter)
+        self.addDiagramExporter(SvgDiagramExporter)
+        self.addDiagramExporter(TiffDiagramExporter)
 
     def initLoaders(self) -> None:
         """
@@ -1206,10 +1256,12 @@ class Session(
         # menu.addAction(self.action('import'))
         menu.addAction(self.action('import_ontology'))
         menu.addAction(self.action('export_ontology'))
+        menu.addAction(self.action('export_ontology_on_save'))
         # menu.addSeparator()
         # menu.addAction(self.action('export'))
         menu.addSeparator()
         menu.addAction(self.action('export_diagrams'))
+        menu.addAction(self.action('export_bundle'))
         menu.addSeparator()
         for action in self.action('recent_projects').actions():
             menu.addAction(action)
@@ -1251,8 +1303,11 @@ class Session(
         menu.addAction(self.action('swap_edge'))
         menu.addSeparator()
         menu.addAction(self.action('select_all'))
+        menu.addAction(self.action('goto_entity'))
         menu.addAction(self.action('snap_to_grid'))
         menu.addAction(self.action('center_diagram'))
+        menu.addAction(self.action('layout_hierarchical'))
+        menu.addAction(self.action('layout_force_directed'))
         menu.addSeparator()
         menu.addMenu(self.menu('compose'))
         menu.addSeparator()
@@ -1540,7 +1595,9 @@ class Session(
         """
         connect(self.app.sgnSessionCreated, self.onSessionCreated)
         connect(self.app.sgnSessionClosed, self.onSessionClosed)
-        connect(self.undostack.cleanChanged, self.doUpdateState)
+        connect(self.clipboard.sgnCleared, self.doScheduleUpdateState)
+        connect(self.clipboard.sgnUpdated, self.doScheduleUpdateState)
+        connect(self.undostack.cleanChanged, self.doScheduleUpdateState)
         connect(self.nmanager.sgnNoUpdateAvailable, self.onNoUpdateAvailable)
         connect(self.nmanager.sgnNoUpdateDataAvailable, self.onNoUpdateDataAvailable)
         connect(self.nmanager.sgnUpdateAvailable, self.onUpdateAvailable)
@@ -1551,7 +1608,8 @@ class Session(
         connect(self.sgnReady, self.doUpdateState)
         connect(self.sgnReady, self.onSessionReady)
         connect(self.sgnSaveProject, self.doSave)
-        connect(self.sgnUpdateState, self.doUpdateState)
+        connect(self.sgnUpdateState, self.doScheduleUpdateState)
+        connect(self.stateTimer.timeout, self.doUpdateState)
 
     def initState(self) -> None:
         """
@@ -1691,6 +1749,28 @@ class Session(
     def onSingleNodeSwitchIRI(self, node: QtWidgets.QGraphicsItem, iri: IRI) -> None:
         self.sgnSingleNodeSwitchIRI.emit(node, iri)
 
+    @QtCore.pyqtSlot()
+    def doApplyLayout(self) -> None:
+        """
+        Apply the layout algorithm attached to the triggering action to the selected nodes
+        of the active diagram, or to the whole diagram if no node is selected.
+        """
+        diagram = self.mdi.activeDiagram()
+        if diagram and not self.worker('layout'):
+            diagram.setMode(DiagramMode.Idle)
+            nodes = diagram.selectedNodes() or list(diagram.nodes())
+            if len(nodes) > 1:
+                layout = self.sender().data()()
+                worker = LayoutWorker(layout, LayoutGraph.fromNodes(diagram, nodes))
+                connect(worker.sgnCompleted, self.onLayoutCompleted)
+                connect(worker.sgnErrored, self.onLayoutErrored)
+                connect(worker.sgnProgress, self.onLayoutProgress)
+                progressBar = self.widget('progress_bar')
+                progressBar.setToolTip('Computing {0} layout...'.format(layout.name))
+                progressBar.setVisible(True)
+                self.startThread('layout', worker)
+                self.sgnUpdateState.emit()
+
     @QtCore.pyqtSlot()
     def doBringToFront(self) -> None:
         """
@@ -1934,6 +2014,47 @@ class Session(
                 Could not complete the export, see the System Log for details.
                 """)
 
+    @QtCore.pyqtSlot()
+    def doExportBundle(self) -> None:
+        """
+        Run all the exports described by an export profile.
+        """
+        if self.project.isEmpty():
+            return
+        dialog = FileDialog(self)
+        dialog.setAcceptMode(QtWidgets.QFileDialog.AcceptOpen)
+        dialog.setFileMode(QtWidgets.QFileDialog.ExistingFile)
+        dialog.setNameFilters([File.Json.value])
+        if not dialog.exec_():
+            return
+        directory = QtWidgets.QFileDialog.getExistingDirectory(self, 'Export Bundle To', expandPath('~'))
+        if not directory:
+            return
+        try:
+            profile = ExportProfile.load(first(dialog.selectedFiles()))
+            orchestrator = ExportOrchestrator(self.project, profile, self)
+            with BusyProgressDialog('Exporting {0}...'.format(profile.name), parent=self, modal=True) as progress:
+                connect(orchestrator.sgnProgress, progress.setProgress)
+                failures = orchestrator.run(directory)
+            orchestrator.deleteLater()
+        except Exception as e:
+            LOGGER.error('error during export: {}', e)
+            self.addNotification("""
+            <b><font color="#7E0B17">ERROR</font></b>:
+            Could not complete the export, see the System Log for details.
+            """)
+        else:
+            if failures:
+                self.addNotification("""
+                <b><font color="#7E0B17">ERROR</font></b>:
+                {0} of {1} exports failed ({2}), see the System Log for details.
+                """.format(len(failures), orchestrator.total, ', '.join(label for label, _ in failures)))
+            else:
+                self.addNotification("""
+                Bundle export completed: <br><br>
+                <b><a href=file:{0}>{1}</a></b>
+                """.format(expandPath(directory), 'Open Folder'))
+
     @QtCore.pyqtSlot()
     def doExportDiagram(self) -> None:
         """
@@ -1968,7 +2089,7 @@ class Session(
                 if not filterDialog.exec_():
                     return
                 # EXPORT DIAGRAMS
-                with BusyProgressDialog(parent=self) as progress:
+                with BusyProgressDialog(parent=self, modal=True) as progress:
                     for diagram in filterDialog.selectedDiagrams():
                         progress.setWindowTitle('Exporting {0}...'.format(diagram.name))
                         path = first(dialog.selectedFiles())
@@ -2037,6 +2158,7 @@ class Session(
 
         :param diagram: The diagram to focus
         """
+        self.project.materialize(diagram)
         subwindow = self.mdi.subWindowForDiagram(diagram)
         if not subwindow:
             view = self.createDiagramView(diagram)
@@ -2118,7 +2240,24 @@ class Session(
                                 worker.run(expandPath(path), override)
                             else:
                                 worker.run()
-                                if worker.owlOntologyImportErrors:
+                                if getattr(worker, 'warnings', None):
+                                    # LOADERS COLLECTING PER-ELEMENT WARNINGS (E.G. GRAPHML)
+                                    # IMPORT WHAT THEY CAN: REPORT WHAT HAS BEEN SKIPPED
+                                    msgbox = QtWidgets.QMessageBox(self)
+                                    msgbox.setDetailedText('\n'.join(
+                                        'line {0}: {1} {2}: {3}'.format(line, tag, id_, message)
+                                        for line, tag, id_, message in worker.warnings))
+                                    msgbox.setIconPixmap(
+                                        QtGui.QIcon(':/icons/48/ic_warning_black').pixmap(48))
+                                    msgbox.setStandardButtons(QtWidgets.QMessageBox.Close)
+                                    msgbox.setText('{0} element(s) of {1} could not be imported '
+                                                   'and have been skipped'
+                                                   .format(len(worker.warnings),
+                                                           os.path.basename(path)))
+                                    msgbox.setWindowIcon(QtGui.QIcon(':/icons/128/ic_eddy'))
+                                    msgbox.setWindowTitle('Import completed with warnings')
+                                    msgbox.exec_()
+                                if getattr(worker, 'owlOntologyImportErrors', None):
                                     msgbox = QtWidgets.QMessageBox(self)
                                     msgbox.setDetailedText(
                                         '{} OWL 2 ontologies declared as imports '
@@ -2220,7 +2359,7 @@ class Session(
             diagram = Diagram.create(name, size, self.project)
             connect(diagram.sgnItemAdded, self.project.doAddItem)
             connect(diagram.sgnItemRemoved, self.project.doRemoveItem)
-            connect(diagram.selectionChanged, self.doUpdateState)
+            connect(diagram.selectionChanged, self.doScheduleUpdateState)
             self.undostack.push(CommandDiagramAdd(diagram, self.project))
             self.sgnFocusDiagram.emit(diagram)
 
@@ -2734,6 +2873,14 @@ class Session(
             self.undostack.setClean()
             self.sgnProjectSaved.emit()
 
+    @QtCore.pyqtSlot()
+    def doGoToEntity(self) -> None:
+        """
+        Open the dialog used to search an entity of the project and focus it.
+        """
+        dialog = EntitySearchDialog(self)
+        dialog.exec_()
+
     @QtCore.pyqtSlot()
     def doSelectAll(self) -> None:
         """
@@ -3157,11 +3304,45 @@ class Session(
             viewport = subwindow.view.viewport()
             viewport.update()
 
+    @QtCore.pyqtSlot(bool)
+    def doToggleOntologyExportOnSave(self, checked: bool) -> None:
+        """
+        Start or stop keeping an OWL 2 ontology file in sync with the project on every save.
+        """
+        if self.owlWatcher:
+            self.owlWatcher.stop()
+            self.owlWatcher.deleteLater()
+            self.owlWatcher = None
+        if checked:
+            dialog = FileDialog(self)
+            dialog.setAcceptMode(QtWidgets.QFileDialog.AcceptSave)
+            dialog.setFileMode(QtWidgets.QFileDialog.AnyFile)
+            dialog.setNameFilters([File.Owl.value])
+            dialog.selectFile(self.project.name)
+            dialog.setDefaultSuffix(File.Owl.extension)
+            if not dialog.exec_():
+                self.action('export_ontology_on_save').setChecked(False)
+                return
+            self.owlWatcher = OWLOntologyWatcher(self, expandPath(first(dialog.selectedFiles())))
+            # BRING THE FILE UP TO DATE RIGHT AWAY
+            self.owlWatcher.doExport()
+
+    @QtCore.pyqtSlot()
+    def doScheduleUpdateState(self) -> None:
+        """
+        Mark the state of built-in actions as outdated: the actual update is performed
+        once, when control returns to the event loop, no matter how many times the
+        state is invalidated in the meantime (e.g. rubber band selection, bulk paste).
+        """
+        if not self.stateTimer.isActive():
+            self.stateTimer.start()
+
     @QtCore.pyqtSlot()
     def doUpdateState(self) -> None:
         """
         Update built-in actions according to the application state.
         """
+        self.stateTimer.stop()
         isDomainRangeUsable = False
         isDiagramActive = False
         isClipboardEmpty = True
@@ -3198,16 +3379,17 @@ class Session(
             predicates = {Item.ConceptNode, Item.AttributeNode, Item.RoleNode,
                           Item.IndividualNode}
             if diagram:
-                nodes = diagram.selectedNodes()
-                edges = diagram.selectedEdges()
+                selection = diagram.selection
+                nodes = selection.nodes
+                edges = selection.edges
                 isDiagramActive = True
                 isDiagramSwitchEnabled = len(self.mdi.subWindowList()) > 1
                 isClipboardEmpty = self.clipboard.empty()
-                isEdgeSelected = first(edges) is not None
-                isNodeSelected = first(nodes) is not None
-                isDomainRangeUsable = any([x.type() in restrictables for x in nodes])
-                isPredicateSelected = any([x.type() in predicates for x in nodes])
-                isRestrictable = len(nodes) == 1 and first(nodes).type() in restrictables
+                isEdgeSelected = len(edges) > 0
+                isNodeSelected = len(nodes) > 0
+                isDomainRangeUsable = selection.count(*restrictables) > 0
+                isPredicateSelected = selection.count(*predicates) > 0
+                isRestrictable = len(nodes) == 1 and selection.count(*restrictables) == 1
                 isRoleSelected = isRestrictable and first(nodes).type() is Item.RoleNode
                 if isRestrictable:
                     # meta = self.project.meta(first(nodes).type(), first(nodes).text())
@@ -3265,6 +3447,8 @@ class Session(
         self.action('select_all').setEnabled(isDiagramActive)
         self.action('send_to_back').setEnabled(isNodeSelected)
         self.action('snap_to_grid').setEnabled(isDiagramActive)
+        self.action('layout_hierarchical').setEnabled(isDiagramActive)
+        self.action('layout_force_directed').setEnabled(isDiagramActive)
         self.action('syntax_check').setEnabled(not isProjectEmpty)
         self.action('dl_check').setEnabled(not isProjectEmpty)
         self.action('swap_edge').setEnabled(isEdgeSelected and isEdgeSwapEnabled)
@@ -3303,9 +3487,7 @@ class Session(
             for langTag in self.project.getLanguages():
                 actionObjName = 'render_label_{}'.format(langTag)
                 self.action(objectName=actionObjName).setChecked(False)
-            for node in self.project.nodes():
-                if isinstance(node, PredicateNodeMixin):
-                    node.doUpdateNodeLabel()
+            IRILabelRenderer.forProject(self.project).setMode(IRIRender.FULL)
             self.sgnRenderingModified.emit(IRIRender.FULL.value)
 
     @QtCore.pyqtSlot()
@@ -3322,9 +3504,7 @@ class Session(
             for langTag in self.project.getLanguages():
                 actionObjName = 'render_label_{}'.format(langTag)
                 self.action(objectName=actionObjName).setChecked(False)
-            for node in self.project.nodes():
-                if isinstance(node, PredicateNodeMixin):
-                    node.doUpdateNodeLabel()
+            IRILabelRenderer.forProject(self.project).setMode(IRIRender.PREFIX)
             self.sgnRenderingModified.emit(IRIRender.PREFIX.value)
 
     @QtCore.pyqtSlot()
@@ -3342,9 +3522,7 @@ class Session(
             for langTag in self.project.getLanguages():
                 actionObjName = 'render_label_{}'.format(langTag)
                 self.action(objectName=actionObjName).setChecked(False)
-            for node in self.project.nodes():
-                if isinstance(node, PredicateNodeMixin):
-                    node.doUpdateNodeLabel()
+            IRILabelRenderer.forProject(self.project).setMode(IRIRender.SIMPLE_NAME)
         self.sgnRenderingModified.emit(IRIRender.SIMPLE_NAME.value)
 
     @QtCore.pyqtSlot()
@@ -3365,11 +3543,68 @@ class Session(
             for langTag in self.project.getLanguages():
                 actionObjName = 'render_label_{}'.format(langTag)
                 self.action(objectName=actionObjName).setChecked(langTag == lang)
-            for node in self.project.nodes():
-                if isinstance(node, (PredicateNodeMixin, FacetNode)):
+            IRILabelRenderer.forProject(self.project).setMode(IRIRender.LABEL, lang)
+            for node in self.project.index.nodes():
+                if isinstance(node, FacetNode):
                     node.doUpdateNodeLabel()
             self.sgnRenderingModified.emit(IRIRender.LABEL.value)
 
+    @QtCore.pyqtSlot(object)
+    def onLayoutCompleted(self, result: LayoutResult) -> None:
+        """
+        Executed when the layout worker thread terminates: apply the computed layout as a single command.
+        """
+        progressBar = self.widget('progress_bar')
+        progressBar.setToolTip('')
+        progressBar.setRange(0, 0)
+        progressBar.setVisible(False)
+        diagram = result.graph.diagram
+        if diagram in self.project.diagrams():
+            snapToGrid = self.action('toggle_grid').isChecked()
+            data = {'redo': {'nodes': {}, 'edges': {}}, 'undo': {'nodes': {}, 'edges': {}}}
+            for nid, (x, y) in zip(result.graph.ids, result.pos):
+                node = diagram.node(nid)
+                if node:
+                    data['undo']['nodes'][node] = {'pos': node.pos(), 'anchors': dict(node.anchors)}
+                    data['redo']['nodes'][node] = {
+                        'pos': snap(QtCore.QPointF(x, y), Diagram.GridSize, snapToGrid),
+                        'anchors': {}
+                    }
+            for eid, _, _ in result.graph.edges:
+                edge = diagram.edge(eid)
+                if edge:
+                    data['undo']['edges'][edge] = {'breakpoints': list(edge.breakpoints)}
+                    data['redo']['edges'][edge] = {
+                        'breakpoints': [QtCore.QPointF(x, y) for x, y in result.breakpoints.get(eid, [])]
+                    }
+            if data['undo']['nodes']:
+                name = '{0} layout of {1} node(s)'.format(result.layout.name, len(data['undo']['nodes']))
+                self.undostack.push(CommandSnapItemsToGrid(diagram, data, name))
+        self.sgnUpdateState.emit()
+
+    @QtCore.pyqtSlot(Exception)
+    def onLayoutErrored(self, exc: Exception) -> None:
+        """
+        Executed when the layout worker thread terminates abnormally.
+        """
+        progressBar = self.widget('progress_bar')
+        progressBar.setToolTip('')
+        progressBar.setRange(0, 0)
+        progressBar.setVisible(False)
+        self.addNotification(textwrap.dedent("""
+            <b><font color="#7E0B17">ERROR</font></b>: Could not compute the diagram layout: {0}
+            """.format(exc)))
+        self.sgnUpdateState.emit()
+
+    @QtCore.pyqtSlot(int, int)
+    def onLayoutProgress(self, step: int, total: int) -> None:
+        """
+        Executed when the layout worker thread reports progress.
+        """
+        progressBar = self.widget('progress_bar')
+        progressBar.setRange(0, total)
+        progressBar.setValue(step)
+
     @QtCore.pyqtSlot()
     def onNoUpdateAvailable(self) -> None:
         """
@@ -3419,7 +3654,7 @@ class Session(
             self.onSessionCreated(session)
         # CONNECT PROJECT SPECIFIC SIGNALS
         connect(self.project.sgnDiagramRemoved, self.mdi.onDiagramRemoved)
-        connect(self.project.sgnUpdated, self.doUpdateState)
+        connect(self.project.sgnUpdated, self.doScheduleUpdateState)
         # CHECK FOR UPDATES ON STARTUP
         settings = QtCore.QSettings()
         if settings.value('update/check_on_startup', True, bool):
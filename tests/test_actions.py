@@ -40,8 +40,12 @@ Tests for built-in actions.
 import pytest
 from pytestqt.qtbot import QtBot
 
-from PyQt5 import QtWidgets
+from PyQt5 import (
+    QtCore,
+    QtWidgets,
+)
 
+from eddy.core.clipboard import Clipboard
 from eddy.core.datatypes.graphol import Item
 from eddy.core.functions.misc import first
 from eddy.core.functions.path import expandPath
@@ -256,6 +260,80 @@ def test_action_copy_and_paste_multiple_predicate_nodes_with_shared_edges_on_the
     assert not session.undostack.isClean()
 
 
+def test_action_copy_stores_graphol_fragment_in_system_clipboard(session):
+    # GIVEN
+    project = session.project
+    diagram = session.mdi.activeDiagram()
+    action_copy = session.action('copy')
+    iri = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/hasParent')
+    node = first(project.iriOccurrences(Item.RoleNode, iri, diagram))
+    diagram.clearSelection()
+    node.setSelected(True)
+    # WHEN
+    action_copy.trigger()
+    # THEN
+    mimeData = QtWidgets.QApplication.clipboard().mimeData()
+    assert mimeData.hasFormat(Clipboard.MimeType)
+    assert mimeData.text().startswith('<graphol version="3">')
+    assert str(iri) in mimeData.text()
+
+
+def test_action_paste_graphol_fragment_from_another_instance(session):
+    # GIVEN
+    project = session.project
+    diagram = session.mdi.activeDiagram()
+    action_copy = session.action('copy')
+    action_paste = session.action('paste')
+    iri = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/hasParent')
+    node = first(project.iriOccurrences(Item.RoleNode, iri, diagram))
+    diagram.clearSelection()
+    node.setSelected(True)
+    action_copy.trigger()
+    fragment = QtWidgets.QApplication.clipboard().mimeData().text()
+    fragment = fragment.replace(str(iri), 'http://www.dis.uniroma1.it/~graphol/test_project/hasRelative')
+    mimeData = QtCore.QMimeData()
+    mimeData.setData(Clipboard.MimeType, QtCore.QByteArray(fragment.encode('utf-8')))
+    num_nodes_in_diagram = len(diagram.nodes())
+    # WHEN
+    QtWidgets.QApplication.clipboard().setMimeData(mimeData)
+    action_paste.trigger()
+    # THEN
+    assert num_nodes_in_diagram + 1 == len(diagram.nodes())
+    assert project.existIRI('http://www.dis.uniroma1.it/~graphol/test_project/hasRelative')
+    pasted = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/hasRelative')
+    assert len(project.iriOccurrences(Item.RoleNode, pasted, diagram)) == 1
+    assert first(project.iriOccurrences(Item.RoleNode, pasted, diagram)).id != node.id
+    assert session.clipboard.size() == 1
+
+
+def test_action_paste_graphol_fragment_undo_removes_created_iris(session):
+    # GIVEN
+    project = session.project
+    diagram = session.mdi.activeDiagram()
+    iri = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/hasParent')
+    node = first(project.iriOccurrences(Item.RoleNode, iri, diagram))
+    diagram.clearSelection()
+    node.setSelected(True)
+    session.action('copy').trigger()
+    fragment = QtWidgets.QApplication.clipboard().mimeData().text()
+    fragment = fragment.replace(str(iri), 'http://www.dis.uniroma1.it/~graphol/test_project/hasRelative')
+    mimeData = QtCore.QMimeData()
+    mimeData.setData(Clipboard.MimeType, QtCore.QByteArray(fragment.encode('utf-8')))
+    QtWidgets.QApplication.clipboard().setMimeData(mimeData)
+    num_iris_in_project = len(project.iris)
+    session.action('paste').trigger()
+    # WHEN
+    session.undostack.undo()
+    # THEN
+    assert not project.existIRI('http://www.dis.uniroma1.it/~graphol/test_project/hasRelative')
+    assert num_iris_in_project == len(project.iris)
+    # WHEN
+    session.undostack.redo()
+    # THEN
+    pasted = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/hasRelative')
+    assert len(project.iriOccurrences(Item.RoleNode, pasted, diagram)) == 1
+
+
 def test_action_cut(session):
     # GIVEN
     project = session.project
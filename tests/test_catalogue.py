@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+
+"""
+Tests for the diagram catalogue.
+"""
+
+import pytest
+from PyQt5 import QtXml
+
+from eddy.core.catalogue import DiagramCatalogue
+from eddy.core.commands.common import CommandItemsTranslate
+from eddy.core.exporters.graphol_iri import GrapholIRIProjectExporter
+from eddy.core.functions.misc import first
+from eddy.core.functions.path import expandPath
+from eddy.ui.session import Session
+
+
+@pytest.fixture
+def session(qapp, qtbot, logging_disabled):
+    """
+    Provide an initialized Session instance.
+    """
+    with logging_disabled:
+        session = Session(qapp, expandPath('@tests/test_project_3/test_project_3_1.graphol'))
+        session.show()
+    qtbot.addWidget(session)
+    qtbot.waitExposed(session, timeout=3000)
+    yield session
+
+
+#############################################
+#   CATALOGUE TESTS
+#################################
+
+def test_catalogue_describes_project_diagrams(session):
+    # GIVEN
+    project = session.project
+    diagram = project.diagram('diagram')
+    catalogue = DiagramCatalogue.forProject(project)
+    # WHEN
+    entry = catalogue.refresh('diagram')
+    # THEN
+    assert catalogue is DiagramCatalogue.forProject(project)
+    assert set(catalogue.names()) == {d.name for d in project.diagrams()}
+    assert entry.hasDiagram()
+    assert entry.nodes == len(project.nodes(diagram))
+    assert entry.edges == len(project.edges(diagram))
+    assert entry.bounds == diagram.visibleRect()
+    assert not entry.thumbnail.isNull()
+    assert max(entry.thumbnail.width(), entry.thumbnail.height()) <= DiagramCatalogue.ThumbnailSize
+
+
+def test_catalogue_thumbnail_is_refreshed_when_diagram_is_updated(session):
+    # GIVEN
+    project = session.project
+    diagram = project.diagram('diagram')
+    catalogue = DiagramCatalogue.forProject(project)
+    thumbnail = catalogue.refresh('diagram').thumbnail
+    # WHEN
+    session.undostack.push(CommandItemsTranslate(diagram, [first(diagram.nodes())], 10, 10))
+    # THEN
+    assert catalogue.entry('diagram').stale
+    assert catalogue.entry('diagram').thumbnail is thumbnail
+    assert catalogue.refresh('diagram').thumbnail is not thumbnail
+    assert not catalogue.entry('diagram').stale
+
+
+def test_catalogue_thumbnail_is_refreshed_when_rendering_changes(session):
+    # GIVEN
+    project = session.project
+    catalogue = DiagramCatalogue.forProject(project)
+    session.doRenderByPrefixedIRI()
+    thumbnail = catalogue.refresh('diagram').thumbnail
+    # WHEN
+    session.doRenderByFullIRI()
+    # THEN
+    assert catalogue.entry('diagram').stale
+    assert catalogue.refresh('diagram').thumbnail != thumbnail
+    session.doRenderByPrefixedIRI()
+
+
+def test_catalogue_is_persisted_with_the_project(session, tmpdir):
+    # GIVEN
+    project = session.project
+    catalogue = DiagramCatalogue.forProject(project)
+    entry = catalogue.refresh('diagram')
+    savePath = tmpdir.join('catalogue.graphol')
+    # WHEN
+    GrapholIRIProjectExporter(project, session, str(savePath)).run()
+    document = QtXml.QDomDocument()
+    document.setContent(savePath.read())
+    element = document.documentElement().firstChildElement('project').firstChildElement('diagrams').firstChildElement('diagram')
+    while element.attribute('name') != 'diagram':
+        element = element.nextSiblingElement('diagram')
+    loaded = catalogue.fromDomElement('loaded', element.firstChildElement('catalogue'))
+    # THEN
+    assert loaded.name == 'loaded'
+    assert not loaded.hasDiagram()
+    assert (loaded.nodes, loaded.edges) == (entry.nodes, entry.edges)
+    assert loaded.bounds == entry.bounds
+    assert loaded.thumbnail.size() == entry.thumbnail.size()
+    assert not loaded.stale
+
+
+def test_project_explorer_indexes_diagram_rows(session):
+    # GIVEN
+    project = session.project
+    diagram = project.diagram('diagram')
+    widget = session.plugin('project_explorer').widget('project_explorer')
+    # THEN
+    assert set(widget.items) == {d.name for d in project.diagrams()}
+    assert widget.findItem('diagram').data() is diagram
+    assert '{0} nodes'.format(len(project.nodes(diagram))) in widget.diagramToolTip(diagram)
+    assert '<img src="data:image/png;base64,' in widget.diagramToolTip(diagram)
+    # WHEN
+    widget.doRemoveDiagram(diagram)
+    # THEN
+    assert widget.findItem('diagram') is None
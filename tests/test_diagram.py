@@ -37,6 +37,7 @@ import pytest
 
 from PyQt5 import QtCore
 
+from eddy.core.commands.common import CommandItemsRemove
 from eddy.core.datatypes.graphol import Item
 from eddy.core.datatypes.misc import DiagramMode
 from eddy.core.datatypes.qt import Font
@@ -555,3 +556,129 @@ class TestDiagram:
         assert pos3 == node3.textPos()
         assert pos4 == node4.textPos()
 
+
+    #############################################
+    #   TRANSACTIONS
+    #################################
+
+    def test_items_remove_delivers_single_change_set(self, session):
+        # GIVEN
+        project = session.project
+        diagram = session.mdi.activeDiagram()
+        items = project.items(diagram)
+        changesets = []
+        updates = []
+        project.sgnItemsChanged.connect(changesets.append)
+        project.sgnUpdated.connect(lambda: updates.append(True))
+        # WHEN
+        session.undostack.push(CommandItemsRemove(diagram, items))
+        # THEN
+        assert len(changesets) == 1
+        assert len(updates) == 1
+        assert changesets[0].removed[diagram] == items
+        assert not project.items(diagram)
+        assert not project.isInTransaction()
+        # WHEN
+        session.undostack.undo()
+        # THEN
+        assert len(changesets) == 2
+        assert changesets[1].added[diagram] == items
+        assert project.items(diagram) == items
+
+    def test_nested_transactions_are_committed_by_outermost(self, session):
+        # GIVEN
+        project = session.project
+        diagram = session.mdi.activeDiagram()
+        node = first(diagram.nodes())
+        changesets = []
+        project.sgnItemsChanged.connect(changesets.append)
+        # WHEN
+        with diagram.transaction():
+            with diagram.transaction():
+                diagram.removeItem(node)
+                diagram.sgnItemRemoved.emit(diagram, node)
+            assert not changesets
+            diagram.addItem(node)
+            diagram.sgnItemAdded.emit(diagram, node)
+        # THEN
+        assert len(changesets) == 1
+        assert not any(changesets[0].added.values())
+        assert not any(changesets[0].removed.values())
+        assert changesets[0].modified[diagram] == {node}
+
+    #############################################
+    #   PROJECT INDEX
+    #################################
+
+    def test_project_wide_views_follow_item_removal(self, session):
+        # GIVEN
+        project = session.project
+        diagram = session.mdi.activeDiagram()
+        items = project.items(diagram)
+        nodes = {item for item in items if item.isNode()}
+        edges = {item for item in items if item.isEdge()}
+        concepts = {item for item in nodes if item.type() is Item.ConceptNode}
+        numItems = len(project.items())
+        numConcepts = project.itemNum(Item.ConceptNode)
+        view = project.items()
+        # WHEN
+        session.undostack.push(CommandItemsRemove(diagram, items))
+        # THEN
+        assert not items & view
+        assert len(project.items()) == numItems - len(items)
+        assert not nodes & project.nodes()
+        assert not edges & project.edges()
+        assert project.itemNum(Item.ConceptNode) == numConcepts - len(concepts)
+        assert set(project.items()) == set.union(set(), *(project.items(d) for d in project.diagrams()))
+        # WHEN
+        session.undostack.undo()
+        # THEN
+        assert len(project.items()) == numItems
+        assert nodes <= project.nodes()
+        assert edges <= project.edges()
+        assert project.itemNum(Item.ConceptNode) == numConcepts
+        assert {node.iri for node in concepts} <= project.itemIRIs(Item.ConceptNode)
+
+    #############################################
+    #   SELECTION
+    #################################
+
+    def test_selection_summary_follows_item_selection(self, session):
+        # GIVEN
+        project = session.project
+        diagram = session.mdi.activeDiagram()
+        iri = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/hasParent')
+        node = first(project.iriOccurrences(Item.RoleNode, iri, diagram))
+        edge = first(node.edges)
+        diagram.clearSelection()
+        assert len(diagram.selection) == 0
+        # WHEN
+        node.setSelected(True)
+        edge.setSelected(True)
+        # THEN
+        assert set(diagram.selection.nodes) == set(diagram.selectedNodes())
+        assert set(diagram.selection.edges) == set(diagram.selectedEdges())
+        assert diagram.selection.count(Item.RoleNode) == 1
+        assert diagram.selection.count(edge.type()) == 1
+        # WHEN
+        session.undostack.push(CommandItemsRemove(diagram, {node} | node.edges))
+        # THEN
+        assert node not in diagram.selection.nodes
+        assert edge not in diagram.selection.edges
+        assert diagram.selection.count(Item.RoleNode) == 0
+
+    def test_action_state_is_updated_once_per_event_loop_iteration(self, session, qtbot):
+        # GIVEN
+        diagram = session.mdi.activeDiagram()
+        diagram.clearSelection()
+        session.doUpdateState()
+        updates = []
+        session.stateTimer.timeout.connect(lambda: updates.append(True))
+        # WHEN
+        for node in diagram.nodes():
+            node.setSelected(True)
+        # THEN
+        assert session.stateTimer.isActive()
+        assert not session.action('delete').isEnabled()
+        qtbot.waitUntil(lambda: session.action('delete').isEnabled())
+        assert len(updates) == 1
@@ -33,13 +33,20 @@
 ##########################################################################
 
 
+import csv as csvmodule
 import os
 import pytest
+import threading
+import time
+from xml.etree import ElementTree
 
+from PyQt5 import QtGui
 from PyQt5 import QtPrintSupport
 
+from eddy.core.commands.common import CommandItemsRemove, CommandItemsTranslate
 from eddy.core.datatypes.graphol import Item
 from eddy.core.datatypes.owl import OWLSyntax, OWLAxiom
+from eddy.core.datatypes.qt import Font
 from eddy.core.datatypes.system import File
 from eddy.core.exporters.graphml import GraphMLDiagramExporter
 from eddy.core.exporters.graphol_iri import GrapholIRIProjectExporter
@@ -47,10 +54,22 @@ from eddy.core.exporters.graphreferences import GraphReferencesProjectExporter
 from eddy.core.exporters.image import BmpDiagramExporter
 from eddy.core.exporters.image import JpegDiagramExporter
 from eddy.core.exporters.image import PngDiagramExporter
+from eddy.core.exporters.image import TiffDiagramExporter
+from eddy.core.exporters import owl2_analysis
+from eddy.core.exporters.common import DiagramRenderCache
+from eddy.core.exporters.orchestrator import ExportOrchestrator, ExportProfile
+from eddy.core.exporters.owl2 import OWLOntologyExportState
 from eddy.core.exporters.owl2 import OWLOntologyExporterWorker
+from eddy.core.exporters.owl2 import OWLOntologyIncrementalExporterWorker
+from eddy.core.exporters.owl2 import OWLOntologyWatcher
+from eddy.core.exporters.owl2_analysis import snapshot
 from eddy.core.exporters.pdf import PdfDiagramExporter, PdfProjectExporter
+from eddy.core.exporters.svg import SvgDiagramExporter, SvgProjectExporter
 from eddy.core.functions.fsystem import fread
+from eddy.core.functions.misc import first
 from eddy.core.functions.path import expandPath
+from eddy.core.worker import FunctionWorker, WorkerPool
+from eddy.ui.progress import BusyProgressDialog
 from eddy.ui.session import Session
 
 
@@ -106,6 +125,30 @@ def test_export_project_to_csv(session, qtbot, tmpdir):
     assert os.path.isfile(str(csv))
 
 
+def test_export_project_to_csv_streams_rows_sorted_by_resource(session, qtbot, tmpdir):
+    # GIVEN
+    path = tmpdir.join('project.csv')
+    project = session.project
+    with qtbot.waitSignal(session.sgnDiagramFocused):
+        session.sgnFocusDiagram.emit(project.diagram('diagram'))
+    # WHEN
+    exporter = session.projectExporter(File.Csv)
+    worker = exporter(project, session,
+                      diagrams=project.diagrams(),
+                      annotations=project.annotationProperties,
+                      items={Item.ConceptNode, Item.RoleNode,
+                             Item.AttributeNode, Item.IndividualNode},
+                      includeEntitiesWithoutAnnotations=True)
+    worker.run(str(path))
+    # THEN
+    with open(str(path), newline='', encoding='utf8') as f:
+        rows = list(csvmodule.reader(f))
+    assert rows[0] == worker.metadataHeader()
+    assert len(rows) > 1
+    assert [row[0] for row in rows[1:]] == sorted(row[0] for row in rows[1:])
+    assert rows[1:] == [list(map(str, row.values())) for row in worker.metadata()]
+
+
 #############################################
 #   XLSX EXPORT
 #################################
@@ -171,6 +214,45 @@ def test_export_diagram_to_png(session, qtbot, tmpdir):
     assert os.path.isfile(str(image))
 
 
+def test_export_diagram_to_png_in_strips(session, qtbot, tmpdir):
+    # GIVEN
+    image = tmpdir.join('diagram.png')
+    project = session.project
+    with qtbot.waitSignal(session.sgnDiagramFocused):
+        session.sgnFocusDiagram.emit(project.diagram('diagram'))
+    diagram = session.mdi.activeDiagram()
+    shape = diagram.visibleRect(margin=20).toAlignedRect()
+    # WHEN
+    worker = PngDiagramExporter(diagram, session)
+    worker.dpi = 192
+    worker.budget = shape.width() * 2 * 7 * 16
+    worker.run(str(image))
+    # THEN
+    result = QtGui.QImage(str(image))
+    assert not result.isNull()
+    assert result.width() == shape.width() * 2
+    assert result.height() == shape.height() * 2
+    assert round(result.dotsPerMeterX() * 0.0254) == 192
+
+
+def test_export_diagram_to_tiff(session, qtbot, tmpdir):
+    # GIVEN
+    image = tmpdir.join('diagram.tif')
+    project = session.project
+    with qtbot.waitSignal(session.sgnDiagramFocused):
+        session.sgnFocusDiagram.emit(project.diagram('diagram'))
+    diagram = session.mdi.activeDiagram()
+    shape = diagram.visibleRect(margin=20).toAlignedRect()
+    # WHEN
+    worker = TiffDiagramExporter(diagram, session)
+    worker.budget = shape.width() * 7 * 16
+    worker.run(str(image))
+    # THEN
+    assert os.path.isfile(str(image))
+    with open(str(image), 'rb') as f:
+        assert f.read(4) == b'II*\x00'
+
+
 #############################################
 #   GRAPHML EXPORT
 #################################
@@ -193,7 +275,6 @@ def test_export_diagram_to_graphml(session, qtbot, tmpdir):
 #   GRAPH REFERENCES EXPORT
 #################################
 
-@pytest.mark.skip(reason='graphreferences export is currently broken')
 def test_export_project_to_graphreferences(session, qtbot, tmpdir):
     # GIVEN
     xml = tmpdir.join('project.xml')
@@ -205,6 +286,24 @@ def test_export_project_to_graphreferences(session, qtbot, tmpdir):
     worker.run(str(xml))
     # THEN
     assert os.path.isfile(str(xml))
+    root = ElementTree.parse(str(xml)).getroot()
+    assert root.tag == 'graphReferences'
+    assert len(root) == len([n for n in project.nodes() if n.isMeta()])
+    for element in root:
+        assert element.tag in {'concept', 'role', 'attribute', 'individual'}
+        assert project.diagram(element.find('diagramName').text)
+
+
+def test_export_project_to_graphreferences_reports_progress(session, qtbot, tmpdir):
+    # GIVEN
+    xml = tmpdir.join('project.xml')
+    project = session.project
+    # WHEN
+    with BusyProgressDialog(parent=session) as progress:
+        GraphReferencesProjectExporter(project, session).run(str(xml))
+        # THEN
+        assert progress.progressBar.maximum() == len(project.diagrams())
+        assert progress.progressBar.value() == len(project.diagrams())
 
 
 #############################################
@@ -240,10 +339,241 @@ def test_export_project_to_pdf(session, qtbot, tmpdir):
     assert os.path.isfile(str(pdffile))
 
 
+def test_export_project_to_pdf_reuses_unchanged_pages(session, qtbot, tmpdir):
+    # GIVEN
+    project = session.project
+    diagram = project.diagram('diagram')
+    with qtbot.waitSignal(session.sgnDiagramFocused):
+        session.sgnFocusDiagram.emit(diagram)
+    worker = PdfProjectExporter(project, session,
+                                pageSize=QtPrintSupport.QPrinter.A3,
+                                diagrams=project.diagrams(),
+                                includeTables=False)
+    worker.run(str(tmpdir.join('project1.pdf')))
+    cache = DiagramRenderCache.forSession(session)
+    page = cache.pictures.get(diagram)
+    # WHEN
+    worker.run(str(tmpdir.join('project2.pdf')))
+    # THEN
+    assert page is not None
+    assert cache.pictures.get(diagram) is page
+    assert os.path.isfile(str(tmpdir.join('project2.pdf')))
+    # WHEN
+    node = first(diagram.nodes())
+    session.undostack.push(CommandItemsTranslate(diagram, [node], 10, 10))
+    # THEN
+    assert cache.pictures.get(diagram) is None
+
+
+def test_render_cache_is_shared_by_diagram_exporters(session, tmpdir):
+    # GIVEN
+    diagram = session.project.diagram('diagram')
+    cache = DiagramRenderCache.forSession(session)
+    PdfDiagramExporter(diagram, session).run(str(tmpdir.join('diagram.pdf')))
+    page = cache.pictures.get(diagram)
+    # WHEN
+    PngDiagramExporter(diagram, session).run(str(tmpdir.join('diagram.png')))
+    # THEN
+    assert page is not None
+    assert cache.pictures.get(diagram) is page
+    assert os.path.isfile(str(tmpdir.join('diagram.png')))
+    # WHEN
+    session.undostack.push(CommandItemsRemove(diagram, {first(diagram.edges())}))
+    # THEN
+    assert cache.pictures.get(diagram) is None
+
+
+def test_render_cache_is_invalidated_by_rendering_changes(session):
+    # GIVEN
+    diagram = session.project.diagram('diagram')
+    cache = DiagramRenderCache.forSession(session)
+    session.doRenderByPrefixedIRI()
+    picture, _ = DiagramRenderCache.get(diagram, session)
+    # WHEN
+    session.doRenderByFullIRI()
+    # THEN
+    assert cache.pictures.get(diagram) is None
+    assert DiagramRenderCache.get(diagram, session)[0].data() != picture.data()
+    # WHEN
+    picture, _ = DiagramRenderCache.get(diagram, session)
+    diagram.setFont(Font(font=diagram.font(), pixelSize=diagram.font().pixelSize() + 4))
+    # THEN
+    assert cache.pictures.get(diagram) is None
+    assert DiagramRenderCache.get(diagram, session)[0].data() != picture.data()
+    session.doRenderByPrefixedIRI()
+
+
+#############################################
+#   SVG EXPORT
+#################################
+
+def test_export_diagram_to_svg(session, tmpdir):
+    # GIVEN
+    svgfile = tmpdir.join('diagram.svg')
+    diagram = session.project.diagram('diagram')
+    # WHEN
+    worker = SvgDiagramExporter(diagram, session)
+    worker.run(str(svgfile))
+    # THEN
+    assert os.path.isfile(str(svgfile))
+    root = ElementTree.parse(str(svgfile)).getroot()
+    assert root.tag == '{http://www.w3.org/2000/svg}svg'
+    texts = {''.join(e.itertext()).strip() for e in root.iter('{http://www.w3.org/2000/svg}text')}
+    assert any(node.text() in texts for node in diagram.nodes() if node.type() is Item.ConceptNode)
+
+
+def test_export_project_to_svg(session, tmpdir):
+    # GIVEN
+    project = session.project
+    # WHEN
+    worker = SvgProjectExporter(project, session)
+    worker.run(str(tmpdir.join('svg')))
+    # THEN
+    for diagram in project.diagrams():
+        if diagram.items():
+            assert os.path.isfile(str(tmpdir.join('svg', '{0}.svg'.format(diagram.name))))
+
+
+#############################################
+#   EXPORT PROFILES
+#################################
+
+def test_export_profile_roundtrip(tmpdir):
+    # GIVEN
+    profile = ExportProfile('release', [File.Csv, File.Png], ['diagram'], {File.Png: {'dpi': 300}})
+    # WHEN
+    profile.save(str(tmpdir.join('profile.json')))
+    loaded = ExportProfile.load(str(tmpdir.join('profile.json')))
+    # THEN
+    assert loaded.name == 'release'
+    assert loaded.formats == [File.Csv, File.Png]
+    assert loaded.diagrams == ['diagram']
+    assert loaded.optionsFor(File.Png) == {'dpi': 300}
+    with pytest.raises(ValueError):
+        ExportProfile.fromDict({'name': 'broken', 'formats': ['Doc']})
+
+
+def test_export_profile_runs_all_exports(session, tmpdir):
+    # GIVEN
+    project = session.project
+    profile = ExportProfile('bundle', [File.Csv, File.Png, File.Svg, File.GraphReferences], ['diagram'])
+    orchestrator = ExportOrchestrator(project, profile, session, maxThreadCount=2)
+    progress = []
+    orchestrator.sgnProgress.connect(lambda completed, total: progress.append((completed, total)))
+    # WHEN
+    failures = orchestrator.run(str(tmpdir.join('bundle')))
+    # THEN
+    assert failures == []
+    assert progress[-1] == (4, 4)
+    assert os.path.isfile(str(tmpdir.join('bundle', '{0}.csv'.format(project.name))))
+    assert os.path.isfile(str(tmpdir.join('bundle', '{0}.xml'.format(project.name))))
+    assert os.path.isfile(str(tmpdir.join('bundle', '{0}_diagram.png'.format(project.name))))
+    assert os.path.isfile(str(tmpdir.join('bundle', '{0}_diagram.svg'.format(project.name))))
+
+
+def test_worker_pool_runs_exclusive_workers_one_at_a_time(qapp):
+    # GIVEN
+    class ExclusiveWorker(FunctionWorker):
+        pass
+    lock = threading.Lock()
+    running = []
+    peak = []
+    def job():
+        with lock:
+            running.append(None)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+    workers = [ExclusiveWorker(job) for _ in range(3)] + [FunctionWorker(time.sleep, 0.05)]
+    pool = WorkerPool(maxThreadCount=4, exclusive=(ExclusiveWorker,))
+    finished = []
+    pool.sgnWorkerFinished.connect(finished.append)
+    # WHEN
+    pool.run(workers)
+    # THEN
+    assert len(finished) == len(workers)
+    assert all(worker.error is None for worker in workers)
+    assert peak == [1, 1, 1]
+
+
 #############################################
 #   OWL EXPORT
 #################################
 
+def test_owl_axioms_analysis_is_independent_of_parallelism(session, monkeypatch):
+    # GIVEN
+    diagram = session.project.diagram('diagram')
+    snapshots = [snapshot(diagram), snapshot(diagram)]
+    # WHEN
+    sequential = owl2_analysis.analyseAll(snapshots, workers=1)
+    monkeypatch.setattr(owl2_analysis, 'ParallelThreshold', 0)
+    parallel = owl2_analysis.analyseAll(snapshots, workers=2)
+    # THEN
+    assert sequential == parallel
+    assert sequential[0] == sequential[1]
+    assert len(sequential[0].nodes) == len(diagram.nodes())
+    assert len(sequential[0].edges) == len(diagram.edges())
+    assert any(methods for _, methods in sequential[0].nodes)
+    assert all(error is None for _, _, error in sequential[0].edges)
+
+
+def test_export_project_to_owl_incrementally(session, tmpdir):
+    # GIVEN
+    owlfile = tmpdir.join('test_project_3_1.owl')
+    project = session.project
+    state = OWLOntologyExportState()
+    kwargs = dict(axioms={x for x in OWLAxiom}, syntax=OWLSyntax.Functional)
+    worker = OWLOntologyIncrementalExporterWorker(project, str(owlfile), state, **kwargs)
+    worker.run()
+    assert worker.changed
+    assert worker.translated == len(project.nodes()) + len(project.edges())
+    assert os.path.isfile(str(owlfile))
+    # WHEN
+    worker = OWLOntologyIncrementalExporterWorker(project, str(owlfile), state, **kwargs)
+    worker.run()
+    # THEN
+    assert not worker.changed
+    assert worker.translated == 0
+    # WHEN
+    edge = first(e for e in project.edges() if e.type() is Item.InclusionEdge)
+    session.undostack.push(CommandItemsRemove(edge.diagram, {edge}))
+    worker = OWLOntologyIncrementalExporterWorker(project, str(owlfile), state, **kwargs)
+    worker.run()
+    # THEN
+    assert worker.changed
+    assert 2 <= worker.translated < len(project.nodes()) + len(project.edges())
+    assert (edge.diagram, edge.id) not in state.contributions
+
+
+def test_owl_watcher_exports_only_changed_items(session, qtbot, tmpdir):
+    # GIVEN
+    owlfile = tmpdir.join('test_project_3_1.owl')
+    project = session.project
+    watcher = OWLOntologyWatcher(session, str(owlfile), syntax=OWLSyntax.Functional)
+    with qtbot.waitSignal(watcher.sgnExported) as blocker:
+        watcher.doExport()
+    assert blocker.args == [str(owlfile), True]
+    assert not watcher.full
+    assert not watcher.changedItems()
+    # WHEN
+    edge = first(e for e in project.edges() if e.type() is Item.InclusionEdge)
+    session.undostack.push(CommandItemsRemove(edge.diagram, {edge}))
+    # THEN
+    assert (edge.diagram, edge.id) in watcher.removed
+    assert (edge.diagram, edge.source) in watcher.changedItems()
+    assert (edge.diagram, edge.target) in watcher.changedItems()
+    # WHEN
+    with qtbot.waitSignal(watcher.sgnExported) as blocker:
+        watcher.doExport()
+    # THEN
+    assert blocker.args == [str(owlfile), True]
+    assert not watcher.removed
+    assert not watcher.changedItems()
+    assert (edge.diagram, edge.id) not in watcher.state.contributions
+    watcher.stop()
+
+
 def test_export_project_to_owl_without_normalization(session, tmpdir):
     # TODO ADD DATATYPE RESTRICTION WITH FACET TO TEST ONTOLOGY AND VERIFY TRANSLATION
     # WHEN
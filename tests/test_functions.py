@@ -42,7 +42,7 @@ from PyQt5 import QtCore
 from eddy.core.functions.geometry import angle, distance, projection
 from eddy.core.functions.geometry import intersection, midpoint
 from eddy.core.functions.misc import clamp, first, last, lstrip, natsorted, rstrip
-from eddy.core.functions.misc import isEmpty, rangeF, snapF
+from eddy.core.functions.misc import format_size, isEmpty, rangeF, snapF
 from eddy.core.functions.owl import OWLText, OWLShortIRI
 from eddy.core.functions.path import compressPath
 
@@ -95,6 +95,14 @@ def test_first():
     assert first([]) is None
 
 
+def test_format_size():
+    assert '0 B' == format_size(0)
+    assert '512 B' == format_size(512)
+    assert '1.5 KB' == format_size(1536)
+    assert '256.0 MB' == format_size(256 * 1024 * 1024)
+    assert '2048.0 GB' == format_size(2 * 1024 ** 4)
+
+
 def test_last():
     assert 3 == last([5, 7, 9, 11, 97, 4, 7, 3])
     assert 3 == last((5, 7, 9, 11, 97, 4, 7, 3))
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+import pytest
+
+from eddy.core.datatypes.graphol import Item
+from eddy.core.datatypes.misc import Direction
+from eddy.core.functions.graph import bfs, dfs
+from eddy.core.functions.misc import first
+from eddy.core.functions.path import expandPath
+from eddy.core.graph import GraphSnapshot
+from eddy.ui.session import Session
+
+
+@pytest.fixture
+def session(qapp, qtbot, logging_disabled):
+    """
+    Provide an initialized Session instance.
+    """
+    with logging_disabled:
+        session = Session(qapp, expandPath('@tests/test_project_3/test_project_3_1.graphol'))
+        session.show()
+    qtbot.addWidget(session)
+    qtbot.waitExposed(session, timeout=3000)
+    with qtbot.waitSignal(session.sgnDiagramFocused):
+        session.sgnFocusDiagram.emit(session.project.diagram('diagram'))
+    yield session
+
+
+@pytest.fixture
+def snapshot():
+    """
+    Provide a small snapshot: a -> b -> c -> a (c -> a being an equivalence), a -> d, and the isolated node e.
+    """
+    nodes = [(key, Item.ConceptNode) for key in 'abcde']
+    edges = [
+        ('e1', 'a', 'b', Item.InclusionEdge),
+        ('e2', 'b', 'c', Item.InclusionEdge),
+        ('e3', 'c', 'a', Item.EquivalenceEdge),
+        ('e4', 'a', 'd', Item.InclusionEdge),
+    ]
+    return GraphSnapshot(nodes, edges)
+
+
+#############################################
+#   LIVE ITEMS TRAVERSAL
+#################################
+
+def test_bfs_and_dfs_return_ordered_nodes_once(session):
+    # GIVEN
+    project = session.project
+    diagram = session.mdi.activeDiagram()
+    iri = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/hasParent')
+    node = first(project.iriOccurrences(Item.RoleNode, iri, diagram))
+    # WHEN
+    visited1 = bfs(source=node)
+    visited2 = dfs(source=node)
+    # THEN
+    assert isinstance(visited2, list)
+    assert visited1[0] is node
+    assert visited2[0] is node
+    assert len(visited1) == len(set(visited1))
+    assert len(visited2) == len(set(visited2))
+    assert set(visited1) == set(visited2)
+
+
+#############################################
+#   SNAPSHOT
+#################################
+
+def test_snapshot_from_diagram(session):
+    # GIVEN
+    diagram = session.mdi.activeDiagram()
+    # WHEN
+    graph = GraphSnapshot.fromDiagram(diagram)
+    # THEN
+    assert len(graph) == len(diagram.nodes())
+    assert len(graph.edgeKeys) == len(diagram.edges())
+    for edge in diagram.edges():
+        i = graph.edgeIndex[edge.id]
+        assert graph.nodeKeys[graph.sources[i]] == edge.source.id
+        assert graph.nodeKeys[graph.targets[i]] == edge.target.id
+        assert graph.edgeTypes[i] == edge.type()
+
+
+def test_snapshot_traversals(snapshot):
+    a, b, c, d, e = range(5)
+    assert snapshot.bfs(a) == [a, b, d, c]
+    assert snapshot.dfs(a) == [a, b, c, d]
+    assert snapshot.bfs(d, direction=Direction.Incoming) == [d, a, c, b]
+    assert snapshot.bfs(a, types={Item.EquivalenceEdge}) == [a]
+    assert sorted(map(sorted, snapshot.components())) == [[a, b, c, d], [e]]
+
+
+def test_snapshot_shortest_path(snapshot):
+    a, b, c, d, e = range(5)
+    assert snapshot.shortestPath(a, c) == [a, b, c]
+    assert snapshot.shortestPath(c, d) == [c, a, d]
+    assert snapshot.shortestPath(d, a) is None
+    assert snapshot.shortestPath(d, a, direction=Direction.Both) == [d, a]
+    assert snapshot.shortestPath(a, e, direction=Direction.Both) is None
+
+
+def test_snapshot_cycles(snapshot):
+    a, b, c, d, e = range(5)
+    assert snapshot.findCycle() == [a, b, c]
+    assert snapshot.hasCycle()
+    assert not snapshot.hasCycle(types={Item.InclusionEdge})
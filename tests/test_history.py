@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+import pytest
+
+from PyQt5 import QtWidgets
+
+from eddy.core import history
+from eddy.core.history import (
+    UndoEntry,
+    UndoStack,
+)
+
+
+class CommandAppend(QtWidgets.QUndoCommand):
+    """
+    Test command appending a value to a list.
+    """
+    def __init__(self, values, value, merge=False):
+        super().__init__('append {0}'.format(value))
+        self.values = values
+        self.value = value
+        self.payload = [value] * 1000
+        self.merge = merge
+
+    def redo(self):
+        self.values.append(self.value)
+
+    def undo(self):
+        self.values.remove(self.value)
+
+    def id(self):
+        return 1 if self.merge else -1
+
+    def mergeWith(self, command):
+        self.values.remove(self.value)
+        self.value = command.value
+        return True
+
+
+@pytest.fixture
+def stack(qapp):
+    """
+    Provide an empty undo stack.
+    """
+    stack = UndoStack(qapp)
+    yield stack
+    stack.clear()
+
+
+#############################################
+# UNDO HISTORY TESTS
+#################################
+
+def test_history_limit_deletes_oldest_commands(stack):
+    # GIVEN
+    values = []
+    stack.setLimit(3)
+    # WHEN
+    for i in range(5):
+        stack.push(CommandAppend(values, i))
+    # THEN
+    assert values == [0, 1, 2, 3, 4]
+    assert stack.count() == 3
+    assert len(stack.sizes) == 3
+    assert all(vars(stack.command(i)) for i in range(stack.count()))
+    # WHEN
+    for _ in range(5):
+        stack.undo()
+    # THEN
+    assert values == [0, 1]
+    assert stack.index() == 0
+    assert not stack.canUndo()
+
+
+def test_history_budget_bounds_footprint(stack):
+    # GIVEN
+    values = []
+    stack.push(CommandAppend(values, 0))
+    size = stack.footprint()
+    stack.setBudget(size * 3 + size // 2)
+    # WHEN
+    for i in range(1, 20):
+        stack.push(CommandAppend(values, i))
+    # THEN
+    assert 0 < stack.footprint() <= size * 3 + size // 2
+    assert 0 < stack.count() <= 3
+    assert len(stack.sizes) == stack.count()
+    assert all(vars(stack.command(i)) for i in range(stack.count()))
+
+
+def test_history_budget_keeps_most_recent_commands(stack):
+    # GIVEN
+    values = []
+    stack.push(CommandAppend(values, 0))
+    size = stack.footprint()
+    stack.setBudget(size * 3 + size // 2)
+    # WHEN
+    for i in range(1, 10):
+        stack.push(CommandAppend(values, i))
+    # THEN
+    assert stack.count() == 3
+    assert stack.index() == 3
+    assert stack.undoText() == 'append 9'
+    # WHEN
+    for _ in range(5):
+        stack.undo()
+    # THEN
+    assert values == [0, 1, 2, 3, 4, 5, 6]
+    assert not stack.canUndo()
+    # WHEN
+    for _ in range(3):
+        stack.redo()
+    # THEN
+    assert values == list(range(10))
+
+
+def test_history_lowered_limit_keeps_redo_history(stack):
+    # GIVEN
+    values = []
+    for i in range(6):
+        stack.push(CommandAppend(values, i))
+    stack.undo()
+    # WHEN
+    stack.setLimit(3)
+    # THEN
+    assert stack.count() == 3
+    assert stack.index() == 2
+    assert values == [0, 1, 2, 3, 4]
+    # WHEN
+    stack.redo()
+    stack.undo()
+    stack.undo()
+    stack.undo()
+    # THEN
+    assert values == [0, 1, 2]
+    assert not stack.canUndo()
+
+
+def test_history_trim_retains_modified_state(stack):
+    # GIVEN
+    values = []
+    stack.push(CommandAppend(values, 0))
+    stack.setClean()
+    for i in range(1, 4):
+        stack.push(CommandAppend(values, i))
+    # WHEN
+    stack.setLimit(2)
+    # THEN
+    assert stack.count() == 2
+    assert not stack.isClean()
+    # WHEN
+    stack.undo()
+    stack.undo()
+    # THEN
+    assert values == [0, 1]
+    assert not stack.isClean()
+    # WHEN
+    stack.setClean()
+    # THEN
+    assert stack.isClean()
+
+
+def test_history_trim_restores_clean_state(stack):
+    # GIVEN
+    values = []
+    for i in range(3):
+        stack.push(CommandAppend(values, i))
+    stack.setClean()
+    stack.push(CommandAppend(values, 3))
+    # WHEN
+    stack.setLimit(2)
+    # THEN
+    assert not stack.isClean()
+    # WHEN
+    stack.undo()
+    # THEN
+    assert stack.isClean()
+    assert values == [0, 1, 2]
+
+
+def test_history_merges_consecutive_commands(stack):
+    # GIVEN
+    values = []
+    # WHEN
+    stack.push(CommandAppend(values, 0, merge=True))
+    stack.push(CommandAppend(values, 1, merge=True))
+    stack.push(CommandAppend(values, 2, merge=True))
+    # THEN
+    assert stack.count() == 1
+    assert values == [2]
+    # WHEN
+    stack.undo()
+    # THEN
+    assert values == []
+
+
+def test_history_does_not_merge_separate_interactions(stack, monkeypatch):
+    # GIVEN
+    values = []
+    clock = [0.0]
+    monkeypatch.setattr(history.time, 'monotonic', lambda: clock[0])
+    # WHEN
+    stack.push(CommandAppend(values, 0, merge=True))
+    clock[0] += UndoEntry.MergeInterval / 2
+    stack.push(CommandAppend(values, 1, merge=True))
+    clock[0] += UndoEntry.MergeInterval * 2
+    stack.push(CommandAppend(values, 2, merge=True))
+    # THEN
+    assert stack.count() == 2
+    assert values == [1, 2]
+    # WHEN
+    stack.undo()
+    # THEN
+    assert values == [1]
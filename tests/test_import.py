@@ -34,9 +34,11 @@
 
 
 import pytest
+from PyQt5 import QtCore
 from PyQt5 import QtWidgets
 
 from eddy.core.datatypes.graphol import Item
+from eddy.core.exporters.graphol_iri import GrapholIRIProjectExporter
 from eddy.core.functions.fsystem import cpdir, fcopy
 from eddy.core.functions.path import expandPath
 from eddy.core.loaders.graphml import GraphMLOntologyLoader
@@ -45,6 +47,9 @@ from eddy.core.loaders.graphol_iri import (
     GrapholIRIProjectLoader_v2,
     GrapholIRIProjectLoader_v3,
 )
+from eddy.core.loaders.graphol_model import parse
+from eddy.core.worker import runInChunks
+from eddy.ui.progress import BusyProgressDialog
 from eddy.ui.session import Session
 
 
@@ -176,6 +181,129 @@ def test_load_project_from_graphol_v3(session, qtbot, tmpdir):
     assert len(list(filter(lambda n: n.type() == Item.IndividualNode, loader.session.project.diagram(diagram2).nodes()))) == 0
 
 
+def test_load_project_from_graphol_v3_lazily(session, qtbot, tmpdir):
+    # GIVEN
+    graphol = tmpdir.mkdir('MovieOntology').join('MovieOntology_v3.graphol')
+    fcopy(expandPath('@tests/test_resources/loaders/graphol/v3/MovieOntology/MovieOntology_v3.graphol'), str(graphol))
+    # WHEN
+    loader = GrapholIRIProjectLoader_v3(str(graphol), session)
+    loader.lazy = True
+    loader.run()
+    project = loader.session.project
+    movie = project.diagram('movie')
+    territory = project.diagram('territory')
+    # THEN
+    assert project.isPending(movie)
+    assert project.isPending(territory)
+    assert not project.index.items()
+    assert not project.isEmpty()
+    assert project.itemNum(Item.ConceptNode, movie) == 65
+    assert project.itemNum(Item.RoleNode, territory) == 2
+    assert project.itemIRIs(Item.ConceptNode, territory)
+    assert all(project.existIriOccurrence(iri) for iri in project.itemIRIs(Item.RoleNode, territory))
+    # WHEN
+    with qtbot.waitSignal(session.sgnDiagramFocused):
+        session.sgnFocusDiagram.emit(movie)
+    # THEN
+    assert not project.isPending(movie)
+    assert project.isPending(territory)
+    assert len(project.index.nodes(movie)) == 347
+    assert len(project.index.edges(movie)) == 433
+    assert project.itemNum(Item.ConceptNode, movie) == 65
+    # WHEN
+    nodes = territory.nodes()
+    # THEN
+    assert not project.isPending(territory)
+    assert len(nodes) == 8
+    assert len(territory.edges()) == 8
+    assert len(list(filter(lambda n: n.type() == Item.ConceptNode, nodes))) == 2
+
+
+def test_save_project_with_pending_diagrams(session, qtbot, tmpdir):
+    # GIVEN
+    graphol = tmpdir.mkdir('MovieOntology').join('MovieOntology_v3.graphol')
+    fcopy(expandPath('@tests/test_resources/loaders/graphol/v3/MovieOntology/MovieOntology_v3.graphol'), str(graphol))
+    loader = GrapholIRIProjectLoader_v3(str(graphol), session)
+    loader.lazy = True
+    loader.run()
+    project = loader.session.project
+    # WHEN
+    GrapholIRIProjectExporter(project, session, str(graphol)).run()
+    # THEN
+    assert all(project.isPending(diagram) for diagram in project.diagrams())
+    # WHEN
+    loader = GrapholIRIProjectLoader_v3(str(graphol), session)
+    loader.run()
+    # THEN
+    territory = loader.session.project.diagram('territory')
+    assert not loader.session.project.isPending(territory)
+    assert len(territory.nodes()) == 8
+    assert len(territory.edges()) == 8
+
+
+def test_parse_project_from_graphol_v3():
+    # WHEN
+    model = parse(expandPath('@tests/test_resources/loaders/graphol/v3/MovieOntology/MovieOntology_v3.graphol'))
+    # THEN
+    diagrams = {record.name: record for record in model.diagrams}
+    assert len(diagrams['movie'].nodes) == 347
+    assert len(diagrams['movie'].edges) == 433
+    assert len([r for r in diagrams['movie'].nodes if r.type is Item.ConceptNode]) == 65
+    assert all(r.iri for r in diagrams['movie'].nodes if r.type is Item.RoleNode)
+    assert diagrams['territory'].itemNum() == 16
+    assert model.itemNum() == sum(record.itemNum() for record in model.diagrams)
+    assert model.iris
+    assert not {r.value for r in model.iris} & model.datatypes
+
+
+def test_load_project_from_graphol_v3_reports_progress(session, qtbot, tmpdir):
+    # GIVEN
+    graphol = tmpdir.mkdir('MovieOntology').join('MovieOntology_v3.graphol')
+    fcopy(expandPath('@tests/test_resources/loaders/graphol/v3/MovieOntology/MovieOntology_v3.graphol'), str(graphol))
+    loader = GrapholIRIProjectLoader_v3(str(graphol), session)
+    # WHEN
+    with BusyProgressDialog(mtime=0, modal=True) as progress:
+        loader.run()
+    # THEN
+    assert progress.progressBar.maximum() == loader.stepNum()
+    assert progress.progressBar.value() == progress.progressBar.maximum()
+    assert loader.renderNum == len(loader.nproject.items())
+    assert len(loader.session.project.diagram('movie').nodes()) == 347
+    assert BusyProgressDialog.current() is None
+
+
+def test_busy_progress_dialog_cannot_be_dismissed_while_running(session, qtbot):
+    # GIVEN
+    progress = BusyProgressDialog(mtime=0, parent=session, modal=True)
+    # WHEN
+    with progress:
+        qtbot.keyClick(progress, QtCore.Qt.Key_Escape)
+        progress.close()
+        progress.reject()
+        # THEN
+        assert progress.isVisible()
+    # THEN
+    assert not progress.isVisible()
+
+
+def test_run_in_chunks():
+    # GIVEN
+    values = []
+    # WHEN
+    runInChunks(iter(range(1, 1001)), budget=1, callback=values.append)
+    # THEN
+    assert values
+    assert values[-1] == 1000
+    assert values == sorted(values)
+    # WHEN
+    def steps():
+        yield 1
+        raise ValueError('failed step')
+    # THEN
+    with pytest.raises(ValueError):
+        runInChunks(steps())
+
+
 #############################################
 #   GRAPHML IMPORT
 #################################
@@ -220,3 +348,42 @@ def test_load_ontology_from_graphml_2(session, qtbot):
     assert len(list(filter(lambda n: n.type() == Item.RoleNode, project.diagram(diagram).nodes()))) == 60
     assert len(list(filter(lambda n: n.type() == Item.AttributeNode, project.diagram(diagram).nodes()))) == 27
     assert len(list(filter(lambda n: n.type() == Item.IndividualNode, project.diagram(diagram).nodes()))) == 0
+
+
+def test_load_ontology_from_graphml_collects_warnings(session, tmpdir):
+    # GIVEN
+    graphml = tmpdir.join('broken.graphml')
+    graphml.write('''<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns" xmlns:y="http://www.yworks.com/xml/graphml">
+  <key for="node" id="d0" yfiles.type="nodegraphics"/>
+  <key for="edge" id="d1" yfiles.type="edgegraphics"/>
+  <graph edgedefault="directed" id="G">
+    <node id="n0">
+      <data key="d0">
+        <y:GenericNode configuration="com.yworks.unknown"/>
+      </data>
+    </node>
+    <hyperedge id="h0"/>
+    <edge id="e0" source="n0" target="n1">
+      <data key="d1">
+        <y:PolyLineEdge>
+          <y:LineStyle type="line"/>
+        </y:PolyLineEdge>
+      </data>
+    </edge>
+    <node id="n1">
+''')
+    # WHEN
+    loader = GraphMLOntologyLoader(str(graphml), session.project, session)
+    loader.createProject()
+    loader.createDiagram()
+    # THEN
+    assert len(loader.diagram.items()) == 0
+    assert [(tag, id) for _, tag, id, _ in loader.warnings] == [
+        ('node', 'n0'),
+        ('hyperedge', 'h0'),
+        ('graphml', ''),
+        ('edge', 'e0'),
+    ]
+    assert loader.warnings[0][0] == 6
+    assert loader.warnings[3][0] == 12
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+import pytest
+
+from eddy.core.layout import (
+    ForceDirectedLayout,
+    LayeredLayout,
+    LayoutGraph,
+)
+
+
+def graph(positions, edges):
+    """
+    Build a layout snapshot out of the given node positions and (source, target) edges.
+    """
+    graph = LayoutGraph()
+    for i, pos in enumerate(positions):
+        graph.index['n{0}'.format(i)] = i
+        graph.ids.append('n{0}'.format(i))
+        graph.pos.append(pos)
+        graph.size.append((110, 50))
+    for i, (source, target) in enumerate(edges):
+        graph.edges.append(('e{0}'.format(i), source, target))
+    return graph
+
+
+#############################################
+#   LAYERED LAYOUT
+#################################
+
+def test_layered_layout_places_superclasses_above_subclasses():
+    # GIVEN
+    snapshot = graph([(0, 0)] * 5, [(1, 0), (2, 0), (3, 1), (4, 1), (4, 0)])
+    # WHEN
+    result = LayeredLayout().apply(snapshot)
+    # THEN
+    y = [pos[1] for pos in result.pos]
+    assert y[0] < y[1] < y[3]
+    assert y[1] == y[2]
+    assert len(result.breakpoints['e4']) == 1
+    assert result.bounds()[:2] == snapshot.bounds()[:2]
+
+
+def test_layered_layout_does_not_overlap_nodes_and_tolerates_cycles():
+    # GIVEN
+    snapshot = graph([(0, 0)] * 6, [(0, 1), (1, 2), (2, 0), (3, 2), (4, 2), (5, 2)])
+    # WHEN
+    result = LayeredLayout().apply(snapshot)
+    # THEN
+    rows = {}
+    for (x, y), (w, _) in zip(result.pos, snapshot.size):
+        rows.setdefault(y, []).append((x - w / 2, x + w / 2))
+    for row in rows.values():
+        row.sort()
+        assert all(a[1] <= b[0] for a, b in zip(row, row[1:]))
+
+
+#############################################
+#   FORCE-DIRECTED LAYOUT
+#################################
+
+def test_force_directed_layout_separates_coincident_nodes():
+    # GIVEN
+    snapshot = graph([(100, 100)] * 20, [(i, i + 1) for i in range(19)])
+    # WHEN
+    result = ForceDirectedLayout(iterations=50).apply(snapshot)
+    # THEN
+    assert len(set(result.pos)) == 20
+    assert result.bounds()[:2] == pytest.approx(snapshot.bounds()[:2])
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+"""
+Tests for the ontology explorer plugin.
+"""
+
+import pytest
+
+from PyQt5 import QtCore
+
+from eddy.core.commands.common import CommandItemsRemove
+from eddy.core.datatypes.graphol import Item
+from eddy.core.functions.misc import first
+from eddy.core.functions.path import expandPath
+from eddy.ui.session import Session
+
+
+@pytest.fixture
+def session(qapp, qtbot, logging_disabled):
+    """
+    Provide an initialized Session instance.
+    """
+    with logging_disabled:
+        session = Session(qapp, expandPath('@tests/test_project_3/test_project_3_1.graphol'))
+        session.show()
+    qtbot.addWidget(session)
+    qtbot.waitExposed(session, timeout=3000)
+    yield session
+
+
+#############################################
+#   MODEL TESTS
+#################################
+
+def test_model_lists_project_iris_sorted(session):
+    # GIVEN
+    project = session.project
+    model = session.plugin('ontology_explorer').widget('ontology_explorer').model
+    # WHEN
+    texts = [model.index(row, 0).data() for row in range(model.rowCount())]
+    # THEN
+    assert texts == sorted(texts)
+    for item in (Item.ConceptNode, Item.RoleNode, Item.AttributeNode):
+        for iri in project.itemIRIs(item):
+            assert id(iri) in model.entryForIRI
+
+
+def test_model_fetches_occurrences_lazily(session):
+    # GIVEN
+    project = session.project
+    model = session.plugin('ontology_explorer').widget('ontology_explorer').model
+    iri = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/Person')
+    entry = model.entryForIRI[id(iri)]
+    parent = model.index(model.rowForEntry(entry), 0)
+    # THEN
+    assert model.hasChildren(parent)
+    assert model.canFetchMore(parent)
+    assert model.rowCount(parent) == 0
+    # WHEN
+    model.fetchMore(parent)
+    # THEN
+    assert model.rowCount(parent) == len(project.iriOccurrences(iri=iri))
+    nodes = {model.index(row, 0, parent).data(QtCore.Qt.UserRole + 1) for row in range(model.rowCount(parent))}
+    assert nodes == project.iriOccurrences(iri=iri)
+
+
+def test_model_removes_occurrences_of_deleted_nodes(session, qtbot):
+    # GIVEN
+    project = session.project
+    diagram = project.diagram('diagram')
+    model = session.plugin('ontology_explorer').widget('ontology_explorer').model
+    iri = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/Person')
+    entry = model.entryForIRI[id(iri)]
+    parent = model.index(model.rowForEntry(entry), 0)
+    assert model.canFetchMore(parent)
+    model.fetchMore(parent)
+    nodes = project.iriOccurrences(iri=iri, diagram=diagram)
+    assert len(nodes) == 1
+    assert model.rowCount(parent) == 1
+    count = model.rowCount()
+    # WHEN
+    with qtbot.waitSignal(model.rowsRemoved):
+        session.undostack.push(CommandItemsRemove(diagram, {first(nodes)}))
+    # THEN
+    assert not project.iriOccurrences(iri=iri)
+    assert id(iri) not in model.entryForIRI
+    assert model.rowCount() == count - 1
+    # WHEN
+    session.undostack.undo()
+    # THEN
+    assert id(iri) in model.entryForIRI
+    assert model.rowCount() == count
+    parent = model.index(model.rowForEntry(model.entryForIRI[id(iri)]), 0)
+    assert model.canFetchMore(parent)
+    model.fetchMore(parent)
+    assert model.rowCount(parent) == 1
+
+
+def test_proxy_filters_iris_by_search_key(session):
+    # GIVEN
+    widget = session.plugin('ontology_explorer').widget('ontology_explorer')
+    model = widget.model
+    proxy = widget.proxy
+    iri = session.project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/Person')
+    assert proxy.rowCount() == model.rowCount()
+    # WHEN
+    widget.doFilterItem('Person')
+    # THEN
+    iris = {model.entries[proxy.mapToSource(proxy.index(row, 0)).row()].iri for row in range(proxy.rowCount())}
+    assert iri in iris
+    assert 0 < proxy.rowCount() < model.rowCount()
+    # WHEN
+    widget.doFilterItem('')
+    # THEN
+    assert proxy.rowCount() == model.rowCount()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+"""
+Tests for the overview plugin.
+"""
+
+import pytest
+
+from PyQt5 import QtCore
+
+from eddy.core.datatypes.graphol import Item
+from eddy.core.functions.misc import first
+from eddy.core.functions.path import expandPath
+from eddy.ui.session import Session
+
+
+@pytest.fixture
+def session(qapp, qtbot, logging_disabled):
+    """
+    Provide an initialized Session instance.
+    """
+    with logging_disabled:
+        session = Session(qapp, expandPath('@tests/test_project_3/test_project_3_1.graphol'))
+        session.show()
+    qtbot.addWidget(session)
+    qtbot.waitExposed(session, timeout=3000)
+    with qtbot.waitSignal(session.sgnDiagramFocused):
+        session.sgnFocusDiagram.emit(session.project.diagram('diagram'))
+    yield session
+
+
+#############################################
+#   OVERVIEW TESTS
+#################################
+
+def test_overview_tracks_diagram_bounds(session, qtbot):
+    # GIVEN
+    diagram = session.mdi.activeDiagram()
+    widget = session.plugin('overview').widget('overview')
+    node = first(diagram.nodes(), filter_on_item=lambda n: n.type() is Item.ConceptNode)
+    qtbot.waitUntil(lambda: not widget.redrawTimer.isActive())
+    assert widget.bounds.contains(diagram.itemsBoundingRect())
+    assert widget.snapshot is not None
+    # WHEN
+    node.setPos(widget.bounds.bottomRight() + QtCore.QPointF(500, 500))
+    # THEN
+    qtbot.waitUntil(lambda: widget.bounds.contains(node.mapRectToScene(node.boundingRect())))
+
+
+def test_overview_redraws_are_coalesced(session, qtbot):
+    # GIVEN
+    widget = session.plugin('overview').widget('overview')
+    qtbot.waitUntil(lambda: not widget.redrawTimer.isActive())
+    redraws = []
+    widget.redrawTimer.timeout.connect(lambda: redraws.append(True))
+    # WHEN
+    for _ in range(10):
+        widget.redraw()
+    qtbot.waitUntil(lambda: not widget.redrawTimer.isActive())
+    # THEN
+    assert len(redraws) == 1
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+"""
+Tests for the IRI label renderer.
+"""
+
+import pytest
+
+from eddy.core.owl import AnnotationAssertion, AnnotationAssertionProperty, IRIRender
+from eddy.core.rendering import IRILabelRenderer
+from eddy.core.functions.path import expandPath
+from eddy.ui.session import Session
+
+
+@pytest.fixture
+def session(qapp, qtbot, logging_disabled):
+    """
+    Provide an initialized Session instance.
+    """
+    with logging_disabled:
+        session = Session(qapp, expandPath('@tests/test_project_3/test_project_3_1.graphol'))
+        session.show()
+    qtbot.addWidget(session)
+    qtbot.waitExposed(session, timeout=3000)
+    yield session
+
+
+#############################################
+#   RENDERING
+#################################
+
+def test_render_mode_switch_relabels_nodes(session):
+    # GIVEN
+    project = session.project
+    renderer = IRILabelRenderer.forProject(project)
+    iri = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/Person')
+    nodes = project.iriOccurrences(iri=iri)
+    assert renderer is IRILabelRenderer.forProject(project)
+    assert nodes
+    # WHEN
+    renderer.setMode(IRIRender.FULL)
+    # THEN
+    assert renderer.label(iri) == str(iri)
+    assert all(node.labelString == str(iri) for node in nodes)
+    # WHEN
+    renderer.setMode(IRIRender.SIMPLE_NAME)
+    # THEN
+    assert renderer.label(iri) == 'Person'
+    assert all(node.labelString == 'Person' for node in nodes)
+
+
+def test_label_cache_is_invalidated_by_annotations(session):
+    # GIVEN
+    project = session.project
+    renderer = IRILabelRenderer.forProject(project)
+    iri = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/Person')
+    nodes = project.iriOccurrences(iri=iri)
+    annotation = AnnotationAssertion(iri, AnnotationAssertionProperty.Label.value, 'Persona', language='it')
+    renderer.setMode(IRIRender.LABEL, 'it')
+    assert renderer.label(iri) != 'Persona'
+    # WHEN
+    iri.addAnnotationAssertion(annotation)
+    # THEN
+    assert renderer.label(iri) == 'Persona'
+    assert all(node.labelString == 'Persona' for node in nodes)
+    # WHEN
+    iri.removeAnnotationAssertion(annotation)
+    # THEN
+    assert renderer.label(iri) != 'Persona'
+    assert all(node.labelString != 'Persona' for node in nodes)
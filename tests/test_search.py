@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+
+"""
+Tests for the entity search index.
+"""
+
+import pytest
+
+from eddy.core.owl import AnnotationAssertion, AnnotationAssertionProperty
+from eddy.core.search import EntitySearchIndex
+from eddy.core.functions.path import expandPath
+from eddy.ui.session import Session
+
+
+@pytest.fixture
+def session(qapp, qtbot, logging_disabled):
+    """
+    Provide an initialized Session instance.
+    """
+    with logging_disabled:
+        session = Session(qapp, expandPath('@tests/test_project_3/test_project_3_1.graphol'))
+        session.show()
+    qtbot.addWidget(session)
+    qtbot.waitExposed(session, timeout=3000)
+    yield session
+
+
+#############################################
+#   TOKENIZATION
+#################################
+
+def test_tokenize_splits_words_and_camel_case():
+    assert EntitySearchIndex.tokenize('hasParent') == ['hasparent', 'has', 'parent']
+    assert EntitySearchIndex.tokenize('test:Person_name') == ['test', 'person', 'name']
+    assert EntitySearchIndex.tokenize('  ') == []
+
+
+#############################################
+#   SEARCH
+#################################
+
+def test_search_by_exact_prefix_and_approximate_name(session):
+    # GIVEN
+    project = session.project
+    index = EntitySearchIndex.forProject(project)
+    iri = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/Person')
+    # THEN
+    assert index is EntitySearchIndex.forProject(project)
+    assert index.search('Person')[0] is iri
+    assert iri in index.search('Pers')
+    assert iri in index.search('Persn')
+    assert index.search('zzzzqqqq') == []
+
+
+def test_search_is_updated_with_annotations(session):
+    # GIVEN
+    project = session.project
+    index = EntitySearchIndex.forProject(project)
+    iri = project.getIRI('http://www.dis.uniroma1.it/~graphol/test_project/Person')
+    annotation = AnnotationAssertion(iri, AnnotationAssertionProperty.Label.value, 'Persona umana', language='it')
+    assert iri not in index.search('umana')
+    # WHEN
+    iri.addAnnotationAssertion(annotation)
+    # THEN
+    assert index.search('umana')[0] is iri
+    # WHEN
+    iri.removeAnnotationAssertion(annotation)
+    # THEN
+    assert iri not in index.search('umana')
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#                                                                        #
+#  Eddy: a graphical editor for the specification of Graphol ontologies  #
+#  Copyright (C) 2015 Daniele Pantaleone <danielepantaleone@me.com>      #
+#                                                                        #
+#  This program is free software: you can redistribute it and/or modify  #
+#  it under the terms of the GNU General Public License as published by  #
+#  the Free Software Foundation, either version 3 of the License, or     #
+#  (at your option) any later version.                                   #
+#                                                                        #
+#  This program is distributed in the hope that it will be useful,       #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of        #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the          #
+#  GNU General Public License for more details.                          #
+#                                                                        #
+#  You should have received a copy of the GNU General Public License     #
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.  #
+#                                                                        #
+#  #####################                          #####################  #
+#                                                                        #
+#  Graphol is developed by members of the DASI-lab group of the          #
+#  Dipartimento di Ingegneria Informatica, Automatica e Gestionale       #
+#  A.Ruberti at Sapienza University of Rome: http://www.dis.uniroma1.it  #
+#                                                                        #
+#     - Domenico Lembo <lembo@dis.uniroma1.it>                           #
+#     - Valerio Santarelli <santarelli@dis.uniroma1.it>                  #
+#     - Domenico Fabio Savo <savo@dis.uniroma1.it>                       #
+#     - Daniele Pantaleone <pantaleone@dis.uniroma1.it>                  #
+#     - Marco Console <console@dis.uniroma1.it>                          #
+#                                                                        #
+##########################################################################
+
+"""
+Tests for the project statistics.
+"""
+
+import pytest
+
+from eddy.core.commands.common import CommandItemsRemove
+from eddy.core.datatypes.graphol import Item
+from eddy.core.functions.path import expandPath
+from eddy.core.statistics import ProjectStatistics
+from eddy.ui.session import Session
+
+
+@pytest.fixture
+def session(qapp, qtbot, logging_disabled):
+    """
+    Provide an initialized Session instance.
+    """
+    with logging_disabled:
+        session = Session(qapp, expandPath('@tests/test_project_3/test_project_3_1.graphol'))
+        session.show()
+    qtbot.addWidget(session)
+    qtbot.waitExposed(session, timeout=3000)
+    yield session
+
+
+#############################################
+#   STATISTICS TESTS
+#################################
+
+def test_statistics_match_project_counters(session):
+    # GIVEN
+    project = session.project
+    statistics = ProjectStatistics.forProject(project)
+    # THEN
+    assert statistics is ProjectStatistics.forProject(project)
+    for item in ProjectStatistics.Entities:
+        assert statistics.entities(item) == len(project.itemIRIs(item))
+    assert statistics.items(Item.ConceptNode) == project.itemNum(Item.ConceptNode)
+
+
+def test_statistics_publish_only_changed_counters(session, qtbot):
+    # GIVEN
+    project = session.project
+    diagram = project.diagram('diagram')
+    statistics = ProjectStatistics.forProject(project)
+    widget = session.plugin('info').widget('info')
+    roles = project.itemNum(Item.RoleNode, diagram)
+    nodes = {node for node in project.nodes(diagram) if node.type() is Item.RoleNode}
+    items = nodes | {edge for node in nodes for edge in node.edges}
+    # WHEN
+    with qtbot.waitSignal(statistics.sgnStatisticsChanged) as blocker:
+        session.undostack.push(CommandItemsRemove(diagram, items))
+    # THEN
+    changed = blocker.args[0]
+    assert ('items', Item.RoleNode) in changed
+    assert ('items', Item.ConceptNode) not in changed
+    assert statistics.items(Item.RoleNode, diagram) == project.itemNum(Item.RoleNode, diagram) == 0
+    assert statistics.items(Item.RoleNode) == project.itemNum(Item.RoleNode)
+    assert roles > 0
+    assert widget.infoProject.rolesField.value() == len(project.itemIRIs(Item.RoleNode))